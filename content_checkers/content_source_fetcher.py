@@ -0,0 +1,171 @@
+"""
+Concurrent fetching for content sources.
+
+Content sources with many lists (MDBList URLs, Trakt lists, other users' Plex
+watchlists) and paginated APIs (Overseerr requests) used to be fetched one
+request at a time. This module runs those requests on a small thread pool while
+keeping each service within its own limits:
+
+- `ServiceRateLimiter` caps concurrent requests and request spacing per service,
+  and lets a 429 from one request pause every request to that service. A
+  thread that already holds a slot (a fetch_in_order job whose fetcher takes
+  the limiter again per HTTP request) reuses it instead of waiting for another.
+- `fetch_in_order` runs independent fetches concurrently but yields results in
+  submission order as soon as they are ready, so the caller can process list 1
+  while lists 2..N are still downloading, and results stay deterministic.
+- `iter_pages` pipelines pagination: the next page is requested while the
+  current one is processed, and once the page count is known the remaining
+  pages are fetched concurrently.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# service -> (max concurrent requests, minimum seconds between request starts)
+SERVICE_LIMITS = {
+    'trakt': (3, 0.25),
+    'mdblist': (4, 0.0),
+    'overseerr': (4, 0.0),
+    'plex': (3, 0.0),
+}
+DEFAULT_SERVICE_LIMIT = (2, 0.0)
+
+
+class ServiceRateLimiter:
+    """Concurrency cap, request spacing and shared back-off for one external service."""
+
+    def __init__(self, name: str, max_concurrent: int, min_interval: float = 0.0):
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.min_interval = min_interval
+        self._semaphore = threading.BoundedSemaphore(max_concurrent)
+        self._lock = threading.Lock()
+        self._next_start = 0.0
+        self._blocked_until = 0.0
+        self._held = threading.local()
+
+    def backoff(self, seconds: float):
+        """Pause all requests to this service for `seconds` (e.g. after a 429)."""
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.time() + seconds)
+
+    def _wait_for_turn(self):
+        while True:
+            with self._lock:
+                now = time.time()
+                start_at = max(self._next_start, self._blocked_until)
+                if start_at <= now:
+                    self._next_start = now + self.min_interval
+                    return
+            time.sleep(start_at - now)
+
+    @contextmanager
+    def request(self):
+        """
+        Hold a request slot; waits for a free slot, the request spacing and any back-off.
+
+        Re-entrant per thread: a nested request() keeps the spacing and back-off
+        but reuses the slot the thread already holds.
+        """
+        depth = getattr(self._held, 'depth', 0)
+        if depth:
+            self._wait_for_turn()
+            self._held.depth = depth + 1
+            try:
+                yield
+            finally:
+                self._held.depth = depth
+            return
+        with self._semaphore:
+            self._wait_for_turn()
+            self._held.depth = 1
+            try:
+                yield
+            finally:
+                self._held.depth = 0
+
+
+_limiters: Dict[str, ServiceRateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_service_limiter(service: str) -> ServiceRateLimiter:
+    with _limiters_lock:
+        limiter = _limiters.get(service)
+        if limiter is None:
+            max_concurrent, min_interval = SERVICE_LIMITS.get(service, DEFAULT_SERVICE_LIMIT)
+            limiter = ServiceRateLimiter(service, max_concurrent, min_interval)
+            _limiters[service] = limiter
+        return limiter
+
+
+def fetch_in_order(jobs: Iterable[Tuple[str, Callable[[], Any]]], service: str) -> Iterator[Tuple[str, Any, Optional[Exception]]]:
+    """
+    Run fetch jobs concurrently and yield (label, result, error) in job order.
+
+    At most the service's concurrency limit runs at once. A job's result is
+    yielded as soon as it and all jobs before it have finished. If the consumer
+    stops early, jobs that haven't started are cancelled.
+    """
+    jobs = list(jobs)
+    if not jobs:
+        return
+    limiter = get_service_limiter(service)
+
+    def run(fetch):
+        with limiter.request():
+            return fetch()
+
+    executor = ThreadPoolExecutor(max_workers=min(limiter.max_concurrent, len(jobs)),
+                                  thread_name_prefix=f"ContentFetch-{service}")
+    try:
+        futures = [(label, executor.submit(run, fetch)) for label, fetch in jobs]
+        for label, future in futures:
+            try:
+                yield label, future.result(), None
+            except Exception as e:
+                yield label, None, e
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def iter_pages(fetch_page: Callable[[int], Tuple[List[Any], Optional[int]]], service: str) -> Iterator[List[Any]]:
+    """
+    Yield pages from `fetch_page(page_number)` (1-based) in order, fetching ahead.
+
+    `fetch_page` returns (results, total_pages); total_pages may be None if the
+    API doesn't report it. Iteration stops at the first empty page, at
+    total_pages, or when fetch_page raises (the error propagates).
+    """
+    limiter = get_service_limiter(service)
+
+    def run(page_number):
+        with limiter.request():
+            return fetch_page(page_number)
+
+    executor = ThreadPoolExecutor(max_workers=limiter.max_concurrent, thread_name_prefix=f"ContentPages-{service}")
+    try:
+        pending = {1: executor.submit(run, 1)}
+        next_page = 1
+        submitted = 1
+        total_pages = None
+        while next_page in pending:
+            results, reported_pages = pending.pop(next_page).result()
+            if reported_pages is not None:
+                total_pages = reported_pages
+            if not results:
+                break
+            last_page = total_pages if total_pages is not None else next_page + 1
+            # Keep up to max_concurrent pages in flight: all of them once the page count is
+            # known, otherwise speculatively the next one only
+            window = limiter.max_concurrent if total_pages is not None else 1
+            while submitted < last_page and submitted < next_page + window:
+                submitted += 1
+                pending[submitted] = executor.submit(run, submitted)
+            yield results
+            next_page += 1
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
@@ -5,6 +5,7 @@ from typing import List, Dict, Any, Tuple
 import os
 import pickle
 from datetime import datetime, timedelta
+from content_checkers.content_source_fetcher import iter_pages
 
 DEFAULT_TAKE = 100
 REQUEST_TIMEOUT = 15  # seconds
@@ -103,39 +104,33 @@ def get_overseerr_details(overseerr_url: str, overseerr_api_key: str, tmdb_id: i
 def fetch_overseerr_wanted_content(overseerr_url: str, overseerr_api_key: str, take: int = DEFAULT_TAKE) -> List[Dict[str, Any]]:
     headers = get_overseerr_headers(overseerr_api_key)
     wanted_content = []
-    skip = 0
-    page = 1
-
-    while True:
-        try:
-            request_url = get_url(overseerr_url, f"/api/v1/request?take={take}&skip={skip}&filter=approved")
-            logging.debug(f"Fetching Overseerr requests with URL: {request_url}")
-            response = api.get(
-                request_url,
-                headers=headers,
-                timeout=REQUEST_TIMEOUT
-            )
-            response.raise_for_status()
-            data = response.json()
-            
-            results = data.get('results', [])
-            
-            if not results:
-                break
 
+    def fetch_page(page: int):
+        skip = (page - 1) * take
+        request_url = get_url(overseerr_url, f"/api/v1/request?take={take}&skip={skip}&filter=approved")
+        logging.debug(f"Fetching Overseerr requests with URL: {request_url}")
+        response = api.get(
+            request_url,
+            headers=headers,
+            timeout=REQUEST_TIMEOUT
+        )
+        response.raise_for_status()
+        data = response.json()
+        results = data.get('results', [])
+        total_pages = (data.get('pageInfo') or {}).get('pages')
+        if len(results) < take:
+            # A short page is the last one, whatever pageInfo says
+            total_pages = page
+        return results, total_pages
+
+    # Later pages are fetched concurrently while earlier ones are collected
+    try:
+        for results in iter_pages(fetch_page, 'overseerr'):
             wanted_content.extend(results)
-            skip += take
-            page += 1
-
-            if len(results) < take:
-                break
-
-        except api.exceptions.RequestException as e:
-            logging.error(f"Error fetching wanted content from Overseerr: {e}")
-            break
-        except Exception as e:
-            logging.error(f"Unexpected error while processing Overseerr response: {e}")
-            break
+    except api.exceptions.RequestException as e:
+        logging.error(f"Error fetching wanted content from Overseerr: {e}")
+    except Exception as e:
+        logging.error(f"Unexpected error while processing Overseerr response: {e}")
 
     logging.info(f"Found {len(wanted_content)} wanted items from Overseerr")
     return wanted_content
@@ -65,11 +65,11 @@ patch_logger.info(f"{LOG_FLAG_PATCH} Imported MyPlexAccount from plexapi.myplex.
 from typing import List, Dict, Any, Tuple
 from utilities.settings import get_setting
 from database.database_reading import get_media_item_presence
+from database.plex_ingestion import get_plex_watchlist_entries, upsert_plex_watchlist_entries, remove_plex_watchlist_entries
 from queues.config_manager import load_config
 from cli_battery.app.trakt_metadata import TraktMetadata
 from cli_battery.app.direct_api import DirectAPI
 import os
-import pickle
 from datetime import datetime, timedelta
 from .plex_token_manager import update_token_status, get_token_status
 import time
@@ -77,28 +77,8 @@ import aiohttp
 import asyncio
 import xml.etree.ElementTree as ET
 
-# Get db_content directory from environment variable with fallback
-DB_CONTENT_DIR = os.environ.get('USER_DB_CONTENT', '/user/db_content')
-PLEX_WATCHLIST_CACHE_FILE = os.path.join(DB_CONTENT_DIR, 'plex_watchlist_cache.pkl')
-OTHER_PLEX_WATCHLIST_CACHE_FILE = os.path.join(DB_CONTENT_DIR, 'other_plex_watchlist_cache.pkl')
-CACHE_EXPIRY_DAYS = 7
-
-def load_plex_cache(cache_file):
-    try:
-        if os.path.exists(cache_file):
-            with open(cache_file, 'rb') as f:
-                return pickle.load(f)
-    except (EOFError, pickle.UnpicklingError, FileNotFoundError) as e:
-        logging.warning(f"Error loading Plex watchlist cache: {e}. Creating a new cache.")
-    return {}
-
-def save_plex_cache(cache, cache_file):
-    try:
-        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
-        with open(cache_file, 'wb') as f:
-            pickle.dump(cache, f)
-    except Exception as e:
-        logging.error(f"Error saving Plex watchlist cache: {e}")
+# IDs resolved for a watchlist entry are re-fetched after this many days, in case Plex's match changed
+WATCHLIST_ID_REFRESH_DAYS = 30
 
 async def fetch_item_details_and_extract_ids(session, item_data, plex_token_str):
     """
@@ -166,6 +146,75 @@ async def run_async_fetches(watchlist_items_with_urls, plex_token_str):
         results = await asyncio.gather(*tasks, return_exceptions=False) # Errors handled in fetch_item_details
         return results
 
+def _watchlist_rating_key(item_obj) -> str:
+    return str(getattr(item_obj, 'ratingKey', None) or item_obj.key)
+
+def resolve_watchlist_details(username: str, watchlist, plex_token_str: str, log_prefix: str = '') -> List[Dict[str, Any]]:
+    """
+    Get IMDB ID, TMDB ID and media type for every watchlist entry, in watchlist order.
+
+    IDs resolved on an earlier run are read from plex_watchlist_entries, so only
+    entries that are new to the watchlist (or whose IDs are older than
+    WATCHLIST_ID_REFRESH_DAYS) cost a metadata request; those are fetched
+    concurrently over one shared session. Entries no longer on the watchlist are
+    forgotten. Results have the same shape as fetch_item_details_and_extract_ids,
+    plus 'rating_key' and 'cached'. Call remember_watchlist_details afterwards to
+    store newly resolved IDs.
+    """
+    known_entries = get_plex_watchlist_entries(username)
+    refresh_before = time.time() - WATCHLIST_ID_REFRESH_DAYS * 86400
+
+    details: List[Dict[str, Any]] = []
+    items_to_fetch = []
+    current_keys = set()
+    for item_obj in watchlist:
+        if not (hasattr(item_obj, 'key') and item_obj.key and hasattr(item_obj, '_server')):
+            logging.warning(f"{log_prefix}Skipping item {getattr(item_obj, 'title', 'Unknown Title')} due to missing key or _server attribute.")
+            continue
+        rating_key = _watchlist_rating_key(item_obj)
+        current_keys.add(rating_key)
+        known = known_entries.get(rating_key)
+        if known and known['imdb_id'] and known['resolved_at'] >= refresh_before:
+            details.append({'imdb_id': known['imdb_id'], 'tmdb_id': known['tmdb_id'], 'media_type': known['media_type'],
+                            'original_plex_item': item_obj, 'rating_key': rating_key, 'cached': True})
+            continue
+        try:
+            details_url = item_obj._server.url(item_obj.key)
+        except Exception as e_url:
+            logging.error(f"{log_prefix}Error constructing details URL for {item_obj.title}: {e_url}")
+            continue
+        items_to_fetch.append({'title': item_obj.title, 'url': details_url, 'original_plex_item': item_obj})
+        details.append({'rating_key': rating_key, 'original_plex_item': item_obj, 'cached': False, 'pending': True})
+
+    removed = remove_plex_watchlist_entries(username, [key for key in known_entries if key not in current_keys])
+    logging.info(f"{log_prefix}{len(details) - len(items_to_fetch)} watchlist entries already resolved, "
+                 f"{len(items_to_fetch)} to fetch, {removed} no longer on the watchlist.")
+
+    if items_to_fetch:
+        async_fetch_start_time = time.time()
+        fetched = iter(asyncio.run(run_async_fetches(items_to_fetch, plex_token_str)))
+        logging.info(f"{log_prefix}Async fetching of {len(items_to_fetch)} item details took {time.time() - async_fetch_start_time:.4f} seconds.")
+        for entry in details:
+            if entry.pop('pending', False):
+                entry.update(next(fetched))
+    return details
+
+def remember_watchlist_details(username: str, details: List[Dict[str, Any]]):
+    """Store the IDs of newly resolved watchlist entries so later runs don't fetch them again."""
+    entries = [
+        {
+            'rating_key': entry['rating_key'],
+            'title': getattr(entry['original_plex_item'], 'title', None),
+            'media_type': entry.get('media_type'),
+            'imdb_id': entry['imdb_id'],
+            'tmdb_id': entry.get('tmdb_id'),
+        }
+        for entry in details
+        if not entry.get('cached') and not entry.get('error') and entry.get('imdb_id')
+    ]
+    if entries and not upsert_plex_watchlist_entries(username, entries):
+        logging.warning(f"Could not store {len(entries)} resolved watchlist entries for {username}; they will be fetched again.")
+
 def get_plex_client():
     start_time = time.time()
     # Prefer main Plex token, fallback to symlink token if primary not set
@@ -250,29 +299,9 @@ def get_wanted_from_plex_watchlist(versions: Dict[str, bool]) -> List[Tuple[List
             logging.info("Plex watchlist is empty.")
             return [([], versions)]
 
-        items_to_process_async = []
-        for item_obj in initial_watchlist:
-            if hasattr(item_obj, 'key') and item_obj.key and hasattr(item_obj, '_server'):
-                try:
-                    details_url = item_obj._server.url(item_obj.key)
-                    items_to_process_async.append({
-                        'title': item_obj.title,
-                        'url': details_url,
-                        'original_plex_item': item_obj # Keep original item for removal etc.
-                    })
-                except Exception as e_url:
-                     logging.error(f"Error constructing details URL for {item_obj.title}: {e_url}")
-            else:
-                logging.warning(f"Skipping item {getattr(item_obj, 'title', 'Unknown Title')} due to missing key or _server attribute.")
+        # Only entries that are new to the watchlist need their details fetched
+        fetched_data_list = resolve_watchlist_details(account.username, initial_watchlist, plex_token_str)
 
-        logging.info(f"Prepared {len(items_to_process_async)} items for async fetching of details.")
-        
-        async_fetch_start_time = time.time()
-        # Run the asynchronous fetching
-        fetched_data_list = asyncio.run(run_async_fetches(items_to_process_async, plex_token_str))
-        async_fetch_end_time = time.time()
-        logging.info(f"Async fetching of all item details took {async_fetch_end_time - async_fetch_start_time:.4f} seconds.")
-        
         total_items_from_async = len(fetched_data_list)
         skipped_count = 0
         removed_count = 0
@@ -312,6 +341,7 @@ def get_wanted_from_plex_watchlist(versions: Dict[str, bool]) -> List[Tuple[List
                 skipped_count += 1
                 logging.debug(f"Skipping item '{title}' - no IMDB ID found after async fetch and potential conversion.")
                 continue
+            item_details['imdb_id'] = imdb_id
             
             # Ensure media_type is 'tv' or 'movie' for consistency downstream
             if media_type == 'show': media_type = 'tv' 
@@ -357,13 +387,14 @@ def get_wanted_from_plex_watchlist(versions: Dict[str, bool]) -> List[Tuple[List
 
         logging.info(f"Plex.tv cloud watchlist processing complete:")
         logging.info(f"Total items in initial watchlist: {len(initial_watchlist)}")
-        logging.info(f"Items prepared for async fetch: {len(items_to_process_async)}")
+        logging.info(f"Items resolved from earlier runs: {sum(1 for d in fetched_data_list if d.get('cached'))}")
         logging.info(f"Items successfully processed from async results: {len(fetched_data_list) - skipped_count - collected_skipped - removed_count}")
         logging.info(f"Items skipped (no IMDB ID or fetch error): {skipped_count}")
         logging.info(f"Items removed from watchlist: {removed_count}")
         logging.info(f"Items skipped (already collected and kept): {collected_skipped}")
         logging.info(f"New items added to wanted list: {len(processed_items_for_current_run)}")
         
+        remember_watchlist_details(account.username, fetched_data_list)
         all_wanted_items.append((processed_items_for_current_run, versions))
         
         overall_end_time = time.time()
@@ -408,28 +439,7 @@ def get_wanted_from_other_plex_watchlist(username: str, token: str, versions: Di
             logging.info(f"Plex watchlist for user {username} is empty.")
             return [([], versions)]
                     
-        items_to_process_async = []
-        for item_obj in initial_watchlist:
-            if hasattr(item_obj, 'key') and item_obj.key and hasattr(item_obj, '_server'):
-                try:
-                    details_url = item_obj._server.url(item_obj.key)
-                    items_to_process_async.append({
-                        'title': item_obj.title,
-                        'url': details_url,
-                        'original_plex_item': item_obj
-                    })
-                except Exception as e_url:
-                     logging.error(f"User {username}: Error constructing details URL for {item_obj.title}: {e_url}")
-            else:
-                logging.warning(f"User {username}: Skipping item {getattr(item_obj, 'title', 'Unknown Title')} due to missing key or _server attribute.")
-        
-        logging.info(f"User {username}: Prepared {len(items_to_process_async)} items for async fetching of details.")
-        
-        async_fetch_start_time = time.time()
-        # Run the asynchronous fetching using the provided 'token' for this user
-        fetched_data_list = asyncio.run(run_async_fetches(items_to_process_async, token))
-        async_fetch_end_time = time.time()
-        logging.info(f"User {username}: Async fetching of all item details took {async_fetch_end_time - async_fetch_start_time:.4f} seconds.")
+        fetched_data_list = resolve_watchlist_details(username, initial_watchlist, token, log_prefix=f"User {username}: ")
 
         items_processed_count = 0
         items_skipped_no_imdb = 0
@@ -465,6 +475,7 @@ def get_wanted_from_other_plex_watchlist(username: str, token: str, versions: Di
             logging.debug(f"User {username}: Added '{title}' (IMDB: {imdb_id}, Type: {media_type}) to processed items.")
             
         logging.info(f"User {username}: Retrieved {items_processed_count} wanted items from watchlist. Skipped {items_skipped_no_imdb} (no IMDB or fetch error).")
+        remember_watchlist_details(username, fetched_data_list)
         
     except Exception as e:
         logging.error(f"Error fetching {username}'s Plex watchlist: {str(e)}", exc_info=True)
@@ -16,6 +16,7 @@ from utilities.settings import get_setting
 import random
 from time import sleep
 import requests
+from content_checkers.content_source_fetcher import get_service_limiter
 
 REQUEST_TIMEOUT = 10  # seconds
 TRAKT_API_URL = "https://api.trakt.tv"
@@ -252,12 +253,14 @@ def make_trakt_request(method, endpoint, data=None, max_retries=5, initial_delay
     if not headers:
         return None
 
+    limiter = get_service_limiter('trakt')
     for attempt in range(max_retries):
         try:
-            if method.lower() == 'get':
-                response = api.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
-            else:  # post
-                response = api.post(url, headers=headers, json=data, timeout=REQUEST_TIMEOUT)
+            with limiter.request():
+                if method.lower() == 'get':
+                    response = api.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
+                else:  # post
+                    response = api.post(url, headers=headers, json=data, timeout=REQUEST_TIMEOUT)
             
             # Check if response is HTML instead of JSON
             content_type = response.headers.get('content-type', '')
@@ -283,7 +286,8 @@ def make_trakt_request(method, endpoint, data=None, max_retries=5, initial_delay
                     delay = retry_after if retry_after > 0 else initial_delay * (2 ** attempt) + random.uniform(0, 1)
                     
                     logging.warning(f"Rate limit hit. Waiting {delay:.2f} seconds before retry {attempt + 1}/{max_retries}")
-                    sleep(delay)
+                    # Pause every Trakt request, not just this one; the next limiter.request() waits it out
+                    limiter.backoff(delay)
                     continue
                 elif status_code == 502:  # Bad Gateway
                     logging.warning(f"Trakt API Bad Gateway error (attempt {attempt + 1}/{max_retries})")
@@ -331,9 +335,12 @@ def fetch_items_from_trakt(
     url = f"{TRAKT_API_URL}{endpoint}"
     logging.debug(f"Fetching items from Trakt API: {url}")
 
+    limiter = get_service_limiter('trakt')
     for attempt in range(max_retries):
+        delay = 0
         try:
-            response = requests.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
+            with limiter.request():
+                response = requests.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
 
             # Detect HTML responses that sometimes appear instead of JSON
             content_type = response.headers.get("content-type", "")
@@ -359,6 +366,9 @@ def fetch_items_from_trakt(
                 logging.warning(
                     f"Rate limit hit (429). Waiting {delay:.2f} seconds before retry {attempt + 1}/{max_retries}"
                 )
+                # Shared back-off so concurrent Trakt fetches pause too
+                limiter.backoff(delay)
+                delay = 0
 
             elif status_code in (502, 504):  # Temporary gateway issues
                 delay = initial_delay * (2 ** attempt) + random.uniform(0, 1)
@@ -380,7 +390,7 @@ def fetch_items_from_trakt(
             )
 
         # If this was the last attempt, break out of the loop; otherwise sleep and retry.
-        if attempt < max_retries - 1:
+        if attempt < max_retries - 1 and delay:
             sleep(delay)
 
     logging.error(f"Failed to fetch items from Trakt API after {max_retries} attempts: {url}")
@@ -0,0 +1,216 @@
+"""
+Consistent online backups of the SQLite databases.
+
+Backups used to be made with shutil.copy2 of media_items.db. That copy could be
+torn while WAL writers were active and it left out everything still in the
+-wal file. This module uses the sqlite3 online backup API instead:
+
+- Pages are copied in steps of BACKUP_PAGES_PER_STEP with a short sleep
+  between steps, so writers are never blocked for long.
+- The copy is a consistent snapshot including committed WAL content.
+- The copy is written to a .partial file and checked with
+  `PRAGMA quick_check`. It is then optionally compressed (gzip, or zstd
+  when the `zstandard` package is installed) and renamed into place.
+- Older backups beyond the retention count are removed.
+
+media_items.db and cli_battery.db are both backed up. `run_database_backups`
+is called at startup (skipped when the last backup is recent) and by the
+scheduled `task_backup_databases`.
+"""
+
+import gzip
+import logging
+import os
+import shutil
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+try:
+    import zstandard
+except ImportError:  # optional dependency
+    zstandard = None
+
+BACKUP_PAGES_PER_STEP = 256
+BACKUP_STEP_SLEEP_SECONDS = 0.01
+DEFAULT_RETENTION = 2
+DEFAULT_INTERVAL_HOURS = 24
+BACKUP_DATABASES = ('media_items', 'cli_battery')
+COMPRESSION_EXTENSIONS = {'none': '', 'gzip': '.gz', 'zstd': '.zst'}
+
+_backup_lock = threading.Lock()
+_backup_status: Dict[str, Any] = {'running': False, 'last_run': None, 'results': []}
+
+
+def get_backup_dir() -> str:
+    db_content_dir = os.environ.get('USER_DB_CONTENT', '/user/db_content')
+    return os.path.join(db_content_dir, 'backups')
+
+
+def list_backups(name: str, backup_dir: Optional[str] = None) -> List[str]:
+    """Backups of one database, newest first."""
+    backup_dir = backup_dir or get_backup_dir()
+    if not os.path.isdir(backup_dir):
+        return []
+    suffixes = tuple('.db' + ext for ext in COMPRESSION_EXTENSIONS.values())
+    backups = [os.path.join(backup_dir, f) for f in os.listdir(backup_dir)
+               if f.startswith(f'{name}_') and f.endswith(suffixes)]
+    backups.sort(key=os.path.getmtime, reverse=True)
+    return backups
+
+
+def _compress(path: str, compression: str) -> str:
+    """Compress a finished backup file and return the new path."""
+    if compression == 'zstd' and zstandard is None:
+        logging.warning("zstandard is not installed, compressing database backup with gzip instead")
+        compression = 'gzip'
+    target = path + COMPRESSION_EXTENSIONS[compression]
+    partial = target + '.partial'
+    with open(path, 'rb') as src:
+        if compression == 'zstd':
+            with open(partial, 'wb') as dst:
+                zstandard.ZstdCompressor(level=3).copy_stream(src, dst)
+        else:
+            with gzip.open(partial, 'wb', compresslevel=6) as dst:
+                shutil.copyfileobj(src, dst, length=1024 * 1024)
+    os.replace(partial, target)
+    os.remove(path)
+    return target
+
+
+def backup_sqlite_database(
+    source_path: str,
+    name: str,
+    backup_dir: Optional[str] = None,
+    compression: str = 'none',
+    retention: int = DEFAULT_RETENTION,
+    progress_callback: Optional[Callable[[int, int], None]] = None,
+) -> Dict[str, Any]:
+    """
+    Back up one SQLite database with the online backup API.
+
+    Args:
+        source_path: Path of the live database
+        name: Prefix of the backup files (name_YYYYmmdd_HHMMSS.db[.gz|.zst])
+        backup_dir: Target directory, defaults to USER_DB_CONTENT/backups
+        compression: 'none', 'gzip' or 'zstd'
+        retention: Number of backups of this database to keep
+        progress_callback: Called with (pages_copied, total_pages) after every step
+
+    Returns:
+        Dict with name, path, size_bytes, pages, duration_seconds, verified, and error when failed
+    """
+    backup_dir = backup_dir or get_backup_dir()
+    os.makedirs(backup_dir, exist_ok=True)
+    compression = compression if compression in COMPRESSION_EXTENSIONS else 'none'
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    backup_path = os.path.join(backup_dir, f'{name}_{timestamp}.db')
+    partial_path = backup_path + '.partial'
+    result: Dict[str, Any] = {'name': name, 'path': None, 'size_bytes': 0, 'pages': 0,
+                              'duration_seconds': 0.0, 'verified': False}
+    start = time.monotonic()
+    last_logged = [0]
+
+    def on_progress(status, remaining, total):
+        copied = total - remaining
+        result['pages'] = total
+        if progress_callback:
+            progress_callback(copied, total)
+        percent = int(copied * 100 / total) if total else 100
+        if percent >= last_logged[0] + 25:
+            last_logged[0] = percent - percent % 25
+            logging.info(f"Backing up {name}: {percent}% ({copied}/{total} pages)")
+
+    source = dest = None
+    try:
+        source = sqlite3.connect(source_path, timeout=30)
+        dest = sqlite3.connect(partial_path)
+        source.backup(dest, pages=BACKUP_PAGES_PER_STEP, progress=on_progress, sleep=BACKUP_STEP_SLEEP_SECONDS)
+        dest.close()
+        dest = None
+
+        check = sqlite3.connect(partial_path)
+        try:
+            quick_check = check.execute('PRAGMA quick_check').fetchone()[0]
+        finally:
+            check.close()
+        if quick_check != 'ok':
+            raise sqlite3.DatabaseError(f"quick_check on the backup copy failed: {quick_check}")
+        result['verified'] = True
+
+        os.replace(partial_path, backup_path)
+        if compression != 'none':
+            backup_path = _compress(backup_path, compression)
+        result['path'] = backup_path
+        result['size_bytes'] = os.path.getsize(backup_path)
+    except Exception as e:
+        result['error'] = str(e)
+        logging.error(f"Error backing up {name} database: {e}")
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+        return result
+    finally:
+        if dest is not None:
+            dest.close()
+        if source is not None:
+            source.close()
+        result['duration_seconds'] = round(time.monotonic() - start, 3)
+
+    logging.info(f"Backup of {name} created: {backup_path} "
+                 f"({result['size_bytes'] / 1024 / 1024:.1f} MB, {result['duration_seconds']:.1f}s, quick_check ok)")
+
+    for old_backup in list_backups(name, backup_dir)[max(retention, 1):]:
+        try:
+            os.remove(old_backup)
+            logging.info(f"Removed old backup: {old_backup}")
+        except OSError as e:
+            logging.warning(f"Could not remove old backup {old_backup}: {e}")
+    return result
+
+
+def run_database_backups(min_age_hours: float = 0, progress_callback: Optional[Callable[[str, int, int], None]] = None) -> List[Dict[str, Any]]:
+    """
+    Back up media_items.db and cli_battery.db using the Debug backup settings.
+
+    A database is skipped when its newest backup is younger than min_age_hours.
+    Returns one result dict per database backed up.
+    """
+    from utilities.settings import get_setting
+
+    if not _backup_lock.acquire(blocking=False):
+        logging.info("Database backup already running, skipping")
+        return []
+    try:
+        _backup_status['running'] = True
+        compression = get_setting('Debug', 'database_backup_compression', 'none')
+        try:
+            retention = int(get_setting('Debug', 'database_backup_retention', DEFAULT_RETENTION))
+        except (TypeError, ValueError):
+            retention = DEFAULT_RETENTION
+        db_content_dir = os.environ.get('USER_DB_CONTENT', '/user/db_content')
+        results = []
+        for name in BACKUP_DATABASES:
+            source_path = os.path.join(db_content_dir, f'{name}.db')
+            if not os.path.exists(source_path):
+                continue
+            existing = list_backups(name)
+            if min_age_hours and existing and time.time() - os.path.getmtime(existing[0]) < min_age_hours * 3600:
+                logging.info(f"Skipping {name} backup, the latest one is less than {min_age_hours:g} hours old")
+                continue
+            callback = (lambda copied, total, n=name: progress_callback(n, copied, total)) if progress_callback else None
+            results.append(backup_sqlite_database(source_path, name, compression=compression,
+                                                  retention=retention, progress_callback=callback))
+        _backup_status['last_run'] = datetime.now().isoformat()
+        _backup_status['results'] = results
+        return results
+    finally:
+        _backup_status['running'] = False
+        _backup_lock.release()
+
+
+def get_backup_status() -> Dict[str, Any]:
+    status = dict(_backup_status)
+    status['backups'] = {name: [os.path.basename(path) for path in list_backups(name)] for name in BACKUP_DATABASES}
+    return status
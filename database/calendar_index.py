@@ -0,0 +1,158 @@
+"""
+Calendar index of media_items by local air date and time.
+
+The home page and calendar views used to filter media_items by release_date
+on every load, then group and convert the rows in Python. `media_calendar`
+holds one row per movie or episode with a parseable release date:
+
+- `air_local` is 'YYYY-MM-DD HH:MM' in local wall-clock time. It is the
+  release date plus the airtime, or 19:00 when no airtime is set, the same
+  default the views already used.
+- The fields the views display (title, season/episode, ids, state,
+  upgrading_from) are copied into the row, so a view is a range scan of
+  idx_media_calendar_type_air and never reads media_items.
+
+Triggers on media_items keep the table current when items are added or
+deleted, and when their release date, airtime, state or displayed fields
+change. `verify_calendar_index` compares it with media_items and can
+rebuild it.
+"""
+
+import logging
+import sqlite3
+from typing import Any, Dict
+
+from .core import get_db_connection
+
+DEFAULT_AIRTIME = '19:00'
+_DATE_PATTERN = "'[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9]*'"
+
+_CALENDAR_COLUMNS = ('item_id', 'type', 'air_local', 'release_date', 'airtime', 'title', 'season_number',
+                     'episode_number', 'imdb_id', 'tmdb_id', 'state', 'upgrading_from')
+_SOURCE_COLUMNS = ('type', 'release_date', 'airtime', 'title', 'season_number', 'episode_number',
+                   'imdb_id', 'tmdb_id', 'state', 'upgrading_from')
+
+
+def _calendar_select(row: str, source: str = '') -> str:
+    """SELECT producing calendar rows for `row` (NEW, or the alias of `source`), skipping items without a usable date."""
+    return f'''
+        SELECT {row}.id, {row}.type,
+               substr({row}.release_date, 1, 10) || ' ' ||
+                   CASE WHEN {row}.airtime GLOB '[0-9][0-9]:[0-9][0-9]*' THEN substr({row}.airtime, 1, 5)
+                        ELSE '{DEFAULT_AIRTIME}' END,
+               substr({row}.release_date, 1, 10), {row}.airtime, {row}.title, {row}.season_number,
+               {row}.episode_number, {row}.imdb_id, {row}.tmdb_id, {row}.state, {row}.upgrading_from
+        {source}
+        WHERE {row}.type IN ('movie', 'episode') AND {row}.release_date GLOB {_DATE_PATTERN}
+    '''
+
+
+_INSERT_CALENDAR_ROW = f"INSERT OR REPLACE INTO media_calendar ({', '.join(_CALENDAR_COLUMNS)})"
+
+_TRIGGERS = {
+    'trigger_media_calendar_insert': f'''
+        CREATE TRIGGER trigger_media_calendar_insert
+        AFTER INSERT ON media_items
+        BEGIN
+            {_INSERT_CALENDAR_ROW} {_calendar_select('NEW')};
+        END
+    ''',
+    'trigger_media_calendar_update': f'''
+        CREATE TRIGGER trigger_media_calendar_update
+        AFTER UPDATE OF {', '.join(_SOURCE_COLUMNS)} ON media_items
+        WHEN {' OR '.join(f'OLD.{column} IS NOT NEW.{column}' for column in _SOURCE_COLUMNS)}
+        BEGIN
+            DELETE FROM media_calendar WHERE item_id = OLD.id;
+            {_INSERT_CALENDAR_ROW} {_calendar_select('NEW')};
+        END
+    ''',
+    'trigger_media_calendar_delete': '''
+        CREATE TRIGGER trigger_media_calendar_delete
+        AFTER DELETE ON media_items
+        BEGIN
+            DELETE FROM media_calendar WHERE item_id = OLD.id;
+        END
+    ''',
+}
+
+
+def create_calendar_index():
+    """Create media_calendar with its indexes and triggers, filling it when it is new."""
+    conn = get_db_connection()
+    try:
+        created = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'media_calendar'").fetchone() is None
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS media_calendar (
+                item_id INTEGER PRIMARY KEY,
+                type TEXT NOT NULL,
+                air_local TEXT NOT NULL,
+                release_date TEXT NOT NULL,
+                airtime TEXT,
+                title TEXT,
+                season_number INTEGER,
+                episode_number INTEGER,
+                imdb_id TEXT,
+                tmdb_id TEXT,
+                state TEXT,
+                upgrading_from TEXT
+            )
+        ''')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_media_calendar_type_air ON media_calendar(type, air_local)')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_media_calendar_type_release ON media_calendar(type, release_date)')
+        existing = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'")}
+        for name, sql in _TRIGGERS.items():
+            if name not in existing:
+                conn.execute(sql)
+        conn.commit()
+    except sqlite3.Error as e:
+        logging.error(f"Error creating calendar index: {e}")
+        conn.rollback()
+        return
+    finally:
+        conn.close()
+
+    if created:
+        rebuild_calendar_index()
+
+
+def rebuild_calendar_index() -> bool:
+    """Refill media_calendar from media_items in one write transaction."""
+    conn = get_db_connection()
+    try:
+        conn.execute('BEGIN IMMEDIATE')
+        conn.execute('DELETE FROM media_calendar')
+        conn.execute(f"{_INSERT_CALENDAR_ROW} {_calendar_select('m', 'FROM media_items m')}")
+        count = conn.execute('SELECT COUNT(*) FROM media_calendar').fetchone()[0]
+        conn.commit()
+        logging.info(f"Rebuilt calendar index ({count} dated items)")
+        return True
+    except sqlite3.Error as e:
+        logging.error(f"Error rebuilding calendar index: {e}")
+        conn.rollback()
+        return False
+    finally:
+        conn.close()
+
+
+def verify_calendar_index(repair: bool = False) -> Dict[str, Any]:
+    """
+    Compare media_calendar with the rows media_items would produce.
+
+    Returns {'consistent': bool, 'missing': n, 'stale': n, 'repaired': bool}. Missing rows are
+    dated items without a calendar row. Stale rows differ from their item or have no item.
+    """
+    expected = _calendar_select('m', 'FROM media_items m')
+    conn = get_db_connection()
+    try:
+        missing = conn.execute(f"SELECT COUNT(*) FROM ({expected} EXCEPT SELECT {', '.join(_CALENDAR_COLUMNS)} FROM media_calendar)").fetchone()[0]
+        stale = conn.execute(f"SELECT COUNT(*) FROM (SELECT {', '.join(_CALENDAR_COLUMNS)} FROM media_calendar EXCEPT {expected})").fetchone()[0]
+    finally:
+        conn.close()
+    consistent = not missing and not stale
+    repaired = False
+    if not consistent:
+        logging.warning(f"Calendar index out of date ({missing} missing, {stale} stale rows)")
+        if repair:
+            repaired = rebuild_calendar_index()
+    return {'consistent': consistent, 'missing': missing, 'stale': stale, 'repaired': repaired}
@@ -12,7 +12,16 @@ from cli_battery.app.direct_api import DirectAPI
 import sqlite3
 import time
 
-def add_collected_items(media_items_batch, recent=False):
+def add_collected_items(media_items_batch, recent=False, seen_filenames=None):
+    """
+    Add or update collected items from a library scan.
+
+    With recent=False the batch is the whole library: afterwards, Collected items
+    whose file wasn't in the batch are treated as missing. A streamed full scan
+    passes its batches in chunks with a `seen_filenames` set instead; the
+    filenames of each chunk are added to it and the missing-file cleanup is left
+    to remove_missing_collected_items once the scan is complete.
+    """
     from datetime import datetime, timedelta
     from utilities.settings import get_setting
     from queues.upgrading_queue import log_successful_upgrade
@@ -473,84 +482,11 @@ def add_collected_items(media_items_batch, recent=False):
 
         # --- Post-loop cleanup ---
         if not recent:
-            # logging.info("Starting post-loop cleanup for missing files.")
-            # start_cleanup_time = time.time()
-            cursor = conn.execute('''
-                SELECT id, imdb_id, tmdb_id, title, type, season_number, episode_number, state, version, 
-                       filled_by_file, collected_at, release_date, upgrading_from, location_basename
-                FROM media_items
-                WHERE state = 'Collected'
-            ''')
-            for row in cursor:
-                item = row_to_dict(row)
-                item_identifier = generate_identifier(item)
-                
-                filled_by = item.get('filled_by_file')
-                location_base = item.get('location_basename')
-
-                # A file is considered present if either its 'filled_by_file' or 'location_basename' is in the scan results
-                is_present_on_disk = (filled_by and filled_by in all_valid_filenames) or \
-                                     (location_base and location_base in all_valid_filenames)
-
-                # A file is considered expected if it has at least one filename associated with it
-                is_expected_on_disk = filled_by or location_base
-
-                if is_expected_on_disk and not is_present_on_disk:
-                    file_to_log = location_base or filled_by
-                    # This item's file is considered missing
-                    if get_setting("Debug", "rescrape_missing_files", default=False):
-                        try:
-                            # Check if another version of this item already exists in 'Collected' state
-                            current_version = item['version'].strip('*') if item.get('version') else ''
-                            
-                            # Build query based on item type to find other collected versions
-                            if item['type'] == 'movie':
-                                matching_cursor = conn.execute('''
-                                    SELECT id, version FROM media_items 
-                                    WHERE (imdb_id = ? OR (tmdb_id IS NOT NULL AND tmdb_id = ?)) AND type = 'movie' AND state = 'Collected' AND id != ?
-                                ''', (item['imdb_id'], item['tmdb_id'], item['id']))
-                            else: # episode
-                                matching_cursor = conn.execute('''
-                                    SELECT id, version FROM media_items 
-                                    WHERE (imdb_id = ? OR (tmdb_id IS NOT NULL AND tmdb_id = ?)) AND type = 'episode' AND season_number = ? AND episode_number = ? AND state = 'Collected' AND id != ?
-                                ''', (item['imdb_id'], item['tmdb_id'], item['season_number'], item['episode_number'], item['id']))
-                            
-                            matching_items = matching_cursor.fetchall()
-                            matching_cursor.close()
-                            
-                            matching_version_exists = any(
-                                (m['version'].strip('*') if m.get('version') else '') == current_version 
-                                for m in matching_items
-                            )
-                            
-                            if matching_version_exists:
-                                logging.info(f"[Missing File Cleanup] Deleting item {item_identifier} (ID: {item['id']}, File: {file_to_log}) as another collected version ('{current_version}') exists.")
-                                conn.execute('DELETE FROM media_items WHERE id = ?', (item['id'],))
-                            else:
-                                logging.info(f"[Missing File Cleanup] File missing for {item_identifier} (ID: {item['id']}, File: {file_to_log}). No other matching version found. Moving to 'Wanted'.")
-                                conn.execute('''
-                                    UPDATE media_items 
-                                    SET state = 'Wanted', 
-                                        filled_by_file = NULL, 
-                                        filled_by_title = NULL, 
-                                        filled_by_magnet = NULL, 
-                                        filled_by_torrent_id = NULL, 
-                                        collected_at = NULL,
-                                        last_updated = ?,
-                                        version = TRIM(version, '*') 
-                                    WHERE id = ?
-                                ''', (datetime.now(), item['id']))
-                        except Exception as e:
-                            # conn.rollback() # Rollback for THIS item was removed, transaction handles overall
-                            logging.error(f"Error handling missing file for item {item_identifier} (ID: {item['id']}): {str(e)}", exc_info=True)
-                    else: # rescrape_missing_files is False
-                        logging.info(f"[Missing File Cleanup] File missing for {item_identifier} (ID: {item['id']}, File: {file_to_log}). 'rescrape_missing_files' is False. Deleting item.")
-                        conn.execute('''
-                            DELETE FROM media_items
-                            WHERE id = ?
-                        ''', (item['id'],))
-            cursor.close()
-            # logging.info(f"Finished post-loop cleanup in {time.time() - start_cleanup_time:.4f} seconds.")
+            if seen_filenames is not None:
+                # Chunk of a streamed full scan: the caller runs the cleanup once all chunks are in
+                seen_filenames.update(all_valid_filenames)
+            else:
+                _remove_missing_collected_files(conn, all_valid_filenames)
 
         conn.commit()
     except Exception as e:
@@ -560,6 +496,110 @@ def add_collected_items(media_items_batch, recent=False):
     finally:
         conn.close()
 
+def _remove_missing_collected_files(conn, all_valid_filenames):
+    """Delete (or reset to Wanted) Collected items whose file is not in all_valid_filenames."""
+    # start_cleanup_time = time.time()
+    cursor = conn.execute('''
+        SELECT id, imdb_id, tmdb_id, title, type, season_number, episode_number, state, version, 
+               filled_by_file, collected_at, release_date, upgrading_from, location_basename
+        FROM media_items
+        WHERE state = 'Collected'
+    ''')
+    for row in cursor:
+        item = row_to_dict(row)
+        item_identifier = generate_identifier(item)
+        
+        filled_by = item.get('filled_by_file')
+        location_base = item.get('location_basename')
+
+        # A file is considered present if either its 'filled_by_file' or 'location_basename' is in the scan results
+        is_present_on_disk = (filled_by and filled_by in all_valid_filenames) or \
+                             (location_base and location_base in all_valid_filenames)
+
+        # A file is considered expected if it has at least one filename associated with it
+        is_expected_on_disk = filled_by or location_base
+
+        if is_expected_on_disk and not is_present_on_disk:
+            file_to_log = location_base or filled_by
+            # This item's file is considered missing
+            if get_setting("Debug", "rescrape_missing_files", default=False):
+                try:
+                    # Check if another version of this item already exists in 'Collected' state
+                    current_version = item['version'].strip('*') if item.get('version') else ''
+                    
+                    # Build query based on item type to find other collected versions
+                    if item['type'] == 'movie':
+                        matching_cursor = conn.execute('''
+                            SELECT id, version FROM media_items 
+                            WHERE (imdb_id = ? OR (tmdb_id IS NOT NULL AND tmdb_id = ?)) AND type = 'movie' AND state = 'Collected' AND id != ?
+                        ''', (item['imdb_id'], item['tmdb_id'], item['id']))
+                    else: # episode
+                        matching_cursor = conn.execute('''
+                            SELECT id, version FROM media_items 
+                            WHERE (imdb_id = ? OR (tmdb_id IS NOT NULL AND tmdb_id = ?)) AND type = 'episode' AND season_number = ? AND episode_number = ? AND state = 'Collected' AND id != ?
+                        ''', (item['imdb_id'], item['tmdb_id'], item['season_number'], item['episode_number'], item['id']))
+                    
+                    matching_items = matching_cursor.fetchall()
+                    matching_cursor.close()
+                    
+                    matching_version_exists = any(
+                        (m['version'].strip('*') if m.get('version') else '') == current_version 
+                        for m in matching_items
+                    )
+                    
+                    if matching_version_exists:
+                        logging.info(f"[Missing File Cleanup] Deleting item {item_identifier} (ID: {item['id']}, File: {file_to_log}) as another collected version ('{current_version}') exists.")
+                        conn.execute('DELETE FROM media_items WHERE id = ?', (item['id'],))
+                    else:
+                        logging.info(f"[Missing File Cleanup] File missing for {item_identifier} (ID: {item['id']}, File: {file_to_log}). No other matching version found. Moving to 'Wanted'.")
+                        conn.execute('''
+                            UPDATE media_items 
+                            SET state = 'Wanted', 
+                                filled_by_file = NULL, 
+                                filled_by_title = NULL, 
+                                filled_by_magnet = NULL, 
+                                filled_by_torrent_id = NULL, 
+                                collected_at = NULL,
+                                last_updated = ?,
+                                version = TRIM(version, '*') 
+                            WHERE id = ?
+                        ''', (datetime.now(), item['id']))
+                except Exception as e:
+                    # conn.rollback() # Rollback for THIS item was removed, transaction handles overall
+                    logging.error(f"Error handling missing file for item {item_identifier} (ID: {item['id']}): {str(e)}", exc_info=True)
+            else: # rescrape_missing_files is False
+                logging.info(f"[Missing File Cleanup] File missing for {item_identifier} (ID: {item['id']}, File: {file_to_log}). 'rescrape_missing_files' is False. Deleting item.")
+                conn.execute('''
+                    DELETE FROM media_items
+                    WHERE id = ?
+                ''', (item['id'],))
+    cursor.close()
+    # logging.info(f"Finished post-loop cleanup in {time.time() - start_cleanup_time:.4f} seconds.")
+
+
+def remove_missing_collected_items(valid_filenames) -> bool:
+    """
+    Run the missing-file cleanup of a full scan that was added in chunks.
+
+    Args:
+        valid_filenames: Every filename seen during the complete scan
+    """
+    if get_setting('Plex', 'disable_plex_library_checks', default=False):
+        return True
+    conn = get_db_connection()
+    try:
+        conn.execute('BEGIN TRANSACTION')
+        _remove_missing_collected_files(conn, set(valid_filenames))
+        conn.commit()
+        return True
+    except Exception as e:
+        logging.error(f"Error removing missing collected items: {str(e)}", exc_info=True)
+        conn.rollback()
+        return False
+    finally:
+        conn.close()
+
+
 def plex_collection_disabled(media_items_batch: List[Dict[str, Any]]) -> bool:
     """
     Simplified collection process when Plex library checks are disabled.
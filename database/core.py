@@ -9,6 +9,7 @@ import time
 import random
 import uuid
 from datetime import datetime
+from utilities import metrics
 
 # --- Constants ---
 MAX_STORED_NOTIFICATIONS = 50 # Define max notifications to keep in DB
@@ -45,6 +46,7 @@ def retry_on_db_lock(max_attempts=5, initial_wait=0.1, backoff_factor=2,
                     # Successful execution
                     overall_end_time = time.monotonic()
                     duration = overall_end_time - overall_start_time
+                    metrics.DB_CALL_SECONDS.observe(duration, function=func.__name__)
                     if duration > long_execution_threshold_seconds:
                         logging.warning(
                             f"Function {func.__name__} executed successfully but took {duration:.3f}s "
@@ -71,6 +73,7 @@ def retry_on_db_lock(max_attempts=5, initial_wait=0.1, backoff_factor=2,
                                 f"Database locked executing {func.__name__} (attempt {current_failed_attempt_count} of {max_attempts -1} retries). "
                                 f"Retrying in {actual_wait_time:.3f}s..."
                             )
+                            metrics.DB_LOCK_RETRIES.inc(function=func.__name__)
                             time.sleep(actual_wait_time)
                             attempt += 1 # Increment after sleep, before next try
                         else:
@@ -175,6 +178,14 @@ def initialize_notifications_table(conn: sqlite3.Connection) -> bool:
     # No finally block to close conn, as it's passed in and managed by the caller.
 
 # --- Database Connection --- Now defined AFTER initialize_notifications_table ---
+# Called with every SQL statement run on new connections while set (used by the query advisor)
+_statement_trace = None
+
+def set_statement_trace(callback):
+    """Trace statements on connections opened from now on, or stop tracing new ones with None."""
+    global _statement_trace
+    _statement_trace = callback
+
 def get_db_connection(db_path=None):
     if db_path is None:
         # Get db_content directory from environment variable with fallback
@@ -184,6 +195,8 @@ def get_db_connection(db_path=None):
     conn = sqlite3.connect(db_path, timeout=10)  # Increased timeout slightly
     conn.execute('PRAGMA journal_mode=WAL')  # Enable WAL mode
     conn.row_factory = sqlite3.Row
+    if _statement_trace is not None:
+        conn.set_trace_callback(_statement_trace)
     
     # REMOVED: Initialization moved to schema_management.py
     # if is_new_db:
@@ -1,4 +1,5 @@
 from .core import get_db_connection
+from .write_behind import pending_media_item_fields, read_with_pending_fields
 import logging
 import os
 import json
@@ -157,6 +158,54 @@ def stream_all_media_items(state=None, media_type=None, imdb_id=None, tmdb_id=No
         if conn:
             conn.close()
 
+def count_media_items_by_imdb_id(states: List[str]) -> Tuple[int, int, int]:
+    """Return (distinct imdb_ids, items with an imdb_id, items without one) for items in the given states."""
+    conn = get_db_connection()
+    try:
+        placeholders = ','.join('?' for _ in states)
+        row = conn.execute(f'''
+            SELECT COUNT(DISTINCT imdb_id) AS titles,
+                   SUM(CASE WHEN imdb_id IS NOT NULL AND imdb_id != '' THEN 1 ELSE 0 END) AS with_id,
+                   SUM(CASE WHEN imdb_id IS NULL OR imdb_id = '' THEN 1 ELSE 0 END) AS without_id
+            FROM media_items WHERE state IN ({placeholders})
+        ''', list(states)).fetchone()
+        return row['titles'] or 0, row['with_id'] or 0, row['without_id'] or 0
+    finally:
+        conn.close()
+
+def stream_media_items_grouped_by_imdb_id(states: List[str], titles_per_chunk: int = 50):
+    """
+    Yield lists of (imdb_id, [items]) for items in the given states, ordered by imdb_id.
+
+    Titles are read in keyset-paginated chunks so no read transaction stays open
+    while the caller processes (and writes back) a chunk. Items without an
+    imdb_id are not returned.
+    """
+    placeholders = ','.join('?' for _ in states)
+    last_imdb_id = ''
+    while True:
+        conn = get_db_connection()
+        try:
+            imdb_ids = [row['imdb_id'] for row in conn.execute(f'''
+                SELECT DISTINCT imdb_id FROM media_items
+                WHERE state IN ({placeholders}) AND imdb_id > ?
+                ORDER BY imdb_id LIMIT ?
+            ''', list(states) + [last_imdb_id, titles_per_chunk])]
+            if not imdb_ids:
+                return
+            id_placeholders = ','.join('?' for _ in imdb_ids)
+            grouped = {imdb_id: [] for imdb_id in imdb_ids}
+            for row in conn.execute(f'''
+                SELECT * FROM media_items
+                WHERE state IN ({placeholders}) AND imdb_id IN ({id_placeholders})
+                ORDER BY imdb_id, season_number, episode_number
+            ''', list(states) + imdb_ids):
+                grouped[row['imdb_id']].append(dict(row))
+        finally:
+            conn.close()
+        last_imdb_id = imdb_ids[-1]
+        yield list(grouped.items())
+
 def get_media_item_presence(imdb_id=None, tmdb_id=None):
     conn = get_db_connection()
     try:
@@ -193,12 +242,11 @@ def get_media_item_presence(imdb_id=None, tmdb_id=None):
 def get_media_item_by_id(item_id):
     conn = get_db_connection()
     try:
-        cursor = conn.execute('SELECT * FROM media_items WHERE id = ?', (item_id,))
-        item = cursor.fetchone()
-        if item:
-            item_dict = dict(item)
-            return item_dict
-        return None
+        def read():
+            item = conn.execute('SELECT * FROM media_items WHERE id = ?', (item_id,)).fetchone()
+            return dict(item) if item else None
+        # Overlay updates still waiting in the write-behind buffer
+        return read_with_pending_fields(item_id, read)
     except Exception as e:
         logging.error(f"Error retrieving media item (ID: {item_id}): {str(e)}")
         return None
@@ -707,6 +755,9 @@ def check_existing_media_item(item_details: Dict, target_version: str, target_st
 
 def get_wake_count(item_id: int) -> int:
     """Get the current wake count for a media item."""
+    pending_wake_count = pending_media_item_fields(item_id).get('wake_count')
+    if pending_wake_count is not None:
+        return pending_wake_count
     conn = get_db_connection()
     try:
         cursor = conn.execute('SELECT wake_count FROM media_items WHERE id = ?', (item_id,))
@@ -1041,6 +1092,67 @@ def check_item_exists_with_symlink_path_containing(path_segment: str) -> bool:
         if conn:
             conn.close()
 
+def find_existing_directory_names(directory_names: List[str]) -> Set[str]:
+    """
+    Batch form of check_item_exists_by_directory_name and
+    check_item_exists_with_symlink_path_containing, used by the rclone webhook queue.
+
+    media_items is read once for the whole batch instead of twice per name. Each
+    title and path is normalized once. Title matches are set lookups, and the
+    'contains' check is one substring search per name over the joined paths.
+
+    Args:
+        directory_names: Directory names or filenames reported by rclone.
+
+    Returns:
+        The subset of directory_names that match a title field or are contained in
+        an original_path_for_symlink. Empty on error, like the single-name checks.
+    """
+    normalized_names = {name: normalize_string_for_comparison(name) for name in directory_names if name}
+    if not normalized_names:
+        return set()
+
+    conn = None
+    try:
+        conn = get_db_connection()
+        cursor = conn.execute('''
+            SELECT filled_by_title, real_debrid_original_title, original_path_for_symlink
+            FROM media_items
+            WHERE filled_by_title IS NOT NULL
+               OR real_debrid_original_title IS NOT NULL
+               OR original_path_for_symlink IS NOT NULL
+        ''')
+
+        titles = set()
+        paths = []
+        for row in cursor:
+            for title in (row['filled_by_title'], row['real_debrid_original_title']):
+                if title:
+                    titles.add(normalize_string_for_comparison(title))
+            if row['original_path_for_symlink']:
+                paths.append(normalize_string_for_comparison(row['original_path_for_symlink']))
+
+        # Paths never contain newlines, so a match in the joined text is a match in one path
+        joined_paths = '\n'.join(paths)
+        existing = set()
+        for name, normalized in normalized_names.items():
+            if normalized in titles:
+                existing.add(name)
+            elif '\n' not in normalized and normalized in joined_paths:
+                existing.add(name)
+            elif '\n' in normalized and any(normalized in path for path in paths):
+                existing.add(name)
+
+        logging.debug(f"Batch directory name check: {len(existing)} of {len(normalized_names)} names already in DB")
+        return existing
+
+    except Exception as e:
+        logging.error(f"Error checking {len(normalized_names)} directory names against the database: {str(e)}")
+        return set()
+    finally:
+        if conn:
+            conn.close()
+
 def get_distinct_library_shows(letter: Optional[str] = None) -> List[Dict[str, str]]:
     """
     Retrieves a list of distinct shows from the media_items table, optionally filtered by the starting letter of the title.
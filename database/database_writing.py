@@ -1,4 +1,9 @@
 from .core import get_db_connection, retry_on_db_lock
+from .write_behind import (
+    buffer_media_item_update,
+    take_pending_media_item_fields, restore_pending_media_item_fields,
+    discard_pending_media_item_fields, increment_pending_media_item_field
+)
 import logging
 from datetime import datetime
 import json
@@ -6,9 +11,16 @@ import pickle
 from pathlib import Path
 import os
 from utilities.post_processing import handle_state_change
-from typing import List
+from typing import Any, Dict, List, Optional
 import sqlite3
 
+# Keeps batched "WHERE id IN (...)" statements under SQLite's bound parameter limit
+BATCH_STATE_UPDATE_CHUNK_SIZE = 500
+
+# Columns written by the release date updaters; their buffered values are dropped first
+RELEASE_DATE_COLUMNS = ('release_date', 'airtime', 'early_release', 'physical_release_date',
+                        'theatrical_release_date', 'no_early_release')
+
 @retry_on_db_lock()
 def bulk_delete_by_id(id_value, id_type):
     conn = get_db_connection()
@@ -45,6 +57,7 @@ def bulk_delete_by_id(id_value, id_type):
 
 @retry_on_db_lock()
 def update_year(item_id: int, year: int):
+    discard_pending_media_item_fields(item_id, ('year',))
     conn = get_db_connection()
     try:
         conn.execute('''
@@ -92,6 +105,7 @@ def update_release_date_and_state(
         no_early_release: bool | None = None  # Add the new flag parameter
     ):
     """Update the release date, state, and potentially airtime, early_release, physical_release_date, and no_early_release flag for a media item."""
+    discard_pending_media_item_fields(item_id, RELEASE_DATE_COLUMNS)
     conn = get_db_connection()
     try:
         conn.execute('BEGIN TRANSACTION')
@@ -166,12 +180,82 @@ def update_release_date_and_state(
     finally:
         if conn:
             conn.close()
-    
+
+@retry_on_db_lock()
+def update_release_dates_and_states_batch(updates: List[Dict[str, Any]]) -> int:
+    """
+    Apply many release date/state updates in one transaction.
+
+    Each update is a dict with 'id', 'release_date' and 'state', plus optional
+    'airtime', 'early_release', 'physical_release_date', 'theatrical_release_date'
+    and 'no_early_release'. As in update_release_date_and_state, optional values
+    that are None leave the column unchanged.
+    """
+    if not updates:
+        return 0
+    # state is never buffered, so only the release date columns can be stale in the buffer
+    for update in updates:
+        discard_pending_media_item_fields(update['id'], RELEASE_DATE_COLUMNS)
+    conn = get_db_connection()
+    try:
+        now = datetime.now()
+        params = [
+            (
+                update['release_date'], update['state'], now,
+                update.get('airtime'), update.get('early_release'),
+                update.get('physical_release_date'), update.get('theatrical_release_date'),
+                update.get('no_early_release'),
+                update['id'],
+            )
+            for update in updates
+        ]
+        conn.execute('BEGIN TRANSACTION')
+        conn.executemany('''
+            UPDATE media_items
+            SET release_date = ?,
+                state = ?,
+                last_updated = ?,
+                airtime = COALESCE(?, airtime),
+                early_release = COALESCE(?, early_release),
+                physical_release_date = COALESCE(?, physical_release_date),
+                theatrical_release_date = COALESCE(?, theatrical_release_date),
+                no_early_release = COALESCE(?, no_early_release)
+            WHERE id = ?
+        ''', params)
+        conn.commit()
+        logging.debug(f"Batch updated release dates and states for {len(updates)} items")
+        return len(updates)
+    except sqlite3.OperationalError as e:
+        logging.debug(f"OperationalError in update_release_dates_and_states_batch: {e}. Handing over to retry_on_db_lock.")
+        try:
+            if conn: conn.rollback()
+        except Exception as rb_ex:
+            logging.error(f"Rollback failed in update_release_dates_and_states_batch after OperationalError: {rb_ex}")
+        raise
+    except sqlite3.Error as e:
+        logging.error(f"SQLite error in batch release date update: {str(e)}")
+        try:
+            if conn: conn.rollback()
+        except Exception as rb_ex:
+            logging.error(f"Rollback failed in update_release_dates_and_states_batch after sqlite3.Error: {rb_ex}")
+        return 0
+    finally:
+        if conn:
+            conn.close()
+
 @retry_on_db_lock()
 def update_media_item_state(item_id, state, **kwargs):
+    # Buffered writes of this item go out with the state change
+    pending_fields = take_pending_media_item_fields(item_id)
     conn = get_db_connection()
     try:
         conn.execute('BEGIN TRANSACTION')
+
+        if pending_fields:
+            conn.execute(
+                f"UPDATE media_items SET {', '.join(f'{column} = ?' for column in pending_fields)} WHERE id = ?",
+                list(pending_fields.values()) + [item_id]
+            )
         
         # Get the item before update for post-processing
         item_before = conn.execute('SELECT * FROM media_items WHERE id = ?', (item_id,)).fetchone()
@@ -229,6 +313,7 @@ def update_media_item_state(item_id, state, **kwargs):
             if conn: conn.rollback()
         except Exception as rb_ex:
             logging.error(f"Rollback failed in update_media_item_state after OperationalError: {rb_ex}")
+        restore_pending_media_item_fields(item_id, pending_fields)
         raise
     except sqlite3.Error as e:
         logging.error(f"SQLite error updating media item (ID: {item_id}): {str(e)}")
@@ -236,6 +321,7 @@ def update_media_item_state(item_id, state, **kwargs):
             if conn: conn.rollback()
         except Exception as rb_ex:
             logging.error(f"Rollback failed in update_media_item_state after sqlite3.Error: {rb_ex}")
+        restore_pending_media_item_fields(item_id, pending_fields)
         return None
     except Exception as e:
         logging.error(f"Error updating media item (ID: {item_id}): {str(e)}")
@@ -243,6 +329,7 @@ def update_media_item_state(item_id, state, **kwargs):
             if conn: conn.rollback()
         except Exception as rb_ex:
             logging.error(f"Rollback failed in update_media_item_state after non-Operational error: {rb_ex}")
+        restore_pending_media_item_fields(item_id, pending_fields)
         return None
     finally:
         if conn:
@@ -306,6 +393,10 @@ def add_to_collected_notifications(media_item):
 
 @retry_on_db_lock()
 def update_media_item(item_id: int, **kwargs):
+    if buffer_media_item_update(item_id, **kwargs):
+        logging.info(f"Buffered update of media item ID {item_id} with values: {kwargs}")
+        return True
+    discard_pending_media_item_fields(item_id, kwargs)
     conn = get_db_connection()
     try:
         # Build the SET clause dynamically from kwargs
@@ -352,6 +443,9 @@ def update_media_item(item_id: int, **kwargs):
 
 @retry_on_db_lock()
 def update_blacklisted_date(item_id: int, blacklisted_date: datetime | None):
+    if buffer_media_item_update(item_id, blacklisted_date=blacklisted_date):
+        logging.info(f"Buffered blacklisted_date {blacklisted_date} for item ID {item_id}")
+        return True
     conn = get_db_connection()
     try:
         conn.execute('''
@@ -716,17 +810,36 @@ def update_version_for_items(old_version_id: str, new_version_id: str | None) ->
     return updated_count
 
 @retry_on_db_lock()
-def update_media_items_state_batch(item_ids: List[int], state: str, **kwargs):
+def update_media_items_state_batch(item_ids: List[int], state: str, item_fields: Optional[Dict[int, Dict[str, Any]]] = None, **kwargs):
     """Update the state of multiple media items in a single transaction.
     
     Args:
         item_ids: List of item IDs to update
         state: New state for all items
-        **kwargs: Additional fields to update
+        item_fields: Optional per-item field values (item ID -> {field: value}),
+                     e.g. the matched file of each episode in a pack
+        **kwargs: Additional fields to update for every item
+
+    Returns:
+        List of updated item dicts in the order of item_ids (missing items are skipped),
+        or an empty list if the update failed.
     """
+    if not item_ids:
+        return []
+
+    # Buffered writes of these items go out with the state change
+    pending_by_item = {item_id: take_pending_media_item_fields(item_id) for item_id in item_ids}
+    pending_by_item = {item_id: fields for item_id, fields in pending_by_item.items() if fields}
+
     conn = get_db_connection()
     try:
         conn.execute('BEGIN TRANSACTION')
+
+        for item_id, fields in pending_by_item.items():
+            conn.execute(
+                f"UPDATE media_items SET {', '.join(f'{column} = ?' for column in fields)} WHERE id = ?",
+                list(fields.values()) + [item_id]
+            )
         
         # Prepare the base query
         query = '''
@@ -738,40 +851,58 @@ def update_media_items_state_batch(item_ids: List[int], state: str, **kwargs):
         # Add optional fields to the query
         optional_fields = ['filled_by_title', 'filled_by_magnet', 'filled_by_file', 
                          'filled_by_torrent_id', 'scrape_results', 'version', 
-                         'resolution', 'upgrading_from']
+                         'resolution', 'upgrading_from', 'current_score',
+                         'original_scraped_torrent_title']
         
+        def serialize(field, value):
+            if field == 'scrape_results':
+                return json.dumps(value) if value else None
+            return value
+
         for field in kwargs:
             if field in optional_fields:
                 query += f", {field} = ?"
-                value = kwargs[field]
-                if field == 'scrape_results':
-                    value = json.dumps(value) if value else None
-                base_params.append(value)
+                base_params.append(serialize(field, kwargs[field]))
 
-        # Complete the query with ID list
-        placeholders = ','.join('?' * len(item_ids))
-        query += f" WHERE id IN ({placeholders})"
-        params = base_params + item_ids
+        # Chunk the ID list to stay under SQLite's bound parameter limit
+        item_ids = list(item_ids)
+        for i in range(0, len(item_ids), BATCH_STATE_UPDATE_CHUNK_SIZE):
+            chunk = item_ids[i:i + BATCH_STATE_UPDATE_CHUNK_SIZE]
+            placeholders = ','.join('?' * len(chunk))
+            conn.execute(query + f" WHERE id IN ({placeholders})", base_params + chunk)
 
-        # Execute the batch update
-        conn.execute(query, params)
+        for item_id, fields in (item_fields or {}).items():
+            columns = [field for field in fields if field in optional_fields]
+            if columns:
+                conn.execute(
+                    f"UPDATE media_items SET {', '.join(f'{column} = ?' for column in columns)} WHERE id = ?",
+                    [serialize(column, fields[column]) for column in columns] + [item_id]
+                )
         conn.commit()
 
         # Get updated items for post-processing
-        for item_id in item_ids:
-            updated_item = conn.execute('SELECT * FROM media_items WHERE id = ?', (item_id,)).fetchone()
-            if updated_item:
-                item_dict = dict(updated_item)
-                if state in ['Collected', 'Upgrading']:
-                    handle_state_change(item_dict)
+        rows_by_id = {}
+        for i in range(0, len(item_ids), BATCH_STATE_UPDATE_CHUNK_SIZE):
+            chunk = item_ids[i:i + BATCH_STATE_UPDATE_CHUNK_SIZE]
+            placeholders = ','.join('?' * len(chunk))
+            for row in conn.execute(f'SELECT * FROM media_items WHERE id IN ({placeholders})', chunk):
+                rows_by_id[row['id']] = dict(row)
+
+        updated_items = [rows_by_id[item_id] for item_id in item_ids if item_id in rows_by_id]
+        if state in ['Collected', 'Upgrading']:
+            for item_dict in updated_items:
+                handle_state_change(item_dict)
 
         logging.info(f"Batch updated {len(item_ids)} items to state {state}")
+        return updated_items
     except sqlite3.OperationalError as e:
         logging.debug(f"OperationalError in update_media_items_state_batch: {e}. Handing over to retry_on_db_lock.")
         try:
             if conn: conn.rollback()
         except Exception as rb_ex:
             logging.error(f"Rollback failed in update_media_items_state_batch after OperationalError: {rb_ex}")
+        for item_id, fields in pending_by_item.items():
+            restore_pending_media_item_fields(item_id, fields)
         raise
     except sqlite3.Error as e:
         logging.error(f"SQLite error in batch state update: {str(e)}")
@@ -779,14 +910,18 @@ def update_media_items_state_batch(item_ids: List[int], state: str, **kwargs):
             if conn: conn.rollback()
         except Exception as rb_ex:
             logging.error(f"Rollback failed in update_media_items_state_batch after sqlite3.Error: {rb_ex}")
-        # This function does not return a value, so no return here on error.
+        for item_id, fields in pending_by_item.items():
+            restore_pending_media_item_fields(item_id, fields)
+        return []
     except Exception as e:
         logging.error(f"Unexpected error in batch state update: {str(e)}")
         try:
             if conn: conn.rollback()
         except Exception as rb_ex:
             logging.error(f"Rollback failed in update_media_items_state_batch after Exception: {rb_ex}")
-        # This function does not return a value, so no return here on error.
+        for item_id, fields in pending_by_item.items():
+            restore_pending_media_item_fields(item_id, fields)
+        return []
     finally:
         if conn:
             conn.close()
@@ -794,6 +929,7 @@ def update_media_items_state_batch(item_ids: List[int], state: str, **kwargs):
 @retry_on_db_lock()
 def update_media_item_torrent_id(item_id: int, new_torrent_id: str) -> bool:
     """Updates the 'filled_by_torrent_id' for a specific media item."""
+    discard_pending_media_item_fields(item_id, ('filled_by_torrent_id',))
     conn = get_db_connection()
     try:
         cursor = conn.execute(
@@ -835,6 +971,8 @@ def update_media_item_torrent_id(item_id: int, new_torrent_id: str) -> bool:
 @retry_on_db_lock()
 def set_wake_count(item_id: int, wake_count: int):
     """Set the wake count for a specific media item."""
+    if buffer_media_item_update(item_id, wake_count=wake_count):
+        return
     conn = get_db_connection()
     try:
         conn.execute('''
@@ -872,6 +1010,7 @@ def set_wake_count(item_id: int, wake_count: int):
 @retry_on_db_lock()
 def update_delayed_upgrade_eligibility(item_id: int, eligible: bool) -> bool:
     """Update the delayed upgrade eligibility for a specific media item."""
+    discard_pending_media_item_fields(item_id, ('delayed_upgrade_eligible',))
     conn = get_db_connection()
     try:
         conn.execute('''
@@ -932,6 +1071,10 @@ def get_delayed_upgrade_eligible_items(days_threshold: int) -> List[dict]:
 @retry_on_db_lock()
 def increment_wake_count(item_id: int) -> int:
     """Increment the wake count for a specific media item and return the new count."""
+    from .database_reading import get_wake_count
+    new_wake_count = increment_pending_media_item_field(item_id, 'wake_count', lambda: get_wake_count(item_id))
+    if new_wake_count is not None:
+        return new_wake_count
     conn = get_db_connection()
     new_wake_count = 0
     try:
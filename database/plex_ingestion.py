@@ -0,0 +1,213 @@
+"""
+SQLite-backed state for incremental Plex watchlist and watch-history ingestion.
+
+`plex_watchlist_entries` remembers the IDs already resolved for each user's
+watchlist entries (keyed by Plex rating key), so only entries that are new to
+a watchlist need a metadata request. `plex_ingestion_cursors` keeps a per-user,
+per-source high-water mark (the last viewedAt seen in the account history and
+in the server libraries) so later runs only ask Plex for newer entries.
+"""
+
+import logging
+import sqlite3
+import time
+from typing import Any, Dict, Iterable, Optional, Sequence
+
+from .core import get_db_connection, retry_on_db_lock
+
+
+def create_plex_ingestion_tables():
+    """Creates the Plex ingestion tables and indexes if they don't exist."""
+    conn = get_db_connection()
+    try:
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS plex_watchlist_entries (
+                username TEXT NOT NULL,
+                rating_key TEXT NOT NULL,
+                title TEXT,
+                media_type TEXT,
+                imdb_id TEXT,
+                tmdb_id TEXT,
+                added_at REAL,
+                resolved_at REAL NOT NULL,
+                PRIMARY KEY (username, rating_key)
+            )
+        ''')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_plex_watchlist_entries_imdb ON plex_watchlist_entries(imdb_id)')
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS plex_ingestion_cursors (
+                username TEXT NOT NULL,
+                source TEXT NOT NULL,
+                cursor_value REAL NOT NULL,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (username, source)
+            )
+        ''')
+        conn.commit()
+    except sqlite3.Error as e:
+        logging.error(f"Error creating Plex ingestion tables: {e}")
+        raise
+    finally:
+        conn.close()
+
+
+def get_plex_watchlist_entries(username: str) -> Dict[str, Dict[str, Any]]:
+    """Get the stored watchlist entries of a user, keyed by rating key."""
+    conn = get_db_connection()
+    try:
+        rows = conn.execute('''
+            SELECT rating_key, title, media_type, imdb_id, tmdb_id, added_at, resolved_at
+            FROM plex_watchlist_entries WHERE username = ?
+        ''', (username,)).fetchall()
+        return {row['rating_key']: dict(row) for row in rows}
+    except sqlite3.Error as e:
+        logging.error(f"Error loading Plex watchlist entries for {username}: {e}")
+        return {}
+    finally:
+        conn.close()
+
+
+@retry_on_db_lock()
+def upsert_plex_watchlist_entries(username: str, entries: Sequence[Dict[str, Any]]) -> bool:
+    """
+    Insert or update resolved watchlist entries of a user in one transaction.
+
+    Each entry needs 'rating_key' and may have 'title', 'media_type', 'imdb_id',
+    'tmdb_id' and 'added_at'.
+    """
+    if not entries:
+        return True
+
+    now = time.time()
+    rows = [
+        (username, str(entry['rating_key']), entry.get('title'), entry.get('media_type'),
+         entry.get('imdb_id'), entry.get('tmdb_id'), entry.get('added_at'), now)
+        for entry in entries
+    ]
+    conn = get_db_connection()
+    try:
+        conn.executemany('''
+            INSERT INTO plex_watchlist_entries (
+                username, rating_key, title, media_type, imdb_id, tmdb_id, added_at, resolved_at
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(username, rating_key) DO UPDATE SET
+                title = excluded.title,
+                media_type = excluded.media_type,
+                imdb_id = excluded.imdb_id,
+                tmdb_id = excluded.tmdb_id,
+                added_at = COALESCE(excluded.added_at, plex_watchlist_entries.added_at),
+                resolved_at = excluded.resolved_at
+        ''', rows)
+        conn.commit()
+        return True
+    except sqlite3.OperationalError as e:
+        logging.debug(f"OperationalError in upsert_plex_watchlist_entries: {e}. Handing over to retry_on_db_lock.")
+        try:
+            conn.rollback()
+        except Exception as rb_ex:
+            logging.error(f"Rollback failed in upsert_plex_watchlist_entries after OperationalError: {rb_ex}")
+        raise
+    except sqlite3.Error as e:
+        logging.error(f"SQLite error storing Plex watchlist entries for {username}: {e}")
+        try:
+            conn.rollback()
+        except Exception as rb_ex:
+            logging.error(f"Rollback failed in upsert_plex_watchlist_entries after sqlite3.Error: {rb_ex}")
+        return False
+    finally:
+        conn.close()
+
+
+@retry_on_db_lock()
+def remove_plex_watchlist_entries(username: str, rating_keys: Iterable[str]) -> int:
+    """Forget watchlist entries that are no longer on the user's watchlist. Returns the number removed."""
+    rows = [(username, str(rating_key)) for rating_key in rating_keys]
+    if not rows:
+        return 0
+
+    conn = get_db_connection()
+    try:
+        cursor = conn.executemany('DELETE FROM plex_watchlist_entries WHERE username = ? AND rating_key = ?', rows)
+        conn.commit()
+        return cursor.rowcount
+    except sqlite3.OperationalError as e:
+        logging.debug(f"OperationalError in remove_plex_watchlist_entries: {e}. Handing over to retry_on_db_lock.")
+        try:
+            conn.rollback()
+        except Exception as rb_ex:
+            logging.error(f"Rollback failed in remove_plex_watchlist_entries after OperationalError: {rb_ex}")
+        raise
+    except sqlite3.Error as e:
+        logging.error(f"SQLite error removing Plex watchlist entries for {username}: {e}")
+        try:
+            conn.rollback()
+        except Exception as rb_ex:
+            logging.error(f"Rollback failed in remove_plex_watchlist_entries after sqlite3.Error: {rb_ex}")
+        return 0
+    finally:
+        conn.close()
+
+
+def get_plex_ingestion_cursor(username: str, source: str) -> Optional[float]:
+    """Get the stored high-water mark (Unix timestamp) for a user and source, if any."""
+    conn = get_db_connection()
+    try:
+        row = conn.execute(
+            'SELECT cursor_value FROM plex_ingestion_cursors WHERE username = ? AND source = ?',
+            (username, source)
+        ).fetchone()
+        return row['cursor_value'] if row else None
+    except sqlite3.Error as e:
+        logging.error(f"Error loading Plex ingestion cursor {source} for {username}: {e}")
+        return None
+    finally:
+        conn.close()
+
+
+@retry_on_db_lock()
+def set_plex_ingestion_cursor(username: str, source: str, cursor_value: float) -> bool:
+    """Store the high-water mark for a user and source. The cursor never moves backwards."""
+    conn = get_db_connection()
+    try:
+        conn.execute('''
+            INSERT INTO plex_ingestion_cursors (username, source, cursor_value, updated_at)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(username, source) DO UPDATE SET
+                cursor_value = MAX(plex_ingestion_cursors.cursor_value, excluded.cursor_value),
+                updated_at = excluded.updated_at
+        ''', (username, source, float(cursor_value), time.time()))
+        conn.commit()
+        return True
+    except sqlite3.OperationalError as e:
+        logging.debug(f"OperationalError in set_plex_ingestion_cursor: {e}. Handing over to retry_on_db_lock.")
+        try:
+            conn.rollback()
+        except Exception as rb_ex:
+            logging.error(f"Rollback failed in set_plex_ingestion_cursor after OperationalError: {rb_ex}")
+        raise
+    except sqlite3.Error as e:
+        logging.error(f"SQLite error storing Plex ingestion cursor {source} for {username}: {e}")
+        try:
+            conn.rollback()
+        except Exception as rb_ex:
+            logging.error(f"Rollback failed in set_plex_ingestion_cursor after sqlite3.Error: {rb_ex}")
+        return False
+    finally:
+        conn.close()
+
+
+def reset_plex_ingestion_cursors(username: Optional[str] = None) -> int:
+    """Drop stored cursors (all users, or one) so the next run does a full fetch."""
+    conn = get_db_connection()
+    try:
+        if username is None:
+            cursor = conn.execute('DELETE FROM plex_ingestion_cursors')
+        else:
+            cursor = conn.execute('DELETE FROM plex_ingestion_cursors WHERE username = ?', (username,))
+        conn.commit()
+        return cursor.rowcount
+    except sqlite3.Error as e:
+        logging.error(f"Error resetting Plex ingestion cursors: {e}")
+        return 0
+    finally:
+        conn.close()
@@ -0,0 +1,261 @@
+"""
+Query-plan advisor for the media_items database.
+
+Captures the SQL that database/* and the queues really issue, runs
+`EXPLAIN QUERY PLAN` on each distinct statement and flags:
+
+- full table scans (`SCAN media_items` without an index),
+- temporary B-trees built for ORDER BY / GROUP BY / DISTINCT,
+- automatic (transient) indexes SQLite had to build for the statement.
+
+A flagged scan gets a proposed `CREATE INDEX` on the columns its WHERE
+clause compares with = / IN / IS, followed by the ORDER BY columns. When the
+select list is short, the selected columns are appended so the index covers
+the query. Proposals are meant to be reviewed and then added to
+`schema_management.migrate_schema`. The hot lookups in HOT_QUERIES are pinned
+there, and tests/test_query_plans.py checks them on a seeded database.
+
+Capture is off by default. `start_capture()` sets a trace callback on every
+connection opened by `get_db_connection` until `stop_capture()`.
+"""
+
+import re
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .core import get_db_connection, set_statement_trace
+
+MAX_CAPTURED_STATEMENTS = 2000
+MAX_COVERING_EXTRA_COLUMNS = 4
+
+# Known hot lookups with representative parameters. Each must use an index.
+HOT_QUERIES: Dict[str, Tuple[str, Sequence[Any]]] = {
+    # get_media_item_by_filename / rclone processing and reconciliation
+    'item_by_filled_by_file': (
+        "SELECT * FROM media_items WHERE filled_by_file = ?", ('Movie.2020.1080p.mkv',)),
+    # collected_items.add_collected_items batch matching
+    'collected_items_file_match': (
+        "SELECT id, filled_by_file, location_on_disk FROM media_items "
+        "WHERE filled_by_file IN (?, ?) OR upgrading_from IN (?, ?) "
+        "OR location_basename IN (?, ?) OR location_on_disk IN (?, ?)",
+        ('a.mkv', 'b.mkv') * 4),
+    # WantedQueue force-priority pass
+    'wanted_force_priority': (
+        "SELECT * FROM media_items WHERE state = 'Wanted' AND force_priority = 1", ()),
+    # Queue loads by state
+    'items_by_state': (
+        "SELECT * FROM media_items WHERE state = ?", ('Checking',)),
+    # Existing files of one show
+    'files_by_imdb_id': (
+        "SELECT filled_by_file FROM media_items WHERE imdb_id = ? AND filled_by_file IS NOT NULL", ('tt0000001',)),
+}
+
+_SKIPPED_PREFIXES = ('PRAGMA', 'BEGIN', 'COMMIT', 'ROLLBACK', 'END', 'CREATE', 'DROP', 'ALTER',
+                     'SAVEPOINT', 'RELEASE', 'ANALYZE', 'VACUUM', 'EXPLAIN', 'ATTACH', 'DETACH')
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?(?![\w.])")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+_COMPARED_COLUMN = re.compile(r"(?:\b\w+\.)?\b(\w+)\s*(?:=|==|\bIN\b|\bIS\b(?!\s+NOT\b))", re.IGNORECASE)
+_ORDER_BY = re.compile(r"\bORDER\s+BY\s+(.+?)(?:\bLIMIT\b|\bOFFSET\b|$)", re.IGNORECASE | re.DOTALL)
+_SELECT_LIST = re.compile(r"^\s*SELECT\s+(?:DISTINCT\s+)?(.+?)\s+FROM\b", re.IGNORECASE | re.DOTALL)
+_WHERE_CLAUSE = re.compile(r"\bWHERE\b(.+?)(?:\bGROUP\s+BY\b|\bORDER\s+BY\b|\bLIMIT\b|$)", re.IGNORECASE | re.DOTALL)
+
+
+def fingerprint(sql: str) -> str:
+    """Statement text with literals replaced by ? and IN lists collapsed, for grouping."""
+    text = _STRING_LITERAL.sub('?', sql)
+    text = _NUMBER_LITERAL.sub('?', text)
+    text = _PLACEHOLDER_LIST.sub('(?, ...)', text)
+    return _WHITESPACE.sub(' ', text).strip()
+
+
+class StatementCapture:
+    """Thread-safe record of distinct statements with their call counts and one example each."""
+
+    def __init__(self, max_statements: int = MAX_CAPTURED_STATEMENTS):
+        self.max_statements = max_statements
+        self._statements: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.dropped = 0
+
+    def __call__(self, sql: str):
+        stripped = sql.lstrip()
+        if not stripped or stripped.split(None, 1)[0].upper() in _SKIPPED_PREFIXES:
+            return
+        key = fingerprint(stripped)
+        with self._lock:
+            entry = self._statements.get(key)
+            if entry is not None:
+                entry['count'] += 1
+            elif len(self._statements) < self.max_statements:
+                self._statements[key] = {'fingerprint': key, 'example': stripped, 'count': 1}
+            else:
+                self.dropped += 1
+
+    def statements(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [dict(entry) for entry in self._statements.values()]
+
+
+def explain(conn: sqlite3.Connection, sql: str, params: Sequence[Any] = ()) -> List[str]:
+    """The `detail` column of EXPLAIN QUERY PLAN for one statement."""
+    return [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", tuple(params)).fetchall()]
+
+
+def plan_flags(details: Sequence[str]) -> List[str]:
+    flags = []
+    for detail in details:
+        upper = detail.upper()
+        if upper.startswith('SCAN ') and 'INDEX' not in upper and 'CONSTANT ROW' not in upper:
+            flags.append(f"full_scan: {detail}")
+        elif 'USE TEMP B-TREE' in upper:
+            flags.append(f"temp_btree: {detail}")
+        elif 'AUTOMATIC' in upper:
+            flags.append(f"automatic_index: {detail}")
+    return flags
+
+
+def _table_columns(conn: sqlite3.Connection, table: str) -> List[str]:
+    return [row[1] for row in conn.execute(f"PRAGMA table_info({table})").fetchall()]
+
+
+def propose_index(conn: sqlite3.Connection, sql: str, table: str) -> Optional[str]:
+    """A CREATE INDEX for a statement that scans `table`, or None when no usable column is found."""
+    columns = _table_columns(conn, table)
+    if not columns:
+        return None
+    known = {name.lower(): name for name in columns}
+    where = _WHERE_CLAUSE.search(sql)
+    if where and re.search(r"\bOR\b", where.group(1), re.IGNORECASE):
+        return None  # OR terms need one index per branch, left to the reviewer
+    key_columns: List[str] = []
+    for name in _COMPARED_COLUMN.findall(where.group(1) if where else ''):
+        column = known.get(name.lower())
+        if column and column not in key_columns:
+            key_columns.append(column)
+    order = _ORDER_BY.search(sql)
+    if order:
+        for term in order.group(1).split(','):
+            words = term.strip().split()
+            column = known.get(words[0].split('.')[-1].lower()) if words else None
+            if column and column not in key_columns:
+                key_columns.append(column)
+    if not key_columns:
+        return None
+
+    select = _SELECT_LIST.search(sql)
+    if select and select.group(1).strip() != '*':
+        selected = [known.get(part.strip().split('.')[-1].lower()) for part in select.group(1).split(',')]
+        extra = [column for column in selected if column and column not in key_columns]
+        if None not in selected and len(extra) <= MAX_COVERING_EXTRA_COLUMNS:
+            key_columns.extend(extra)
+
+    name = f"idx_{table}_{'_'.join(key_columns)}"[:120]
+    return f"CREATE INDEX IF NOT EXISTS {name} ON {table}({', '.join(key_columns)})"
+
+
+def analyze_statement(conn: sqlite3.Connection, sql: str, params: Sequence[Any] = ()) -> Dict[str, Any]:
+    """Plan, flags and (for flagged scans) a proposed index for one statement."""
+    try:
+        details = explain(conn, sql, params)
+    except sqlite3.Error as e:
+        return {'sql': sql, 'error': str(e), 'plan': [], 'flags': [], 'suggestion': None}
+    flags = plan_flags(details)
+    suggestion = None
+    for flag in flags:
+        if flag.startswith('full_scan'):
+            table = flag.split('SCAN ', 1)[1].split()[0]
+            suggestion = propose_index(conn, sql, table)
+            break
+    return {'sql': sql, 'plan': details, 'flags': flags, 'suggestion': suggestion}
+
+
+def analyze_statements(statements: List[Dict[str, Any]], conn: Optional[sqlite3.Connection] = None) -> List[Dict[str, Any]]:
+    """Analyze captured statements, flagged ones first and then by call count."""
+    own_conn = conn is None
+    conn = conn or get_db_connection()
+    try:
+        report = []
+        for statement in statements:
+            result = analyze_statement(conn, statement['example'])
+            result.update(fingerprint=statement['fingerprint'], count=statement['count'])
+            report.append(result)
+    finally:
+        if own_conn:
+            conn.close()
+    report.sort(key=lambda entry: (not entry['flags'], -entry['count']))
+    return report
+
+
+def check_hot_queries(conn: Optional[sqlite3.Connection] = None) -> Dict[str, Dict[str, Any]]:
+    """Analyze HOT_QUERIES. Any entry with a full_scan flag is a regression."""
+    own_conn = conn is None
+    conn = conn or get_db_connection()
+    try:
+        return {name: analyze_statement(conn, sql, params) for name, (sql, params) in HOT_QUERIES.items()}
+    finally:
+        if own_conn:
+            conn.close()
+
+
+_capture: Optional[StatementCapture] = None
+_capturing = False
+_capture_lock = threading.Lock()
+
+
+def start_capture() -> StatementCapture:
+    """Start recording statements on new connections. An existing capture keeps its data."""
+    global _capture, _capturing
+    with _capture_lock:
+        if _capture is None:
+            _capture = StatementCapture()
+        set_statement_trace(_capture)
+        _capturing = True
+        return _capture
+
+
+def stop_capture() -> Optional[StatementCapture]:
+    """Stop recording on new connections and keep the captured statements for the report."""
+    global _capturing
+    with _capture_lock:
+        set_statement_trace(None)
+        _capturing = False
+        return _capture
+
+
+def reset_capture():
+    """Discard the captured statements. Capturing continues if it was running."""
+    global _capture
+    with _capture_lock:
+        _capture = StatementCapture() if _capturing else None
+        set_statement_trace(_capture)
+
+
+def is_capturing() -> bool:
+    return _capturing
+
+
+def capture_report() -> Dict[str, Any]:
+    capture = _capture
+    statements = capture.statements() if capture else []
+    return {
+        'capturing': _capturing,
+        'distinct_statements': len(statements),
+        'dropped': capture.dropped if capture else 0,
+        'statements': analyze_statements(statements) if statements else [],
+    }
+
+
+if __name__ == '__main__':
+    import json
+    import sys
+
+    path = sys.argv[1] if len(sys.argv) > 1 else None
+    connection = get_db_connection(path)
+    try:
+        print(json.dumps(check_hot_queries(connection), indent=2))
+    finally:
+        connection.close()
@@ -0,0 +1,234 @@
+"""
+SQLite-backed storage for queue dwell times.
+
+Every completed queue visit (entry -> exit) is appended to `queue_transitions`.
+Items that are currently sitting in a queue are kept in the small
+`queue_open_entries` table so entry times survive restarts. Writes are buffered
+by `QueueTimer` and flushed here in a single transaction.
+"""
+
+import logging
+import sqlite3
+import time
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .core import get_db_connection, retry_on_db_lock
+
+# Columns percentiles can be grouped by
+QUEUE_TIMING_GROUP_COLUMNS = ('queue_name', 'content_source', 'version', 'scheduling_mode')
+
+DEFAULT_PERCENTILES = (50, 90, 99)
+
+
+def create_queue_timing_tables():
+    """Creates the queue timing tables and indexes if they don't exist."""
+    conn = get_db_connection()
+    try:
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS queue_transitions (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                item_id INTEGER NOT NULL,
+                queue_name TEXT NOT NULL,
+                content_source TEXT,
+                version TEXT,
+                scheduling_mode TEXT,
+                entered_at REAL NOT NULL,
+                exited_at REAL NOT NULL,
+                duration_seconds REAL NOT NULL
+            )
+        ''')
+        # Time-windowed percentile queries filter on queue + exit time and only need the duration
+        conn.execute('''
+            CREATE INDEX IF NOT EXISTS idx_queue_transitions_queue_exited
+            ON queue_transitions(queue_name, exited_at, duration_seconds)
+        ''')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_queue_transitions_exited ON queue_transitions(exited_at)')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_queue_transitions_item ON queue_transitions(item_id)')
+
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS queue_open_entries (
+                item_id INTEGER NOT NULL,
+                queue_name TEXT NOT NULL,
+                content_source TEXT,
+                version TEXT,
+                entered_at REAL NOT NULL,
+                PRIMARY KEY (item_id, queue_name)
+            )
+        ''')
+        conn.commit()
+    except sqlite3.Error as e:
+        logging.error(f"Error creating queue timing tables: {e}")
+        raise
+    finally:
+        conn.close()
+
+
+@retry_on_db_lock()
+def write_queue_timing_batch(open_entries: Sequence[Tuple], closed_entries: Sequence[Tuple], transitions: Sequence[Tuple]) -> bool:
+    """
+    Apply a batch of buffered queue timing changes in one transaction.
+
+    Args:
+        open_entries: (item_id, queue_name, content_source, version, entered_at) rows to upsert
+        closed_entries: (item_id, queue_name) rows to remove from the open entries
+        transitions: (item_id, queue_name, content_source, version, scheduling_mode,
+                      entered_at, exited_at, duration_seconds) rows to append
+    """
+    if not open_entries and not closed_entries and not transitions:
+        return True
+
+    conn = get_db_connection()
+    try:
+        cursor = conn.cursor()
+        if closed_entries:
+            cursor.executemany(
+                'DELETE FROM queue_open_entries WHERE item_id = ? AND queue_name = ?',
+                closed_entries
+            )
+        if open_entries:
+            cursor.executemany('''
+                INSERT OR REPLACE INTO queue_open_entries (item_id, queue_name, content_source, version, entered_at)
+                VALUES (?, ?, ?, ?, ?)
+            ''', open_entries)
+        if transitions:
+            cursor.executemany('''
+                INSERT INTO queue_transitions (
+                    item_id, queue_name, content_source, version, scheduling_mode,
+                    entered_at, exited_at, duration_seconds
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ''', transitions)
+        conn.commit()
+        return True
+    except sqlite3.OperationalError as e:
+        logging.debug(f"OperationalError in write_queue_timing_batch: {e}. Handing over to retry_on_db_lock.")
+        try:
+            conn.rollback()
+        except Exception as rb_ex:
+            logging.error(f"Rollback failed in write_queue_timing_batch after OperationalError: {rb_ex}")
+        raise
+    except sqlite3.Error as e:
+        logging.error(f"SQLite error writing queue timing batch: {e}")
+        try:
+            conn.rollback()
+        except Exception as rb_ex:
+            logging.error(f"Rollback failed in write_queue_timing_batch after sqlite3.Error: {rb_ex}")
+        return False
+    finally:
+        conn.close()
+
+
+def get_open_queue_entries(max_age_seconds: Optional[float] = None) -> List[Dict[str, Any]]:
+    """Get items that are currently recorded as sitting in a queue."""
+    conn = get_db_connection()
+    try:
+        query = 'SELECT item_id, queue_name, content_source, version, entered_at FROM queue_open_entries'
+        params: List[Any] = []
+        if max_age_seconds is not None:
+            query += ' WHERE entered_at >= ?'
+            params.append(time.time() - max_age_seconds)
+        return [dict(row) for row in conn.execute(query, params).fetchall()]
+    except sqlite3.Error as e:
+        logging.error(f"Error loading open queue timing entries: {e}")
+        return []
+    finally:
+        conn.close()
+
+
+def prune_queue_timing(retention_days: int = 90, open_entry_max_age_days: int = 30) -> int:
+    """Delete transitions older than the retention window and stale open entries."""
+    now = time.time()
+    conn = get_db_connection()
+    try:
+        cursor = conn.execute('DELETE FROM queue_transitions WHERE exited_at < ?', (now - retention_days * 86400,))
+        removed = cursor.rowcount
+        conn.execute('DELETE FROM queue_open_entries WHERE entered_at < ?', (now - open_entry_max_age_days * 86400,))
+        conn.commit()
+        if removed:
+            logging.debug(f"Pruned {removed} queue transitions older than {retention_days} days")
+        return removed
+    except sqlite3.Error as e:
+        logging.error(f"Error pruning queue timing data: {e}")
+        return 0
+    finally:
+        conn.close()
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    """Linear-interpolated percentile of an already sorted list."""
+    if len(sorted_values) == 1:
+        return sorted_values[0]
+    rank = (pct / 100.0) * (len(sorted_values) - 1)
+    lower = int(rank)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    fraction = rank - lower
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * fraction
+
+
+def get_queue_dwell_percentiles(
+    hours: float = 24,
+    group_by: Iterable[str] = ('queue_name',),
+    percentiles: Iterable[float] = DEFAULT_PERCENTILES,
+    queue_name: Optional[str] = None,
+    content_source: Optional[str] = None,
+    version: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Get dwell-time percentiles for queue visits that completed in the last `hours`.
+
+    Args:
+        hours: Size of the time window, ending now
+        group_by: Any of QUEUE_TIMING_GROUP_COLUMNS
+        percentiles: Percentiles to compute (0-100)
+        queue_name, content_source, version: Optional filters
+
+    Returns:
+        One dict per group with the group columns, count, avg/min/max and a
+        'p<N>' key (seconds) for each requested percentile.
+    """
+    group_columns = [column for column in group_by if column in QUEUE_TIMING_GROUP_COLUMNS]
+    if not group_columns:
+        group_columns = ['queue_name']
+    percentiles = list(percentiles)
+
+    where = ['exited_at >= ?']
+    params: List[Any] = [time.time() - hours * 3600]
+    for column, value in (('queue_name', queue_name), ('content_source', content_source), ('version', version)):
+        if value is not None:
+            where.append(f'{column} = ?')
+            params.append(value)
+
+    # Group columns are whitelisted above, so formatting them in is safe
+    columns_sql = ', '.join(group_columns)
+    query = f'''
+        SELECT {columns_sql}, duration_seconds
+        FROM queue_transitions
+        WHERE {' AND '.join(where)}
+        ORDER BY {columns_sql}, duration_seconds
+    '''
+
+    conn = get_db_connection()
+    try:
+        rows = conn.execute(query, params).fetchall()
+    except sqlite3.Error as e:
+        logging.error(f"Error querying queue dwell percentiles: {e}")
+        return []
+    finally:
+        conn.close()
+
+    # Rows arrive grouped and sorted by duration within each group
+    groups: Dict[Tuple, List[float]] = {}
+    for row in rows:
+        key = tuple(row[column] for column in group_columns)
+        groups.setdefault(key, []).append(row['duration_seconds'])
+
+    results = []
+    for key, durations in groups.items():
+        entry = dict(zip(group_columns, key))
+        entry['count'] = len(durations)
+        entry['avg'] = sum(durations) / len(durations)
+        entry['min'] = durations[0]
+        entry['max'] = durations[-1]
+        for pct in percentiles:
+            entry[f'p{pct:g}'] = _percentile(durations, pct)
+        results.append(entry)
+    return results
@@ -1,15 +1,16 @@
 import logging
 from .core import get_db_connection
+from .statistics_counters import get_summary_counts
 import asyncio
 import aiohttp
 from .poster_management import get_poster_url
 from routes.poster_cache import get_cached_poster_url, cache_poster_url, clean_expired_cache
 from utilities.settings import get_setting
+from utilities.ttl_cache import ttl_cache
 from flask import request, url_for
 from urllib.parse import urlparse
 from datetime import datetime
 import time
-from functools import wraps
 import random
 from debrid import get_debrid_provider, TooManyDownloadsError, ProviderUnavailableError
 import threading
@@ -271,63 +272,31 @@ def get_cached_subscription_status() -> Dict:
             'error': str(e)
         }
 
-def cache_for_seconds(seconds):
+def cache_for_seconds(seconds, maxsize=32, stale_while_revalidate=0):
     """Cache the result of a function for the specified number of seconds."""
-    def decorator(func):
-        cache = {}
-        
-        @wraps(func)
-        async def async_wrapper(*args, **kwargs):
-            now = time.time()
-            
-            # Create a cache key from the function name and arguments
-            key = (func.__name__, args, frozenset(kwargs.items()))
-            
-            # Check if we have a cached value and it's still valid
-            if key in cache:
-                result, timestamp = cache[key]
-                if now - timestamp < seconds:
-                    logging.debug(f"Cache hit for {func.__name__}")
-                    return result
-            
-            # If no valid cached value, call the function
-            result = await func(*args, **kwargs)
-            cache[key] = (result, now)
-            return result
-            
-        @wraps(func)
-        def sync_wrapper(*args, **kwargs):
-            now = time.time()
-            
-            # Create a cache key from the function name and arguments
-            key = (func.__name__, args, frozenset(kwargs.items()))
-            
-            # Check if we have a cached value and it's still valid
-            if key in cache:
-                result, timestamp = cache[key]
-                if now - timestamp < seconds:
-                    logging.debug(f"Cache hit for {func.__name__}")
-                    return result
-            
-            # If no valid cached value, call the function
-            result = func(*args, **kwargs)
-            cache[key] = (result, now)
-            return result
-            
-        if asyncio.iscoroutinefunction(func):
-            return async_wrapper
-        return sync_wrapper
-    return decorator
+    return ttl_cache(seconds, maxsize=maxsize, stale_while_revalidate=stale_while_revalidate)
 
-@cache_for_seconds(60)  # Cache collection counts for 1 minute
 def get_collected_counts():
     """
     Get counts of collected media items.
-    This function is optimized to use indexes and minimize computation.
+    Reads the trigger-maintained statistics counters, which are always current.
+    Falls back to the summary table or direct counts when the counters are not built.
     """
     import time
     overall_start = time.perf_counter()
-    
+
+    try:
+        counters = get_summary_counts()
+    except sqlite3.Error as e:
+        logging.error(f"Error reading statistics counters: {str(e)}")
+        counters = None
+    if counters is not None:
+        return {
+            'total_movies': counters['total_movies'],
+            'total_shows': counters['total_shows'],
+            'total_episodes': counters['total_episodes']
+        }
+
     conn = get_db_connection()
     try:
         cursor = conn.cursor()
@@ -754,41 +723,14 @@ def update_statistics_summary(force=False):
             logging.info(f"Update check took {update_check_time*1000:.2f}ms")
             
             # Get the latest statistics
-            # Count unique collected movies
-            movies_start = time.perf_counter()
-            cursor.execute('''
-                SELECT COUNT(DISTINCT imdb_id) 
-                FROM media_items 
-                WHERE type = 'movie' AND state IN ('Collected', 'Upgrading')
-            ''')
-            total_movies = cursor.fetchone()[0]
-            movies_time = time.perf_counter() - movies_start
-            logging.info(f"Movies count took {movies_time*1000:.2f}ms")
-
-            # Count unique collected TV shows
-            shows_start = time.perf_counter()
-            cursor.execute('''
-                SELECT COUNT(DISTINCT imdb_id) 
-                FROM media_items 
-                WHERE type = 'episode' AND state IN ('Collected', 'Upgrading')
-            ''')
-            total_shows = cursor.fetchone()[0]
-            shows_time = time.perf_counter() - shows_start
-            logging.info(f"Shows count took {shows_time*1000:.2f}ms")
-
-            # Count unique collected episodes - Optimized query
-            episodes_start = time.perf_counter()
-            cursor.execute('''
-                SELECT COUNT(*) 
-                FROM (
-                    SELECT DISTINCT imdb_id, season_number, episode_number
-                    FROM media_items 
-                    WHERE type = 'episode' AND state IN ('Collected', 'Upgrading')
-                )
-            ''')
-            total_episodes = cursor.fetchone()[0]
-            episodes_time = time.perf_counter() - episodes_start
-            logging.info(f"Episodes count took {episodes_time*1000:.2f}ms")
+            # Collection totals come from the trigger-maintained counters (direct counts as fallback)
+            counts_start = time.perf_counter()
+            counts = get_collected_counts()
+            total_movies = counts['total_movies']
+            total_shows = counts['total_shows']
+            total_episodes = counts['total_episodes']
+            counts_time = time.perf_counter() - counts_start
+            logging.info(f"Collection counts took {counts_time*1000:.2f}ms")
             
             # Get latest collected movie
             latest_movie_start = time.perf_counter()
@@ -864,9 +806,19 @@ def update_statistics_summary(force=False):
         statistics_update_lock.release()
 
 def get_statistics_summary():
-    """Get the statistics summary from the dedicated table"""
+    """Get the statistics summary from the trigger-maintained counters, or the dedicated table as fallback"""
     import time
     overall_start = time.perf_counter()
+
+    try:
+        counters = get_summary_counts()
+    except sqlite3.Error as e:
+        logging.error(f"Error reading statistics counters: {str(e)}")
+        counters = None
+    if counters is not None:
+        counters['last_updated'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        return counters
+
     conn = None
     try:
         # Time database connection
@@ -0,0 +1,306 @@
+"""
+Statistics summary counters maintained by SQLite triggers.
+
+The collection counts used to come from COUNT(DISTINCT ...) scans over
+media_items. They were recomputed on a schedule into statistics_summary and
+memoized for 60 seconds. Triggers on media_items now keep them current inside
+the writing transaction:
+
+- `statistics_counters(metric, key, value)` holds:
+  - rows per state ('state', <state>),
+  - collected rows per version ('version', <version>),
+  - collected rows per content source ('content_source', <source>),
+  - the collected item count ('library', 'collected_items'),
+  - the distinct totals ('collected', 'movies' | 'shows' | 'episodes').
+- The distinct totals are reference counts. `statistics_collected_titles` counts
+  collected rows per (type, imdb_id). `statistics_collected_episodes` counts
+  them per (imdb_id, season, episode). Triggers on those two tables move the
+  totals when a key appears or its last row goes away.
+
+"Collected" means state 'Collected' or 'Upgrading', as in get_collected_counts.
+Reading the summary is a lookup of a few dozen rows. `verify_statistics_counters`
+recomputes everything from media_items, reports differences and can rebuild.
+"""
+
+import logging
+import sqlite3
+from typing import Any, Dict, Optional, Tuple
+
+from .core import get_db_connection
+
+COLLECTED_STATES = "('Collected', 'Upgrading')"
+INITIALIZED_KEY = ('meta', 'initialized')
+
+_UPSERT_COUNTER = '''
+    INSERT INTO statistics_counters (metric, key, value)
+    SELECT {metric}, {key}, {delta} WHERE {condition}
+    ON CONFLICT(metric, key) DO UPDATE SET value = value + excluded.value;
+'''
+
+
+def _row_delta(row: str, sign: int) -> str:
+    """Trigger statements that add (sign=1) or remove (sign=-1) the contribution of NEW or OLD."""
+    collected = f"{row}.state IN {COLLECTED_STATES}"
+    statements = [
+        _UPSERT_COUNTER.format(metric="'state'", key=f"IFNULL({row}.state, '')", delta=sign, condition='1'),
+        _UPSERT_COUNTER.format(metric="'version'", key=f"IFNULL({row}.version, '')", delta=sign, condition=collected),
+        _UPSERT_COUNTER.format(metric="'content_source'", key=f"IFNULL({row}.content_source, '')", delta=sign,
+                               condition=collected),
+        _UPSERT_COUNTER.format(metric="'library'", key="'collected_items'", delta=sign, condition=collected),
+        f'''
+    INSERT INTO statistics_collected_titles (type, imdb_id, refs)
+    SELECT {row}.type, {row}.imdb_id, {sign}
+    WHERE {collected} AND {row}.type IN ('movie', 'episode') AND {row}.imdb_id IS NOT NULL
+    ON CONFLICT(type, imdb_id) DO UPDATE SET refs = refs + excluded.refs;
+''',
+        f'''
+    INSERT INTO statistics_collected_episodes (imdb_id, season_number, episode_number, refs)
+    SELECT IFNULL({row}.imdb_id, ''), IFNULL({row}.season_number, -1), IFNULL({row}.episode_number, -1), {sign}
+    WHERE {collected} AND {row}.type = 'episode'
+    ON CONFLICT(imdb_id, season_number, episode_number) DO UPDATE SET refs = refs + excluded.refs;
+''',
+    ]
+    return ''.join(statements)
+
+
+_TRACKED_COLUMNS = ('state', 'type', 'imdb_id', 'season_number', 'episode_number', 'version', 'content_source')
+
+_TRIGGERS = {
+    'trigger_statistics_media_items_insert': f'''
+        CREATE TRIGGER trigger_statistics_media_items_insert
+        AFTER INSERT ON media_items
+        BEGIN {_row_delta('NEW', 1)} END
+    ''',
+    'trigger_statistics_media_items_delete': f'''
+        CREATE TRIGGER trigger_statistics_media_items_delete
+        AFTER DELETE ON media_items
+        BEGIN {_row_delta('OLD', -1)} END
+    ''',
+    # NEW is added before OLD is removed so an unchanged key never drops to zero refs
+    'trigger_statistics_media_items_update': f'''
+        CREATE TRIGGER trigger_statistics_media_items_update
+        AFTER UPDATE OF {', '.join(_TRACKED_COLUMNS)} ON media_items
+        WHEN {' OR '.join(f'OLD.{column} IS NOT NEW.{column}' for column in _TRACKED_COLUMNS)}
+        BEGIN {_row_delta('NEW', 1)} {_row_delta('OLD', -1)} END
+    ''',
+    'trigger_statistics_titles_insert': f'''
+        CREATE TRIGGER trigger_statistics_titles_insert
+        AFTER INSERT ON statistics_collected_titles
+        BEGIN {_UPSERT_COUNTER.format(metric="'collected'",
+                                      key="CASE NEW.type WHEN 'movie' THEN 'movies' ELSE 'shows' END",
+                                      delta=1, condition='1')} END
+    ''',
+    'trigger_statistics_titles_delete': f'''
+        CREATE TRIGGER trigger_statistics_titles_delete
+        AFTER DELETE ON statistics_collected_titles
+        BEGIN {_UPSERT_COUNTER.format(metric="'collected'",
+                                      key="CASE OLD.type WHEN 'movie' THEN 'movies' ELSE 'shows' END",
+                                      delta=-1, condition='1')} END
+    ''',
+    'trigger_statistics_titles_release': '''
+        CREATE TRIGGER trigger_statistics_titles_release
+        AFTER UPDATE OF refs ON statistics_collected_titles
+        WHEN NEW.refs <= 0
+        BEGIN DELETE FROM statistics_collected_titles WHERE type = NEW.type AND imdb_id = NEW.imdb_id; END
+    ''',
+    'trigger_statistics_episodes_insert': f'''
+        CREATE TRIGGER trigger_statistics_episodes_insert
+        AFTER INSERT ON statistics_collected_episodes
+        BEGIN {_UPSERT_COUNTER.format(metric="'collected'", key="'episodes'", delta=1, condition='1')} END
+    ''',
+    'trigger_statistics_episodes_delete': f'''
+        CREATE TRIGGER trigger_statistics_episodes_delete
+        AFTER DELETE ON statistics_collected_episodes
+        BEGIN {_UPSERT_COUNTER.format(metric="'collected'", key="'episodes'", delta=-1, condition='1')} END
+    ''',
+    'trigger_statistics_episodes_release': '''
+        CREATE TRIGGER trigger_statistics_episodes_release
+        AFTER UPDATE OF refs ON statistics_collected_episodes
+        WHEN NEW.refs <= 0
+        BEGIN
+            DELETE FROM statistics_collected_episodes
+            WHERE imdb_id = NEW.imdb_id AND season_number = NEW.season_number AND episode_number = NEW.episode_number;
+        END
+    ''',
+}
+
+
+def create_statistics_counters():
+    """Create the counter tables and triggers, and fill the counters if they were never built."""
+    conn = get_db_connection()
+    try:
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS statistics_counters (
+                metric TEXT NOT NULL,
+                key TEXT NOT NULL,
+                value INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (metric, key)
+            ) WITHOUT ROWID
+        ''')
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS statistics_collected_titles (
+                type TEXT NOT NULL,
+                imdb_id TEXT NOT NULL,
+                refs INTEGER NOT NULL,
+                PRIMARY KEY (type, imdb_id)
+            ) WITHOUT ROWID
+        ''')
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS statistics_collected_episodes (
+                imdb_id TEXT NOT NULL,
+                season_number INTEGER NOT NULL,
+                episode_number INTEGER NOT NULL,
+                refs INTEGER NOT NULL,
+                PRIMARY KEY (imdb_id, season_number, episode_number)
+            ) WITHOUT ROWID
+        ''')
+        existing = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'")}
+        for name, sql in _TRIGGERS.items():
+            if name not in existing:
+                conn.execute(sql)
+        conn.commit()
+        initialized = conn.execute('SELECT value FROM statistics_counters WHERE metric = ? AND key = ?',
+                                   INITIALIZED_KEY).fetchone()
+    except sqlite3.Error as e:
+        logging.error(f"Error creating statistics counters: {e}")
+        conn.rollback()
+        return
+    finally:
+        conn.close()
+
+    if not initialized:
+        logging.info("Building statistics counters from media_items...")
+        rebuild_statistics_counters()
+
+
+def _expected_counters(conn: sqlite3.Connection) -> Dict[Tuple[str, str], int]:
+    """All counter values computed from scratch with full scans of media_items."""
+    expected: Dict[Tuple[str, str], int] = {}
+    grouped = {
+        'state': "SELECT IFNULL(state, ''), COUNT(*) FROM media_items GROUP BY 1",
+        'version': f"SELECT IFNULL(version, ''), COUNT(*) FROM media_items WHERE state IN {COLLECTED_STATES} GROUP BY 1",
+        'content_source': f'''SELECT IFNULL(content_source, ''), COUNT(*) FROM media_items
+                              WHERE state IN {COLLECTED_STATES} GROUP BY 1''',
+    }
+    for metric, sql in grouped.items():
+        for key, count in conn.execute(sql):
+            expected[(metric, key)] = count
+    expected[('library', 'collected_items')] = conn.execute(
+        f"SELECT COUNT(*) FROM media_items WHERE state IN {COLLECTED_STATES}").fetchone()[0]
+    for key, media_type in (('movies', 'movie'), ('shows', 'episode')):
+        expected[('collected', key)] = conn.execute(f'''
+            SELECT COUNT(DISTINCT imdb_id) FROM media_items
+            WHERE type = ? AND state IN {COLLECTED_STATES}
+        ''', (media_type,)).fetchone()[0]
+    expected[('collected', 'episodes')] = conn.execute(f'''
+        SELECT COUNT(*) FROM (
+            SELECT DISTINCT IFNULL(imdb_id, ''), IFNULL(season_number, -1), IFNULL(episode_number, -1)
+            FROM media_items WHERE type = 'episode' AND state IN {COLLECTED_STATES}
+        )
+    ''').fetchone()[0]
+    return {key: value for key, value in expected.items() if value}
+
+
+def rebuild_statistics_counters() -> bool:
+    """Recompute every counter from media_items in one write transaction."""
+    conn = get_db_connection()
+    try:
+        conn.execute('BEGIN IMMEDIATE')
+        conn.execute('DELETE FROM statistics_collected_titles')
+        conn.execute('DELETE FROM statistics_collected_episodes')
+        conn.execute(f'''
+            INSERT INTO statistics_collected_titles (type, imdb_id, refs)
+            SELECT type, imdb_id, COUNT(*) FROM media_items
+            WHERE state IN {COLLECTED_STATES} AND type IN ('movie', 'episode') AND imdb_id IS NOT NULL
+            GROUP BY type, imdb_id
+        ''')
+        conn.execute(f'''
+            INSERT INTO statistics_collected_episodes (imdb_id, season_number, episode_number, refs)
+            SELECT IFNULL(imdb_id, ''), IFNULL(season_number, -1), IFNULL(episode_number, -1), COUNT(*)
+            FROM media_items WHERE type = 'episode' AND state IN {COLLECTED_STATES}
+            GROUP BY 1, 2, 3
+        ''')
+        # The inserts above moved the 'collected' counters through their triggers; replace them all
+        conn.execute('DELETE FROM statistics_counters')
+        counters = _expected_counters(conn)
+        counters[INITIALIZED_KEY] = 1
+        conn.executemany('INSERT INTO statistics_counters (metric, key, value) VALUES (?, ?, ?)',
+                         [(metric, key, value) for (metric, key), value in counters.items()])
+        conn.commit()
+        logging.info(f"Rebuilt statistics counters ({len(counters)} values)")
+        return True
+    except sqlite3.Error as e:
+        logging.error(f"Error rebuilding statistics counters: {e}")
+        conn.rollback()
+        return False
+    finally:
+        conn.close()
+
+
+def _stored_counters(conn: sqlite3.Connection) -> Dict[Tuple[str, str], int]:
+    return {(row[0], row[1]): row[2] for row in conn.execute('SELECT metric, key, value FROM statistics_counters')}
+
+
+def verify_statistics_counters(repair: bool = False) -> Dict[str, Any]:
+    """
+    Compare the trigger-maintained counters with a full recount.
+
+    Returns {'consistent': bool, 'mismatches': [...], 'repaired': bool}. With repair set,
+    inconsistent counters are rebuilt.
+    """
+    conn = get_db_connection()
+    try:
+        conn.execute('BEGIN')  # one snapshot for both reads
+        stored = _stored_counters(conn)
+        expected = _expected_counters(conn)
+        conn.rollback()
+    finally:
+        conn.close()
+
+    initialized = stored.pop(INITIALIZED_KEY, None)
+    mismatches = [
+        {'metric': metric, 'key': key, 'stored': stored.get((metric, key), 0), 'expected': expected.get((metric, key), 0)}
+        for metric, key in sorted(set(stored) | set(expected))
+        if stored.get((metric, key), 0) != expected.get((metric, key), 0)
+    ]
+    consistent = bool(initialized) and not mismatches
+    repaired = False
+    if not consistent:
+        logging.warning(f"Statistics counters are inconsistent ({len(mismatches)} mismatches"
+                        f"{', never built' if not initialized else ''})")
+        if repair:
+            repaired = rebuild_statistics_counters()
+    return {'consistent': consistent, 'mismatches': mismatches, 'repaired': repaired}
+
+
+def get_summary_counts() -> Optional[Dict[str, Any]]:
+    """
+    The current summary from the counters, or None if they have not been built.
+
+    Keys: total_movies, total_shows, total_episodes, collected_items, and the
+    states, versions and content_sources breakdowns.
+    """
+    conn = get_db_connection()
+    try:
+        stored = _stored_counters(conn)
+    except sqlite3.OperationalError as e:
+        if 'no such table' in str(e):
+            return None
+        raise
+    finally:
+        conn.close()
+    if not stored.get(INITIALIZED_KEY):
+        return None
+
+    def breakdown(metric: str) -> Dict[str, int]:
+        return {key: value for (name, key), value in stored.items() if name == metric and value}
+
+    return {
+        'total_movies': stored.get(('collected', 'movies'), 0),
+        'total_shows': stored.get(('collected', 'shows'), 0),
+        'total_episodes': stored.get(('collected', 'episodes'), 0),
+        'collected_items': stored.get(('library', 'collected_items'), 0),
+        'states': breakdown('state'),
+        'versions': breakdown('version'),
+        'content_sources': breakdown('content_source'),
+    }
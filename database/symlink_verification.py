@@ -2,13 +2,84 @@ import logging
 import os
 import time
 from datetime import datetime
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, Iterator, List, Any, Optional, Sequence, Tuple
 import sqlite3
 
 from .core import get_db_connection, retry_on_db_lock
 
 logger = logging.getLogger(__name__)
 
+# Chunk size for id lists bound into IN (...) clauses, well below SQLite's variable limit
+ID_BATCH_SIZE = 500
+
+UNVERIFIED_FILE_COLUMNS = """
+    v.id as verification_id,
+    v.media_item_id,
+    v.filename,
+    v.full_path,
+    v.added_at,
+    v.verification_attempts,
+    v.last_attempt,
+    m.id as item_id,
+    m.title,
+    m.episode_title,
+    m.season_number,
+    m.episode_number,
+    m.type,
+    m.location_on_disk
+"""
+
+def _unverified_row_to_dict(row: sqlite3.Row) -> Dict[str, Any]:
+    return {
+        'verification_id': row['verification_id'],
+        'media_item_id': row['media_item_id'],
+        'filename': row['filename'],
+        'full_path': row['full_path'],
+        'added_at': row['added_at'],
+        'verification_attempts': row['verification_attempts'],
+        'last_attempt': row['last_attempt'],
+        'item_id': row['item_id'],
+        'title': row['title'],
+        'episode_title': row['episode_title'],
+        'season_number': row['season_number'],
+        'episode_number': row['episode_number'],
+        'type': row['type'],
+        'location_on_disk': row['location_on_disk']
+    }
+
+def _id_chunks(ids: Sequence[int]) -> Iterator[List[int]]:
+    ids = list(ids)
+    for start in range(0, len(ids), ID_BATCH_SIZE):
+        yield ids[start:start + ID_BATCH_SIZE]
+
+def create_verification_indexes() -> bool:
+    """
+    Create the indexes used by the verification queue.
+
+    idx_symlink_verification_pending covers the pending-files scan (filter on
+    verified/permanently_failed, order by attempts and added_at) so it is read in
+    index order without a sort. idx_symlink_verification_media_item serves the
+    per-item lookups when files are queued or removed.
+    """
+    conn = get_db_connection()
+    try:
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_symlink_verification_pending
+            ON symlinked_files_verification (verified, permanently_failed, verification_attempts, added_at)
+        """)
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_symlink_verification_media_item
+            ON symlinked_files_verification (media_item_id, full_path)
+        """)
+        conn.commit()
+        return True
+    except sqlite3.Error as e:
+        # The table doesn't exist yet on a fresh database; create_database() calls this again later
+        logger.debug(f"Could not create symlink verification indexes: {e}")
+        return False
+    finally:
+        conn.close()
+
 @retry_on_db_lock()
 def add_symlinked_file_for_verification(media_item_id: int, full_path: str) -> bool:
     """
@@ -121,7 +192,8 @@ def get_unverified_files(limit: int = 100) -> List[Dict[str, Any]]:
                 m.episode_title,
                 m.season_number,
                 m.episode_number,
-                m.type
+                m.type,
+                m.location_on_disk
             FROM symlinked_files_verification v
             JOIN media_items m ON v.media_item_id = m.id
             WHERE v.verified = FALSE 
@@ -132,25 +204,7 @@ def get_unverified_files(limit: int = 100) -> List[Dict[str, Any]]:
             (limit,)
         )
         
-        results = []
-        for row in cursor.fetchall():
-            results.append({
-                'verification_id': row['verification_id'],
-                'media_item_id': row['media_item_id'],
-                'filename': row['filename'],
-                'full_path': row['full_path'],
-                'added_at': row['added_at'],
-                'verification_attempts': row['verification_attempts'],
-                'last_attempt': row['last_attempt'],
-                'item_id': row['item_id'],
-                'title': row['title'],
-                'episode_title': row['episode_title'],
-                'season_number': row['season_number'],
-                'episode_number': row['episode_number'],
-                'type': row['type']
-            })
-        
-        return results
+        return [_unverified_row_to_dict(row) for row in cursor.fetchall()]
     except sqlite3.OperationalError as e:
         logger.debug(f"OperationalError in get_unverified_files: {e}. Handing over to retry_on_db_lock.")
         try:
@@ -169,6 +223,67 @@ def get_unverified_files(limit: int = 100) -> List[Dict[str, Any]]:
         if conn:
             conn.close()
 
+@retry_on_db_lock()
+def get_unverified_file_ids(limit: int = 100) -> List[int]:
+    """
+    Get the IDs of unverified, not permanently failed files in processing order.
+    Answered from idx_symlink_verification_pending alone.
+    """
+    conn = get_db_connection()
+    try:
+        cursor = conn.execute(
+            """
+            SELECT id FROM symlinked_files_verification
+            WHERE verified = FALSE
+            AND permanently_failed = FALSE
+            ORDER BY verification_attempts ASC, added_at ASC
+            LIMIT ?
+            """,
+            (limit,)
+        )
+        return [row[0] for row in cursor.fetchall()]
+    except sqlite3.OperationalError as e:
+        logger.debug(f"OperationalError in get_unverified_file_ids: {e}. Handing over to retry_on_db_lock.")
+        raise
+    except sqlite3.Error as e:
+        logger.error(f"SQLite error getting unverified file IDs: {str(e)}")
+        return []
+    finally:
+        conn.close()
+
+def iter_unverified_files(verification_ids: Sequence[int], page_size: int = 200) -> Iterator[Dict[str, Any]]:
+    """
+    Yield the details of the given verification records (same format as get_unverified_files),
+    in the order given, loading them one page at a time.
+
+    Records that were removed, or whose media item no longer exists, since the IDs
+    were read are skipped.
+    """
+    verification_ids = list(verification_ids)
+    for start in range(0, len(verification_ids), page_size):
+        page_ids = verification_ids[start:start + page_size]
+        conn = get_db_connection()
+        try:
+            placeholders = ','.join('?' * len(page_ids))
+            rows = conn.execute(
+                f"""
+                SELECT {UNVERIFIED_FILE_COLUMNS}
+                FROM symlinked_files_verification v
+                JOIN media_items m ON v.media_item_id = m.id
+                WHERE v.id IN ({placeholders})
+                """,
+                page_ids
+            ).fetchall()
+        except sqlite3.Error as e:
+            logger.error(f"SQLite error loading unverified files page: {str(e)}")
+            rows = []
+        finally:
+            conn.close()
+        by_id = {row['verification_id']: _unverified_row_to_dict(row) for row in rows}
+        for verification_id in page_ids:
+            if verification_id in by_id:
+                yield by_id[verification_id]
+
 @retry_on_db_lock()
 def mark_file_as_verified(verification_id: int) -> bool:
     """
@@ -430,6 +545,134 @@ def mark_verification_as_max_attempts_failed(verification_id: int, reason: str)
         if conn: 
             conn.close()
 
+def _run_verification_batch(name: str, statements: Sequence[Tuple[str, Sequence[Any], bool]]) -> int:
+    """
+    Run (sql, params, counted) statements in one transaction.
+    Returns the summed rowcount of the statements flagged as counted.
+    """
+    conn = get_db_connection()
+    try:
+        updated = 0
+        for sql, params, counted in statements:
+            cursor = conn.execute(sql, params)
+            if counted:
+                updated += cursor.rowcount
+        conn.commit()
+        return updated
+    except sqlite3.OperationalError as e:
+        logger.debug(f"OperationalError in {name}: {e}. Handing over to retry_on_db_lock.")
+        try:
+            conn.rollback()
+        except Exception as rb_ex:
+            logger.error(f"Rollback failed after OperationalError in {name}: {rb_ex}")
+        raise
+    except sqlite3.Error as e:
+        logger.error(f"SQLite error in {name}: {str(e)}")
+        try:
+            conn.rollback()
+        except Exception as rb_ex:
+            logger.error(f"Rollback failed after sqlite3.Error in {name}: {rb_ex}")
+        return 0
+    finally:
+        conn.close()
+
+@retry_on_db_lock()
+def mark_verified_many(verification_ids: Sequence[int]) -> int:
+    """
+    Mark files as verified (and their media items as plex_verified) in one transaction.
+
+    Returns:
+        int: Number of verification records updated
+    """
+    now = datetime.now()
+    statements = []
+    for chunk in _id_chunks(verification_ids):
+        placeholders = ','.join('?' * len(chunk))
+        statements.append((f"""
+            UPDATE symlinked_files_verification
+            SET verified = TRUE,
+                verified_at = ?,
+                verification_attempts = verification_attempts + 1,
+                last_attempt = ?
+            WHERE id IN ({placeholders})
+        """, [now, now, *chunk], True))
+        statements.append((f"""
+            UPDATE media_items
+            SET plex_verified = TRUE
+            WHERE id IN (SELECT media_item_id FROM symlinked_files_verification WHERE id IN ({placeholders}))
+        """, chunk, False))
+    total = _run_verification_batch('mark_verified_many', statements) if statements else 0
+    if total:
+        logger.info(f"Marked {total} files as verified")
+    return total
+
+@retry_on_db_lock()
+def record_attempts_many(verification_ids: Sequence[int]) -> int:
+    """
+    Count one more verification attempt for each file in one transaction.
+
+    Returns:
+        int: Number of verification records updated
+    """
+    now = datetime.now()
+    statements = []
+    for chunk in _id_chunks(verification_ids):
+        placeholders = ','.join('?' * len(chunk))
+        statements.append((f"""
+            UPDATE symlinked_files_verification
+            SET verification_attempts = verification_attempts + 1,
+                last_attempt = ?
+            WHERE id IN ({placeholders})
+        """, [now, *chunk], True))
+    total = _run_verification_batch('record_attempts_many', statements) if statements else 0
+    if total:
+        logger.info(f"Updated verification attempts for {total} files")
+    return total
+
+@retry_on_db_lock()
+def mark_failed_many(failures: Sequence[Tuple[int, str]]) -> int:
+    """
+    Mark files as permanently failed, each with its own reason, in one transaction.
+    Does not change the associated media items' state.
+
+    Returns:
+        int: Number of verification records updated
+    """
+    if not failures:
+        return 0
+    now = datetime.now()
+    conn = get_db_connection()
+    try:
+        cursor = conn.executemany(
+            """
+            UPDATE symlinked_files_verification
+            SET permanently_failed = TRUE,
+                failure_reason = ?,
+                last_attempt = ?
+            WHERE id = ?
+            """,
+            [(reason, now, verification_id) for verification_id, reason in failures]
+        )
+        conn.commit()
+        logger.info(f"Marked {cursor.rowcount} verification records as permanently failed. Associated media item states NOT changed.")
+        return cursor.rowcount
+    except sqlite3.OperationalError as e:
+        logger.debug(f"OperationalError in mark_failed_many: {e}. Handing over to retry_on_db_lock.")
+        try:
+            conn.rollback()
+        except Exception as rb_ex:
+            logger.error(f"Rollback failed after OperationalError in mark_failed_many: {rb_ex}")
+        raise
+    except sqlite3.Error as e:
+        logger.error(f"SQLite error marking verification records as permanently failed: {str(e)}")
+        try:
+            conn.rollback()
+        except Exception as rb_ex:
+            logger.error(f"Rollback failed after sqlite3.Error in mark_failed_many: {rb_ex}")
+        return 0
+    finally:
+        conn.close()
+
 @retry_on_db_lock()
 def get_verification_stats() -> Dict[str, int]:
     """
@@ -580,7 +823,8 @@ def get_recent_unverified_files(hours: int = 24, limit: int = 100) -> List[Dict[
                 m.episode_title,
                 m.season_number,
                 m.episode_number,
-                m.type
+                m.type,
+                m.location_on_disk
             FROM symlinked_files_verification v
             JOIN media_items m ON v.media_item_id = m.id
             WHERE v.verified = FALSE 
@@ -592,25 +836,7 @@ def get_recent_unverified_files(hours: int = 24, limit: int = 100) -> List[Dict[
             (cutoff_time, limit)
         )
         
-        results = []
-        for row in cursor.fetchall():
-            results.append({
-                'verification_id': row['verification_id'],
-                'media_item_id': row['media_item_id'],
-                'filename': row['filename'],
-                'full_path': row['full_path'],
-                'added_at': row['added_at'],
-                'verification_attempts': row['verification_attempts'],
-                'last_attempt': row['last_attempt'],
-                'item_id': row['item_id'],
-                'title': row['title'],
-                'episode_title': row['episode_title'],
-                'season_number': row['season_number'],
-                'episode_number': row['episode_number'],
-                'type': row['type']
-            })
-        
-        return results
+        return [_unverified_row_to_dict(row) for row in cursor.fetchall()]
     except sqlite3.OperationalError as e:
         logger.debug(f"OperationalError in get_recent_unverified_files: {e}. Handing over to retry_on_db_lock.")
         try:
@@ -688,6 +914,7 @@ def migrate_verification_database() -> bool:
 
 # Run migration when module is imported
 migrate_verification_database()
+create_verification_indexes()
 
 # --- Plex Removal Verification Queue ---
 
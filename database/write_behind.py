@@ -0,0 +1,303 @@
+"""
+Optional write-behind buffer for small media_items updates.
+
+Wake counts, blacklisted dates and generic field updates from
+`update_media_item` each used to open a connection, run one UPDATE and commit.
+That is one WAL commit per call. When `Debug.media_item_write_behind` is
+enabled, these updates are collected per item instead:
+
+- Later values for the same column replace earlier ones.
+- The pending rows are written together in one transaction every
+  `media_item_write_behind_interval_ms`, or as soon as MAX_PENDING_ITEMS items
+  are waiting.
+
+Read-your-writes:
+
+- `get_media_item_by_id` and `get_wake_count` overlay the pending values on
+  what they read. A batch being flushed stays in the overlay until its
+  transaction commits.
+- `increment_wake_count` reads and buffers the new count under the buffer
+  lock, so concurrent increments are not lost.
+- Writes that bypass the buffer (`update_media_item` with state,
+  `update_media_item_torrent_id`, ...) first discard the pending values of the
+  columns they write, so an older buffered value can't overwrite them later.
+- `update_media_item_state` takes the pending values of its item and writes
+  them in its own UPDATE, so a buffered change is never older than the state
+  change that follows it.
+- State changes themselves are never buffered, so queries that filter on
+  state stay exact. Queries that filter on a buffered column can be one flush
+  interval behind.
+
+The buffer is flushed synchronously when the program stops and at interpreter
+exit.
+"""
+
+import atexit
+import logging
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from .core import get_db_connection
+
+DEFAULT_FLUSH_INTERVAL_MS = 250
+MAX_PENDING_ITEMS = 200
+# Columns that are never buffered because queue queries select on them
+UNBUFFERED_COLUMNS = {'state'}
+
+
+class MediaItemWriteBuffer:
+    """Coalesces per-item media_items column updates and writes them in one transaction."""
+
+    def __init__(self, flush_interval_ms: int = DEFAULT_FLUSH_INTERVAL_MS, max_pending_items: int = MAX_PENDING_ITEMS):
+        self.flush_interval = max(flush_interval_ms, 10) / 1000
+        self.max_pending_items = max_pending_items
+        self._pending: Dict[int, Dict[str, Any]] = {}
+        # The batch a flush is writing, visible to readers until it commits
+        self._inflight: Dict[int, Dict[str, Any]] = {}
+        self._lock = threading.RLock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.stats = {'buffered': 0, 'flushes': 0, 'rows_written': 0}
+
+    def start(self):
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, name='MediaItemWriteBehind', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stop the flush thread and write everything still pending."""
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=5)
+        self.flush()
+
+    def _run(self):
+        while not self._stopped.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logging.error(f"Error flushing buffered media item writes: {e}", exc_info=True)
+
+    def update(self, item_id: int, **fields):
+        """Buffer column updates for an item. last_updated is set to the time of the call."""
+        with self._lock:
+            pending = self._pending.setdefault(item_id, {})
+            pending.update(fields)
+            pending['last_updated'] = datetime.now()
+            self.stats['buffered'] += 1
+            if len(self._pending) >= self.max_pending_items:
+                self._wakeup.set()
+
+    def pending_fields(self, item_id: int) -> Dict[str, Any]:
+        """Values buffered for an item but not yet committed."""
+        with self._lock:
+            fields = dict(self._inflight.get(item_id, {}))
+            fields.update(self._pending.get(item_id, {}))
+            return fields
+
+    def increment(self, item_id: int, column: str, read_current) -> int:
+        """
+        Buffer column + 1 and return it. `read_current()` supplies the stored value when
+        nothing is buffered; it runs under the buffer lock so no flush commits in between.
+        """
+        with self._lock:
+            current = self.pending_fields(item_id).get(column)
+            if current is None:
+                current = read_current() or 0
+            self.update(item_id, **{column: current + 1})
+            return current + 1
+
+    def discard(self, item_id: int, columns) -> None:
+        """
+        Drop buffered values of `columns` before the caller writes them directly.
+        Waits for a flush in progress so its older values can't land after the caller's write.
+        """
+        with self._flush_lock, self._lock:
+            pending = self._pending.get(item_id)
+            if not pending:
+                return
+            for column in columns:
+                pending.pop(column, None)
+            if set(pending) <= {'last_updated'}:
+                del self._pending[item_id]
+
+    def take(self, item_id: int) -> Dict[str, Any]:
+        """
+        Remove and return an item's buffered values, for a caller that writes them itself.
+        Waits for a flush in progress so an older batch can't land after the caller's write.
+        """
+        with self._flush_lock, self._lock:
+            return self._pending.pop(item_id, {})
+
+    def restore(self, item_id: int, fields: Dict[str, Any]):
+        """Put values back after a failed write, without overriding newer buffered values."""
+        if not fields:
+            return
+        with self._lock:
+            pending = self._pending.setdefault(item_id, {})
+            for column, value in fields.items():
+                pending.setdefault(column, value)
+
+    def flush(self) -> int:
+        """Write all pending updates in one transaction. Returns the number of items written."""
+        with self._flush_lock:
+            with self._lock:
+                if not self._pending:
+                    return 0
+                batch, self._pending = self._pending, {}
+                self._inflight = batch
+
+            # Group items updating the same set of columns into one executemany
+            groups: Dict[tuple, list] = {}
+            for item_id, fields in batch.items():
+                columns = tuple(sorted(fields))
+                groups.setdefault(columns, []).append([fields[column] for column in columns] + [item_id])
+
+            conn = get_db_connection()
+            try:
+                for columns, rows in groups.items():
+                    set_clause = ', '.join(f"{column} = ?" for column in columns)
+                    conn.executemany(f"UPDATE media_items SET {set_clause} WHERE id = ?", rows)
+                conn.commit()
+            except sqlite3.Error as e:
+                logging.warning(f"Could not flush {len(batch)} buffered media item updates, will retry: {e}")
+                try:
+                    conn.rollback()
+                except Exception as rb_ex:
+                    logging.error(f"Rollback failed while flushing buffered media item updates: {rb_ex}")
+                with self._lock:
+                    for item_id, fields in batch.items():
+                        self.restore(item_id, fields)
+                    self._inflight = {}
+                return 0
+            finally:
+                conn.close()
+
+            with self._lock:
+                self._inflight = {}
+
+            self.stats['flushes'] += 1
+            self.stats['rows_written'] += len(batch)
+            logging.debug(f"Flushed buffered updates for {len(batch)} media items")
+            return len(batch)
+
+
+_buffer: Optional[MediaItemWriteBuffer] = None
+_buffer_lock = threading.Lock()
+_settings_checked_at = 0.0
+SETTINGS_RECHECK_SECONDS = 30
+
+
+def get_write_buffer() -> Optional[MediaItemWriteBuffer]:
+    """The shared write buffer, or None when write-behind is disabled."""
+    global _buffer, _settings_checked_at
+    now = time.time()
+    if now - _settings_checked_at < SETTINGS_RECHECK_SECONDS:
+        return _buffer
+    with _buffer_lock:
+        _settings_checked_at = now
+        from utilities.settings import get_setting
+        enabled = get_setting('Debug', 'media_item_write_behind', False)
+        if enabled and _buffer is None:
+            try:
+                interval_ms = int(get_setting('Debug', 'media_item_write_behind_interval_ms', DEFAULT_FLUSH_INTERVAL_MS))
+            except (TypeError, ValueError):
+                interval_ms = DEFAULT_FLUSH_INTERVAL_MS
+            _buffer = MediaItemWriteBuffer(flush_interval_ms=interval_ms)
+            _buffer.start()
+            logging.info(f"Media item write-behind enabled (flush every {interval_ms} ms)")
+        elif not enabled and _buffer is not None:
+            _buffer.stop()
+            _buffer = None
+            logging.info("Media item write-behind disabled")
+        return _buffer
+
+
+def buffer_media_item_update(item_id: int, **fields) -> bool:
+    """Buffer an update if write-behind is enabled and no column is unbufferable. Returns False otherwise."""
+    if UNBUFFERED_COLUMNS.intersection(fields):
+        return False
+    buffer = get_write_buffer()
+    if buffer is None:
+        return False
+    buffer.update(item_id, **fields)
+    return True
+
+
+def pending_media_item_fields(item_id: int) -> Dict[str, Any]:
+    """Buffered, not yet written values of an item (empty when write-behind is off)."""
+    buffer = _buffer
+    return buffer.pending_fields(item_id) if buffer is not None else {}
+
+
+def read_with_pending_fields(item_id: int, read):
+    """
+    Run `read()` (a row dict or None) and overlay the item's buffered values.
+
+    The overlay is taken before and after the read: a value a concurrent flush
+    committed after the read started is then still applied.
+    """
+    buffer = _buffer
+    if buffer is None:
+        return read()
+    before = buffer.pending_fields(item_id)
+    row = read()
+    if row is not None:
+        row.update(before)
+        row.update(buffer.pending_fields(item_id))
+    return row
+
+
+def increment_pending_media_item_field(item_id: int, column: str, read_current) -> Optional[int]:
+    """Buffer column + 1 atomically. Returns the new value, or None when write-behind is off."""
+    buffer = get_write_buffer()
+    return buffer.increment(item_id, column, read_current) if buffer is not None else None
+
+
+def discard_pending_media_item_fields(item_id: int, columns) -> None:
+    """Forget buffered values of `columns` for an item about to be written directly."""
+    buffer = _buffer
+    if buffer is not None:
+        buffer.discard(item_id, columns)
+
+
+def take_pending_media_item_fields(item_id: int) -> Dict[str, Any]:
+    buffer = _buffer
+    return buffer.take(item_id) if buffer is not None else {}
+
+
+def restore_pending_media_item_fields(item_id: int, fields: Dict[str, Any]):
+    buffer = _buffer
+    if buffer is not None:
+        buffer.restore(item_id, fields)
+
+
+def flush_media_item_writes() -> int:
+    """Write all buffered media item updates now."""
+    buffer = _buffer
+    return buffer.flush() if buffer is not None else 0
+
+
+def stop_media_item_write_buffer():
+    """Flush synchronously and stop the flush thread (used on program stop)."""
+    global _buffer, _settings_checked_at
+    with _buffer_lock:
+        buffer, _buffer = _buffer, None
+        # Re-read the setting on the next write so a restarted program can buffer again
+        _settings_checked_at = 0.0
+    if buffer is not None:
+        buffer.stop()
+
+
+atexit.register(stop_media_item_write_buffer)
@@ -10,6 +10,7 @@ from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_excep
 from ..base import ProviderUnavailableError, RateLimitError
 from .exceptions import RealDebridAPIError, RealDebridAuthError
 from utilities.settings import get_setting
+from utilities.metrics import DEBRID_REQUEST_SECONDS, DEBRID_REQUEST_ERRORS
 from routes.api_tracker import api
 import asyncio
 
@@ -52,6 +53,11 @@ def should_retry_error(exception: Exception) -> bool:
         return exception.response.status_code in [503, 504]  # Service Unavailable, Gateway Timeout
     return isinstance(exception, (api.exceptions.Timeout, api.exceptions.ConnectionError))
 
+def _endpoint_label(endpoint: str) -> str:
+    """Endpoint without IDs (e.g. /torrents/info/ABC -> /torrents/info), for metric labels."""
+    segments = [segment for segment in endpoint.split('?')[0].split('/') if segment]
+    return '/' + '/'.join(segments[:2])
+
 @retry(
     stop=stop_after_attempt(3),
     wait=wait_exponential(multiplier=1, min=4, max=10),
@@ -97,20 +103,23 @@ def make_request(
     # Apply rate limiting
     _wait_for_rate_limit()
     
+    endpoint_label = _endpoint_label(endpoint)
     try:
-        if method.upper() == 'GET':
-            response = api.get(url, **kwargs)
-        elif method.upper() == 'POST':
-            response = api.post(url, data=data, files=files, **kwargs)
-        elif method.upper() == 'PUT':
-            response = api.put(url, data=data, files=files, **kwargs)
-        elif method.upper() == 'DELETE':
-            response = api.delete(url, **kwargs)
-        else:
-            raise ValueError(f"Unsupported HTTP method: {method}")
+        with DEBRID_REQUEST_SECONDS.time(provider='real_debrid', endpoint=endpoint_label, method=method.upper()):
+            if method.upper() == 'GET':
+                response = api.get(url, **kwargs)
+            elif method.upper() == 'POST':
+                response = api.post(url, data=data, files=files, **kwargs)
+            elif method.upper() == 'PUT':
+                response = api.put(url, data=data, files=files, **kwargs)
+            elif method.upper() == 'DELETE':
+                response = api.delete(url, **kwargs)
+            else:
+                raise ValueError(f"Unsupported HTTP method: {method}")
             
         # Handle HTTP errors
         if response.status_code >= 400:
+            DEBRID_REQUEST_ERRORS.inc(provider='real_debrid', endpoint=endpoint_label, status=response.status_code)
             if response.status_code == 401:
                 raise RealDebridAuthError("Invalid API key")
             elif response.status_code == 403:
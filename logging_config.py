@@ -5,37 +5,29 @@ import psutil
 import os
 import time
 import threading
-import cProfile
-import pstats
 import io
 import json
 import re
+import queue
+import atexit
 from datetime import datetime
 from queues.performance_monitor import monitor, start_performance_monitoring
 
-# Global profiler
-global_profiler = cProfile.Profile()
-
 def start_global_profiling():
-    global global_profiler
+    """Start the sampling profiler at startup if Debug.enable_sampling_profiler is set."""
     try:
-        # First try to disable any existing profiler
-        try:
-            global_profiler.disable()
-        except:
-            pass
-        # Create a new profiler instance
-        global_profiler = cProfile.Profile()
-        global_profiler.enable()
+        if get_setting('Debug', 'enable_sampling_profiler', False):
+            from utilities.sampling_profiler import start_profiler
+            start_profiler()
     except Exception as e:
         logging.warning(f"Failed to start profiling: {str(e)}")
         # Continue without profiling if it fails
         pass
 
 def stop_global_profiling():
-    global global_profiler
     try:
-        global_profiler.disable()
+        from utilities.sampling_profiler import stop_profiler
+        stop_profiler()
     except Exception as e:
         logging.warning(f"Failed to stop profiling: {str(e)}")
 
@@ -185,14 +177,161 @@ class JSONFormatter(logging.Formatter):
             
         return json.dumps(log_record)
 
-def setup_debug_logging(log_dir):
+# --- Asynchronous logging pipeline ---
+# Counters for records that never reached a handler
+_log_stats = {'dropped': 0, 'suppressed': 0}
+_log_stats_lock = threading.Lock()
+_queue_handler = None
+_queue_listener = None
+
+def _count_log_stat(key):
+    with _log_stats_lock:
+        _log_stats[key] += 1
+
+class RateLimitFilter(logging.Filter):
+    """
+    Lets at most `burst` records per call site (logger, file, line) through in
+    each `window` seconds. WARNING and above always pass. The first record of
+    the next window notes how many were suppressed.
+    """
+    def __init__(self, burst, window=10.0):
+        super().__init__()
+        self.burst = burst
+        self.window = window
+        self._sites = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        if self.burst <= 0 or record.levelno >= logging.WARNING:
+            return True
+        key = (record.name, record.pathname, record.lineno)
+        with self._lock:
+            site = self._sites.get(key)
+            if site is None or record.created - site[0] >= self.window:
+                suppressed = site[2] if site else 0
+                self._sites[key] = [record.created, 1, 0]
+                if suppressed and isinstance(record.msg, str):
+                    record.msg = f"{record.msg} [{suppressed} similar messages suppressed]"
+                return True
+            if site[1] < self.burst:
+                site[1] += 1
+                return True
+            site[2] += 1
+        _count_log_stat('suppressed')
+        return False
+
+class AsyncQueueHandler(logging.handlers.QueueHandler):
+    """
+    Hands records to the logging thread without blocking. When the queue is
+    full, records below WARNING are dropped and counted; WARNING and above
+    wait briefly for room.
+    """
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            if record.levelno >= logging.WARNING:
+                try:
+                    self.queue.put(record, timeout=1)
+                    return
+                except queue.Full:
+                    pass
+            _count_log_stat('dropped')
+
+class GroupCommitRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """Rotating file handler that only flushes when the listener commits a batch."""
+    def flush(self):
+        pass
+
+    def commit(self):
+        super().flush()
+
+class BatchingQueueListener(logging.handlers.QueueListener):
+    """
+    Writes every record already waiting in the queue before flushing the
+    handlers once (group commit), instead of flushing after each record.
+    """
+    def __init__(self, log_queue, *handlers, max_batch=500):
+        super().__init__(log_queue, *handlers, respect_handler_level=True)
+        self.max_batch = max_batch
+
+    def _monitor(self):
+        q = self.queue
+        has_task_done = hasattr(q, 'task_done')
+        while True:
+            batch = [self.dequeue(True)]
+            while len(batch) < self.max_batch:
+                try:
+                    batch.append(self.dequeue(False))
+                except queue.Empty:
+                    break
+            stopping = False
+            for record in batch:
+                if record is self._sentinel:
+                    stopping = True
+                else:
+                    self.handle(record)
+                if has_task_done:
+                    q.task_done()
+            self.commit()
+            if stopping:
+                break
+
+    def commit(self):
+        for handler in self.handlers:
+            try:
+                getattr(handler, 'commit', handler.flush)()
+            except Exception:
+                pass
+
+def start_async_logging(queue_size=10000, rate_limit_burst=100):
+    """Move the root logger's handlers behind a QueueHandler served by a background listener."""
+    global _queue_handler, _queue_listener
+    stop_async_logging()
+    root_logger = logging.getLogger()
+    handlers = list(root_logger.handlers)
+    log_queue = queue.Queue(maxsize=max(queue_size, 100))
+    _queue_handler = AsyncQueueHandler(log_queue)
+    _queue_handler.addFilter(RateLimitFilter(rate_limit_burst))
+    _queue_listener = BatchingQueueListener(log_queue, *handlers)
+    root_logger.handlers = [_queue_handler]
+    _queue_listener.start()
+
+def stop_async_logging():
+    """Write out everything queued and put the handlers back on the root logger."""
+    global _queue_handler, _queue_listener
+    listener, handler = _queue_listener, _queue_handler
+    _queue_listener = _queue_handler = None
+    if listener is None:
+        return
+    root_logger = logging.getLogger()
+    if handler in root_logger.handlers:
+        root_logger.removeHandler(handler)
+    listener.stop()
+    for target in listener.handlers:
+        root_logger.addHandler(target)
+
+def get_logging_stats():
+    """Counters of the asynchronous logging pipeline."""
+    handler = _queue_handler
+    with _log_stats_lock:
+        stats = dict(_log_stats)
+    stats['async'] = handler is not None
+    stats['queued'] = handler.queue.qsize() if handler is not None else 0
+    return stats
+
+atexit.register(stop_async_logging)
+
+def setup_debug_logging(log_dir, group_commit=False):
     # Debug file handler with immediate flush
     class ImmediateRotatingFileHandler(logging.handlers.RotatingFileHandler):
         def emit(self, record):
             super().emit(record)
             self.flush()  # Force immediate flush
-            
-    debug_handler = ImmediateRotatingFileHandler(
+
+    # With the async pipeline the listener flushes once per batch instead
+    handler_class = GroupCommitRotatingFileHandler if group_commit else ImmediateRotatingFileHandler
+    debug_handler = handler_class(
         os.path.join(log_dir, 'debug.log'), 
         maxBytes=50*1024*1024, 
         backupCount=5, 
@@ -295,20 +434,31 @@ def setup_logging():
     if not os.path.exists(log_dir):
         os.makedirs(log_dir)
     
-    # Configure root logger
+    # Configure root logger at the configured level so records no handler
+    # would write are discarded before a LogRecord is built
     root_logger = logging.getLogger()
-    root_logger.setLevel(logging.DEBUG)  # Set to DEBUG to see all debug messages
+    console_level = get_setting("Debug", "logging_level", "INFO")
+    root_logger.setLevel(getattr(logging, console_level.upper()))
     
     # Clear any existing handlers
+    stop_async_logging()
     root_logger.handlers.clear()
     
     # Configure handlers
-    setup_debug_logging(log_dir)
+    async_logging = get_setting("Debug", "async_logging", True)
+    setup_debug_logging(log_dir, group_commit=async_logging)
     setup_info_logging(log_dir)
     setup_error_logging(log_dir)
     setup_queue_logging(log_dir)
     setup_performance_logging(log_dir)
     setup_item_tracker_logging(log_dir)
+
+    # Write debug.log and the console from a background thread
+    if async_logging:
+        start_async_logging(
+            queue_size=int(get_setting("Debug", "log_queue_size", 10000)),
+            rate_limit_burst=int(get_setting("Debug", "log_rate_limit_burst", 100))
+        )
     
     # Start performance monitoring after logging is set up
     start_performance_monitoring()
@@ -451,12 +451,13 @@ def _get_local_timezone():
     logging.warning("All timezone detection methods failed, falling back to UTC")
     return timezone.utc
 
-def get_physical_release_date(imdb_id: Optional[str] = None) -> Optional[str]:
-    """Get the earliest physical release date for a movie."""
+def get_physical_release_date(imdb_id: Optional[str] = None, release_dates: Optional[Dict[str, Any]] = None) -> Optional[str]:
+    """Get the earliest physical release date for a movie. Pass `release_dates` if already fetched."""
     if not imdb_id:
         return None
 
-    release_dates, _ = DirectAPI.get_movie_release_dates(imdb_id)
+    if release_dates is None:
+        release_dates, _ = DirectAPI.get_movie_release_dates(imdb_id)
     if not release_dates:
         return None
 
@@ -472,12 +473,13 @@ def get_physical_release_date(imdb_id: Optional[str] = None) -> Optional[str]:
 
     return min(physical_releases).strftime("%Y-%m-%d") if physical_releases else None
 
-def get_theatrical_release_date(imdb_id: Optional[str] = None) -> Optional[str]:
-    """Get the oldest theatrical release date for a movie."""
+def get_theatrical_release_date(imdb_id: Optional[str] = None, release_dates: Optional[Dict[str, Any]] = None) -> Optional[str]:
+    """Get the oldest theatrical release date for a movie. Pass `release_dates` if already fetched."""
     if not imdb_id:
         return None
 
-    release_dates, _ = DirectAPI.get_movie_release_dates(imdb_id)
+    if release_dates is None:
+        release_dates, _ = DirectAPI.get_movie_release_dates(imdb_id)
     if not release_dates:
         return None
 
@@ -953,7 +955,7 @@ def process_metadata(media_items: List[Dict[str, Any]]) -> Dict[str, List[Dict[s
     logging.debug(f"Finished processing. Prepared {len(processed_items['movies'])} movies and {len(processed_items['episodes'])} episodes for database operations.")
     return processed_items
 
-def get_release_date(media_details: Dict[str, Any], imdb_id: Optional[str] = None) -> str:
+def get_release_date(media_details: Dict[str, Any], imdb_id: Optional[str] = None, release_dates: Optional[Dict[str, Any]] = None) -> str:
     if not media_details:
         logging.warning("No media details provided for release date")
         return 'Unknown'
@@ -962,7 +964,8 @@ def get_release_date(media_details: Dict[str, Any], imdb_id: Optional[str] = Non
         logging.warning("Attempted to get release date with None IMDB ID")
         return media_details.get('released', 'Unknown')
 
-    release_dates, _ = DirectAPI.get_movie_release_dates(imdb_id)
+    if release_dates is None:
+        release_dates, _ = DirectAPI.get_movie_release_dates(imdb_id)
     logging.debug(f"Processing release dates for IMDb ID: {imdb_id}")
 
     if not release_dates:
@@ -1065,244 +1068,261 @@ def get_imdb_id_if_missing(item: Dict[str, Any]) -> Optional[str]:
     imdb_id, _ = DirectAPI.tmdb_to_imdb(str(tmdb_id), media_type=api_media_type)
     return imdb_id
 
-def refresh_release_dates():
-    from database import get_all_media_items, update_release_date_and_state
+REFRESH_RELEASE_DATE_STATES = ["Unreleased", "Wanted", "Sleeping", "Final_Check", "Scraping"]
+
+# Titles fetched and written per batch by refresh_release_dates
+RELEASE_DATE_REFRESH_CHUNK_SIZE = 50
+
+def _get_titles_metadata(imdb_ids: List[str], media_type: str) -> Dict[str, Optional[Dict[str, Any]]]:
+    """
+    Metadata for many titles: one bulk read from the metadata battery, with a
+    per-title fetch only for titles that are missing there or stale.
+    """
+    from cli_battery.app.metadata_manager import MetadataManager
+
+    if not imdb_ids:
+        return {}
+    if media_type == 'movie':
+        bulk_metadata = DirectAPI.get_bulk_movie_metadata(imdb_ids)
+        fetch_single = DirectAPI.get_movie_metadata
+    else:
+        bulk_metadata = DirectAPI.get_bulk_show_metadata(imdb_ids)
+        fetch_single = DirectAPI.get_show_metadata
+
+    titles_metadata = {}
+    for imdb_id in imdb_ids:
+        metadata = bulk_metadata.get(imdb_id)
+        if not metadata or MetadataManager.is_metadata_stale(metadata.get('item_updated_at')):
+            # Missing or stale in the battery: the single-title call fetches and stores fresh metadata
+            metadata, _ = fetch_single(imdb_id)
+        titles_metadata[imdb_id] = metadata
+    return titles_metadata
+
+def _is_in_trakt_early_release_list(title: str, imdb_id: str) -> bool:
     import content_checkers.trakt as trakt
-    logging.info("Starting refresh_release_dates function")
-    
-    logging.info("Fetching items to refresh")
-    items_to_refresh = list(get_all_media_items(state="Unreleased")) \
-                     + list(get_all_media_items(state="Wanted")) \
-                     + list(get_all_media_items(state="Sleeping")) \
-                     + list(get_all_media_items(state="Final_Check")) \
-                     + list(get_all_media_items(state="Scraping"))
-    logging.info(f"Found {len(items_to_refresh)} items to refresh")
-
-    for index, item in enumerate(items_to_refresh, 1):
-        try:
-            item_dict = dict(item)
-            title = item_dict.get('title', 'Unknown Title')
-            media_type = item_dict.get('type', 'Unknown Type').lower()
-            imdb_id = item_dict.get('imdb_id')
-            season_number = item_dict.get('season_number')
-            episode_number = item_dict.get('episode_number')
-            db_item_id = item_dict.get('id')
-
-            existing_release_date = item_dict.get('release_date')
-            def is_valid_date_str(date_str):
-                if not date_str or str(date_str).lower() in ['unknown', 'none']: return False
-                try: datetime.strptime(str(date_str), '%Y-%m-%d'); return True
-                except (ValueError, TypeError): return False
-
-            logging.info(f"Processing item {index}/{len(items_to_refresh)}: {title} ({media_type}) - IMDb ID: {imdb_id}, DB ID: {db_item_id}")
-
-            if not imdb_id:
-                logging.warning(f"Skipping item {index} (DB ID: {db_item_id}) due to missing imdb_id")
-                continue
 
-            new_release_date = None
-            new_physical_release_date = None
-            new_theatrical_release_date = None
-            new_airtime = None
+    logging.info(f"Checking Trakt for early releases for {title} ({imdb_id})")
+    trakt_id = trakt.fetch_items_from_trakt(f"/search/imdb/{imdb_id}")
+    if not (trakt_id and isinstance(trakt_id, list) and len(trakt_id) > 0):
+        logging.info(f"No Trakt ID found for {imdb_id} via search, cannot check early release lists.")
+        return False
+    for result in trakt_id:
+        if result.get('type') == 'movie':
+            trakt_movie_data = result.get('movie')
+            if trakt_movie_data and trakt_movie_data.get('ids') and trakt_movie_data['ids'].get('trakt'):
+                trakt_id_num = str(trakt_movie_data['ids']['trakt'])
+                logging.debug(f"Found Trakt movie ID {trakt_id_num} for {imdb_id}")
+                trakt_lists = trakt.fetch_items_from_trakt(f"/movies/{trakt_id_num}/lists/personal/popular")
+                if trakt_lists:
+                    for trakt_list in trakt_lists:
+                        if re.search(r'(latest|new).*?(releases)', trakt_list['name'], re.IGNORECASE):
+                            logging.info(f"Movie {title} ({imdb_id}) found in early release list: {trakt_list['name']}")
+                            return True
+            else:
+                logging.warning(f"Trakt search result for {imdb_id} did not contain expected movie ID structure: {result}")
+    logging.info(f"Did not find {title} ({imdb_id}) in any relevant Trakt early release lists.")
+    return False
+
+def _movie_release_updates(imdb_id: str, items: List[Dict[str, Any]], metadata: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Compute release date/state updates for all items (versions) of one movie."""
+    title = items[0].get('title', 'Unknown Title')
+    if not metadata:
+        logging.warning(f"No metadata found for movie {title} ({imdb_id})")
+        new_release_date = 'Unknown'
+        new_physical_release_date = None
+        new_theatrical_release_date = None
+    else:
+        # One release dates fetch serves all three lookups
+        release_dates, _ = DirectAPI.get_movie_release_dates(imdb_id)
+        fetched_release_date = get_release_date(metadata, imdb_id, release_dates=release_dates or {})
+        new_physical_release_date = get_physical_release_date(imdb_id, release_dates=release_dates or {})
+        new_theatrical_release_date = get_theatrical_release_date(imdb_id, release_dates=release_dates or {})
+        logging.debug(f"{title} ({imdb_id}): physical release date {new_physical_release_date}, theatrical release date {new_theatrical_release_date}")
+        if fetched_release_date == 'Unknown':
+            logging.warning(f"Fetched release date was 'Unknown' for {title} ({imdb_id}), replacing any existing release date with 'Unknown'")
+        new_release_date = fetched_release_date
+
+    trakt_early_releases = get_setting('Scraping', 'trakt_early_releases', False)
+    trakt_early_release = None  # Looked up at most once per movie
+    today = datetime.now().date()
+    updates = []
+    for item_dict in items:
+        early_release_original = item_dict.get('early_release', False)
+        early_release = early_release_original
+        if trakt_early_releases and not item_dict.get('no_early_release', False):
+            if trakt_early_release is None:
+                trakt_early_release = _is_in_trakt_early_release_list(title, imdb_id)
+            early_release = early_release or trakt_early_release
+
+        new_state = item_dict['state']
+        if early_release:
+            new_state = "Wanted"
+        elif new_physical_release_date and new_physical_release_date != 'Unknown':
+            try:
+                physical_release_dt = datetime.strptime(new_physical_release_date, "%Y-%m-%d").date()
+                new_state = "Wanted" if physical_release_dt <= today else "Unreleased"
+            except ValueError:
+                logging.warning(f"Invalid physical release date format: {new_physical_release_date}. Setting state to Wanted")
+                new_state = "Wanted"
+        elif new_release_date and new_release_date != 'Unknown':
+            try:
+                release_dt = datetime.strptime(new_release_date, "%Y-%m-%d").date()
+                new_state = "Wanted" if release_dt <= today else "Unreleased"
+            except ValueError:
+                logging.warning(f"Invalid release date format: {new_release_date}. Setting state to Wanted")
+                new_state = "Wanted"
+        else:
+            new_state = "Wanted"
+
+        if (new_state != item_dict['state'] or
+            new_release_date != item_dict.get('release_date') or
+            early_release != early_release_original or
+            item_dict.get('no_early_release', False) or
+            new_physical_release_date != item_dict.get('physical_release_date') or
+            new_theatrical_release_date != item_dict.get('theatrical_release_date')):
+            updates.append({
+                'id': item_dict['id'], 'release_date': new_release_date, 'state': new_state,
+                'early_release': early_release,
+                'physical_release_date': new_physical_release_date,
+                'theatrical_release_date': new_theatrical_release_date,
+                'no_early_release': item_dict.get('no_early_release', False),
+                'previous_state': item_dict['state'],
+            })
+    return updates
+
+def _episode_release_date(metadata: Optional[Dict[str, Any]], imdb_id: str, season_number, episode_number, local_tz) -> str:
+    """Local release date of an episode from its show's metadata, or 'Unknown'."""
+    if not metadata or not isinstance(metadata, dict):
+        return 'Unknown'
+    seasons = metadata.get('seasons', {})
+    if not isinstance(seasons, dict):
+        logging.warning(f"Invalid seasons data for show {imdb_id}")
+        return 'Unknown'
+    season_data = seasons.get(str(season_number)) or seasons.get(season_number) or {}
+    episodes = season_data.get('episodes', {}) if isinstance(season_data, dict) else None
+    if not isinstance(episodes, dict):
+        logging.warning(f"Invalid season data for show {imdb_id} season {season_number}")
+        return 'Unknown'
+    episode_data = episodes.get(episode_number)
+    if episode_data is None:
+        episode_data = episodes.get(str(episode_number))
+    if not episode_data or not isinstance(episode_data, dict):
+        logging.warning(f"No valid data found for {imdb_id} S{season_number}E{episode_number} in fetched metadata.")
+        return 'Unknown'
+    first_aired_str = episode_data.get('first_aired')
+    if not first_aired_str:
+        logging.debug(f"No first_aired date found for {imdb_id} S{season_number}E{episode_number}")
+        return 'Unknown'
+    try:
+        first_aired_dt_obj = iso8601.parse_date(first_aired_str)
+        # If the parsed datetime is naive, assume it's UTC
+        if first_aired_dt_obj.tzinfo is None:
+            first_aired_dt_obj = first_aired_dt_obj.replace(tzinfo=timezone.utc)
+        return first_aired_dt_obj.astimezone(local_tz).strftime("%Y-%m-%d")
+    except (ValueError, iso8601.ParseError) as e:
+        logging.error(f"Invalid datetime format or conversion error: {first_aired_str} - Error: {e}")
+        return 'Unknown'
 
-            if media_type == 'movie':
-                metadata, source = DirectAPI.get_movie_metadata(imdb_id)
-                if not metadata:
-                    logging.warning(f"No metadata found for movie {title} ({imdb_id})")
-                    new_release_date = 'Unknown'
-                    new_physical_release_date = None
-                    new_theatrical_release_date = None
-                else:
-                    logging.info("Getting release date, physical release date, and theatrical release date")
-                    fetched_release_date = get_release_date(metadata, imdb_id)
-                    new_physical_release_date = get_physical_release_date(imdb_id)
-                    new_theatrical_release_date = get_theatrical_release_date(imdb_id)
-                    logging.info(f"Physical release date: {new_physical_release_date}")
-                    logging.info(f"Theatrical release date: {new_theatrical_release_date}")
-
-                    if fetched_release_date == 'Unknown':
-                        new_release_date = 'Unknown'
-                        logging.warning(f"Fetched release date was 'Unknown' for {title} ({imdb_id}), replacing any existing release date with 'Unknown'")
-                    else:
-                        new_release_date = fetched_release_date
-
-                item_dict['early_release_original'] = item_dict.get('early_release', False)
-                item_dict['physical_release_date_original'] = item_dict.get('physical_release_date')
-                item_dict['theatrical_release_date_original'] = item_dict.get('theatrical_release_date')
-                trakt_early_releases = get_setting('Scraping', 'trakt_early_releases', False)
-                skip_early_release_check = item_dict.get('no_early_release', False)
-                if trakt_early_releases and not skip_early_release_check:
-                    logging.info(f"Checking Trakt for early releases for {title} ({imdb_id})")
-                    trakt_id = trakt.fetch_items_from_trakt(f"/search/imdb/{imdb_id}")
-                    if trakt_id and isinstance(trakt_id, list) and len(trakt_id) > 0:
-                        found_movie = False
-                        for result in trakt_id:
-                            if result.get('type') == 'movie':
-                                trakt_movie_data = result.get('movie')
-                                if trakt_movie_data and trakt_movie_data.get('ids') and trakt_movie_data['ids'].get('trakt'):
-                                    trakt_id_num = str(trakt_movie_data['ids']['trakt'])
-                                    logging.debug(f"Found Trakt movie ID {trakt_id_num} for {imdb_id}")
-                                    trakt_lists = trakt.fetch_items_from_trakt(f"/movies/{trakt_id_num}/lists/personal/popular")
-                                    if trakt_lists:
-                                        for trakt_list in trakt_lists:
-                                            if re.search(r'(latest|new).*?(releases)', trakt_list['name'], re.IGNORECASE):
-                                                logging.info(f"Movie {title} ({imdb_id}) found in early release list: {trakt_list['name']}")
-                                                item_dict['early_release'] = True
-                                                found_movie = True
-                                                break
-                                    if found_movie:
-                                        break
-                                else:
-                                     logging.warning(f"Trakt search result for {imdb_id} did not contain expected movie ID structure: {result}")
-                        if not found_movie:
-                             logging.info(f"Did not find {title} ({imdb_id}) in any relevant Trakt early release lists.")
-                    else:
-                        logging.info(f"No Trakt ID found for {imdb_id} via search, cannot check early release lists.")
-                elif skip_early_release_check:
-                    logging.info(f"Skipping Trakt early release check for {title} ({imdb_id}) due to no_early_release flag.")
-                
-                new_state = item_dict['state']
-                today = datetime.now().date()
+def _episode_release_updates(imdb_id: str, items: List[Dict[str, Any]], metadata: Optional[Dict[str, Any]], local_tz) -> List[Dict[str, Any]]:
+    """Compute release date/airtime/state updates for all episodes of one show from a single metadata fetch."""
+    if not metadata or not isinstance(metadata, dict):
+        logging.warning(f"Invalid or missing metadata for show {imdb_id}")
+    today = datetime.now().date()
+    updates = []
+    for item_dict in items:
+        season_number = item_dict.get('season_number')
+        episode_number = item_dict.get('episode_number')
+        new_airtime = get_episode_airtime(imdb_id, season_number, episode_number, metadata=metadata or {}, local_tz=local_tz)
+        new_release_date = _episode_release_date(metadata, imdb_id, season_number, episode_number, local_tz)
+
+        if new_release_date == "Unknown":
+            new_state = "Wanted"
+        else:
+            try:
+                release_date_dt = datetime.strptime(new_release_date, "%Y-%m-%d").date()
                 if item_dict.get('early_release', False):
                     new_state = "Wanted"
-                    logging.info(f"Movie is an early release, setting state to Wanted")
-                elif new_physical_release_date and new_physical_release_date != 'Unknown':
-                    try:
-                        physical_release_dt = datetime.strptime(new_physical_release_date, "%Y-%m-%d").date()
-                        if physical_release_dt <= today:
-                             new_state = "Wanted"
-                             logging.info(f"Physical release date {physical_release_dt} is past, setting state to Wanted")
-                        else:
-                             new_state = "Unreleased"
-                             logging.info(f"Physical release date {physical_release_dt} is in the future, setting state to Unreleased")
-                    except ValueError:
-                         logging.warning(f"Invalid physical release date format: {new_physical_release_date}. Keeping state as {new_state}")
-                         new_state = "Wanted"
-                elif new_release_date and new_release_date != 'Unknown':
-                    try:
-                        release_dt = datetime.strptime(new_release_date, "%Y-%m-%d").date()
-                        if release_dt <= today:
-                            new_state = "Wanted"
-                            logging.info(f"Release date {release_dt} is past, setting state to Wanted")
-                        else:
-                            new_state = "Unreleased"
-                            logging.info(f"Release date {release_dt} is in the future, setting state to Unreleased")
-                    except ValueError:
-                        logging.warning(f"Invalid release date format: {new_release_date}. Keeping state as {new_state}")
-                        new_state = "Wanted"
                 else:
-                    new_state = "Wanted"
-                    logging.info(f"No valid release dates found, setting state to Wanted")
-                
-                new_airtime = None
-
-            elif media_type == 'episode':
-                metadata, source = DirectAPI.get_show_metadata(imdb_id)
-                logging.info(f"Processing metadata for {title} S{season_number}E{episode_number}")
+                    new_state = "Wanted" if release_date_dt <= today else "Unreleased"
+            except ValueError:
+                logging.warning(f"Invalid release date format: {new_release_date}. Setting state to Wanted.")
+                new_state = "Wanted"
+
+        if (new_state != item_dict['state'] or
+            new_release_date != item_dict.get('release_date') or
+            new_airtime != item_dict.get('airtime') or
+            item_dict.get('no_early_release', False)):
+            updates.append({
+                'id': item_dict['id'], 'release_date': new_release_date, 'state': new_state,
+                'airtime': new_airtime,
+                'early_release': item_dict.get('early_release', False),
+                'no_early_release': item_dict.get('no_early_release', False),
+                'previous_state': item_dict['state'],
+            })
+    return updates
 
-                new_airtime = get_episode_airtime(imdb_id, season_number, episode_number)
-                # logging.info(f"New airtime from metadata: {new_airtime}")
+def refresh_release_dates():
+    """
+    Refresh release dates, airtimes and release states of items that are not collected yet.
 
-                if not metadata or not isinstance(metadata, dict):
-                    logging.warning(f"Invalid or missing metadata for show {imdb_id}")
-                    new_release_date = 'Unknown'
-                else:
-                    seasons = metadata.get('seasons', {})
-                    if not isinstance(seasons, dict):
-                        logging.warning(f"Invalid seasons data for show {imdb_id}")
-                        new_release_date = 'Unknown'
-                    else:
-                        season_data = seasons.get(str(season_number)) or seasons.get(season_number) or {}
-                        if not isinstance(season_data, dict):
-                            logging.warning(f"Invalid season data for show {imdb_id} season {season_number}")
-                            new_release_date = 'Unknown'
-                        else:
-                            episodes = season_data.get('episodes', {})
-                            if not isinstance(episodes, dict):
-                                logging.warning(f"Invalid episodes data for show {imdb_id} season {season_number}")
-                                new_release_date = 'Unknown'
-                            else:
-                                season_key_lookup = str(season_number) # This is for the log message
-                                episode_key_lookup_for_log = str(episode_number) # For the log message
-
-                                # Attempt to get episode data using integer key first, then string key as a fallback
-                                episode_data = episodes.get(episode_number) # episode_number is an int
-                                if episode_data is None:
-                                    episode_data = episodes.get(str(episode_number)) # Fallback
-
-                                if not episode_data or not isinstance(episode_data, dict):
-
-                                    logging.warning(f"No valid data found for S{season_number}E{episode_number} in fetched metadata.")
-                                    new_release_date = 'Unknown'
-                                    logging.warning("Episode data lookup failed. Setting release date to 'Unknown'.")
-                                else:
-                                    first_aired_str = episode_data.get('first_aired')
-                                    # logging.info(f"First aired date from metadata: {first_aired_str}")
-                                    if first_aired_str:
-                                        try:
-                                            # Use iso8601 library for robust parsing
-                                            first_aired_dt_obj = iso8601.parse_date(first_aired_str)
-                                            
-                                            # If the parsed datetime is naive, assume it's UTC
-                                            if first_aired_dt_obj.tzinfo is None:
-                                                first_aired_dt_obj = first_aired_dt_obj.replace(tzinfo=timezone.utc)
-                                            
-                                            local_tz = _get_local_timezone()
-                                            local_dt = first_aired_dt_obj.astimezone(local_tz)
-                                            new_release_date = local_dt.strftime("%Y-%m-%d")
-                                            # logging.info(f"Calculated local release date {new_release_date} from original aired string {first_aired_str}")
-                                        except (ValueError, iso8601.ParseError) as e: # Catch iso8601.ParseError as well
-                                            logging.error(f"Invalid datetime format or conversion error: {first_aired_str} - Error: {e}")
-                                            new_release_date = 'Unknown'
-                                    else:
-                                        logging.warning("No first_aired date found in episode data")
-                                        new_release_date = 'Unknown'
+    Items are streamed grouped by imdb_id, metadata is fetched once per title
+    (in bulk from the metadata battery where possible), dates for all of a
+    title's items are computed in memory and each batch of titles is written
+    with a single executemany.
+    """
+    from database import (count_media_items_by_imdb_id, stream_media_items_grouped_by_imdb_id,
+                          update_release_dates_and_states_batch)
+    logging.info("Starting refresh_release_dates function")
 
-                # logging.info(f"New release date: {new_release_date}")
+    total_titles, total_items, items_without_imdb_id = count_media_items_by_imdb_id(REFRESH_RELEASE_DATE_STATES)
+    logging.info(f"Found {total_items} items across {total_titles} titles to refresh")
+    if items_without_imdb_id:
+        logging.warning(f"Skipping {items_without_imdb_id} items without an imdb_id")
 
-                new_state = item_dict['state']
-                if new_release_date == "Unknown" or new_release_date is None:
-                    new_state = "Wanted"
-                    logging.info("Release date is Unknown, setting state to Wanted")
-                else:
-                    try:
-                        release_date_dt = datetime.strptime(new_release_date, "%Y-%m-%d").date()
-                        today = datetime.now().date()
-                        if item_dict.get('early_release', False): new_state = "Wanted"; logging.info(f"Episode marked as early release, setting state to Wanted")
-                        else: new_state = "Wanted" if release_date_dt <= today else "Unreleased"; logging.info(f"Episode release date is {release_date_dt}, today is {today}, setting state to {new_state}")
-                    except ValueError: new_state = "Wanted"; logging.warning(f"Invalid release date format: {new_release_date}. Setting state to Wanted.")
-
-            if (new_state != item_dict['state'] or
-                new_release_date != item_dict.get('release_date') or
-                (media_type == 'episode' and new_airtime != item_dict.get('airtime')) or
-                item_dict.get('early_release', False) != item_dict.get('early_release_original', False) or
-                item_dict.get('no_early_release', False) != item_dict.get('no_early_release_original', False) or
-                (media_type == 'movie' and new_physical_release_date != item_dict.get('physical_release_date_original')) or
-                (media_type == 'movie' and new_theatrical_release_date != item_dict.get('theatrical_release_date_original'))):
-
-                logging.info(f"Changes detected for {title} (DB ID: {db_item_id}). Current state: {item_dict['state']}, New state: {new_state}. Updating database.")
-                item_dict['no_early_release_original'] = item_dict.get('no_early_release', False)
-                update_release_date_and_state(
-                    db_item_id, new_release_date, new_state, airtime=new_airtime,
-                    early_release=item_dict.get('early_release', False),
-                    physical_release_date=new_physical_release_date if media_type == 'movie' else None,
-                    theatrical_release_date=new_theatrical_release_date if media_type == 'movie' else None,
-                    no_early_release=item_dict.get('no_early_release', False)
-                )
-                log_msg = f"Updated DB for ID {db_item_id}: State={new_state}, ReleaseDate={new_release_date}"
-                if media_type == 'movie': 
-                    log_msg += f" and physical release date of: {new_physical_release_date}"
-                    log_msg += f" and theatrical release date of: {new_theatrical_release_date}"
-                if media_type == 'episode': log_msg += f" and airtime of: {new_airtime}"
-                logging.info(log_msg)
-            else:
-                logging.info(f"No changes needed for {title} (DB ID: {db_item_id})")
+    local_tz = _get_local_timezone()
+    start_time = time.time()
+    titles_done = items_done = items_updated = errors = 0
 
+    for chunk in stream_media_items_grouped_by_imdb_id(REFRESH_RELEASE_DATE_STATES, RELEASE_DATE_REFRESH_CHUNK_SIZE):
+        movie_ids = [imdb_id for imdb_id, items in chunk if items[0].get('type', '').lower() == 'movie']
+        show_ids = [imdb_id for imdb_id, items in chunk if items[0].get('type', '').lower() == 'episode']
+        try:
+            titles_metadata = _get_titles_metadata(movie_ids, 'movie')
+            titles_metadata.update(_get_titles_metadata(show_ids, 'show'))
         except Exception as e:
-            logging.error(f"Error processing item {index} (DB ID: {item_dict.get('id', 'N/A')}): {str(e)}", exc_info=True)
-            continue
+            logging.error(f"Error fetching metadata for release date refresh batch: {e}", exc_info=True)
+            titles_metadata = {}
 
-    logging.info("Finished refresh_release_dates function")
+        updates = []
+        for imdb_id, items in chunk:
+            media_type = items[0].get('type', '').lower()
+            try:
+                if media_type == 'movie':
+                    updates.extend(_movie_release_updates(imdb_id, items, titles_metadata.get(imdb_id)))
+                elif media_type == 'episode':
+                    updates.extend(_episode_release_updates(imdb_id, items, titles_metadata.get(imdb_id), local_tz))
+                else:
+                    logging.warning(f"Skipping {len(items)} items of {imdb_id} with unsupported type '{media_type}'")
+            except Exception as e:
+                errors += 1
+                logging.error(f"Error refreshing release dates for {imdb_id}: {str(e)}", exc_info=True)
+            titles_done += 1
+            items_done += len(items)
+
+        if updates:
+            for update in updates:
+                if update['state'] != update['previous_state']:
+                    logging.info(f"Release date refresh: item {update['id']} {update['previous_state']} -> {update['state']} (release date {update['release_date']})")
+            items_updated += update_release_dates_and_states_batch(updates)
+
+        elapsed = max(time.time() - start_time, 0.001)
+        logging.info(f"Release date refresh progress: {titles_done}/{total_titles} titles, {items_done}/{total_items} items "
+                     f"({items_done / elapsed:.1f} items/s), {items_updated} updated")
+
+    elapsed = time.time() - start_time
+    logging.info(f"Finished refresh_release_dates function: {items_done} items across {titles_done} titles in {elapsed:.1f}s, "
+                 f"{items_updated} updated, {errors} titles failed")
+    return {'titles': titles_done, 'items': items_done, 'updated': items_updated, 'errors': errors, 'seconds': round(elapsed, 1)}
 
 def get_episode_count_for_seasons(imdb_id: str, seasons: List[int]) -> int:
     show_metadata, _ = DirectAPI.get_show_metadata(imdb_id)
@@ -1450,12 +1470,19 @@ def get_media_country_code(imdb_id: str, media_type: str) -> Optional[str]:
         logging.error(f"Error retrieving country code for {imdb_id}: {str(e)}")
         return None
 
-def get_episode_airtime(imdb_id: str, season_number: Optional[int] = None, episode_number: Optional[int] = None) -> Optional[str]:
-    """Return the episode's airtime converted to the user's local time, preferring first_aired over airs.time."""
+def get_episode_airtime(imdb_id: str, season_number: Optional[int] = None, episode_number: Optional[int] = None,
+                        metadata: Optional[Dict[str, Any]] = None, local_tz=None) -> Optional[str]:
+    """
+    Return the episode's airtime converted to the user's local time, preferring first_aired over airs.time.
+
+    `metadata` (the show's metadata) and `local_tz` can be passed in when they are already known.
+    """
     DEFAULT_AIRTIME = "19:00"
 
     try:
-        metadata, _ = DirectAPI.get_show_metadata(imdb_id)
+        if metadata is None:
+            metadata, _ = DirectAPI.get_show_metadata(imdb_id)
+        local_tz = local_tz or _get_local_timezone()
         if not metadata or not isinstance(metadata, dict):
             logging.warning(f"Could not retrieve valid metadata for show {imdb_id}")
             return DEFAULT_AIRTIME
@@ -1476,7 +1503,6 @@ def get_episode_airtime(imdb_id: str, season_number: Optional[int] = None, episo
                                 dt = iso8601.parse_date(first_aired)
                                 if dt.tzinfo is None:
                                     dt = dt.replace(tzinfo=timezone.utc)
-                                local_tz = _get_local_timezone()
                                 local_dt = dt.astimezone(local_tz)
                                 airtime_str = local_dt.strftime("%H:%M")
                                 # logging.info(f"[Airtime] Used first_aired for {imdb_id} S{season_number}E{episode_number}: {first_aired} → {airtime_str} (local)")
@@ -1498,7 +1524,7 @@ def get_episode_airtime(imdb_id: str, season_number: Optional[int] = None, episo
             air_time_obj = datetime.strptime(time_str, "%H:%M").time()
             today = datetime.now().date()
             show_air_dt = datetime.combine(today, air_time_obj).replace(tzinfo=show_tz)
-            local_air_dt = show_air_dt.astimezone(_get_local_timezone())
+            local_air_dt = show_air_dt.astimezone(local_tz)
             airtime_str = local_air_dt.strftime("%H:%M")
             logging.info(f"[Airtime Fallback] Used airs for {imdb_id}: {time_str} {timezone_str} → {airtime_str} (local)")
             return airtime_str
@@ -78,6 +78,32 @@ class AddingQueue:
                 logging.debug(f"Attempted to remove item {item_id} but it was not in queue")
         else:
             logging.error("Attempted to remove item without ID from queue")
+
+    def add_items(self, items: List[Dict]):
+        """Add several items to the queue in a single pass"""
+        existing_ids = {i['id'] for i in self.items}
+        added = []
+        for item in items:
+            item_id = item.get('id')
+            if not item_id:
+                logging.error("Attempted to add item without ID to queue")
+            elif item_id in existing_ids:
+                logging.warning(f"Item {item_id} already exists in queue - duplicate add attempt")
+            else:
+                self.items.append(item)
+                existing_ids.add(item_id)
+                added.append(item_id)
+        if added:
+            logging.info(f"Added {len(added)} items to queue: {added}")
+
+    def remove_items(self, items: List[Dict]):
+        """Remove several items from the queue in a single pass"""
+        ids_to_remove = {item.get('id') for item in items if item.get('id')}
+        if not ids_to_remove:
+            return
+        old_len = len(self.items)
+        self.items = [i for i in self.items if i['id'] not in ids_to_remove]
+        logging.info(f"Removed {old_len - len(self.items)} of {len(ids_to_remove)} items from queue")
         
     def remove_unwanted_torrent(self, torrent_id: str):
         """
@@ -496,30 +522,30 @@ class AddingQueue:
                     if related_matches:
                         logging.info(f"Found {len(related_matches)} related episodes matching parsed files (from Scraping and/or Wanted)")
 
+                        # Group by source queue so each group moves to Checking in one batch
+                        related_by_state = {}
                         for related_item, related_file_basename in related_matches:
-                            related_identifier = f"{related_item.get('title')} S{related_item.get('season_number')}E{related_item.get('episode_number')}"
                             related_item_state = related_item.get('state', 'Unknown')
-
-                            # Update related item score/details (use same score as primary)
-                            related_update_data = {
-                                'current_score': current_score,
-                                'original_scraped_torrent_title': original_scraped_torrent_title,
-                                'resolution': resolution
-                                # Note: We are NOT applying XEM mapping specifically to related items here
-                            }
-                            logging.info(f"Updating related item {related_item['id']} with score and details: {related_update_data}")
-                            update_media_item(related_item['id'], **related_update_data)
-
-                            logging.info(f"Moving related episode {related_identifier} (from {related_item_state}) to checking")
-                            queue_manager.move_to_checking(
-                                item=related_item,
+                            related_by_state.setdefault(related_item_state, []).append((related_item, related_file_basename))
+
+                        for related_item_state, related_group in related_by_state.items():
+                            related_items = [related_item for related_item, _ in related_group]
+                            logging.info(f"Moving {len(related_items)} related episodes (from {related_item_state}) to checking")
+                            # Related items get the same score/details as the primary item
+                            # Note: We are NOT applying XEM mapping specifically to related items here
+                            queue_manager.move_items(
+                                related_items,
+                                "Checking",
                                 from_queue=related_item_state,
-                                title=torrent_title,
-                                link=magnet,
-                                filled_by_file=related_file_basename, # Pass the basename
-                                torrent_id=torrent_info.get('id')
+                                item_fields={related_item['id']: {'filled_by_file': related_file_basename} for related_item, related_file_basename in related_group},
+                                filled_by_title=torrent_title,
+                                filled_by_magnet=magnet,
+                                filled_by_torrent_id=torrent_info.get('id'),
+                                current_score=current_score,
+                                original_scraped_torrent_title=original_scraped_torrent_title,
+                                resolution=resolution
                             )
-                            # move_to_checking handles removal from original queue (Scraping/Wanted)
+                            # move_items handles removal from the original queue (Scraping/Wanted)
 
                 success = True # Mark overall success if primary item processed
 
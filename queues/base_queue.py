@@ -1,5 +1,5 @@
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, List
 
 class BaseQueue:
     """Base interface for all queue classes"""
@@ -24,6 +24,16 @@ class BaseQueue:
         """Remove an item from the queue"""
         raise NotImplementedError("Each queue must implement remove_item method")
 
+    def add_items(self, items: List[Dict[str, Any]]):
+        """Add several items to the queue (queues can override this with a single pass)"""
+        for item in items:
+            self.add_item(item)
+
+    def remove_items(self, items: List[Dict[str, Any]]):
+        """Remove several items from the queue (queues can override this with a single pass)"""
+        for item in items:
+            self.remove_item(item)
+
     def contains_item_id(self, item_id: Any) -> bool:
         """Check if the queue contains an item with the given ID (optimized)"""
         # Default implementation, queues should override this with more efficient implementations
@@ -35,7 +45,10 @@ class BaseQueue:
             queue_name = self.__class__.__name__.replace('Queue', '')
             item_id = item['id']
             item_identifier = queue_manager.generate_identifier(item)
-            queue_manager.queue_timer.item_entered_queue(item_id, queue_name, item_identifier)
+            queue_manager.queue_timer.item_entered_queue(
+                item_id, queue_name, item_identifier,
+                content_source=item.get('content_source'), version=item.get('version')
+            )
 
     def _record_item_exited(self, queue_manager, item: Dict[str, Any]):
         """Record that an item exited this queue"""
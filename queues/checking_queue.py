@@ -1,6 +1,6 @@
 import logging
 import time
-from typing import Dict, Any, Optional, Union
+from typing import Dict, Any, List, Optional, Union
 from queues.run_program import get_and_add_recent_collected_from_plex, run_recent_local_library_scan
 from utilities.local_library_scan import check_local_file_for_item
 from utilities.plex_functions import plex_update_item
@@ -518,24 +518,81 @@ class CheckingQueue:
                     if response.json['success']:
                         enabled_notifications = response.json['enabled_notifications']
                         if enabled_notifications:
-                            notification_data = {
-                                'id': item['id'],
-                                'title': item.get('title', 'Unknown Title'),
-                                'type': item.get('type', 'unknown'),
-                                'year': item.get('year', ''),
-                                'version': item.get('version', ''),
-                                # Convert season_number and episode_number to strings to avoid type comparison issues
-                                'season_number': str(item.get('season_number', '')) if item.get('season_number') is not None else None,
-                                'episode_number': str(item.get('episode_number', '')) if item.get('episode_number') is not None else None,
-                                'new_state': 'Downloading' if item.get('downloading') else 'Checking',
-                                'is_upgrade': False,
-                                'upgrading_from': None
-                            }
+                            notification_data = self._build_state_change_notification(item)
                             send_notifications([notification_data], enabled_notifications, notification_category='state_change')
                             logging.debug(f"Sent notification for item {item['id']}")
         except Exception as e:
             logging.error(f"Failed to send state change notification: {str(e)}")
 
+    def add_items(self, items: List[Dict[str, Any]]):
+        """
+        Add several items at once (e.g. the episodes of a season pack).
+
+        Each torrent's initial progress is checked once and a single state change
+        notification is sent for all non-upgrade items.
+        """
+        if not items:
+            return
+
+        from routes.notifications import send_notifications
+        from routes.settings_routes import get_enabled_notifications_for_category
+        from routes.extensions import app
+        from database.database_reading import get_media_item_by_id
+
+        now = time.time()
+        initial_progress_by_torrent = {}
+        for item in items:
+            self.items.append(item)
+            self.checking_queue_times[item['id']] = now
+
+            torrent_id = item.get('filled_by_torrent_id')
+            if torrent_id:
+                try:
+                    if torrent_id not in initial_progress_by_torrent:
+                        initial_progress_by_torrent[torrent_id] = self.get_torrent_progress(torrent_id)
+                        logging.debug(f"Initial progress for torrent {torrent_id}: {initial_progress_by_torrent[torrent_id]}")
+                    if initial_progress_by_torrent[torrent_id] == 0:
+                        self.register_uncached_torrent(item)
+                except Exception as e:
+                    logging.error(f"Failed to check initial progress for item {item['id']}: {str(e)}")
+
+            # Items coming from a batch state update are fresh rows, so only look up stale ones
+            if 'upgrading' not in item:
+                db_item = get_media_item_by_id(item['id'])
+                item['upgrading'] = db_item['upgrading'] if db_item else None
+
+        logging.debug(f"Added {len(items)} items to checking queue")
+
+        notifications = [self._build_state_change_notification(item) for item in items if not item.get('upgrading')]
+        if not notifications:
+            return
+        try:
+            with app.app_context():
+                response = get_enabled_notifications_for_category('checking')
+                if response.json['success']:
+                    enabled_notifications = response.json['enabled_notifications']
+                    if enabled_notifications:
+                        send_notifications(notifications, enabled_notifications, notification_category='state_change')
+                        logging.debug(f"Sent state change notification for {len(notifications)} items")
+        except Exception as e:
+            logging.error(f"Failed to send state change notification: {str(e)}")
+
+    @staticmethod
+    def _build_state_change_notification(item: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            'id': item['id'],
+            'title': item.get('title', 'Unknown Title'),
+            'type': item.get('type', 'unknown'),
+            'year': item.get('year', ''),
+            'version': item.get('version', ''),
+            # Convert season_number and episode_number to strings to avoid type comparison issues
+            'season_number': str(item.get('season_number', '')) if item.get('season_number') is not None else None,
+            'episode_number': str(item.get('episode_number', '')) if item.get('episode_number') is not None else None,
+            'new_state': 'Downloading' if item.get('downloading') else 'Checking',
+            'is_upgrade': False,
+            'upgrading_from': None
+        }
+
     def register_uncached_torrent(self, item):
         """Register a torrent for cache status tracking"""
         if not item.get('filled_by_magnet'):
@@ -676,6 +733,47 @@ class CheckingQueue:
         except Exception as e:
             logging.error(f"Error cleaning up uncached torrent tracking for item {item['id']}: {str(e)}")
 
+    def remove_items(self, items: List[Dict[str, Any]]):
+        """Remove several items in one pass over the queue, cleaning up torrent tracking once per torrent."""
+        ids_to_remove = {item['id'] for item in items}
+        if not ids_to_remove:
+            return
+
+        original_item_count = len(self.items)
+        self.items = [i for i in self.items if i['id'] not in ids_to_remove]
+        logging.debug(f"Removed {original_item_count - len(self.items)} of {len(ids_to_remove)} items from checking queue items list.")
+
+        for item_id in ids_to_remove:
+            self.checking_queue_times.pop(item_id, None)
+
+        # Clean up progress checks and unknown strikes for torrents no longer referenced by any item
+        remaining_torrent_ids = {i.get('filled_by_torrent_id') for i in self.items}
+        for torrent_id in {item.get('filled_by_torrent_id') for item in items}:
+            if torrent_id and torrent_id not in remaining_torrent_ids:
+                self.progress_checks.pop(torrent_id, None)
+                self.unknown_strikes.pop(torrent_id, None)
+                logging.debug(f"Cleaned up tracking for torrent {torrent_id} as it has no more associated items.")
+
+        # Items from the same pack share a magnet, so only extract each hash once
+        hashes_by_magnet = {}
+        for item in items:
+            magnet = item.get('filled_by_magnet')
+            if not magnet:
+                continue
+            try:
+                if magnet not in hashes_by_magnet:
+                    hashes_by_magnet[magnet] = download_and_extract_hash(magnet) if magnet.startswith('http') else extract_hash_from_magnet(magnet)
+                hash_value = hashes_by_magnet[magnet]
+                if hash_value and hash_value in self.uncached_torrents:
+                    tracked_item_ids = self.uncached_torrents[hash_value]['item_ids']
+                    if item['id'] in tracked_item_ids:
+                        tracked_item_ids.remove(item['id'])
+                    if not tracked_item_ids:
+                        del self.uncached_torrents[hash_value]
+                        logging.debug(f"Removed hash {hash_value[:8]}... from uncached tracking as it has no more items")
+            except Exception as e:
+                logging.error(f"Error cleaning up uncached torrent tracking for item {item['id']}: {str(e)}")
+
     def _calculate_dynamic_queue_period(self, items):
         """Calculate a dynamic queue period based on the number of items.
         Base period from settings + 1 minute per item in the checking queue.
@@ -886,11 +984,9 @@ class CheckingQueue:
                         except Exception as e:
                             logging.error(f"Failed to remove torrent {torrent_id}: {str(e)}")
                         # Move all items for this torrent back to Wanted
-                        # Make a copy of current_items_for_torrent for iteration, as move_to_wanted modifies self.items
-                        for item_to_move in list(current_items_for_torrent):
-                            if self.contains_item_id(item_to_move['id']): # Check if item is still in the main queue
-                                queue_manager.move_to_wanted(item_to_move, "Checking")
-                        # items_to_remove.extend(current_items_for_torrent) # Items are moved by move_to_wanted, which calls remove_item
+                        # Only move items that are still in the main queue; move_items removes them from self.items
+                        items_to_move = [item_to_move for item_to_move in current_items_for_torrent if self.contains_item_id(item_to_move['id'])]
+                        queue_manager.move_items(items_to_move, "Wanted", from_queue="Checking", filled_by_title=None, filled_by_magnet=None)
                         continue
 
                 # Skip remaining checks if the torrent is completed
@@ -1055,17 +1151,15 @@ class CheckingQueue:
             except Exception as e:
                 logging.error(f"Failed to process magnet for not wanted: {str(e)}")
         
-        # Move items back to Wanted state
-        for item in items:
-            try:
-                item_identifier = queue_manager.generate_identifier(item)
-                queue_manager.move_to_wanted(item, "Checking")
-                logging.info(f"Successfully moved item back to Wanted: {item_identifier}")
-            except Exception as e:
-                logging.error(f"Failed to move item {item_identifier} back to Wanted: {str(e)}")
-            
-            # Remove from checking queue
-            self.remove_item(item)
+        # Move items back to Wanted state in one batch
+        try:
+            moved_items = queue_manager.move_items(items, "Wanted", from_queue="Checking", filled_by_title=None, filled_by_magnet=None)
+            logging.info(f"Successfully moved {len(moved_items)} of {len(items)} items back to Wanted")
+        except Exception as e:
+            logging.error(f"Failed to move items back to Wanted: {str(e)}")
+
+        # Remove from checking queue (including any the batch update missed)
+        self.remove_items(items)
 
     def clean_up_checking_times(self):
         """Clean up old entries from checking times and progress cache"""
@@ -1203,6 +1297,7 @@ class CheckingQueue:
                 logging.error(f"Failed to add magnet to not-wanted list for stalled torrent: {str(e)}")
         
         upgrading_queue = None # Initialize for potential use
+        items_to_rescrape = [] # Non-upgrade items, moved back to Wanted together below
 
         for item in items_for_stalled_torrent: # Iterate over the collected list
             # Double-check if item is still in self.items before processing, as it might have been handled by another concurrent process
@@ -1241,7 +1336,8 @@ class CheckingQueue:
                 else:
                     # For non-upgrade items, move back to Wanted state to trigger re-scraping
                     logging.info(f"Moving item {item_identifier} back to Wanted state due to stalled torrent: {reason}")
-                    queue_manager.move_to_wanted(item, "Checking")
+                    items_to_rescrape.append(item)
+                    continue
                 
                 # remove_item is called by move_to_wanted or restore_item_state indirectly through DB state change and queue update.
                 # Explicitly ensure it's removed from the Python object list if not already.
@@ -1252,6 +1348,14 @@ class CheckingQueue:
 
             except Exception as e:
                 logging.error(f"Failed to handle item {item.get('id', 'N/A')} for stalled torrent {torrent_id}: {str(e)}", exc_info=True)
+
+        if items_to_rescrape:
+            try:
+                queue_manager.move_items(items_to_rescrape, "Wanted", from_queue="Checking", filled_by_title=None, filled_by_magnet=None)
+            except Exception as e:
+                logging.error(f"Failed to move {len(items_to_rescrape)} items for stalled torrent {torrent_id} back to Wanted: {str(e)}", exc_info=True)
+            # Ensure they are out of the checking queue object even if the batch update missed some
+            self.remove_items(items_to_rescrape)
         
         # Clean up strike counter for this torrent_id after all its items are processed
         if torrent_id in self.unknown_strikes:
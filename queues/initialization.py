@@ -149,11 +149,12 @@ def plex_collection_update(skip_initial_plex_update):
         
         # First check if we got any content from Plex
         if result and isinstance(result, dict):
-            movies = result.get('movies', [])
-            episodes = result.get('episodes', [])
-            if len(movies) > 0 or len(episodes) > 0:
+            # A streamed full scan has already written its items and only reports counts
+            movie_count = result.get('movies_count', len(result.get('movies', [])))
+            episode_count = result.get('episodes_count', len(result.get('episodes', [])))
+            if movie_count > 0 or episode_count > 0:
                 update_initialization_step("Plex Update", 
-                                        f"Found {len(movies)} movies and {len(episodes)} episodes",
+                                        f"Found {movie_count} movies and {episode_count} episodes",
                                         is_substep=True)
                 return True, True  # Plex responded and had content
             
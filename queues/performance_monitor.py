@@ -7,9 +7,9 @@ import threading
 from collections import defaultdict, OrderedDict
 from datetime import datetime, timedelta
 import time
-import json
 import platform
 from utilities.settings import get_setting
+from queues.performance_store import get_performance_store
 
 class PerformanceMonitor:
     """Monitor system performance metrics"""
@@ -44,30 +44,19 @@ class PerformanceMonitor:
         # Store last memory info for delta calculation
         self._last_memory_info = None
         
-        # Initialize JSON logger
-        self.json_logger = logging.getLogger('json_performance_logger')
-        self.json_logger.propagate = False
-        log_dir = os.environ.get('USER_LOGS', '/user/logs')
-        if not os.path.exists(log_dir):
-            os.makedirs(log_dir)
-        self.log_file = os.path.join(log_dir, 'performance_log.json')
-        
-        # Maximum number of entries to keep in the log file
-        self.max_entries = 1440  # 24 hours worth of entries at 1 per minute
+        # Entries are stored in the SQLite time-series store (opened on first write)
+        self.store = get_performance_store()
         
         # Polling intervals (in seconds)
         self.basic_metrics_interval = 15  # Poll basic metrics every 15 seconds
         self.detailed_metrics_interval = 60  # Poll detailed metrics every minute
         self.snapshot_interval = 1800  # Take memory snapshots every 30 minutes
-        self.log_cleanup_interval = 3600  # Clean up logs every hour
+        self.log_cleanup_interval = 3600  # Prune expired samples and rollups every hour
         
         # Timestamps for last operations
         self.last_detailed_check = datetime.now()
         self.last_snapshot = datetime.now()
         self.last_cleanup = datetime.now()
-        
-        # Write initial metadata
-        self._write_metadata()
     
     def start_monitoring(self):
         """Start comprehensive performance monitoring"""
@@ -135,19 +124,10 @@ class PerformanceMonitor:
             size_bytes /= 1024
         return f"{size_bytes:.1f} TB"
     
-    def _write_metadata(self):
-        """Write metadata to the log file"""
-        # Just ensure the file exists and is empty
-        with open(self.log_file, 'w') as f:
-            pass
-    
-    def _write_entry(self, entry):
-        """Append a single entry to the log file"""
+    def _write_entry(self, entry, entry_type=None):
+        """Store a single entry in the performance store"""
         try:
-            # Append entry directly without reading the file
-            with open(self.log_file, 'a') as f:
-                f.write(json.dumps(entry) + '\n')
-                
+            self.store.record(entry, entry_type=entry_type)
         except Exception as e:
             self.performance_logger.error(f"Error writing entry: {e}")
     
@@ -195,7 +175,7 @@ class PerformanceMonitor:
                 }
             }
             
-            # Write entry to log file
+            # Write entry to the performance store
             self._write_entry(entry)
             
             # Log human-readable format
@@ -295,8 +275,8 @@ class PerformanceMonitor:
                 }
             }
             
-            # Write entry to log file
-            self._write_entry(entry)
+            # Write entry to the performance store
+            self._write_entry(entry, entry_type='detailed_memory')
             
             # Log to performance logger
             self.performance_logger.info("""
@@ -352,7 +332,7 @@ No memory growth data available""")
                 }
             }
             
-            # Write entry to log file
+            # Write entry to the performance store
             self._write_entry(log_entry)
             
         except Exception as e:
@@ -400,7 +380,7 @@ No memory growth data available""")
                 }
             }
             
-            # Write entry to log file
+            # Write entry to the performance store
             self._write_entry(log_entry)
             
         except Exception as e:
@@ -478,7 +458,7 @@ Top Thread Usage:
                     }
                 }
                 
-                # Write entry to log file
+                # Write entry to the performance store
                 self._write_entry(log_entry)
                 
                 # Update measurement time
@@ -511,56 +491,22 @@ No memory snapshot available""")
                 }
             }
             
-            # Write entry to log file
+            # Write entry to the performance store
             self._write_entry(log_entry)
             
         except Exception as e:
             self.performance_logger.error(f"Error taking memory snapshot: {e}")
 
     def _cleanup_old_logs(self):
-        """Clean up old log entries to prevent file growth"""
+        """Remove samples and rollups that are past their retention"""
         try:
-            # Keep last 24 hours of entries (one entry per minute = 1440 entries)
-            max_age = 24 * 60 * 60  # 24 hours in seconds
-            cutoff_time = time.time() - max_age
-            
-            if not os.path.exists(self.log_file):
-                return
-                
-            # Create a temporary file
-            temp_file = self.log_file + '.temp'
-            kept_count = 0
-            removed_count = 0
-            
-            with open(self.log_file, 'r') as old_file, open(temp_file, 'w') as new_file:
-                for line in old_file:
-                    try:
-                        entry = json.loads(line.strip())
-                        entry_time = datetime.fromisoformat(entry['timestamp']).timestamp()
-                        
-                        if entry_time >= cutoff_time:
-                            new_file.write(line)
-                            kept_count += 1
-                        else:
-                            removed_count += 1
-                    except (json.JSONDecodeError, KeyError, ValueError):
-                        # Keep lines we can't parse, just in case
-                        new_file.write(line)
-                        kept_count += 1
-            
-            # Replace old file with new file
-            os.replace(temp_file, self.log_file)
-            
-            self.performance_logger.info(f"Cleaned up performance logs: kept {kept_count} entries, removed {removed_count} entries")
-            
+            removed = self.store.prune()
+            self.performance_logger.info(
+                "Pruned performance store: {entries} entries, {samples} samples, "
+                "{minute_rollups} minute rollups, {hour_rollups} hour rollups".format(**removed)
+            )
         except Exception as e:
-            self.performance_logger.error(f"Error cleaning up old log entries: {e}")
-            # If cleanup fails, don't leave temp file behind
-            if os.path.exists(temp_file):
-                try:
-                    os.remove(temp_file)
-                except:
-                    pass
+            self.performance_logger.error(f"Error cleaning up old performance data: {e}")
 
 # Create singleton instance but don't start monitoring yet
 monitor = PerformanceMonitor()
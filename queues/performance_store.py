@@ -0,0 +1,255 @@
+"""
+SQLite time-series store for PerformanceMonitor samples.
+
+Replaces the append-only performance_log.json. Reads used to parse the whole
+file, and pruning rewrote it.
+
+The store lives in its own performance_metrics.db so that metric writes never
+wait on the media_items lock. It has three tables:
+
+- `performance_entries`: full monitor entries (JSON) keyed by (type, ts).
+  The dashboard endpoints read recent entries from it.
+- `metric_samples`: one row per numeric metric per sample, keyed by
+  (metric, ts).
+- `metric_rollups`: count/sum/min/max/last per metric for 1-minute and
+  1-hour buckets. Rows are upserted as samples arrive, so downsampling needs
+  no background job.
+
+Each resolution has its own retention. `query_series` picks the finest
+resolution that still covers the requested range, so a 30-day view reads
+about 720 hourly rows.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+MINUTE = 60
+HOUR = 3600
+ROLLUP_RESOLUTIONS = (MINUTE, HOUR)
+
+# Retention per resolution, in seconds
+RAW_RETENTION_SECONDS = 2 * 24 * HOUR
+MINUTE_RETENTION_SECONDS = 14 * 24 * HOUR
+HOUR_RETENTION_SECONDS = 365 * 24 * HOUR
+
+# Longest range served from each resolution when resolution='auto'
+RAW_MAX_RANGE_SECONDS = 6 * HOUR
+MINUTE_MAX_RANGE_SECONDS = 3 * 24 * HOUR
+
+
+def _numeric_fields(data: Dict[str, Any], prefix: str) -> Iterable[Tuple[str, float]]:
+    """Flatten nested dicts into (dotted.name, value) pairs for numeric leaves. Lists are skipped."""
+    for key, value in data.items():
+        name = f"{prefix}.{key}"
+        if isinstance(value, bool):
+            continue
+        if isinstance(value, (int, float)):
+            yield name, float(value)
+        elif isinstance(value, dict):
+            yield from _numeric_fields(value, name)
+
+
+class PerformanceStore:
+    """Time-series storage for performance metrics with minute and hour rollups."""
+
+    def __init__(self, db_path: Optional[str] = None):
+        self._db_path = db_path
+        self._schema_ready_for: Optional[str] = None
+        self._lock = threading.Lock()
+
+    @property
+    def db_path(self) -> str:
+        if self._db_path:
+            return self._db_path
+        return os.path.join(os.environ.get('USER_DB_CONTENT', '/user/db_content'), 'performance_metrics.db')
+
+    def _connect(self) -> sqlite3.Connection:
+        path = self.db_path
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        conn = sqlite3.connect(path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        if self._schema_ready_for != path:
+            self._create_tables(conn)
+            self._schema_ready_for = path
+        return conn
+
+    @staticmethod
+    def _create_tables(conn: sqlite3.Connection):
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS performance_entries (
+                type TEXT NOT NULL,
+                ts REAL NOT NULL,
+                payload TEXT NOT NULL,
+                PRIMARY KEY (type, ts)
+            ) WITHOUT ROWID
+        ''')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_performance_entries_ts ON performance_entries(ts)')
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS metric_samples (
+                metric TEXT NOT NULL,
+                ts REAL NOT NULL,
+                value REAL NOT NULL,
+                PRIMARY KEY (metric, ts)
+            ) WITHOUT ROWID
+        ''')
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS metric_rollups (
+                resolution INTEGER NOT NULL,
+                metric TEXT NOT NULL,
+                bucket INTEGER NOT NULL,
+                count INTEGER NOT NULL,
+                sum REAL NOT NULL,
+                min REAL NOT NULL,
+                max REAL NOT NULL,
+                last REAL NOT NULL,
+                PRIMARY KEY (resolution, metric, bucket)
+            ) WITHOUT ROWID
+        ''')
+        conn.commit()
+
+    def record(self, entry: Dict[str, Any], entry_type: Optional[str] = None, ts: Optional[float] = None):
+        """Store a monitor entry and its numeric metrics, updating the rollups in the same transaction."""
+        ts = time.time() if ts is None else ts
+        entry_type = entry_type or entry.get('type') or 'unknown'
+        source = entry.get('metrics') if isinstance(entry.get('metrics'), dict) else {
+            key: value for key, value in entry.items() if key not in ('timestamp', 'type')
+        }
+        samples = list(_numeric_fields(source, entry_type))
+
+        rollup_rows = [
+            (resolution, metric, int(ts // resolution) * resolution, value, value, value, value)
+            for resolution in ROLLUP_RESOLUTIONS
+            for metric, value in samples
+        ]
+        with self._lock:
+            conn = self._connect()
+            try:
+                conn.execute('INSERT OR REPLACE INTO performance_entries (type, ts, payload) VALUES (?, ?, ?)',
+                             (entry_type, ts, json.dumps(entry)))
+                conn.executemany('INSERT OR REPLACE INTO metric_samples (metric, ts, value) VALUES (?, ?, ?)',
+                                 [(metric, ts, value) for metric, value in samples])
+                conn.executemany('''
+                    INSERT INTO metric_rollups (resolution, metric, bucket, count, sum, min, max, last)
+                    VALUES (?, ?, ?, 1, ?, ?, ?, ?)
+                    ON CONFLICT(resolution, metric, bucket) DO UPDATE SET
+                        count = count + 1,
+                        sum = sum + excluded.sum,
+                        min = MIN(min, excluded.min),
+                        max = MAX(max, excluded.max),
+                        last = excluded.last
+                ''', rollup_rows)
+                conn.commit()
+            except sqlite3.Error:
+                conn.rollback()
+                raise
+            finally:
+                conn.close()
+
+    def prune(self, now: Optional[float] = None) -> Dict[str, int]:
+        """Delete raw and rolled-up data older than its retention."""
+        now = time.time() if now is None else now
+        with self._lock:
+            conn = self._connect()
+            try:
+                removed = {
+                    'entries': conn.execute('DELETE FROM performance_entries WHERE ts < ?',
+                                            (now - RAW_RETENTION_SECONDS,)).rowcount,
+                    'samples': conn.execute('DELETE FROM metric_samples WHERE ts < ?',
+                                            (now - RAW_RETENTION_SECONDS,)).rowcount,
+                    'minute_rollups': conn.execute('DELETE FROM metric_rollups WHERE resolution = ? AND bucket < ?',
+                                                   (MINUTE, now - MINUTE_RETENTION_SECONDS)).rowcount,
+                    'hour_rollups': conn.execute('DELETE FROM metric_rollups WHERE resolution = ? AND bucket < ?',
+                                                 (HOUR, now - HOUR_RETENTION_SECONDS)).rowcount,
+                }
+                conn.commit()
+                return removed
+            finally:
+                conn.close()
+
+    def get_entries(self, since: float, entry_types: Optional[List[str]] = None, limit: int = 1000,
+                    newest_first: bool = False) -> List[Dict[str, Any]]:
+        """
+        Full entries recorded since `since`, returned oldest first. `limit` keeps the
+        newest entries when newest_first is set and the oldest otherwise.
+        """
+        conditions = ['ts >= ?']
+        params: List[Any] = [since]
+        if entry_types:
+            conditions.append(f"type IN ({', '.join('?' * len(entry_types))})")
+            params.extend(entry_types)
+        order = 'DESC' if newest_first else 'ASC'
+        conn = self._connect()
+        try:
+            rows = conn.execute(f'''
+                SELECT payload FROM performance_entries
+                WHERE {' AND '.join(conditions)}
+                ORDER BY ts {order} LIMIT ?
+            ''', params + [limit]).fetchall()
+        finally:
+            conn.close()
+        entries = [json.loads(row['payload']) for row in rows]
+        if newest_first:
+            entries.reverse()
+        return entries
+
+    def query_series(self, metric: str, start: float, end: Optional[float] = None,
+                     resolution: Any = 'auto') -> Dict[str, Any]:
+        """
+        Points for one metric between start and end.
+
+        resolution is 'raw', 60, 3600 or 'auto' (the finest resolution whose retention and size
+        suit the range). Each point has ts, avg, min, max and count.
+        """
+        end = time.time() if end is None else end
+        if resolution == 'auto':
+            span = end - start
+            if span <= RAW_MAX_RANGE_SECONDS:
+                resolution = 'raw'
+            elif span <= MINUTE_MAX_RANGE_SECONDS and start >= end - MINUTE_RETENTION_SECONDS:
+                resolution = MINUTE
+            else:
+                resolution = HOUR
+
+        conn = self._connect()
+        try:
+            if resolution == 'raw':
+                rows = conn.execute('''
+                    SELECT ts, value AS avg, value AS min, value AS max, 1 AS count
+                    FROM metric_samples WHERE metric = ? AND ts BETWEEN ? AND ? ORDER BY ts
+                ''', (metric, start, end)).fetchall()
+            else:
+                resolution = int(resolution)
+                rows = conn.execute('''
+                    SELECT bucket AS ts, sum / count AS avg, min, max, count
+                    FROM metric_rollups WHERE resolution = ? AND metric = ? AND bucket BETWEEN ? AND ?
+                    ORDER BY bucket
+                ''', (resolution, metric, int(start // resolution) * resolution, end)).fetchall()
+        finally:
+            conn.close()
+        return {'metric': metric, 'resolution': resolution, 'points': [dict(row) for row in rows]}
+
+    def list_metrics(self) -> List[str]:
+        conn = self._connect()
+        try:
+            return [row['metric'] for row in conn.execute(
+                'SELECT DISTINCT metric FROM metric_rollups WHERE resolution = ? ORDER BY metric', (HOUR,))]
+        finally:
+            conn.close()
+
+
+_store: Optional[PerformanceStore] = None
+_store_lock = threading.Lock()
+
+
+def get_performance_store() -> PerformanceStore:
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = PerformanceStore()
+        return _store
@@ -4,11 +4,17 @@ from datetime import datetime, timedelta
 from typing import Dict, Any, List, Optional
 import json
 import os
+import threading
 import time
 
-from database.database_writing import update_media_item_state, add_media_item
+from database.database_writing import update_media_item_state, update_media_items_state_batch, add_media_item
 from database.database_reading import get_media_item_by_id, get_item_count_by_state
 from database.collected_items import add_to_collected_notifications
+from database.queue_timing import (
+    create_queue_timing_tables, write_queue_timing_batch, get_open_queue_entries,
+    get_queue_dwell_percentiles, prune_queue_timing
+)
+from utilities.metrics import QUEUE_DWELL_SECONDS
 from routes.notifications import send_queue_pause_notification, send_queue_resume_notification
 
 from queues.wanted_queue import WantedQueue
@@ -23,154 +29,243 @@ from queues.upgrading_queue import UpgradingQueue
 from queues.final_check_queue import FinalCheckQueue
 from queues.pre_release_queue import PreReleaseQueue
 from queues.base_queue import BaseQueue
+from queues.queue_wakeup import QueueWakeupDispatcher
 from utilities.settings import get_setting
 
 # Get the item tracker logger
 item_tracker_logger = logging.getLogger('item_tracker')
 
+# Pseudo queue name used for end-to-end Wanted -> Collected timings
+PIPELINE_QUEUE_NAME = 'Wanted -> Collected'
+
 class QueueTimer:
     """Tracks how long items spend in each queue"""
     
+    # Flush buffered timing rows after this many events or seconds, whichever comes first
+    FLUSH_BATCH_SIZE = 100
+    FLUSH_INTERVAL_SECONDS = 30
+    # Keep finished items in memory for a while so callers can still read their timing
+    COMPLETED_ITEM_GRACE_SECONDS = 3600
+    # Open entries older than this are not restored (prune_queue_timing drops them too)
+    OPEN_ENTRY_MAX_AGE_SECONDS = 30 * 24 * 60 * 60
+    
     def __init__(self):
-        # Initialize stats tracking first
-        self.queue_stats = {
-            queue_name: {'count': 0, 'total_time': 0, 'min_time': float('inf'), 'max_time': 0}
-            for queue_name in ['Wanted', 'Scraping', 'Adding', 'Checking', 'Sleeping', 
-                             'Unreleased', 'Blacklisted', 'Pending Uncached', 'Upgrading', 'Pre_release']
-        }
-        
-        # Initialize queue times
+        # In-memory view of item timings: {item_id: {queue_name: [entry_time, exit_time]}}
         self.queue_times = {}
+        # content_source/version per open (item_id, queue_name) so exits can be attributed
+        self._entry_details = {}
+        # Last Wanted entry per item, kept until it is collected. Persisted as an open entry
+        # under PIPELINE_QUEUE_NAME so Wanted -> Collected timings survive restarts.
+        self._pipeline_starts = {}
+        
+        # Buffered writes for the queue timing tables. The lock also guards the in-memory
+        # timings, which queue moves update from several threads.
+        self._lock = threading.Lock()
+        self._pending_open = {}
+        self._pending_closed = set()
+        self._pending_transitions = []
+        self._last_flush_time = time.time()
+        self._last_prune_time = 0
+        # Flushes run on a timer thread, armed when rows are buffered
+        self._flush_timer = None
+        self._flush_timer_immediate = False
         
-        # Set up file paths
+        # Legacy JSON file, migrated into the database once
         self.db_content_dir = os.environ.get('USER_DB_CONTENT', '/user/db_content')
         self.timing_file = os.path.join(self.db_content_dir, 'queue_timing_data.json')
         
-        # Load timing data after all attributes are initialized
         self.load_timing_data()
         
     def load_timing_data(self):
-        """Load timing data from disk"""
+        """Load open queue entries and unfinished Wanted -> Collected starts from the database"""
         try:
-            if os.path.exists(self.timing_file):
-                with open(self.timing_file, 'r') as f:
-                    data = json.load(f)
-                    self.queue_times = data.get('queue_times', {})
-                    loaded_stats = data.get('queue_stats', {})
-                    # Update queue_stats with loaded data while preserving structure
-                    for queue_name, stats in loaded_stats.items():
-                        if queue_name in self.queue_stats:
-                            self.queue_stats[queue_name].update(stats)
-                    logging.info(f"Loaded queue timing data for {len(self.queue_times)} items")
+            create_queue_timing_tables()
+            self._migrate_legacy_timing_file()
+            for row in get_open_queue_entries(max_age_seconds=self.OPEN_ENTRY_MAX_AGE_SECONDS):
+                item_id = row['item_id']
+                if row['queue_name'] == PIPELINE_QUEUE_NAME:
+                    self._pipeline_starts[item_id] = (row['entered_at'], row['content_source'], row['version'])
+                    continue
+                self.queue_times.setdefault(item_id, {})[row['queue_name']] = [row['entered_at'], None]
+                self._entry_details[(item_id, row['queue_name'])] = (row['content_source'], row['version'])
+            logging.info(f"Loaded queue timing data for {len(self.queue_times)} items "
+                         f"({len(self._pipeline_starts)} waiting to be collected)")
         except Exception as e:
             logging.error(f"Error loading queue timing data: {e}")
             self.queue_times = {}
+            self._pipeline_starts = {}
             
-    def save_timing_data(self, force=False):
-        """Save timing data to disk, but not too frequently"""
-        if not hasattr(self, '_last_save_time'):
-            self._last_save_time = 0
+    def _migrate_legacy_timing_file(self):
+        """Move open entries from the old queue_timing_data.json into the database"""
+        if not os.path.exists(self.timing_file):
+            return
+        try:
+            with open(self.timing_file, 'r') as f:
+                data = json.load(f)
+            open_entries = []
+            for item_id, queue_data in data.get('queue_times', {}).items():
+                for queue_name, times in queue_data.items():
+                    if times and times[0] and times[1] is None:
+                        open_entries.append((int(item_id), queue_name, None, None, times[0]))
+            write_queue_timing_batch(open_entries, [], [])
+            os.replace(self.timing_file, self.timing_file + '.migrated')
+            logging.info(f"Migrated {len(open_entries)} open queue timing entries from {self.timing_file}")
+        except Exception as e:
+            logging.error(f"Error migrating legacy queue timing file: {e}")
+            
+    def _mark_dirty(self):
+        """Arm the flush timer for newly buffered rows. Caller holds self._lock."""
+        pending_count = len(self._pending_open) + len(self._pending_closed) + len(self._pending_transitions)
+        immediate = pending_count >= self.FLUSH_BATCH_SIZE
+        if self._flush_timer is not None and (self._flush_timer_immediate or not immediate):
+            return
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+        self._flush_timer = threading.Timer(0 if immediate else self.FLUSH_INTERVAL_SECONDS, self._flush_from_timer)
+        self._flush_timer.daemon = True
+        self._flush_timer_immediate = immediate
+        self._flush_timer.start()
+        
+    def _flush_from_timer(self):
+        with self._lock:
+            self._flush_timer = None
+        self.save_timing_data(force=True)
             
+    def save_timing_data(self, force=False):
+        """Flush buffered timing rows to the database in one transaction"""
         current_time = time.time()
-        # Only save every 5 minutes unless forced
-        if force or current_time - self._last_save_time >= 300:
-            try:
-                os.makedirs(os.path.dirname(self.timing_file), exist_ok=True)
-                
-                # Prune very old or completed items to prevent file growth
-                self._prune_old_timing_data()
-                
-                with open(self.timing_file, 'w') as f:
-                    json.dump({'queue_times': self.queue_times, 'queue_stats': self.queue_stats}, f)
-                    
-                self._last_save_time = current_time
-                logging.debug(f"Saved queue timing data for {len(self.queue_times)} items")
-            except Exception as e:
-                logging.error(f"Error saving queue timing data: {e}")
+        with self._lock:
+            pending_count = len(self._pending_open) + len(self._pending_closed) + len(self._pending_transitions)
+            if not force and pending_count < self.FLUSH_BATCH_SIZE and current_time - self._last_flush_time < self.FLUSH_INTERVAL_SECONDS:
+                return
+            open_entries = list(self._pending_open.values())
+            closed_entries = list(self._pending_closed)
+            transitions = self._pending_transitions
+            self._pending_open = {}
+            self._pending_closed = set()
+            self._pending_transitions = []
+            self._last_flush_time = current_time
+            
+        try:
+            if not write_queue_timing_batch(open_entries, closed_entries, transitions):
+                raise RuntimeError("write_queue_timing_batch reported failure")
+            if open_entries or closed_entries or transitions:
+                logging.debug(f"Flushed queue timing data: {len(transitions)} transitions, {len(open_entries)} open, {len(closed_entries)} closed")
+        except Exception as e:
+            logging.error(f"Error saving queue timing data: {e}")
+            # Put the rows back so the next flush retries them
+            with self._lock:
+                for entry in open_entries:
+                    self._pending_open.setdefault((entry[0], entry[1]), entry)
+                self._pending_closed.update(key for key in closed_entries if key not in self._pending_open)
+                self._pending_transitions = transitions + self._pending_transitions
+                self._mark_dirty()
+            return
+        
+        self._prune_old_timing_data()
                 
     def _prune_old_timing_data(self):
-        """Remove timing data for completed items or items older than 30 days"""
+        """Drop finished items from memory and expire old rows in the database (at most hourly)"""
         current_time = datetime.now().timestamp()
-        thirty_days_ago = current_time - (30 * 24 * 60 * 60)
-        
-        # Find items to remove
-        items_to_remove = []
-        for item_id, queue_data in self.queue_times.items():
-            all_completed = True
-            has_old_entry = False
+        oldest_open = current_time - self.OPEN_ENTRY_MAX_AGE_SECONDS
+        with self._lock:
+            if current_time - self._last_prune_time < self.COMPLETED_ITEM_GRACE_SECONDS:
+                return
+            self._last_prune_time = current_time
             
-            for queue_name, times in queue_data.items():
-                entry_time = times[0]
-                exit_time = times[1]
-                
-                # Check if entry is older than 30 days
-                if entry_time and entry_time < thirty_days_ago:
-                    has_old_entry = True
+            items_to_remove = []
+            for item_id, queue_data in self.queue_times.items():
+                open_entries = [times for times in queue_data.values() if times[1] is None]
+                last_exit = max((times[1] for times in queue_data.values() if times[1] is not None), default=0)
+                all_old = all(times[0] and times[0] < oldest_open for times in queue_data.values())
+                if (not open_entries and current_time - last_exit >= self.COMPLETED_ITEM_GRACE_SECONDS) or all_old:
+                    items_to_remove.append(item_id)
                     
-                # If any queue doesn't have an exit time, item is not completed
-                if exit_time is None:
-                    all_completed = False
-                    
-            # Remove if completed or all entries are old
-            if all_completed or has_old_entry:
-                items_to_remove.append(item_id)
-                
-        # Remove the identified items
-        for item_id in items_to_remove:
-            del self.queue_times[item_id]
+            for item_id in items_to_remove:
+                for queue_name in self.queue_times.pop(item_id, {}):
+                    self._entry_details.pop((item_id, queue_name), None)
+            stale_starts = [item_id for item_id, start in self._pipeline_starts.items() if start[0] < oldest_open]
+            for item_id in stale_starts:
+                del self._pipeline_starts[item_id]
             
         if items_to_remove:
             logging.debug(f"Pruned {len(items_to_remove)} old items from queue timing data")
+        
+        prune_queue_timing()
     
-    def item_entered_queue(self, item_id, queue_name, item_identifier=None):
+    def item_entered_queue(self, item_id, queue_name, item_identifier=None, content_source=None, version=None):
         """Record when an item enters a queue"""
         if not item_id:
             return
             
-        # Initialize item's timing data if not present
-        if item_id not in self.queue_times:
-            self.queue_times[item_id] = {}
-            
         # Record entry time
         current_time = datetime.now().timestamp()
         
-        # Store as [entry_time, exit_time] where exit_time is initially None
-        self.queue_times[item_id][queue_name] = [current_time, None]
+        with self._lock:
+            # Store as [entry_time, exit_time] where exit_time is initially None
+            self.queue_times.setdefault(item_id, {})[queue_name] = [current_time, None]
+            self._entry_details[(item_id, queue_name)] = (content_source, version)
+            self._pending_closed.discard((item_id, queue_name))
+            self._pending_open[(item_id, queue_name)] = (item_id, queue_name, content_source, version, current_time)
+            if queue_name == 'Wanted':
+                self._pipeline_starts[item_id] = (current_time, content_source, version)
+                self._pending_closed.discard((item_id, PIPELINE_QUEUE_NAME))
+                self._pending_open[(item_id, PIPELINE_QUEUE_NAME)] = (
+                    item_id, PIPELINE_QUEUE_NAME, content_source, version, current_time)
+            self._mark_dirty()
         
         if item_identifier:
             logging.debug(f"Item {item_identifier} (ID: {item_id}) entered {queue_name} queue")
     
-    def item_exited_queue(self, item_id, queue_name, item_identifier=None):
+    def item_exited_queue(self, item_id, queue_name, item_identifier=None, scheduling_mode=None):
         """Record when an item exits a queue"""
-        if not item_id or item_id not in self.queue_times:
+        if not item_id:
             return
             
-        # Get the item's queue timing data
-        item_timing = self.queue_times.get(item_id, {})
-        queue_timing = item_timing.get(queue_name)
-        
-        # If we have entry timing for this queue
-        if queue_timing and queue_timing[0] is not None:
-            current_time = datetime.now().timestamp()
+        current_time = datetime.now().timestamp()
+        with self._lock:
+            queue_timing = self.queue_times.get(item_id, {}).get(queue_name)
+            # Only an open entry can be closed
+            if not queue_timing or queue_timing[0] is None or queue_timing[1] is not None:
+                return
             entry_time = queue_timing[0]
             duration = current_time - entry_time  # Time in seconds
             
             # Set the exit time
-            self.queue_times[item_id][queue_name][1] = current_time
-            
-            # Update stats for this queue
-            if queue_name in self.queue_stats:
-                self.queue_stats[queue_name]['count'] += 1
-                self.queue_stats[queue_name]['total_time'] += duration
-                self.queue_stats[queue_name]['min_time'] = min(self.queue_stats[queue_name]['min_time'], duration)
-                self.queue_stats[queue_name]['max_time'] = max(self.queue_stats[queue_name]['max_time'], duration)
+            queue_timing[1] = current_time
+            content_source, version = self._entry_details.get((item_id, queue_name), (None, None))
+            self._pending_open.pop((item_id, queue_name), None)
+            self._pending_closed.add((item_id, queue_name))
+            self._pending_transitions.append(
+                (item_id, queue_name, content_source, version, scheduling_mode, entry_time, current_time, duration)
+            )
+            self._mark_dirty()
+        QUEUE_DWELL_SECONDS.observe(duration, queue=queue_name)
+        
+        if item_identifier:
+            time_str = self._format_duration(duration)
+            logging.debug(f"Item {item_identifier} (ID: {item_id}) exited {queue_name} queue after {time_str}")
             
-            if item_identifier:
-                time_str = self._format_duration(duration)
-                logging.debug(f"Item {item_identifier} (ID: {item_id}) exited {queue_name} queue after {time_str}")
-                
-            # Periodically save timing data
-            self.save_timing_data()
+    def record_pipeline_completion(self, item_id, mode='polling', item_identifier=None):
+        """Record the Wanted -> Collected latency for an item that just got collected"""
+        current_time = datetime.now().timestamp()
+        with self._lock:
+            start = self._pipeline_starts.pop(item_id, None)
+            if not start or not start[0]:
+                return None
+            started_at, content_source, version = start
+            duration = current_time - started_at
+            self._pending_open.pop((item_id, PIPELINE_QUEUE_NAME), None)
+            self._pending_closed.add((item_id, PIPELINE_QUEUE_NAME))
+            self._pending_transitions.append(
+                (item_id, PIPELINE_QUEUE_NAME, content_source, version, mode, started_at, current_time, duration)
+            )
+            self._mark_dirty()
+        QUEUE_DWELL_SECONDS.observe(duration, queue=PIPELINE_QUEUE_NAME)
+        
+        if item_identifier:
+            logging.debug(f"Item {item_identifier} (ID: {item_id}) went from Wanted to Collected in {self._format_duration(duration)} ({mode})")
+        return duration
             
     def _format_duration(self, seconds):
         """Format duration in seconds to a human-readable string"""
@@ -187,22 +282,25 @@ class QueueTimer:
         """Get timing data for a specific item"""
         return self.queue_times.get(item_id, {})
         
-    def generate_timing_report(self):
+    def get_dwell_percentiles(self, hours=24, group_by=('queue_name',), **filters):
+        """Get p50/p90/p99 dwell times from the database, flushing buffered rows first"""
+        self.save_timing_data(force=True)
+        return get_queue_dwell_percentiles(hours=hours, group_by=group_by, **filters)
+        
+    def generate_timing_report(self, hours=24):
         """Generate a report of queue timing statistics"""
-        report = ["Queue Timing Statistics:"]
+        report = [f"Queue Timing Statistics (last {hours:g} hours):"]
         
-        for queue_name, stats in self.queue_stats.items():
-            count = stats['count']
-            if count > 0:
-                avg_time = stats['total_time'] / count
-                min_time = stats['min_time'] if stats['min_time'] != float('inf') else 0
-                max_time = stats['max_time']
-                
-                report.append(f"{queue_name} Queue:")
-                report.append(f"  Items processed: {count}")
-                report.append(f"  Average time: {self._format_duration(avg_time)}")
-                report.append(f"  Min time: {self._format_duration(min_time)}")
-                report.append(f"  Max time: {self._format_duration(max_time)}")
+        for stats in self.get_dwell_percentiles(hours=hours, group_by=('queue_name', 'scheduling_mode')):
+            if stats['queue_name'] == PIPELINE_QUEUE_NAME:
+                report.append(f"{PIPELINE_QUEUE_NAME} ({stats['scheduling_mode'] or 'unknown'}):")
+            else:
+                report.append(f"{stats['queue_name']} Queue ({stats['scheduling_mode'] or 'unknown'}):")
+            report.append(f"  Items processed: {stats['count']}")
+            report.append(f"  Average time: {self._format_duration(stats['avg'])}")
+            report.append(f"  p50/p90/p99: {self._format_duration(stats['p50'])} / {self._format_duration(stats['p90'])} / {self._format_duration(stats['p99'])}")
+            report.append(f"  Min time: {self._format_duration(stats['min'])}")
+            report.append(f"  Max time: {self._format_duration(stats['max'])}")
                 
         return "\n".join(report)
     
@@ -259,6 +357,11 @@ class QueueManager:
         # Initialize the queue timer
         self.queue_timer = QueueTimer()
         
+        # Wakeups for event-driven queue processing (kept across reinitialize so the
+        # scheduler attachment survives)
+        if not hasattr(self, 'wakeup_dispatcher'):
+            self.wakeup_dispatcher = QueueWakeupDispatcher()
+        
         # Get the item tracker logger instance
         self.item_tracker = logging.getLogger('item_tracker')
         
@@ -385,6 +488,7 @@ class QueueManager:
             logging.debug(f"Skipping {queue_name} queue processing: Queue is paused")
             return False if with_result else None
             
+        self.wakeup_dispatcher.mark_run(queue_name)
         try:
             if with_result:
                 return self.queues[queue_name].process(self)
@@ -401,6 +505,7 @@ class QueueManager:
             logging.debug("Skipping Checking queue processing: Queue is paused")
             return
 
+        self.wakeup_dispatcher.mark_run("Checking")
         try:
             # Call the CheckingQueue process method directly, passing QueueManager (self) and ProgramRunner
             self.queues["Checking"].process(self, program_runner)
@@ -432,6 +537,9 @@ class QueueManager:
             # Process the queue safely (catches exceptions, including RateLimitError)
             result = self._process_queue_safely("Scraping", with_result=True) # process method handles the single item
             logging.debug(f"Scraping queue process result for one item: {result}")
+            # Keep draining while items remain that can be started (workers wake the queue on handoff)
+            if self.queues["Scraping"].has_dispatchable_items():
+                self.wakeup_dispatcher.notify("Scraping", reason="backlog")
             return result # Return True if item was processed, False otherwise
 
         # Return False if queue was empty after update
@@ -611,7 +719,7 @@ class QueueManager:
         # Record exit from source queue
         time_in_from_queue_seconds = None
         if from_queue and from_queue in self.queues and item and 'id' in item:
-            self.queue_timer.item_exited_queue(item['id'], from_queue, item_identifier)
+            self.queue_timer.item_exited_queue(item['id'], from_queue, item_identifier, self.wakeup_dispatcher.mode_label)
             item_timing = self.queue_timer.get_item_timing(item['id'])
             if from_queue in item_timing:
                 entry_time, exit_time = item_timing[from_queue]
@@ -755,7 +863,7 @@ class QueueManager:
         # Record exit from source queue if applicable
         time_in_from_queue_seconds = None
         if from_queue and from_queue in self.queues:
-            self.queue_timer.item_exited_queue(item['id'], from_queue, item_identifier)
+            self.queue_timer.item_exited_queue(item['id'], from_queue, item_identifier, self.wakeup_dispatcher.mode_label)
             item_timing = self.queue_timer.get_item_timing(item['id'])
             if from_queue in item_timing:
                 entry_time, exit_time = item_timing[from_queue]
@@ -775,8 +883,12 @@ class QueueManager:
             # Add the item to the target queue
             if to_queue_name in self.queues:
                 # Record entry into target queue 
-                self.queue_timer.item_entered_queue(updated_item['id'], to_queue_name, item_identifier)
+                self.queue_timer.item_entered_queue(
+                    updated_item['id'], to_queue_name, item_identifier,
+                    content_source=updated_item.get('content_source'), version=updated_item.get('version')
+                )
                 self.queues[to_queue_name].add_item(updated_item)
+                self.wakeup_dispatcher.notify(to_queue_name, reason=f"item moved from {from_queue}")
             
             # Remove from source queue if needed
             if from_queue and from_queue in self.queues:
@@ -810,6 +922,98 @@ class QueueManager:
             })
             return None
 
+    def move_items(self, items: List[Dict[str, Any]], to_queue: str, from_queue: Optional[str] = None,
+                   item_fields: Optional[Dict[int, Dict[str, Any]]] = None, **fields) -> List[Dict[str, Any]]:
+        """
+        Move several items to the same queue with one database transaction.
+
+        Unlike calling _move_item_to_queue per item, the state change is a single
+        batched update, the source and target queues are updated in one pass and the
+        target queue is woken once.
+
+        Args:
+            items: The items to move
+            to_queue: The target queue name (also used as the new state)
+            from_queue: [Optional] The source queue name to remove the items from
+            item_fields: [Optional] Per-item field values, keyed by item ID
+            fields: Fields to set on every item (see update_media_items_state_batch)
+
+        Returns:
+            The updated items that were moved
+        """
+        items = [item for item in items if item and item.get('id')]
+        if not items:
+            return []
+        if to_queue not in self.queues:
+            logging.error(f"Cannot move items to unknown queue '{to_queue}'")
+            return []
+
+        item_ids = [item['id'] for item in items]
+        identifiers = {item['id']: self.generate_identifier(item) for item in items}
+        logging.debug(f"Moving {len(items)} items to {to_queue} from {from_queue}")
+
+        updated_items = update_media_items_state_batch(item_ids, to_queue, item_fields=item_fields, **fields)
+        if not updated_items:
+            self.item_tracker.error({
+                'event': 'BULK_MOVE_FAILED',
+                'item_ids': item_ids,
+                'from_queue': from_queue,
+                'to_queue': to_queue,
+                'reason': 'Batch state update failed'
+            })
+            return []
+
+        updated_ids = {updated_item['id'] for updated_item in updated_items}
+        moved_items = [item for item in items if item['id'] in updated_ids]
+
+        if from_queue and from_queue in self.queues:
+            mode = self.wakeup_dispatcher.mode_label
+            for item in moved_items:
+                self.queue_timer.item_exited_queue(item['id'], from_queue, identifiers[item['id']], mode)
+
+        for updated_item in updated_items:
+            self.queue_timer.item_entered_queue(
+                updated_item['id'], to_queue, identifiers.get(updated_item['id']),
+                content_source=updated_item.get('content_source'), version=updated_item.get('version')
+            )
+        self._add_items_to_queue(to_queue, updated_items)
+
+        if from_queue and from_queue in self.queues:
+            self._remove_items_from_queue(from_queue, moved_items)
+
+        self.wakeup_dispatcher.notify(to_queue, reason=f"{len(updated_items)} items moved from {from_queue}")
+
+        log_data = {
+            'event': 'BULK_MOVE_COMPLETED',
+            'item_ids': [updated_item['id'] for updated_item in updated_items],
+            'count': len(updated_items),
+            'from_queue': from_queue,
+            'to_queue': to_queue
+        }
+        missing_ids = [item_id for item_id in item_ids if item_id not in updated_ids]
+        if missing_ids:
+            log_data['missing_item_ids'] = missing_ids
+        self.item_tracker.info(log_data)
+        logging.info(f"Moved {len(updated_items)} items to {to_queue} from {from_queue}")
+
+        return updated_items
+
+    def _add_items_to_queue(self, queue_name: str, items: List[Dict[str, Any]]):
+        queue = self.queues[queue_name]
+        if hasattr(queue, 'add_items'):
+            queue.add_items(items)
+        else:
+            for item in items:
+                queue.add_item(item)
+
+    def _remove_items_from_queue(self, queue_name: str, items: List[Dict[str, Any]]):
+        queue = self.queues[queue_name]
+        if hasattr(queue, 'remove_items'):
+            queue.remove_items(items)
+        else:
+            for item in items:
+                queue.remove_item(item)
+
     def move_to_collected(self, item: Dict[str, Any], from_queue: str, skip_notification: bool = False):
         """Move an item to the Collected state after symlink is created."""
         item_identifier = self.generate_identifier(item)
@@ -827,7 +1031,9 @@ class QueueManager:
         # Record exit from source queue
         time_in_from_queue_seconds = None
         if from_queue in self.queues and item and 'id' in item:
-            self.queue_timer.item_exited_queue(item['id'], from_queue, item_identifier)
+            # Record end-to-end latency before the exit, which may prune the item's timing data
+            self.queue_timer.record_pipeline_completion(item['id'], self.wakeup_dispatcher.mode_label, item_identifier)
+            self.queue_timer.item_exited_queue(item['id'], from_queue, item_identifier, self.wakeup_dispatcher.mode_label)
             # Calculate time spent in the from_queue
             item_timing = self.queue_timer.get_item_timing(item['id'])
             if from_queue in item_timing:
@@ -879,12 +1085,22 @@ class QueueManager:
                 'reason': 'Failed to retrieve updated item from database after state update'
             })
             
-    def generate_queue_timing_report(self):
+    def generate_queue_timing_report(self, hours=24):
         """Generate a report of queue timing statistics"""
         if hasattr(self, 'queue_timer'):
-            return self.queue_timer.generate_timing_report()
+            return self.queue_timer.generate_timing_report(hours=hours)
         return "Queue timing not available"
         
+    def get_queue_dwell_percentiles(self, hours=24, group_by=('queue_name',), **filters):
+        """Get time-windowed p50/p90/p99 dwell times per queue, content source or version"""
+        if hasattr(self, 'queue_timer'):
+            return self.queue_timer.get_dwell_percentiles(hours=hours, group_by=group_by, **filters)
+        return []
+        
+    def get_wakeup_stats(self):
+        """Get per-queue wakeup counters from the event-driven dispatcher"""
+        return self.wakeup_dispatcher.get_stats()
+        
     def get_current_queue_timing(self):
         """Get timing information for all items currently in queues"""
         if hasattr(self, 'queue_timer'):
@@ -995,7 +1211,11 @@ class QueueManager:
                     logging.info(f"Successfully fetched new media item: {final_item_identifier} (ID: {new_item_id}) with state 'Wanted'.")
 
                     self.queues["Wanted"].add_item(created_item_dict)
-                    self.queue_timer.item_entered_queue(new_item_id, "Wanted", final_item_identifier)
+                    self.queue_timer.item_entered_queue(
+                        new_item_id, "Wanted", final_item_identifier,
+                        content_source=created_item_dict.get('content_source'), version=created_item_dict.get('version')
+                    )
+                    self.wakeup_dispatcher.notify("Wanted", reason=reason)
                     
                     self.item_tracker.info({
                         'event': 'ITEM_CREATED_AND_WANTED',
@@ -0,0 +1,176 @@
+"""
+Event-driven wakeups for queue processing jobs.
+
+Queue moves call `QueueWakeupDispatcher.notify()` for the target queue and the
+dispatcher pulls that queue's APScheduler job forward so it runs as soon as the
+(single) scheduler worker is free, instead of waiting out the rest of its
+polling interval. Wakeups are coalesced per queue and rate limited, and the
+regular interval jobs stay in place as a safety net.
+"""
+
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Optional
+
+from utilities.settings import get_setting
+
+# Queue name -> APScheduler job id (Final_Check is scheduled under its task id)
+QUEUE_JOB_IDS = {
+    'Wanted': 'Wanted',
+    'Scraping': 'Scraping',
+    'Adding': 'Adding',
+    'Checking': 'Checking',
+    'Sleeping': 'Sleeping',
+    'Unreleased': 'Unreleased',
+    'Blacklisted': 'Blacklisted',
+    'Pending Uncached': 'Pending Uncached',
+    'Upgrading': 'Upgrading',
+    'Final_Check': 'final_check_queue',
+    'Pre_release': 'Pre_release',
+}
+
+# Minimum seconds between two wakeup-triggered runs of the same queue
+DEFAULT_MIN_WAKEUP_INTERVALS = {
+    'Wanted': 5,
+    'Scraping': 1,
+    'Adding': 1,
+    'Checking': 15,
+    'Sleeping': 30,
+    'Unreleased': 30,
+    'Blacklisted': 60,
+    'Pending Uncached': 30,
+    'Upgrading': 30,
+    'Final_Check': 30,
+    'Pre_release': 60,
+}
+
+# Queues that only ever receive items through queue moves. When wakeups are enabled
+# their 1s polling jobs are relaxed to the safety net interval.
+EVENT_ONLY_QUEUES = {'Scraping', 'Adding'}
+DEFAULT_SAFETY_NET_INTERVAL = 30
+
+# A pending wakeup that never ran (job removed, scheduler replaced) is dropped after this
+PENDING_WAKEUP_TIMEOUT = 120
+
+
+class QueueWakeupDispatcher:
+    """Coalescing, rate-limited wakeups for the queue processing jobs."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._get_scheduler: Optional[Callable] = None
+        self._pending: Dict[str, float] = {}
+        self._last_run: Dict[str, float] = {}
+        self.enabled = False
+        self.stats = {
+            queue_name: {'wakeups': 0, 'dispatched': 0, 'coalesced': 0, 'rate_limited': 0, 'skipped': 0}
+            for queue_name in QUEUE_JOB_IDS
+        }
+
+    def attach(self, get_scheduler: Callable):
+        """
+        Attach to the program's scheduler.
+
+        Args:
+            get_scheduler: Callable returning the current BackgroundScheduler (or None).
+                           A callable is used because the runner can recreate its scheduler.
+        """
+        self._get_scheduler = get_scheduler
+        self.enabled = bool(get_setting('Queue', 'enable_event_driven_queues', True))
+        with self._lock:
+            self._pending.clear()
+        logging.info(f"Queue wakeup dispatcher attached (event-driven queues {'enabled' if self.enabled else 'disabled'}).")
+
+    def detach(self):
+        self._get_scheduler = None
+        with self._lock:
+            self._pending.clear()
+
+    @property
+    def mode_label(self) -> str:
+        """Label used to bucket pipeline timing so polling and event-driven runs can be compared."""
+        return 'event_driven' if self.enabled and self._get_scheduler else 'polling'
+
+    def get_safety_net_interval(self, queue_name: str, interval_seconds: int) -> int:
+        """Return the polling interval to schedule for a queue job."""
+        if not self.enabled or queue_name not in EVENT_ONLY_QUEUES:
+            return interval_seconds
+        try:
+            safety_net = int(get_setting('Queue', 'event_driven_safety_net_seconds', DEFAULT_SAFETY_NET_INTERVAL))
+        except (ValueError, TypeError):
+            safety_net = DEFAULT_SAFETY_NET_INTERVAL
+        return max(interval_seconds, safety_net)
+
+    def notify(self, queue_name: str, reason: str = None) -> bool:
+        """
+        Request that a queue is processed soon.
+
+        Returns:
+            True if a run was scheduled or one was already pending, False otherwise.
+        """
+        if not self.enabled or not self._get_scheduler:
+            return False
+        job_id = QUEUE_JOB_IDS.get(queue_name)
+        if not job_id:
+            return False
+
+        scheduler = self._get_scheduler()
+        if scheduler is None or not scheduler.running:
+            return False
+
+        with self._lock:
+            stats = self.stats[queue_name]
+            stats['wakeups'] += 1
+            now = time.monotonic()
+
+            pending_at = self._pending.get(queue_name)
+            if pending_at is not None:
+                if now - pending_at < PENDING_WAKEUP_TIMEOUT:
+                    stats['coalesced'] += 1
+                    return True
+                del self._pending[queue_name]
+
+            delay = 0.0
+            last_run = self._last_run.get(queue_name)
+            min_interval = DEFAULT_MIN_WAKEUP_INTERVALS.get(queue_name, 1)
+            if last_run is not None and now - last_run < min_interval:
+                delay = min_interval - (now - last_run)
+                stats['rate_limited'] += 1
+
+            try:
+                job = scheduler.get_job(job_id)
+                # Missing job means the queue is disabled; no next_run_time means it is paused
+                if job is None or job.next_run_time is None:
+                    stats['skipped'] += 1
+                    return False
+
+                run_at = datetime.now(job.next_run_time.tzinfo) + timedelta(seconds=delay)
+                if job.next_run_time <= run_at:
+                    # Already due no later than we'd schedule it
+                    stats['coalesced'] += 1
+                    return True
+
+                job.modify(next_run_time=run_at)
+            except Exception as e:
+                stats['skipped'] += 1
+                logging.debug(f"Could not wake queue '{queue_name}': {e}")
+                return False
+
+            self._pending[queue_name] = now + delay
+            stats['dispatched'] += 1
+
+        if reason:
+            logging.debug(f"Woke {queue_name} queue ({reason}) in {delay:.2f}s")
+        return True
+
+    def mark_run(self, queue_name: str):
+        """Record that a queue has started processing, clearing any pending wakeup."""
+        with self._lock:
+            self._pending.pop(queue_name, None)
+            self._last_run[queue_name] = time.monotonic()
+
+    def get_stats(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {queue_name: dict(stats) for queue_name, stats in self.stats.items()}
@@ -49,11 +49,15 @@ from content_checkers.trakt import (
 )
 from content_checkers.mdb_list import get_wanted_from_mdblists
 from content_checkers.content_source_detail import append_content_source_detail
+from content_checkers.content_source_fetcher import fetch_in_order
 from database.not_wanted_magnets import purge_not_wanted_magnets_file
+from database.write_behind import stop_media_item_write_buffer
+from utilities.sampling_profiler import set_thread_task, clear_thread_task
+from utilities.metrics import SCHEDULER_JOB_SECONDS
 import traceback
 from datetime import datetime, timedelta, time as dt_time, timezone # Modified import
 import asyncio
-from utilities.plex_functions import run_get_collected_from_plex, run_get_recent_from_plex
+from utilities.plex_functions import run_get_collected_from_plex, run_get_recent_from_plex, add_collected_from_plex_streaming
 from routes.notifications import send_notifications, _send_notifications, get_enabled_notifications
 import requests
 from pathlib import Path
@@ -198,6 +202,10 @@ class ProgramRunner:
         # Always resume queue on startup to ensure we're not stuck in paused state
         self.queue_manager.resume_queue()
         
+        # Queue moves wake the target queue's job directly; interval polling is the safety net.
+        # Pass a callable since the scheduler can be recreated on restart.
+        self.queue_manager.wakeup_dispatcher.attach(lambda: self.scheduler)
+        
         logging.info("Successfully initialized QueueManager with queues: " + ", ".join(self.queue_manager.queues.keys()))
         
         # --- START EDIT: Define queue_processing_map FIRST ---
@@ -262,11 +270,13 @@ class ProgramRunner:
             'task_heartbeat': 120,               # Run every 2 minutes
             # 'task_update_statistics_summary': 300, # Run every 5 minutes
             'task_refresh_download_stats': 300,    # Run every 5 minutes
-            'task_precompute_airing_shows': 600,   # Precompute airing shows every 10 minutes
+            'task_precompute_airing_shows': 86400, # Verify the calendar index daily, like the statistics counters
             'task_verify_symlinked_files': 7200,    # Run every 120 minutes (if enabled)
             'task_verify_plex_removals': 900,      # Run every 15 minutes (if enabled) - supports both Plex and Jellyfin/Emby
             'task_reconcile_queues': 3600,         # Run every 1 hour
             'task_check_database_health': 3600,    # Run every hour
+            'task_backup_databases': 3600,         # Check hourly; backs up once per database_backup_interval_hours
+            'task_verify_statistics_counters': 86400, # Recount the trigger-maintained statistics daily
             'task_sync_time': 3600,                # Run every hour
             'task_check_trakt_early_releases': 3600,# Run every hour
             'task_update_show_ids': 40600,         # Run every ~11 hours
@@ -482,6 +492,8 @@ class ProgramRunner:
             'task_precompute_airing_shows',
             'task_reconcile_queues',
             'task_check_database_health',
+            'task_backup_databases',
+            'task_verify_statistics_counters',
             'task_sync_time',
             'task_check_trakt_early_releases',
             # 'task_update_show_ids',
@@ -932,6 +944,8 @@ class ProgramRunner:
                         # For regular tasks, actual_job_id and task_name_for_logging are the same (job_id)
                         wrapped_func = functools.partial(self._run_and_measure_task, job_id, task_name, target_func, args, kwargs)
 
+                        # Event-driven queues only poll as a safety net
+                        interval_seconds = self.queue_manager.wakeup_dispatcher.get_safety_net_interval(task_name, interval_seconds)
                         trigger = IntervalTrigger(seconds=interval_seconds)
 
                         # *** START EDIT: Explicitly pass scheduler's timezone to add_job ***
@@ -1607,347 +1621,152 @@ class ProgramRunner:
             cutoff_date_skipped = 0
             list_length_limited = 0
 
-            wanted_content = []
-            # Pass the original versions_from_config to fetchers, assuming they expect list/dict as per config
-            if source_type == 'Overseerr':
-                wanted_content = get_wanted_from_overseerr(versions_from_config)
-            elif source_type == 'MDBList':
-                mdblist_urls = data.get('urls', '').split(',')
-                for mdblist_url in mdblist_urls:
-                    mdblist_url = mdblist_url.strip()
-                    if mdblist_url: # Ensure not empty
-                        wanted_content.extend(get_wanted_from_mdblists(mdblist_url, versions_from_config))
-            elif source_type == 'Trakt Watchlist':
-                try:
-                    wanted_content = get_wanted_from_trakt_watchlist(versions_from_config)
-                except (ValueError, api.exceptions.RequestException) as e:
-                    logging.error(f"Failed to fetch Trakt watchlist: {str(e)}")
+            received_content = False
+            list_length_used = 0
+
+            def process_batch(items, item_versions_from_source):
+                nonlocal cache_skipped, items_processed, total_items, media_type_skipped, genre_skipped, cutoff_date_skipped
+                logging.debug(f"Processing batch of {len(items)} items from {source}")
+
+                # Convert versions from the batch if necessary; batches without their own use the source versions
+                if item_versions_from_source is None:
+                    versions_to_inject = versions_dict
+                elif isinstance(item_versions_from_source, list):
+                    versions_to_inject = {v: True for v in item_versions_from_source}
+                elif isinstance(item_versions_from_source, dict):
+                    versions_to_inject = item_versions_from_source
+                else:
+                    logging.warning(f"Unexpected format for versions in tuple for {source}. Using main source versions dict.")
+                    versions_to_inject = versions_dict # Fallback to the converted source versions
+
+                # Note: Media type and genre filtering happen after metadata processing
+
+                # Filter items based on cache
+                items_to_process_raw = [
+                    item for item in items
+                    if should_process_item(item, source, source_cache)
+                ]
+                cache_skipped += len(items) - len(items_to_process_raw)
+                if not items_to_process_raw:
                     return
-            elif source_type == 'Trakt Lists':
-                trakt_lists = data.get('trakt_lists', '').split(',')
-                for trakt_list in trakt_lists:
-                    trakt_list = trakt_list.strip()
-                    if trakt_list: # Ensure not empty
-                        try:
-                            wanted_content.extend(get_wanted_from_trakt_lists(trakt_list, versions_from_config))
-                        except (ValueError, api.exceptions.RequestException) as e:
-                            logging.error(f"Failed to fetch Trakt list {trakt_list}: {str(e)}")
+
+                # Inject CONVERTED versions into each item before metadata processing
+                items_to_process = []
+                for item_dict_raw in items_to_process_raw:
+                    item_dict_processed = item_dict_raw.copy()
+                    item_dict_processed['versions'] = versions_to_inject
+                    items_to_process.append(item_dict_processed)
+
+                from metadata.metadata import process_metadata
+                processed_items = process_metadata(items_to_process)
+                if not processed_items:
+                    return
+                all_items = processed_items.get('movies', []) + processed_items.get('episodes', []) + processed_items.get('anime', [])
+
+                # Set content source and detail for each item
+                for item in all_items:
+                    item['content_source'] = source
+                    item = append_content_source_detail(item, source_type=source_type)
+
+                # Filter by media type after metadata processing
+                if source_media_type != 'All' and not source_type.startswith('Collected'):
+                    items_filtered_type = []
+                    for item in all_items:
+                        if (source_media_type == 'Movies' and item.get('media_type') == 'movie') or \
+                           (source_media_type == 'Shows' and item.get('media_type') in ['tv', 'episode']):
+                            items_filtered_type.append(item)
+                        else:
+                            media_type_skipped += 1
+                            logging.debug(f"Item {item.get('title', 'Unknown')} skipped due to media type mismatch: {item.get('media_type')} != {source_media_type}")
+
+                    all_items = items_filtered_type
+                    if media_type_skipped > 0:
+                        logging.debug(f"Batch {source}: Skipped {media_type_skipped} items due to media type mismatch")
+
+                # Filter by excluded genres after metadata processing
+                if exclude_genres:
+                    items_filtered_genre = []
+                    batch_genre_skipped = 0
+                    for item in all_items:
+                        item_genres = item.get('genres', [])
+                        if isinstance(item_genres, str):
+                            # Handle comma-separated string format
+                            item_genres = [genre.strip() for genre in item_genres.split(',') if genre.strip()]
+
+                        # Check if any of the item's genres are in the exclude list
+                        excluded_genre_found = any(genre in exclude_genres for genre in item_genres)
+                        if not excluded_genre_found:
+                            items_filtered_genre.append(item)
+                        else:
+                            batch_genre_skipped += 1
+                            logging.debug(f"Item {item.get('title', 'Unknown')} skipped due to excluded genre(s): {[g for g in item_genres if g in exclude_genres]}")
+
+                    all_items = items_filtered_genre
+                    genre_skipped += batch_genre_skipped
+                    if batch_genre_skipped > 0:
+                        logging.debug(f"Batch {source}: Skipped {batch_genre_skipped} items due to excluded genres")
+
+                # Filter by cutoff date after metadata processing
+                if cutoff_date:
+                    items_filtered_date = []
+                    for item in all_items:
+                        # For movies, use theatrical_release_date if available, otherwise fall back to release_date
+                        if item.get('media_type') == 'movie':
+                            release_date = item.get('theatrical_release_date') or item.get('release_date')
+                        else:
+                            release_date = item.get('release_date')
+
+                        if not release_date or release_date.lower() == 'unknown':
+                            # Skip items with unknown release dates when cutoff date is set
+                            cutoff_date_skipped += 1
+                            logging.debug(f"Item {item.get('title', 'Unknown')} skipped due to unknown release date (cutoff date is set)")
                             continue
-            elif source_type == 'Trakt Collection':
-                wanted_content = get_wanted_from_trakt_collection(versions_from_config)
-            elif source_type == 'Friends Trakt Watchlist':
-                # This function takes data (source_config) and versions
-                wanted_content = get_wanted_from_friend_trakt_watchlist(data, versions_from_config)
-            elif source_type == 'Special Trakt Lists': # New elif block
-                # 'data' is the source_config, 'versions_dict' is the resolved simple versions map
-                wanted_content = get_wanted_from_special_trakt_lists(data, versions_from_config)
-            elif source_type == 'Collected':
-                wanted_content = get_wanted_from_collected() # Doesn't take versions arg
-            elif source_type == 'My Plex Watchlist':
-                from content_checkers.plex_watchlist import get_wanted_from_plex_watchlist
-                wanted_content = get_wanted_from_plex_watchlist(versions_from_config)
-            elif source_type == 'My Plex RSS Watchlist':
-                plex_rss_url = data.get('url', '')
-                wanted_content = get_wanted_from_plex_rss(plex_rss_url, versions_from_config)
-            elif source_type == 'My Friends Plex RSS Watchlist':
-                plex_rss_url = data.get('url', '')
-                wanted_content = get_wanted_from_friends_plex_rss(plex_rss_url, versions_from_config)
-            elif source_type == 'Other Plex Watchlist':
-                # Import the function here
-                from content_checkers.plex_watchlist import get_wanted_from_other_plex_watchlist
-                
-                other_watchlists = []
-                # Use self.content_sources which should be populated
-                all_sources = self.get_content_sources() if hasattr(self, 'get_content_sources') else {}
-                for source_id, source_data in all_sources.items():
-                    if source_id.startswith('Other Plex Watchlist_'):
-                        # Fetch versions specific to this 'Other' source config
-                        other_source_versions = source_data.get('versions', []) # Default list
-                        other_watchlists.append({
-                            'username': source_data.get('username', ''),
-                            'token': source_data.get('token', ''),
-                            'versions': other_source_versions # Pass its specific config
-                        })
-                
-                for watchlist in other_watchlists:
-                    if watchlist['username'] and watchlist['token']:
                         try:
-                             # Pass the versions specific to this friend's config
-                            watchlist_content = get_wanted_from_other_plex_watchlist(
-                                username=watchlist['username'],
-                                token=watchlist['token'],
-                                versions=watchlist['versions'] # Use the versions from the loop
-                            )
-                            # Extend the main wanted_content list
-                            # Note: This assumes get_wanted_from_other_plex_watchlist returns the same tuple format
-                            wanted_content.extend(watchlist_content)
-                        except Exception as e:
-                            logging.error(f"Failed to fetch Other Plex watchlist for {watchlist['username']}: {str(e)}")
-                            continue
-            else:
-                logging.warning(f"Unknown source type: {source_type}")
-                return
-
-            if wanted_content:
+                            item_date = datetime.strptime(release_date, '%Y-%m-%d').date()
+                            if item_date >= cutoff_date:
+                                items_filtered_date.append(item)
+                            else:
+                                cutoff_date_skipped += 1
+                                logging.debug(f"Item {item.get('title', 'Unknown')} skipped due to cutoff date: {release_date} < {cutoff_date}")
+                        except ValueError:
+                            # If we can't parse the date, skip the item when cutoff date is set
+                            cutoff_date_skipped += 1
+                            logging.debug(f"Item {item.get('title', 'Unknown')} skipped due to invalid date format: {release_date} (cutoff date is set)")
+                    all_items = items_filtered_date
+                    if cutoff_date_skipped > 0:
+                        logging.debug(f"Batch {source}: Skipped {cutoff_date_skipped} items due to cutoff date")
+
+                from database import add_wanted_items
+                # Pass the CONVERTED versions dict to add_wanted_items
+                add_wanted_items(all_items, versions_to_inject)
+
+                # Update cache for all items that were processed (regardless of whether they made it through filtering)
+                # This prevents reprocessing the same items repeatedly
+                for item_raw in items_to_process_raw:
+                    update_cache_for_item(item_raw, source, source_cache)
+
+                total_items += len(all_items)
+                items_processed += len(items_to_process)
+
+            # Batches are processed as they arrive; with several lists, later ones download meanwhile
+            for items, item_versions_from_source in self._iter_content_source_batches(source, source_type, data, versions_from_config):
+                received_content = True
                 # Apply list length limit if set
                 if list_length_limit > 0:
-                    if isinstance(wanted_content, list) and len(wanted_content) > 0 and isinstance(wanted_content[0], tuple):
-                        # For tuple format, limit each batch
-                        limited_wanted_content = []
-                        total_items_limited = 0
-                        for items, item_versions_from_source_tuple in wanted_content:
-                            if total_items_limited >= list_length_limit:
-                                logging.info(f"List length limit reached for {source} ({list_length_limit} items), skipping remaining batches")
-                                break
-                            remaining_limit = list_length_limit - total_items_limited
-                            if len(items) > remaining_limit:
-                                items = items[:remaining_limit]
-                                logging.info(f"Limited batch for {source} to {remaining_limit} items due to list length limit")
-                            limited_wanted_content.append((items, item_versions_from_source_tuple))
-                            total_items_limited += len(items)
-                        wanted_content = limited_wanted_content
-                        logging.info(f"Applied list length limit to {source}: processed {total_items_limited} items (limit: {list_length_limit})")
-                    else:
-                        # For single list format, limit the list
-                        original_length = len(wanted_content)
-                        if original_length > list_length_limit:
-                            wanted_content = wanted_content[:list_length_limit]
-                            logging.info(f"Applied list length limit to {source}: limited to {list_length_limit} items from {original_length}")
-                
-                if isinstance(wanted_content, list) and len(wanted_content) > 0 and isinstance(wanted_content[0], tuple):
-                    # Handle list of tuples
-                    for items, item_versions_from_source_tuple in wanted_content:
-                        logging.debug(f"Processing batch of {len(items)} items from {source}")
-
-                        # Convert versions from tuple if necessary
-                        if isinstance(item_versions_from_source_tuple, list):
-                            versions_to_inject = {v: True for v in item_versions_from_source_tuple}
-                        elif isinstance(item_versions_from_source_tuple, dict):
-                            versions_to_inject = item_versions_from_source_tuple
-                        else:
-                            logging.warning(f"Unexpected format for versions in tuple for {source}. Using main source versions dict.")
-                            versions_to_inject = versions_dict # Fallback to the converted source versions
-
-                        # Track genre filtering stats for this batch
-                        batch_genre_skipped = 0
+                    remaining_limit = list_length_limit - list_length_used
+                    if remaining_limit <= 0:
+                        logging.info(f"List length limit reached for {source} ({list_length_limit} items), skipping remaining batches")
+                        break
+                    if len(items) > remaining_limit:
+                        items = items[:remaining_limit]
+                        logging.info(f"Limited batch for {source} to {remaining_limit} items due to list length limit")
+                    list_length_used += len(items)
+                process_batch(items, item_versions_from_source)
+
+            if received_content:
+                if list_length_limit > 0:
+                    logging.info(f"Applied list length limit to {source}: processed {list_length_used} items (limit: {list_length_limit})")
 
-                        # Note: Media type and genre filtering moved to after metadata processing
-                        
-                        # Then filter items based on cache
-                        items_to_process_raw = [
-                            item for item in items 
-                            if should_process_item(item, source, source_cache)
-                        ]
-                        items_skipped = len(items) - len(items_to_process_raw)
-                        cache_skipped += items_skipped
-                        
-                        if items_to_process_raw:
-                            # Inject CONVERTED versions into each item before metadata processing
-                            items_to_process = []
-                            for item_dict_raw in items_to_process_raw:
-                                item_dict_processed = item_dict_raw.copy()
-                                item_dict_processed['versions'] = versions_to_inject # Use the converted dict
-                                items_to_process.append(item_dict_processed)
-                            
-                            from metadata.metadata import process_metadata
-                            processed_items = process_metadata(items_to_process)
-                            if processed_items:
-                                all_items = processed_items.get('movies', []) + processed_items.get('episodes', []) + processed_items.get('anime', [])
-                                
-                                # Set content source and detail for each item
-                                for item in all_items:
-                                    item['content_source'] = source
-                                    item = append_content_source_detail(item, source_type=source_type)
-                                
-                                # Filter by media type after metadata processing
-                                if source_media_type != 'All' and not source_type.startswith('Collected'):
-                                    items_filtered_type = []
-                                    for item in all_items:
-                                        if (source_media_type == 'Movies' and item.get('media_type') == 'movie') or \
-                                           (source_media_type == 'Shows' and item.get('media_type') in ['tv', 'episode']):
-                                            items_filtered_type.append(item)
-                                        else:
-                                            media_type_skipped += 1
-                                            logging.debug(f"Item {item.get('title', 'Unknown')} skipped due to media type mismatch: {item.get('media_type')} != {source_media_type}")
-                                    
-                                    all_items = items_filtered_type
-                                    if media_type_skipped > 0:
-                                        logging.debug(f"Batch {source}: Skipped {media_type_skipped} items due to media type mismatch")
-
-                                # Filter by excluded genres after metadata processing
-                                if exclude_genres:
-                                    items_filtered_genre = []
-                                    for item in all_items:
-                                        item_genres = item.get('genres', [])
-                                        if isinstance(item_genres, str):
-                                            # Handle comma-separated string format
-                                            item_genres = [genre.strip() for genre in item_genres.split(',') if genre.strip()]
-                                        
-                                        # Check if any of the item's genres are in the exclude list
-                                        excluded_genre_found = any(genre in exclude_genres for genre in item_genres)
-                                        if not excluded_genre_found:
-                                            items_filtered_genre.append(item)
-                                        else:
-                                            batch_genre_skipped += 1
-                                            logging.debug(f"Item {item.get('title', 'Unknown')} skipped due to excluded genre(s): {[g for g in item_genres if g in exclude_genres]}")
-                                    
-                                    all_items = items_filtered_genre
-                                    if batch_genre_skipped > 0:
-                                        logging.debug(f"Batch {source}: Skipped {batch_genre_skipped} items due to excluded genres")
-                                
-                                # Filter by cutoff date after metadata processing
-                                if cutoff_date:
-                                    items_filtered_date = []
-                                    for item in all_items:
-                                        # For movies, use theatrical_release_date if available, otherwise fall back to release_date
-                                        if item.get('media_type') == 'movie':
-                                            release_date = item.get('theatrical_release_date') or item.get('release_date')
-                                        else:
-                                            release_date = item.get('release_date')
-                                        
-                                        if not release_date or release_date.lower() == 'unknown':
-                                            # Skip items with unknown release dates when cutoff date is set
-                                            cutoff_date_skipped += 1
-                                            logging.debug(f"Item {item.get('title', 'Unknown')} skipped due to unknown release date (cutoff date is set)")
-                                            continue
-                                        try:
-                                            item_date = datetime.strptime(release_date, '%Y-%m-%d').date()
-                                            if item_date >= cutoff_date:
-                                                items_filtered_date.append(item)
-                                            else:
-                                                cutoff_date_skipped += 1
-                                                logging.debug(f"Item {item.get('title', 'Unknown')} skipped due to cutoff date: {release_date} < {cutoff_date}")
-                                        except ValueError:
-                                            # If we can't parse the date, skip the item when cutoff date is set
-                                            cutoff_date_skipped += 1
-                                            logging.debug(f"Item {item.get('title', 'Unknown')} skipped due to invalid date format: {release_date} (cutoff date is set)")
-                                    all_items = items_filtered_date
-                                    if cutoff_date_skipped > 0:
-                                        logging.debug(f"Batch {source}: Skipped {cutoff_date_skipped} items due to cutoff date")
-
-                                from database import add_collected_items, add_wanted_items
-                                # Pass the CONVERTED versions dict to add_wanted_items
-                                add_wanted_items(all_items, versions_to_inject or versions_dict)
-                                
-                                # Update cache for all items that were processed (regardless of whether they made it through filtering)
-                                # This prevents reprocessing the same items repeatedly
-                                for item_raw in items_to_process_raw:
-                                    update_cache_for_item(item_raw, source, source_cache)
-                                
-                                total_items += len(all_items)
-                                items_processed += len(items_to_process)
-                                genre_skipped += batch_genre_skipped
-                else:
-                    # Handle single list of items
-                    logging.debug(f"Processing batch of {len(wanted_content)} items from {source}")
-                    
-                    # Note: Media type and genre filtering moved to after metadata processing
-                    
-                    # Then filter items based on cache
-                    items_to_process_raw = [
-                        item for item in wanted_content 
-                        if should_process_item(item, source, source_cache)
-                    ]
-                    items_skipped = len(wanted_content) - len(items_to_process_raw)
-                    cache_skipped += items_skipped
-                    
-                    if items_to_process_raw:
-                        # Inject CONVERTED versions into each item before metadata processing
-                        items_to_process = []
-                        for item_dict_raw in items_to_process_raw:
-                            item_dict_processed = item_dict_raw.copy()
-                            # Use the CONVERTED source-level versions_dict here
-                            item_dict_processed['versions'] = versions_dict 
-                            items_to_process.append(item_dict_processed)
-
-                        from metadata.metadata import process_metadata
-                        processed_items = process_metadata(items_to_process)
-                        if processed_items:
-                            all_items = processed_items.get('movies', []) + processed_items.get('episodes', []) + processed_items.get('anime', [])
-                            
-                            # Set content source and detail for each item
-                            for item in all_items:
-                                item['content_source'] = source
-                                item = append_content_source_detail(item, source_type=source_type)
-                            
-                            # Filter by media type after metadata processing
-                            if source_media_type != 'All' and not source_type.startswith('Collected'):
-                                items_filtered_type = []
-                                for item in all_items:
-                                    if (source_media_type == 'Movies' and item.get('media_type') == 'movie') or \
-                                       (source_media_type == 'Shows' and item.get('media_type') in ['tv', 'episode']):
-                                        items_filtered_type.append(item)
-                                    else:
-                                        media_type_skipped += 1
-                                        logging.debug(f"Item {item.get('title', 'Unknown')} skipped due to media type mismatch: {item.get('media_type')} != {source_media_type}")
-                                
-                                all_items = items_filtered_type
-                                if media_type_skipped > 0:
-                                    logging.debug(f"{source}: Skipped {media_type_skipped} items due to media type mismatch")
-
-                            # Filter by excluded genres after metadata processing
-                            if exclude_genres:
-                                items_filtered_genre = []
-                                for item in all_items:
-                                    item_genres = item.get('genres', [])
-                                    if isinstance(item_genres, str):
-                                        # Handle comma-separated string format
-                                        item_genres = [genre.strip() for genre in item_genres.split(',') if genre.strip()]
-                                    
-                                    # Check if any of the item's genres are in the exclude list
-                                    excluded_genre_found = any(genre in exclude_genres for genre in item_genres)
-                                    if not excluded_genre_found:
-                                        items_filtered_genre.append(item)
-                                    else:
-                                        genre_skipped += 1
-                                        logging.debug(f"Item {item.get('title', 'Unknown')} skipped due to excluded genre(s): {[g for g in item_genres if g in exclude_genres]}")
-                                
-                                all_items = items_filtered_genre
-                                if genre_skipped > 0:
-                                    logging.debug(f"{source}: Skipped {genre_skipped} items due to excluded genres")
-                            
-                            # Filter by cutoff date after metadata processing
-                            if cutoff_date:
-                                items_filtered_date = []
-                                for item in all_items:
-                                    # For movies, use theatrical_release_date if available, otherwise fall back to release_date
-                                    if item.get('media_type') == 'movie':
-                                        release_date = item.get('theatrical_release_date') or item.get('release_date')
-                                    else:
-                                        release_date = item.get('release_date')
-                                    
-                                    if not release_date or release_date.lower() == 'unknown':
-                                        # Skip items with unknown release dates when cutoff date is set
-                                        cutoff_date_skipped += 1
-                                        logging.debug(f"Item {item.get('title', 'Unknown')} skipped due to unknown release date (cutoff date is set)")
-                                        continue
-                                    try:
-                                        item_date = datetime.strptime(release_date, '%Y-%m-%d').date()
-                                        if item_date >= cutoff_date:
-                                            items_filtered_date.append(item)
-                                        else:
-                                            cutoff_date_skipped += 1
-                                            logging.debug(f"Item {item.get('title', 'Unknown')} skipped due to cutoff date: {release_date} < {cutoff_date}")
-                                    except ValueError:
-                                        # If we can't parse the date, skip the item when cutoff date is set
-                                        cutoff_date_skipped += 1
-                                        logging.debug(f"Item {item.get('title', 'Unknown')} skipped due to invalid date format: {release_date} (cutoff date is set)")
-                                all_items = items_filtered_date
-                                if cutoff_date_skipped > 0:
-                                    logging.debug(f"{source}: Skipped {cutoff_date_skipped} items due to cutoff date")
-
-                            from database import add_collected_items, add_wanted_items
-                            # Pass the CONVERTED versions_dict to add_wanted_items
-                            add_wanted_items(all_items, versions_dict)
-                            
-                            # Update cache for all items that were processed (regardless of whether they made it through filtering)
-                            # This prevents reprocessing the same items repeatedly
-                            for item_raw in items_to_process_raw:
-                                update_cache_for_item(item_raw, source, source_cache)
-                            
-                            total_items += len(all_items)
-                            items_processed += len(items_to_process)
-                
                 # Save the updated cache
                 save_source_cache(source, source_cache)
                 logging.debug(f"Final cache state for {source}: {len(source_cache)} entries")
@@ -1973,6 +1792,92 @@ class ProgramRunner:
             logging.error(traceback.format_exc())
             # Don't re-raise - allow other content sources to continue processing
 
+    def _iter_content_source_batches(self, source, source_type, data, versions_from_config):
+        """
+        Yield (items, versions) batches for a content source as they are fetched.
+
+        versions is None for sources that return a plain item list (the source's
+        own versions apply). Sources made of several lists fetch them concurrently
+        and yield each list, in configured order, as soon as it is ready.
+        """
+        def batches(wanted_content):
+            if not wanted_content:
+                return
+            if isinstance(wanted_content, list) and isinstance(wanted_content[0], tuple):
+                yield from wanted_content
+            else:
+                yield wanted_content, None
+
+        # Pass the original versions_from_config to fetchers, assuming they expect list/dict as per config
+        if source_type == 'Overseerr':
+            yield from batches(get_wanted_from_overseerr(versions_from_config))
+        elif source_type == 'MDBList':
+            mdblist_urls = [url.strip() for url in data.get('urls', '').split(',') if url.strip()]
+            jobs = [(url, functools.partial(get_wanted_from_mdblists, url, versions_from_config)) for url in mdblist_urls]
+            for mdblist_url, wanted_content, error in fetch_in_order(jobs, 'mdblist'):
+                if error is not None:
+                    logging.error(f"Failed to fetch MDBList {mdblist_url}: {str(error)}")
+                    continue
+                yield from batches(wanted_content)
+        elif source_type == 'Trakt Watchlist':
+            try:
+                wanted_content = get_wanted_from_trakt_watchlist(versions_from_config)
+            except (ValueError, api.exceptions.RequestException) as e:
+                logging.error(f"Failed to fetch Trakt watchlist: {str(e)}")
+                return
+            yield from batches(wanted_content)
+        elif source_type == 'Trakt Lists':
+            trakt_lists = [trakt_list.strip() for trakt_list in data.get('trakt_lists', '').split(',') if trakt_list.strip()]
+            jobs = [(trakt_list, functools.partial(get_wanted_from_trakt_lists, trakt_list, versions_from_config)) for trakt_list in trakt_lists]
+            for trakt_list, wanted_content, error in fetch_in_order(jobs, 'trakt'):
+                if error is not None:
+                    if not isinstance(error, (ValueError, api.exceptions.RequestException)):
+                        raise error
+                    logging.error(f"Failed to fetch Trakt list {trakt_list}: {str(error)}")
+                    continue
+                yield from batches(wanted_content)
+        elif source_type == 'Trakt Collection':
+            yield from batches(get_wanted_from_trakt_collection(versions_from_config))
+        elif source_type == 'Friends Trakt Watchlist':
+            # This function takes data (source_config) and versions
+            yield from batches(get_wanted_from_friend_trakt_watchlist(data, versions_from_config))
+        elif source_type == 'Special Trakt Lists':
+            # 'data' is the source_config
+            yield from batches(get_wanted_from_special_trakt_lists(data, versions_from_config))
+        elif source_type == 'Collected':
+            yield from batches(get_wanted_from_collected()) # Doesn't take versions arg
+        elif source_type == 'My Plex Watchlist':
+            from content_checkers.plex_watchlist import get_wanted_from_plex_watchlist
+            yield from batches(get_wanted_from_plex_watchlist(versions_from_config))
+        elif source_type == 'My Plex RSS Watchlist':
+            plex_rss_url = data.get('url', '')
+            yield from batches(get_wanted_from_plex_rss(plex_rss_url, versions_from_config))
+        elif source_type == 'My Friends Plex RSS Watchlist':
+            plex_rss_url = data.get('url', '')
+            yield from batches(get_wanted_from_friends_plex_rss(plex_rss_url, versions_from_config))
+        elif source_type == 'Other Plex Watchlist':
+            from content_checkers.plex_watchlist import get_wanted_from_other_plex_watchlist
+
+            jobs = []
+            # Use self.content_sources which should be populated
+            all_sources = self.get_content_sources() if hasattr(self, 'get_content_sources') else {}
+            for source_id, source_data in all_sources.items():
+                if source_id.startswith('Other Plex Watchlist_') and source_data.get('username') and source_data.get('token'):
+                    # Each 'Other' source uses the versions from its own config
+                    jobs.append((source_data['username'], functools.partial(
+                        get_wanted_from_other_plex_watchlist,
+                        username=source_data['username'],
+                        token=source_data['token'],
+                        versions=source_data.get('versions', [])
+                    )))
+            for username, watchlist_content, error in fetch_in_order(jobs, 'plex'):
+                if error is not None:
+                    logging.error(f"Failed to fetch Other Plex watchlist for {username}: {str(error)}")
+                    continue
+                yield from batches(watchlist_content)
+        else:
+            logging.warning(f"Unknown source type: {source_type}")
+
     def task_refresh_release_dates(self):
         from metadata.metadata import refresh_release_dates # Added import here
         refresh_release_dates()
@@ -2127,6 +2032,12 @@ class ProgramRunner:
             if self._running: # If it thought it was running, mark it as not running anymore.
                 self._running = False 
             
+            # Flush buffered queue timing rows before shutting down
+            try:
+                self.queue_manager.queue_timer.save_timing_data(force=True)
+            except Exception as e:
+                logging.error(f"Error flushing queue timing data on stop: {e}")
+            
             if self.scheduler:
                 try:
                     logging.info("Attempting to shut down APScheduler...")
@@ -2140,6 +2051,18 @@ class ProgramRunner:
                 self.scheduler = None 
             else:
                 logging.info("No APScheduler instance to shut down (was None).")
+
+            # No queue jobs run now; let running scrapes finish and hand off their queue moves
+            try:
+                self.queue_manager.queues['Scraping'].shutdown_workers(self.queue_manager)
+            except Exception as e:
+                logging.error(f"Error stopping scraping workers on stop: {e}", exc_info=True)
+
+            # No more queue jobs run now; write out buffered media item updates
+            try:
+                stop_media_item_write_buffer()
+            except Exception as e:
+                logging.error(f"Error flushing buffered media item updates on stop: {e}")
             
             self._running = False # Final confirmation
             logging.info("ProgramRunner: Stop sequence completed.")
@@ -3967,6 +3890,27 @@ class ProgramRunner:
     #     except Exception as e:
     #         logging.error(f"Error updating statistics summary: {str(e)}")
 
+    def task_backup_databases(self):
+        """Back up the databases with the SQLite online backup API once per configured interval."""
+        from database.backup import run_database_backups, DEFAULT_INTERVAL_HOURS
+        try:
+            interval_hours = float(get_setting('Debug', 'database_backup_interval_hours', DEFAULT_INTERVAL_HOURS))
+        except (TypeError, ValueError):
+            interval_hours = DEFAULT_INTERVAL_HOURS
+        if interval_hours <= 0:
+            return
+        for result in run_database_backups(min_age_hours=interval_hours):
+            if result.get('error'):
+                logging.error(f"Scheduled backup of {result['name']} failed: {result['error']}")
+
+    def task_verify_statistics_counters(self):
+        """Compare the trigger-maintained statistics counters with a full recount and rebuild them on drift."""
+        from database.statistics_counters import verify_statistics_counters
+        result = verify_statistics_counters(repair=True)
+        if not result['consistent']:
+            logging.warning(f"Statistics counters drifted ({len(result['mismatches'])} mismatches), "
+                            f"rebuilt: {result['repaired']}")
+
     def task_check_database_health(self):
         """Periodic task to verify database health and handle any corruption."""
         from main import verify_database_health
@@ -4227,22 +4171,19 @@ class ProgramRunner:
 
 
     def task_precompute_airing_shows(self):
-        """Precompute the recently aired and airing soon shows in a background task"""
+        """Check the trigger-maintained calendar index behind the airing shows and calendar views, rebuilding it on drift"""
         try:
-            from routes.statistics_routes import get_recently_aired_and_airing_soon
-
-            # Actually call the function to populate the cache
-            logging.info("Precomputing airing shows data...")
+            from database.calendar_index import verify_calendar_index
             start_time = time.time()
-            # *** START EDIT ***
-            # Call the function without the unsupported force_refresh argument
-            recently_aired, airing_soon = get_recently_aired_and_airing_soon()
-            # *** END EDIT ***
-
+            result = verify_calendar_index(repair=True)
             duration = time.time() - start_time
-            logging.info(f"Precomputed airing shows data in {duration:.2f}s. Found {len(recently_aired)} recently aired and {len(airing_soon)} airing soon shows.")
+            if result['consistent']:
+                logging.debug(f"Calendar index verified in {duration:.2f}s")
+            else:
+                logging.warning(f"Calendar index had {result['missing']} missing and {result['stale']} stale rows, "
+                                f"rebuilt: {result['repaired']} ({duration:.2f}s)")
         except Exception as e:
-            logging.error(f"Error precomputing airing shows: {e}")
+            logging.error(f"Error verifying calendar index: {e}")
 
     # --- START: New Task Implementation ---
     def task_update_tv_show_status(self):
@@ -4672,6 +4613,7 @@ class ProgramRunner:
         cpu_start = self._get_current_thread_cpu_seconds()
         # --- END EDIT ---
 
+        set_thread_task(f"job:{task_name_for_logging}")
         try:
             # Execute the original task function
             func(*args, **kwargs)
@@ -4762,6 +4704,7 @@ class ProgramRunner:
 
             raise # Re-raise the exception
         finally:
+            clear_thread_task()
             # --- START EDIT: Manage currently_executing_tasks ---
             with self._running_task_lock:
                 self.currently_executing_tasks.discard(actual_job_id_from_scheduler)
@@ -4889,6 +4832,9 @@ class ProgramRunner:
                 logging.info(f"Task '{normalized_name}' is not currently scheduled. Interval preference updated internally.")
                 return True
 
+            # Event-driven queues only poll as a safety net
+            target_interval_seconds = self.queue_manager.wakeup_dispatcher.get_safety_net_interval(normalized_name, target_interval_seconds)
+
             try:
                 self.scheduler.reschedule_job(
                     normalized_name,
@@ -5114,6 +5060,7 @@ class ProgramRunner:
     def _record_task_runtime(self, task_name: str, duration_seconds: float):
         """Accumulate runtime and periodically log per-task percentage."""
         now = time.monotonic()
+        SCHEDULER_JOB_SECONDS.observe(duration_seconds, job=task_name)
         with self.task_runtime_lock:
             self.task_runtime_totals[task_name] += duration_seconds
             if now - self._last_runtime_log_time >= self._runtime_log_interval_sec:
@@ -5421,6 +5368,21 @@ def get_and_add_all_collected_from_plex(bypass=False):
     collected_content = None  # Initialize here
     mode = get_setting('File Management', 'file_collection_management')
 
+    if (mode == 'Plex' or bypass) and get_setting('Debug', 'plex_streaming_full_scan', True):
+        logging.info("Streaming all collected content from Plex into the database...")
+        try:
+            chunk_size = int(get_setting('Debug', 'plex_streaming_chunk_size', 500))
+            summary = asyncio.run(add_collected_from_plex_streaming(chunk_size=chunk_size))
+        except Exception as e:
+            logging.error(f"Error running add_collected_from_plex_streaming: {e}", exc_info=True)
+            return None
+        if summary is None:
+            logging.warning("Streamed Plex scan did not complete.")
+            return None
+        logging.info(f"Finished adding {summary['movies_count']} movie and {summary['episodes_count']} episode entries from Plex.")
+        # Items were written as they streamed in, so only the counts are returned
+        return {'movies': [], 'episodes': [], **summary}
+
     if mode == 'Plex' or bypass:
         logging.info("Getting all collected content from Plex...")
         try:
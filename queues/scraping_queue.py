@@ -11,6 +11,7 @@ from scraper.scraper import scrape
 from database.not_wanted_magnets import is_magnet_not_wanted, is_url_not_wanted
 from cli_battery.app.direct_api import DirectAPI
 from routes.notifications import send_upgrade_failed_notification
+from queues.scraping_workers import ScrapingWorkerPool, get_configured_worker_count
 
 
 class ScrapingQueue:
@@ -18,6 +19,8 @@ class ScrapingQueue:
         self.items = []
         # Use a set for efficient ID lookup of in-memory items
         self._item_ids = set()
+        # Created on demand when Queue.scraping_workers > 1
+        self._worker_pool = None
 
     def update(self):
         """Synchronize the in-memory queue with the database state."""
@@ -183,6 +186,11 @@ class ScrapingQueue:
 
     def remove_item(self, item: Dict[str, Any]):
         """Remove an item from the in-memory queue."""
+        # Scraping workers hand removals over to the scheduler thread with their queue moves
+        transitions = self._worker_pool.current_transitions if self._worker_pool else None
+        if transitions is not None:
+            transitions.record_removal(item)
+            return
         item_id = item.get('id')
         if item_id and item_id in self._item_ids:
             self.items = [i for i in self.items if i['id'] != item_id]
@@ -191,6 +199,23 @@ class ScrapingQueue:
             logging.warning("Attempted to remove item without ID from ScrapingQueue.")
         # else: item not found in memory
 
+    def add_items(self, items: List[Dict[str, Any]]):
+        """Add several items to the in-memory queue in a single pass, skipping ones already present."""
+        for item in items:
+            item_id = item.get('id')
+            if item_id and item_id not in self._item_ids:
+                self.items.append(item)
+                self._item_ids.add(item_id)
+            elif not item_id:
+                logging.warning("Attempted to add item without ID to ScrapingQueue.")
+
+    def remove_items(self, items: List[Dict[str, Any]]):
+        """Remove several items from the in-memory queue in a single pass."""
+        ids_to_remove = {item.get('id') for item in items if item.get('id')} & self._item_ids
+        if ids_to_remove:
+            self.items = [i for i in self.items if i['id'] not in ids_to_remove]
+            self._item_ids -= ids_to_remove
+
     def reset_not_wanted_check(self, item_id):
         """Reset the disable_not_wanted_check flag after scraping is complete"""
         from database import get_db_connection
@@ -208,7 +233,66 @@ class ScrapingQueue:
         finally:
             conn.close()
 
+    def _get_worker_pool(self):
+        """Return the scraping worker pool, or None when items are processed sequentially."""
+        workers = get_configured_worker_count()
+        pool = self._worker_pool
+        # Resize (or drop back to sequential) only once the current pool has drained
+        if pool is not None and pool.num_workers != workers and pool.is_idle():
+            pool.shutdown()
+            pool = self._worker_pool = None
+        if pool is None and workers > 1:
+            logging.info(f"Starting scraping worker pool with {workers} workers.")
+            pool = self._worker_pool = ScrapingWorkerPool(self._process_item, workers)
+        return pool
+
     def process(self, queue_manager):
+        worker_pool = self._get_worker_pool()
+        if worker_pool is None:
+            if not self.items:
+                return False
+            # Sequential: one item per run, in queue order
+            return self._process_item(self.items[0], queue_manager)
+
+        # Apply queue moves of finished items first so their shows can be dispatched again
+        worker_pool.apply_completed(queue_manager, self)
+        dispatched = worker_pool.dispatch(self.items, queue_manager)
+        return dispatched > 0 or len(self.items) > 0
+
+    def has_dispatchable_items(self) -> bool:
+        """True if a process() run right now could start work on an item."""
+        if self._worker_pool is None:
+            return bool(self.items)
+        return self._worker_pool.has_dispatchable(self.items)
+
+    def get_worker_stats(self):
+        """Items/hour and per-worker utilization of the scraping worker pool, or None if not in use."""
+        return self._worker_pool.get_stats() if self._worker_pool else None
+
+    def shutdown_workers(self, queue_manager):
+        """
+        Stop the scraping worker pool on program stop.
+
+        Waits for the scrapes already running, then applies their queue moves so
+        nothing is left to replay after a restart. Items that were not started stay
+        in the queue.
+        """
+        pool = self._worker_pool
+        if pool is None:
+            return
+        self._worker_pool = None
+        logging.info("Stopping scraping worker pool; waiting for running scrapes to finish.")
+        pool.shutdown(wait=True, cancel_pending=True)
+        applied = pool.apply_completed(queue_manager, self)
+        logging.info(f"Scraping worker pool stopped; applied queue moves for {applied} finished items.")
+
+    def _process_item(self, item_to_process: Dict[str, Any], queue_manager):
+        """
+        Scrape a single item and move it on.
+
+        `queue_manager` is the real queue manager when processing sequentially, or a
+        DeferredQueueTransitions recorder when running on a scraping worker.
+        """
         from database import get_all_media_items, get_media_item_by_id, get_db_connection, get_wake_count
         processed_count = 0
         had_error = False
@@ -218,572 +302,569 @@ class ScrapingQueue:
         # Specific ID for debugging
         DEBUG_ITEM_ID = '177245'
 
-        if self.items:
-            # Peek at the first item instead of popping immediately
-            item_to_process = self.items[0]
-            item_id_being_processed = item_to_process['id'] # Store ID for later check
-            item_identifier = queue_manager.generate_identifier(item_to_process)
-            processed_successfully_or_moved = False # Flag to track if item was moved/handled
+        item_id_being_processed = item_to_process['id'] # Store ID for later check
+        item_identifier = queue_manager.generate_identifier(item_to_process)
+        processed_successfully_or_moved = False # Flag to track if item was moved/handled
+
+        if str(item_id_being_processed) == DEBUG_ITEM_ID:
+            # logging.info(f"[DEBUG_ITEM_{DEBUG_ITEM_ID}] Now being processed at the start of ScrapingQueue.process(). Force_priority: {item_to_process.get('force_priority', False)}")
+            pass
 
+        # --- Alternate scrape time strategy ---
+        if str(item_id_being_processed) == DEBUG_ITEM_ID:
+            # logging.info(f"[DEBUG_ITEM_{DEBUG_ITEM_ID}] Checking alternate scrape window. Item date: {item_to_process.get('release_date')}, Airtime: {item_to_process.get('airtime')}")
+            pass
+        
+        # NEW: Check physical release requirement before alternate scrape window logic
+        # This prevents items with future physical release dates from bouncing between queues
+        scraping_versions = get_setting('Scraping', 'versions', {})
+        version_settings = scraping_versions.get(item_to_process.get('version', ''), {})
+        require_physical = version_settings.get('require_physical_release', False)
+        is_magnet_assigned = item_to_process.get('content_source') == 'Magnet_Assigner'
+        
+        if not is_magnet_assigned and item_to_process.get('type') == 'movie' and require_physical:
+            physical_release_date = item_to_process.get('physical_release_date')
+            if physical_release_date:
+                try:
+                    physical_date = datetime.strptime(physical_release_date, '%Y-%m-%d').date()
+                    if physical_date > today:
+                        if str(item_id_being_processed) == DEBUG_ITEM_ID:
+                            # logging.info(f"[DEBUG_ITEM_{DEBUG_ITEM_ID}] Has future physical release date ({physical_date}). Moving to Wanted regardless of alternate scrape window.")
+                            pass
+                        logging.info(f"Movie {item_identifier} has a future physical release date ({physical_date}). Moving back to Wanted queue.")
+                        queue_manager.move_to_wanted(item_to_process, "Scraping")
+                        self.remove_item(item_to_process)
+                        return True
+                except ValueError:
+                    logging.warning(f"Invalid physical release date format for movie {item_identifier}: {physical_release_date}")
+                    # Continue with normal processing if date format is invalid
+                    pass
+            # If no physical date or physical date has passed, continue with alternate scrape window check
+        
+        # Now check alternate scrape window (only if physical release check passed)
+        alt_scrape_check_result = self._is_within_alternate_scrape_window(item_to_process, datetime.now())
+        if not alt_scrape_check_result:
             if str(item_id_being_processed) == DEBUG_ITEM_ID:
-                # logging.info(f"[DEBUG_ITEM_{DEBUG_ITEM_ID}] Now being processed at the start of ScrapingQueue.process(). Force_priority: {item_to_process.get('force_priority', False)}")
+                # logging.info(f"[DEBUG_ITEM_{DEBUG_ITEM_ID}] FAILED alternate scrape window check. Moving to Wanted.")
                 pass
+            # logging.info(f"{item_identifier} is not within the alternate scrape window. Moving back to Wanted queue.")
+            queue_manager.move_to_wanted(item_to_process, "Scraping")
+            self.remove_item(item_to_process)
+            return True
+        elif str(item_id_being_processed) == DEBUG_ITEM_ID:
+            # logging.info(f"[DEBUG_ITEM_{DEBUG_ITEM_ID}] PASSED alternate scrape window check.")
+            pass
 
-            # --- Alternate scrape time strategy ---
+        # --- START: Check if related item is in Adding Queue --- 
+        item_imdb_id = item_to_process.get('imdb_id')
+        if item_imdb_id: # Only check if IMDb ID exists
             if str(item_id_being_processed) == DEBUG_ITEM_ID:
-                # logging.info(f"[DEBUG_ITEM_{DEBUG_ITEM_ID}] Checking alternate scrape window. Item date: {item_to_process.get('release_date')}, Airtime: {item_to_process.get('airtime')}")
+                # logging.info(f"[DEBUG_ITEM_{DEBUG_ITEM_ID}] Checking if related item (IMDb: {item_imdb_id}) is in Adding Queue.")
                 pass
-            
-            # NEW: Check physical release requirement before alternate scrape window logic
-            # This prevents items with future physical release dates from bouncing between queues
-            scraping_versions = get_setting('Scraping', 'versions', {})
-            version_settings = scraping_versions.get(item_to_process.get('version', ''), {})
-            require_physical = version_settings.get('require_physical_release', False)
-            is_magnet_assigned = item_to_process.get('content_source') == 'Magnet_Assigner'
-            
-            if not is_magnet_assigned and item_to_process.get('type') == 'movie' and require_physical:
-                physical_release_date = item_to_process.get('physical_release_date')
-                if physical_release_date:
-                    try:
-                        physical_date = datetime.strptime(physical_release_date, '%Y-%m-%d').date()
-                        if physical_date > today:
-                            if str(item_id_being_processed) == DEBUG_ITEM_ID:
-                                # logging.info(f"[DEBUG_ITEM_{DEBUG_ITEM_ID}] Has future physical release date ({physical_date}). Moving to Wanted regardless of alternate scrape window.")
-                                pass
-                            logging.info(f"Movie {item_identifier} has a future physical release date ({physical_date}). Moving back to Wanted queue.")
-                            queue_manager.move_to_wanted(item_to_process, "Scraping")
-                            self.remove_item(item_to_process)
-                            return True
-                    except ValueError:
-                        logging.warning(f"Invalid physical release date format for movie {item_identifier}: {physical_release_date}")
-                        # Continue with normal processing if date format is invalid
+            try:
+                adding_queue = queue_manager.queues.get("Adding")
+                if adding_queue and adding_queue.get_contents(): # Check if Adding queue exists and has items
+                    is_in_adding = any(adding_item.get('imdb_id') == item_imdb_id for adding_item in adding_queue.get_contents())
+                    if is_in_adding:
+                        if str(item_id_being_processed) == DEBUG_ITEM_ID:
+                            # logging.info(f"[DEBUG_ITEM_{DEBUG_ITEM_ID}] DEFERRED - related item found in Adding Queue.")
+                            pass
+                        # logging.info(f"Deferring processing for {item_identifier} (IMDb: {item_imdb_id}) - related item found in Adding Queue.")
+                        return False # Defer processing, keep item in queue
+                    elif str(item_id_being_processed) == DEBUG_ITEM_ID:
+                        # logging.info(f"[DEBUG_ITEM_{DEBUG_ITEM_ID}] PASSED Adding Queue check (no related item found).")
                         pass
-                # If no physical date or physical date has passed, continue with alternate scrape window check
-            
-            # Now check alternate scrape window (only if physical release check passed)
-            alt_scrape_check_result = self._is_within_alternate_scrape_window(item_to_process, datetime.now())
-            if not alt_scrape_check_result:
+            except Exception as e:
                 if str(item_id_being_processed) == DEBUG_ITEM_ID:
-                    # logging.info(f"[DEBUG_ITEM_{DEBUG_ITEM_ID}] FAILED alternate scrape window check. Moving to Wanted.")
+                    # logging.error(f"[DEBUG_ITEM_{DEBUG_ITEM_ID}] Error checking Adding Queue: {e}")
                     pass
-                # logging.info(f"{item_identifier} is not within the alternate scrape window. Moving back to Wanted queue.")
-                queue_manager.move_to_wanted(item_to_process, "Scraping")
-                self.remove_item(item_to_process)
-                return True
-            elif str(item_id_being_processed) == DEBUG_ITEM_ID:
-                # logging.info(f"[DEBUG_ITEM_{DEBUG_ITEM_ID}] PASSED alternate scrape window check.")
+                # logging.error(f"Error checking Adding Queue for {item_identifier}: {e}")
                 pass
+        elif str(item_id_being_processed) == DEBUG_ITEM_ID:
+            # logging.info(f"[DEBUG_ITEM_{DEBUG_ITEM_ID}] SKIPPED Adding Queue check (no IMDb ID).")
+            pass
+        # --- END: Check if related item is in Adding Queue ---
 
-            # --- START: Check if related item is in Adding Queue --- 
-            item_imdb_id = item_to_process.get('imdb_id')
-            if item_imdb_id: # Only check if IMDb ID exists
-                if str(item_id_being_processed) == DEBUG_ITEM_ID:
-                    # logging.info(f"[DEBUG_ITEM_{DEBUG_ITEM_ID}] Checking if related item (IMDb: {item_imdb_id}) is in Adding Queue.")
-                    pass
-                try:
-                    adding_queue = queue_manager.queues.get("Adding")
-                    if adding_queue and adding_queue.get_contents(): # Check if Adding queue exists and has items
-                        is_in_adding = any(adding_item.get('imdb_id') == item_imdb_id for adding_item in adding_queue.get_contents())
-                        if is_in_adding:
-                            if str(item_id_being_processed) == DEBUG_ITEM_ID:
-                                # logging.info(f"[DEBUG_ITEM_{DEBUG_ITEM_ID}] DEFERRED - related item found in Adding Queue.")
-                                pass
-                            # logging.info(f"Deferring processing for {item_identifier} (IMDb: {item_imdb_id}) - related item found in Adding Queue.")
-                            return False # Defer processing, keep item in queue
-                        elif str(item_id_being_processed) == DEBUG_ITEM_ID:
-                            # logging.info(f"[DEBUG_ITEM_{DEBUG_ITEM_ID}] PASSED Adding Queue check (no related item found).")
-                            pass
-                except Exception as e:
-                    if str(item_id_being_processed) == DEBUG_ITEM_ID:
-                        # logging.error(f"[DEBUG_ITEM_{DEBUG_ITEM_ID}] Error checking Adding Queue: {e}")
-                        pass
-                    # logging.error(f"Error checking Adding Queue for {item_identifier}: {e}")
-                    pass
-            elif str(item_id_being_processed) == DEBUG_ITEM_ID:
-                # logging.info(f"[DEBUG_ITEM_{DEBUG_ITEM_ID}] SKIPPED Adding Queue check (no IMDb ID).")
+        try:
+            if str(item_id_being_processed) == DEBUG_ITEM_ID:
+                # logging.info(f"[DEBUG_ITEM_{DEBUG_ITEM_ID}] Entering main try block for scraping. Item details: EarlyRelease={item_to_process.get('early_release', False)}, ContentSource={item_to_process.get('content_source')}, ReleaseDate='{item_to_process.get('release_date')}'")
                 pass
-            # --- END: Check if related item is in Adding Queue ---
 
-            try:
-                if str(item_id_being_processed) == DEBUG_ITEM_ID:
-                    # logging.info(f"[DEBUG_ITEM_{DEBUG_ITEM_ID}] Entering main try block for scraping. Item details: EarlyRelease={item_to_process.get('early_release', False)}, ContentSource={item_to_process.get('content_source')}, ReleaseDate='{item_to_process.get('release_date')}'")
-                    pass
-
-                # logging.info(f"Starting to process scraping results for {item_identifier}")
-                processed_an_item_this_cycle = True # Mark that we started processing
+            # logging.info(f"Starting to process scraping results for {item_identifier}")
+            processed_an_item_this_cycle = True # Mark that we started processing
 
-                # --- START EDIT: Add content source check ---
-                is_magnet_assigned = item_to_process.get('content_source') == 'Magnet_Assigner'
-                # --- END EDIT ---
+            # --- START EDIT: Add content source check ---
+            is_magnet_assigned = item_to_process.get('content_source') == 'Magnet_Assigner'
+            # --- END EDIT ---
 
-                # Check release date logic - skip for early release items AND magnet assigned items
-                # --- Use item_to_process instead of item throughout ---
-                if not item_to_process.get('early_release', False) and not is_magnet_assigned: # <-- Added is_magnet_assigned check
+            # Check release date logic - skip for early release items AND magnet assigned items
+            # --- Use item_to_process instead of item throughout ---
+            if not item_to_process.get('early_release', False) and not is_magnet_assigned: # <-- Added is_magnet_assigned check
+                if str(item_id_being_processed) == DEBUG_ITEM_ID:
+                    # logging.info(f"[DEBUG_ITEM_{DEBUG_ITEM_ID}] Evaluating standard release date logic. EarlyRelease={item_to_process.get('early_release', False)}, IsMagnetAssigned={is_magnet_assigned}")
+                    pass
+                if item_to_process['release_date'] == 'Unknown':
                     if str(item_id_being_processed) == DEBUG_ITEM_ID:
-                        # logging.info(f"[DEBUG_ITEM_{DEBUG_ITEM_ID}] Evaluating standard release date logic. EarlyRelease={item_to_process.get('early_release', False)}, IsMagnetAssigned={is_magnet_assigned}")
+                        # logging.info(f"[DEBUG_ITEM_{DEBUG_ITEM_ID}] Release date is 'Unknown'. Moving to Wanted.")
                         pass
-                    if item_to_process['release_date'] == 'Unknown':
-                        if str(item_id_being_processed) == DEBUG_ITEM_ID:
-                            # logging.info(f"[DEBUG_ITEM_{DEBUG_ITEM_ID}] Release date is 'Unknown'. Moving to Wanted.")
-                            pass
-                        # logging.info(f"Item {item_identifier} has an unknown release date. Moving back to Wanted queue.")
-                        queue_manager.move_to_wanted(item_to_process, "Scraping")
-                        processed_successfully_or_moved = True # Handled by move
-                        processed_count += 1
-                        # No return here, let finally handle removal check if needed
-                elif is_magnet_assigned:
-                    logging.info(f"Processing Magnet Assigned item {item_identifier} regardless of release date")
-                elif item_to_process.get('early_release', False): # Existing early release logic
-                    logging.info(f"Processing early release item {item_identifier} regardless of release date")
-
-                # Proceed only if the item wasn't immediately moved back to Wanted
-                if not processed_successfully_or_moved:
-                    try:
-                        # --- Physical Release Check is now handled earlier before alternate scrape window ---
-                        # Only need to handle missing physical release date case here
-                        scraping_versions = get_setting('Scraping', 'versions', {})
-                        version_settings = scraping_versions.get(item_to_process.get('version', ''), {})
-                        require_physical = version_settings.get('require_physical_release', False)
-
-                        if not is_magnet_assigned and item_to_process.get('type') == 'movie' and require_physical:
-                            physical_release_date = item_to_process.get('physical_release_date')
-                            if not physical_release_date:  # Only check for missing physical date
-                                logging.info(f"Movie {item_identifier} requires physical release but no date available. Moving back to Wanted queue.")
-                                queue_manager.move_to_wanted(item_to_process, "Scraping")
-                                processed_successfully_or_moved = True
-                        
-                        # --- Digital Release Check (bypassed by early_release, magnet_assigner, or if already moved) ---
-                        if not processed_successfully_or_moved and not item_to_process.get('early_release', False) and not is_magnet_assigned:
-                            release_date_str = item_to_process.get('release_date')
-                            if release_date_str == 'Unknown':
-                                logging.info(f"Item {item_identifier} has an unknown release date. Moving back to Wanted queue.")
-                                queue_manager.move_to_wanted(item_to_process, "Scraping")
-                                processed_successfully_or_moved = True
-                            else:
-                                release_date = datetime.strptime(release_date_str, '%Y-%m-%d').date()
-                                if release_date > today:
-                                    logging.info(f"Item {item_identifier} has a future release date ({release_date}). Moving back to Wanted queue.")
-                                    queue_manager.move_to_wanted(item_to_process, "Scraping")
-                                    processed_successfully_or_moved = True
-
-                    except ValueError:
-                         # --- START EDIT: Add content source check ---
-                        # Only move back if not magnet assigned and date is bad
-                        if not is_magnet_assigned:
-                            if str(item_id_being_processed) == DEBUG_ITEM_ID:
-                                # logging.warning(f"[DEBUG_ITEM_{DEBUG_ITEM_ID}] Invalid release date format: {item_to_process['release_date']}. Moving to Wanted.")
-                                pass
-                            # logging.warning(f"Item {item_identifier} has an invalid release date format: {item_to_process['release_date']}. Moving back to Wanted queue.")
+                    # logging.info(f"Item {item_identifier} has an unknown release date. Moving back to Wanted queue.")
+                    queue_manager.move_to_wanted(item_to_process, "Scraping")
+                    processed_successfully_or_moved = True # Handled by move
+                    processed_count += 1
+                    # No return here, let finally handle removal check if needed
+            elif is_magnet_assigned:
+                logging.info(f"Processing Magnet Assigned item {item_identifier} regardless of release date")
+            elif item_to_process.get('early_release', False): # Existing early release logic
+                logging.info(f"Processing early release item {item_identifier} regardless of release date")
+
+            # Proceed only if the item wasn't immediately moved back to Wanted
+            if not processed_successfully_or_moved:
+                try:
+                    # --- Physical Release Check is now handled earlier before alternate scrape window ---
+                    # Only need to handle missing physical release date case here
+                    scraping_versions = get_setting('Scraping', 'versions', {})
+                    version_settings = scraping_versions.get(item_to_process.get('version', ''), {})
+                    require_physical = version_settings.get('require_physical_release', False)
+
+                    if not is_magnet_assigned and item_to_process.get('type') == 'movie' and require_physical:
+                        physical_release_date = item_to_process.get('physical_release_date')
+                        if not physical_release_date:  # Only check for missing physical date
+                            logging.info(f"Movie {item_identifier} requires physical release but no date available. Moving back to Wanted queue.")
+                            queue_manager.move_to_wanted(item_to_process, "Scraping")
+                            processed_successfully_or_moved = True
+                    
+                    # --- Digital Release Check (bypassed by early_release, magnet_assigner, or if already moved) ---
+                    if not processed_successfully_or_moved and not item_to_process.get('early_release', False) and not is_magnet_assigned:
+                        release_date_str = item_to_process.get('release_date')
+                        if release_date_str == 'Unknown':
+                            logging.info(f"Item {item_identifier} has an unknown release date. Moving back to Wanted queue.")
                             queue_manager.move_to_wanted(item_to_process, "Scraping")
                             processed_successfully_or_moved = True
                         else:
-                            if str(item_id_being_processed) == DEBUG_ITEM_ID:
-                                # logging.warning(f"[DEBUG_ITEM_{DEBUG_ITEM_ID}] Magnet Assigned. Invalid release date format: {item_to_process['release_date']}. Proceeding.")
-                                pass
-                            # Log but allow Magnet Assigned items to proceed
-                            # logging.warning(f"Magnet Assigned item {item_identifier} has an invalid release date format: {item_to_process['release_date']}. Proceeding anyway.")
+                            release_date = datetime.strptime(release_date_str, '%Y-%m-%d').date()
+                            if release_date > today:
+                                logging.info(f"Item {item_identifier} has a future release date ({release_date}). Moving back to Wanted queue.")
+                                queue_manager.move_to_wanted(item_to_process, "Scraping")
+                                processed_successfully_or_moved = True
+
+                except ValueError:
+                     # --- START EDIT: Add content source check ---
+                    # Only move back if not magnet assigned and date is bad
+                    if not is_magnet_assigned:
+                        if str(item_id_being_processed) == DEBUG_ITEM_ID:
+                            # logging.warning(f"[DEBUG_ITEM_{DEBUG_ITEM_ID}] Invalid release date format: {item_to_process['release_date']}. Moving to Wanted.")
                             pass
-                        # --- END EDIT ---
-                        # Removed return
+                        # logging.warning(f"Item {item_identifier} has an invalid release date format: {item_to_process['release_date']}. Moving back to Wanted queue.")
+                        queue_manager.move_to_wanted(item_to_process, "Scraping")
+                        processed_successfully_or_moved = True
+                    else:
+                        if str(item_id_being_processed) == DEBUG_ITEM_ID:
+                            # logging.warning(f"[DEBUG_ITEM_{DEBUG_ITEM_ID}] Magnet Assigned. Invalid release date format: {item_to_process['release_date']}. Proceeding.")
+                            pass
+                        # Log but allow Magnet Assigned items to proceed
+                        # logging.warning(f"Magnet Assigned item {item_identifier} has an invalid release date format: {item_to_process['release_date']}. Proceeding anyway.")
+                        pass
+                    # --- END EDIT ---
+                    # Removed return
 
-                # Proceed only if the item wasn't moved back to Wanted due to release date
-                if not processed_successfully_or_moved:
-                    # --- Multi-pack check logic ---
-                    is_multi_pack = False # Default to false
+            # Proceed only if the item wasn't moved back to Wanted due to release date
+            if not processed_successfully_or_moved:
+                # --- Multi-pack check logic ---
+                is_multi_pack = False # Default to false
 
-                    if str(item_id_being_processed) == DEBUG_ITEM_ID and not processed_successfully_or_moved:
-                        # logging.info(f"[DEBUG_ITEM_{DEBUG_ITEM_ID}] Passed all preliminary checks. Proceeding to multi-pack logic and scraping attempts.")
-                        pass
+                if str(item_id_being_processed) == DEBUG_ITEM_ID and not processed_successfully_or_moved:
+                    # logging.info(f"[DEBUG_ITEM_{DEBUG_ITEM_ID}] Passed all preliminary checks. Proceeding to multi-pack logic and scraping attempts.")
+                    pass
 
-                    can_attempt_multi_pack = False # Assume false unless it's a valid episode case
-
-                    if item_to_process['type'] == 'episode':
-                        logging.info(f"Checking multi-pack eligibility for {item_to_process['title']} S{item_to_process['season_number']:02d}E{item_to_process['episode_number']:02d}")
-                        can_attempt_multi_pack = True # Eligible for check if it's an episode
-                        show_metadata, _ = DirectAPI.get_show_metadata(item_to_process['imdb_id'])
-
-                        # Calculate other pending episodes for the show *once*
-                        other_pending_episodes = []
-                        if show_metadata: # Only check if we have metadata
-                            all_items_for_show = get_all_media_items(imdb_id=item_to_process['imdb_id'])
-                            other_pending_episodes = [
-                                ep for ep in all_items_for_show
-                                if ep.get('type') == 'episode' # Ensure it's an episode
-                                and ep.get('id') != item_to_process['id'] # Exclude the current item
-                                and ep.get('state') in ["Wanted", "Scraping"]
-                            ]
-                            logging.info(f"Found {len(other_pending_episodes)} other pending episodes for this show in Wanted/Scraping state.")
-
-
-                        if show_metadata and 'seasons' in show_metadata:
-                            season_num = item_to_process['season_number'] # Use integer directly
-                            if season_num in show_metadata['seasons']: # Check for integer key
-                                season_data = show_metadata['seasons'][season_num] # Access using integer key
-                                if 'episodes' in season_data:
-                                    # Check if this is the season finale
-                                    total_episodes = len(season_data['episodes'])
-                                    is_finale = item_to_process['episode_number'] == total_episodes
-
-                                    if is_finale:
-                                        logging.info(f"Episode {item_to_process['episode_number']} is the season finale.")
-                                        # Use the pre-calculated list
-                                        if not other_pending_episodes:
-                                            logging.info("No other pending episodes found for this show. Disabling multi-pack search for this finale.")
-                                            can_attempt_multi_pack = False # Disable if finale and no others pending anywhere in the show
+                can_attempt_multi_pack = False # Assume false unless it's a valid episode case
+
+                if item_to_process['type'] == 'episode':
+                    logging.info(f"Checking multi-pack eligibility for {item_to_process['title']} S{item_to_process['season_number']:02d}E{item_to_process['episode_number']:02d}")
+                    can_attempt_multi_pack = True # Eligible for check if it's an episode
+                    show_metadata, _ = DirectAPI.get_show_metadata(item_to_process['imdb_id'])
+
+                    # Calculate other pending episodes for the show *once*
+                    other_pending_episodes = []
+                    if show_metadata: # Only check if we have metadata
+                        all_items_for_show = get_all_media_items(imdb_id=item_to_process['imdb_id'])
+                        other_pending_episodes = [
+                            ep for ep in all_items_for_show
+                            if ep.get('type') == 'episode' # Ensure it's an episode
+                            and ep.get('id') != item_to_process['id'] # Exclude the current item
+                            and ep.get('state') in ["Wanted", "Scraping"]
+                        ]
+                        logging.info(f"Found {len(other_pending_episodes)} other pending episodes for this show in Wanted/Scraping state.")
+
+
+                    if show_metadata and 'seasons' in show_metadata:
+                        season_num = item_to_process['season_number'] # Use integer directly
+                        if season_num in show_metadata['seasons']: # Check for integer key
+                            season_data = show_metadata['seasons'][season_num] # Access using integer key
+                            if 'episodes' in season_data:
+                                # Check if this is the season finale
+                                total_episodes = len(season_data['episodes'])
+                                is_finale = item_to_process['episode_number'] == total_episodes
+
+                                if is_finale:
+                                    logging.info(f"Episode {item_to_process['episode_number']} is the season finale.")
+                                    # Use the pre-calculated list
+                                    if not other_pending_episodes:
+                                        logging.info("No other pending episodes found for this show. Disabling multi-pack search for this finale.")
+                                        can_attempt_multi_pack = False # Disable if finale and no others pending anywhere in the show
+                                    else:
+                                        logging.info(f"Other pending episodes exist. Multi-pack search remains possible for this finale.")
+                                        # can_attempt_multi_pack remains True
+
+                                # Only check air dates if multi-pack is still a possibility
+                                if can_attempt_multi_pack:
+                                    # First pass - log all episode dates
+                                    logging.info(f"Checking air dates for {total_episodes} episodes in season {season_num}:")
+                                    sorted_episodes = sorted(season_data['episodes'].items(), key=lambda x: int(x[0]))
+                                    for ep_num, ep_data in sorted_episodes:
+                                        first_aired = ep_data.get('first_aired', 'unknown')
+                                        if first_aired and first_aired != 'unknown':
+                                            try:
+                                                # Parse ISO 8601 datetime and convert to date
+                                                air_date = datetime.strptime(first_aired.split('T')[0], '%Y-%m-%d').date()
+                                                status = "future" if air_date > today else "aired"
+                                                logging.info(f"  Episode {ep_num}: {air_date} ({status})")
+                                            except (ValueError, TypeError):
+                                                logging.info(f"  Episode {ep_num}: {first_aired} (invalid format)")
                                         else:
-                                            logging.info(f"Other pending episodes exist. Multi-pack search remains possible for this finale.")
-                                            # can_attempt_multi_pack remains True
-
-                                    # Only check air dates if multi-pack is still a possibility
-                                    if can_attempt_multi_pack:
-                                        # First pass - log all episode dates
-                                        logging.info(f"Checking air dates for {total_episodes} episodes in season {season_num}:")
-                                        sorted_episodes = sorted(season_data['episodes'].items(), key=lambda x: int(x[0]))
-                                        for ep_num, ep_data in sorted_episodes:
-                                            first_aired = ep_data.get('first_aired', 'unknown')
-                                            if first_aired and first_aired != 'unknown':
-                                                try:
-                                                    # Parse ISO 8601 datetime and convert to date
-                                                    air_date = datetime.strptime(first_aired.split('T')[0], '%Y-%m-%d').date()
-                                                    status = "future" if air_date > today else "aired"
-                                                    logging.info(f"  Episode {ep_num}: {air_date} ({status})")
-                                                except (ValueError, TypeError):
-                                                    logging.info(f"  Episode {ep_num}: {first_aired} (invalid format)")
-                                            else:
-                                                logging.info(f"  Episode {ep_num}: unknown air date")
-
-                                        # --- START: New logic for 'old season' check ---
-                                        is_likely_old_season = False
-                                        one_year_ago = today - timedelta(days=365)
-                                        for ep_num, ep_data in season_data['episodes'].items():
-                                            first_aired_str = ep_data.get('first_aired')
-                                            if first_aired_str:
-                                                try:
-                                                    air_date = datetime.strptime(first_aired_str.split('T')[0], '%Y-%m-%d').date()
-                                                    if air_date < one_year_ago:
-                                                        logging.info(f"Found episode {ep_num} aired on {air_date} (more than a year ago). Assuming season is old enough for multi-pack.")
-                                                        is_likely_old_season = True
-                                                        break # Found one, no need to check others
-                                                except (ValueError, TypeError):
-                                                    continue # Ignore episodes with invalid date formats for this check
-                                        # --- END: New logic for 'old season' check ---
-
-
-                                        # Check for any unaired episodes (original logic)
-                                        has_unaired_episodes = False
-                                        for ep_num, ep_data in season_data['episodes'].items(): # Iterate again for the original check
-                                            if 'first_aired' not in ep_data or not ep_data['first_aired']:
-                                                logging.info(f"Episode {ep_data.get('episode_number', 'unknown')} has unknown air date")
-                                                has_unaired_episodes = True
-                                                break
+                                            logging.info(f"  Episode {ep_num}: unknown air date")
+
+                                    # --- START: New logic for 'old season' check ---
+                                    is_likely_old_season = False
+                                    one_year_ago = today - timedelta(days=365)
+                                    for ep_num, ep_data in season_data['episodes'].items():
+                                        first_aired_str = ep_data.get('first_aired')
+                                        if first_aired_str:
                                             try:
-                                                air_date = datetime.strptime(ep_data['first_aired'].split('T')[0], '%Y-%m-%d').date()
-                                                if air_date > today:
-                                                    has_unaired_episodes = True
-                                                    logging.info(f"Episode {ep_data.get('episode_number', 'unknown')} hasn't aired yet (releases {air_date})")
-                                                    break
+                                                air_date = datetime.strptime(first_aired_str.split('T')[0], '%Y-%m-%d').date()
+                                                if air_date < one_year_ago:
+                                                    logging.info(f"Found episode {ep_num} aired on {air_date} (more than a year ago). Assuming season is old enough for multi-pack.")
+                                                    is_likely_old_season = True
+                                                    break # Found one, no need to check others
                                             except (ValueError, TypeError):
-                                                logging.info(f"Episode {ep_data.get('episode_number', 'unknown')} has invalid air date format")
+                                                continue # Ignore episodes with invalid date formats for this check
+                                    # --- END: New logic for 'old season' check ---
+
+
+                                    # Check for any unaired episodes (original logic)
+                                    has_unaired_episodes = False
+                                    for ep_num, ep_data in season_data['episodes'].items(): # Iterate again for the original check
+                                        if 'first_aired' not in ep_data or not ep_data['first_aired']:
+                                            logging.info(f"Episode {ep_data.get('episode_number', 'unknown')} has unknown air date")
+                                            has_unaired_episodes = True
+                                            break
+                                        try:
+                                            air_date = datetime.strptime(ep_data['first_aired'].split('T')[0], '%Y-%m-%d').date()
+                                            if air_date > today:
                                                 has_unaired_episodes = True
+                                                logging.info(f"Episode {ep_data.get('episode_number', 'unknown')} hasn't aired yet (releases {air_date})")
                                                 break
-
-                                        # Enable multi-pack if all episodes have aired OR if it's likely an old season,
-                                        # AND it wasn't disabled by the finale check,
-                                        # AND there are other pending episodes for the show.
-                                        if not has_unaired_episodes or is_likely_old_season:
-                                            if other_pending_episodes:
-                                                is_multi_pack = True # Enable multi-pack
-                                                if is_likely_old_season and has_unaired_episodes:
-                                                    logging.info("Enabling multi-pack based on 'old season' heuristic despite some unknown/invalid dates.")
-                                                elif not has_unaired_episodes:
-                                                     logging.info("All episodes have aired and other episodes are pending - enabling multi-pack")
-                                                # else: (is_likely_old_season and not has_unaired_episodes) - handled by the above case
-                                            else: # No other pending episodes for the show
-                                                if not has_unaired_episodes:
-                                                    logging.info("All episodes have aired, but no other episodes are pending for this show - using single episode scrape")
-                                                elif is_likely_old_season:
-                                                    logging.info("Season is likely old, but no other episodes are pending for this show - using single episode scrape")
-                                                # is_multi_pack remains False
-                                        else: # has_unaired_episodes is True AND not is_likely_old_season
-                                            logging.info("Some episodes haven't aired yet in this recent season - skipping multi-pack")
+                                        except (ValueError, TypeError):
+                                            logging.info(f"Episode {ep_data.get('episode_number', 'unknown')} has invalid air date format")
+                                            has_unaired_episodes = True
+                                            break
+
+                                    # Enable multi-pack if all episodes have aired OR if it's likely an old season,
+                                    # AND it wasn't disabled by the finale check,
+                                    # AND there are other pending episodes for the show.
+                                    if not has_unaired_episodes or is_likely_old_season:
+                                        if other_pending_episodes:
+                                            is_multi_pack = True # Enable multi-pack
+                                            if is_likely_old_season and has_unaired_episodes:
+                                                logging.info("Enabling multi-pack based on 'old season' heuristic despite some unknown/invalid dates.")
+                                            elif not has_unaired_episodes:
+                                                 logging.info("All episodes have aired and other episodes are pending - enabling multi-pack")
+                                            # else: (is_likely_old_season and not has_unaired_episodes) - handled by the above case
+                                        else: # No other pending episodes for the show
+                                            if not has_unaired_episodes:
+                                                logging.info("All episodes have aired, but no other episodes are pending for this show - using single episode scrape")
+                                            elif is_likely_old_season:
+                                                logging.info("Season is likely old, but no other episodes are pending for this show - using single episode scrape")
                                             # is_multi_pack remains False
-                                    # else: (can_attempt_multi_pack is False)
-                                        # is_multi_pack remains False - already logged reason above (finale check)
-
-                                else: # No 'episodes' in season_data
-                                    logging.info("No episodes data found in season metadata - skipping multi-pack check")
-                                    # is_multi_pack remains False
-                            else: # Season not found
-                                logging.info(f"Season {season_num} not found in show metadata - skipping multi-pack check") # Log integer season
+                                    else: # has_unaired_episodes is True AND not is_likely_old_season
+                                        logging.info("Some episodes haven't aired yet in this recent season - skipping multi-pack")
+                                        # is_multi_pack remains False
+                                # else: (can_attempt_multi_pack is False)
+                                    # is_multi_pack remains False - already logged reason above (finale check)
+
+                            else: # No 'episodes' in season_data
+                                logging.info("No episodes data found in season metadata - skipping multi-pack check")
                                 # is_multi_pack remains False
-                        else: # No 'seasons' in show_metadata
-                            logging.info("No seasons data found in show metadata - skipping multi-pack check")
+                        else: # Season not found
+                            logging.info(f"Season {season_num} not found in show metadata - skipping multi-pack check") # Log integer season
                             # is_multi_pack remains False
-                    # else: Not an episode, is_multi_pack remains False
+                    else: # No 'seasons' in show_metadata
+                        logging.info("No seasons data found in show metadata - skipping multi-pack check")
+                        # is_multi_pack remains False
+                # else: Not an episode, is_multi_pack remains False
 
-                    # --- End of Multi-pack logic ---
+                # --- End of Multi-pack logic ---
+
+                # Determine initial check_pack_wantedness based on age
+                check_pack_wantedness_for_initial_scrape = True # Default
+                is_older_than_7_days = False # Flag to check age
+                try:
+                    release_date_str = item_to_process.get('release_date')
+                    if release_date_str and release_date_str != 'Unknown':
+                        release_date_obj = datetime.strptime(release_date_str, '%Y-%m-%d').date()
+                        # 'today' is already defined in this method
+                        if release_date_obj < (today - timedelta(days=7)):
+                            is_older_than_7_days = True
+                            check_pack_wantedness_for_initial_scrape = False
+                            logging.info(f"Item {item_identifier} release date {release_date_str} is older than 7 days. Disabling pack wantedness for initial scrape.")
+                    # If release_date is 'Unknown' or not present, default check_pack_wantedness_for_initial_scrape (True) is used.
+                except ValueError:
+                    logging.warning(f"Could not parse release date '{release_date_str}' for {item_identifier} to check age for pack wantedness/multi-pack modification. Defaulting to check_pack_wantedness={check_pack_wantedness_for_initial_scrape}.")
+
+                # Check if we should skip multi-scrape for new content
+                skip_multi_for_new = get_setting("Debug", "skip_initial_multi_scrape_for_new_content", False)
+                if skip_multi_for_new and not is_older_than_7_days:
+                    if is_multi_pack: # Only log if we are changing it
+                        logging.info(f"Item {item_identifier} is new and 'skip_initial_multi_scrape_for_new_content' is enabled. Forcing single episode scrape for initial attempt.")
+                    is_multi_pack = False
+                    
+                # If item is an episode and older than 7 days, force multi-pack for initial scrape
+                if item_to_process['type'] == 'episode' and is_older_than_7_days:
+                    if not is_multi_pack: # Log only if we are changing it
+                        logging.info(f"Episode {item_identifier} is older than 7 days. Forcing multi-pack scrape for initial attempt.")
+                    is_multi_pack = True
+                
+                logging.info(f"Scraping for {item_identifier} (multi-pack: {is_multi_pack}) with initial check_pack_wantedness={check_pack_wantedness_for_initial_scrape}")
+                results, filtered_out_results = self.scrape_with_fallback(
+                    item_to_process, 
+                    is_multi_pack, 
+                    queue_manager, 
+                    check_pack_wantedness=check_pack_wantedness_for_initial_scrape # Use the determined value
+                )
 
-                    # Determine initial check_pack_wantedness based on age
-                    check_pack_wantedness_for_initial_scrape = True # Default
-                    is_older_than_7_days = False # Flag to check age
+                # Ensure both results and filtered_out_results are lists
+                results = results if results is not None else []
+                filtered_out_results = filtered_out_results if filtered_out_results is not None else []
+
+                # Filter and process results from the first attempt
+                filtered_results = []
+                if results: # Only filter if there are raw results
+                    for result in results:
+                        if not item_to_process.get('disable_not_wanted_check'):
+                            if is_magnet_not_wanted(result['magnet']):
+                                continue
+                            if is_url_not_wanted(result['magnet']):
+                                continue
+                        filtered_results.append(result)
+
+                # --- START: Delayed Scrape Based on Score Logic ---
+                delayed_scrape_enabled = get_setting("Debug", "delayed_scrape_based_on_score", False)
+                delayed_scrape_time_limit = float(get_setting("Debug", "delayed_scrape_time_limit", 6.0))
+                minimum_scrape_score = float(get_setting("Debug", "minimum_scrape_score", 0.0))
+                now = datetime.now()
+                release_date_str = item_to_process.get('release_date')
+                airtime_str = item_to_process.get('airtime')
+                release_datetime = None
+                if release_date_str and release_date_str != 'Unknown':
                     try:
-                        release_date_str = item_to_process.get('release_date')
-                        if release_date_str and release_date_str != 'Unknown':
-                            release_date_obj = datetime.strptime(release_date_str, '%Y-%m-%d').date()
-                            # 'today' is already defined in this method
-                            if release_date_obj < (today - timedelta(days=7)):
-                                is_older_than_7_days = True
-                                check_pack_wantedness_for_initial_scrape = False
-                                logging.info(f"Item {item_identifier} release date {release_date_str} is older than 7 days. Disabling pack wantedness for initial scrape.")
-                        # If release_date is 'Unknown' or not present, default check_pack_wantedness_for_initial_scrape (True) is used.
-                    except ValueError:
-                        logging.warning(f"Could not parse release date '{release_date_str}' for {item_identifier} to check age for pack wantedness/multi-pack modification. Defaulting to check_pack_wantedness={check_pack_wantedness_for_initial_scrape}.")
-
-                    # Check if we should skip multi-scrape for new content
-                    skip_multi_for_new = get_setting("Debug", "skip_initial_multi_scrape_for_new_content", False)
-                    if skip_multi_for_new and not is_older_than_7_days:
-                        if is_multi_pack: # Only log if we are changing it
-                            logging.info(f"Item {item_identifier} is new and 'skip_initial_multi_scrape_for_new_content' is enabled. Forcing single episode scrape for initial attempt.")
-                        is_multi_pack = False
+                        release_date = datetime.strptime(release_date_str, '%Y-%m-%d').date()
+                        # Parse airtime, fallback to 00:00
+                        if airtime_str:
+                            try:
+                                try:
+                                    airtime = datetime.strptime(airtime_str, '%H:%M:%S').time()
+                                except ValueError:
+                                    airtime = datetime.strptime(airtime_str, '%H:%M').time()
+                            except ValueError:
+                                airtime = datetime.strptime("00:00", '%H:%M').time()
+                        else:
+                            airtime = datetime.strptime("00:00", '%H:%M').time()
+                        release_datetime = datetime.combine(release_date, airtime)
                         
-                    # If item is an episode and older than 7 days, force multi-pack for initial scrape
-                    if item_to_process['type'] == 'episode' and is_older_than_7_days:
-                        if not is_multi_pack: # Log only if we are changing it
-                            logging.info(f"Episode {item_identifier} is older than 7 days. Forcing multi-pack scrape for initial attempt.")
-                        is_multi_pack = True
+                        # If a movie has no specific airtime, shift the base release time to the start of the next day.
+                        # The user-defined offset will then be applied to this adjusted time.
+                        if item_to_process.get('type') == 'movie' and not airtime_str:
+                            release_datetime += timedelta(days=1)
+
+                        # Apply offset based on type
+                        offset_hours = 0.0
+                        if item_to_process.get('type') == 'movie':
+                            offset_setting = get_setting("Queue", "movie_airtime_offset", "19")
+                            try:
+                                offset_hours = float(offset_setting)
+                            except (ValueError, TypeError):
+                                offset_hours = 19.0
+                        elif item_to_process.get('type') == 'episode':
+                            offset_setting = get_setting("Queue", "episode_airtime_offset", "0")
+                            try:
+                                offset_hours = float(offset_setting)
+                            except (ValueError, TypeError):
+                                offset_hours = 0.0
+                        release_datetime += timedelta(hours=offset_hours)
+                    except Exception:
+                        release_datetime = None
+                # --- NEW: Restrict delayed scrape to items released within the past 7 days ---
+                if delayed_scrape_enabled and release_datetime:
+                    try:
+                        if (now - release_datetime).days > 7:
+                            logging.info(f"Delayed scrape disabled for {item_identifier}: release is older than 7 days.")
+                            delayed_scrape_enabled = False
+                    except Exception:
+                        # Fallback: if any error occurs, leave delayed_scrape_enabled unchanged
+                        pass
+                # --- END NEW CODE ---
+                # If release_datetime is None, treat as if enough time has passed (allow all results)
+                if delayed_scrape_enabled and minimum_scrape_score > 0:
+                    # Split results by score
+                    high_score_results = [r for r in filtered_results if r.get('score_breakdown', {}).get('total_score', 0) >= minimum_scrape_score]
+                    low_score_results = [r for r in filtered_results if r not in high_score_results]
+                    use_low_score = False
+                    if not high_score_results and filtered_results:
+                        # Only fallback to low score if enough time has passed
+                        if release_datetime:
+                            hours_since_release = (now - release_datetime).total_seconds() / 3600.0
+                            if hours_since_release >= delayed_scrape_time_limit:
+                                use_low_score = True
+                                logging.info(f"Delayed scrape: {hours_since_release:.2f}h since release+airtime, allowing lower scored results for {item_identifier}.")
+                            else:
+                                logging.info(f"Delayed scrape: Only {hours_since_release:.2f}h since release+airtime, not enough to allow lower scored results for {item_identifier}.")
+                                filtered_results = [] # Treat as no suitable results
+                        else:
+                            # No valid release date, allow all results
+                            use_low_score = True
+                            logging.info(f"Delayed scrape: No valid release date/airtime, allowing lower scored results for {item_identifier}.")
+                    if high_score_results:
+                        filtered_results = high_score_results
+                    elif use_low_score:
+                        filtered_results = low_score_results
+                    # else: filtered_results already set to [] if not enough time has passed
+                # --- END: Delayed Scrape Based on Score Logic ---
+
+                # If no filtered results from the first attempt (which includes multi->single internal fallback)
+                # AND the item is an episode, try the final fallback: multi-pack with check_pack_wantedness=False
+                if not filtered_results and item_to_process['type'] == 'episode':
+                    logging.info(f"No valid results after initial scraping for {item_identifier}. "
+                                 f"Attempting final multi-pack fallback (check_pack_wantedness=False).")
                     
-                    logging.info(f"Scraping for {item_identifier} (multi-pack: {is_multi_pack}) with initial check_pack_wantedness={check_pack_wantedness_for_initial_scrape}")
-                    results, filtered_out_results = self.scrape_with_fallback(
+                    # For this final attempt, force multi-pack and disable pack wantedness check
+                    fallback_results, fallback_filtered_out = self.scrape_with_fallback(
                         item_to_process, 
-                        is_multi_pack, 
-                        queue_manager, 
-                        check_pack_wantedness=check_pack_wantedness_for_initial_scrape # Use the determined value
+                        is_multi_pack=True, # Force multi-pack
+                        queue_manager=queue_manager, 
+                        check_pack_wantedness=False # Disable pack wantedness
                     )
+                    
+                    fallback_results = fallback_results if fallback_results is not None else []
+                    # fallback_filtered_out = fallback_filtered_out if fallback_filtered_out is not None else [] # Not used directly
 
-                    # Ensure both results and filtered_out_results are lists
-                    results = results if results is not None else []
-                    filtered_out_results = filtered_out_results if filtered_out_results is not None else []
-
-                    # Filter and process results from the first attempt
-                    filtered_results = []
-                    if results: # Only filter if there are raw results
-                        for result in results:
+                    if fallback_results: # Only filter if there are raw results from fallback
+                        current_filtered_fallback_results = []
+                        for result in fallback_results:
                             if not item_to_process.get('disable_not_wanted_check'):
                                 if is_magnet_not_wanted(result['magnet']):
                                     continue
                                 if is_url_not_wanted(result['magnet']):
                                     continue
-                            filtered_results.append(result)
-
-                    # --- START: Delayed Scrape Based on Score Logic ---
-                    delayed_scrape_enabled = get_setting("Debug", "delayed_scrape_based_on_score", False)
-                    delayed_scrape_time_limit = float(get_setting("Debug", "delayed_scrape_time_limit", 6.0))
-                    minimum_scrape_score = float(get_setting("Debug", "minimum_scrape_score", 0.0))
-                    now = datetime.now()
-                    release_date_str = item_to_process.get('release_date')
-                    airtime_str = item_to_process.get('airtime')
-                    release_datetime = None
-                    if release_date_str and release_date_str != 'Unknown':
-                        try:
-                            release_date = datetime.strptime(release_date_str, '%Y-%m-%d').date()
-                            # Parse airtime, fallback to 00:00
-                            if airtime_str:
-                                try:
-                                    try:
-                                        airtime = datetime.strptime(airtime_str, '%H:%M:%S').time()
-                                    except ValueError:
-                                        airtime = datetime.strptime(airtime_str, '%H:%M').time()
-                                except ValueError:
-                                    airtime = datetime.strptime("00:00", '%H:%M').time()
-                            else:
-                                airtime = datetime.strptime("00:00", '%H:%M').time()
-                            release_datetime = datetime.combine(release_date, airtime)
-                            
-                            # If a movie has no specific airtime, shift the base release time to the start of the next day.
-                            # The user-defined offset will then be applied to this adjusted time.
-                            if item_to_process.get('type') == 'movie' and not airtime_str:
-                                release_datetime += timedelta(days=1)
-
-                            # Apply offset based on type
-                            offset_hours = 0.0
-                            if item_to_process.get('type') == 'movie':
-                                offset_setting = get_setting("Queue", "movie_airtime_offset", "19")
-                                try:
-                                    offset_hours = float(offset_setting)
-                                except (ValueError, TypeError):
-                                    offset_hours = 19.0
-                            elif item_to_process.get('type') == 'episode':
-                                offset_setting = get_setting("Queue", "episode_airtime_offset", "0")
-                                try:
-                                    offset_hours = float(offset_setting)
-                                except (ValueError, TypeError):
-                                    offset_hours = 0.0
-                            release_datetime += timedelta(hours=offset_hours)
-                        except Exception:
-                            release_datetime = None
-                    # --- NEW: Restrict delayed scrape to items released within the past 7 days ---
-                    if delayed_scrape_enabled and release_datetime:
-                        try:
-                            if (now - release_datetime).days > 7:
-                                logging.info(f"Delayed scrape disabled for {item_identifier}: release is older than 7 days.")
-                                delayed_scrape_enabled = False
-                        except Exception:
-                            # Fallback: if any error occurs, leave delayed_scrape_enabled unchanged
-                            pass
-                    # --- END NEW CODE ---
-                    # If release_datetime is None, treat as if enough time has passed (allow all results)
-                    if delayed_scrape_enabled and minimum_scrape_score > 0:
-                        # Split results by score
-                        high_score_results = [r for r in filtered_results if r.get('score_breakdown', {}).get('total_score', 0) >= minimum_scrape_score]
-                        low_score_results = [r for r in filtered_results if r not in high_score_results]
-                        use_low_score = False
-                        if not high_score_results and filtered_results:
-                            # Only fallback to low score if enough time has passed
-                            if release_datetime:
-                                hours_since_release = (now - release_datetime).total_seconds() / 3600.0
-                                if hours_since_release >= delayed_scrape_time_limit:
-                                    use_low_score = True
-                                    logging.info(f"Delayed scrape: {hours_since_release:.2f}h since release+airtime, allowing lower scored results for {item_identifier}.")
-                                else:
-                                    logging.info(f"Delayed scrape: Only {hours_since_release:.2f}h since release+airtime, not enough to allow lower scored results for {item_identifier}.")
-                                    filtered_results = [] # Treat as no suitable results
-                            else:
-                                # No valid release date, allow all results
-                                use_low_score = True
-                                logging.info(f"Delayed scrape: No valid release date/airtime, allowing lower scored results for {item_identifier}.")
-                        if high_score_results:
-                            filtered_results = high_score_results
-                        elif use_low_score:
-                            filtered_results = low_score_results
-                        # else: filtered_results already set to [] if not enough time has passed
-                    # --- END: Delayed Scrape Based on Score Logic ---
-
-                    # If no filtered results from the first attempt (which includes multi->single internal fallback)
-                    # AND the item is an episode, try the final fallback: multi-pack with check_pack_wantedness=False
-                    if not filtered_results and item_to_process['type'] == 'episode':
-                        logging.info(f"No valid results after initial scraping for {item_identifier}. "
-                                     f"Attempting final multi-pack fallback (check_pack_wantedness=False).")
-                        
-                        # For this final attempt, force multi-pack and disable pack wantedness check
-                        fallback_results, fallback_filtered_out = self.scrape_with_fallback(
-                            item_to_process, 
-                            is_multi_pack=True, # Force multi-pack
-                            queue_manager=queue_manager, 
-                            check_pack_wantedness=False # Disable pack wantedness
-                        )
+                            current_filtered_fallback_results.append(result)
                         
-                        fallback_results = fallback_results if fallback_results is not None else []
-                        # fallback_filtered_out = fallback_filtered_out if fallback_filtered_out is not None else [] # Not used directly
-
-                        if fallback_results: # Only filter if there are raw results from fallback
-                            current_filtered_fallback_results = []
-                            for result in fallback_results:
-                                if not item_to_process.get('disable_not_wanted_check'):
-                                    if is_magnet_not_wanted(result['magnet']):
-                                        continue
-                                    if is_url_not_wanted(result['magnet']):
-                                        continue
-                                current_filtered_fallback_results.append(result)
-                            
-                            # Apply delayed scrape filter to fallback results
-                            if current_filtered_fallback_results:
-                                logging.info(f"Applying delayed scrape filter to {len(current_filtered_fallback_results)} fallback results.")
-                                # Apply the same delayed scrape logic to fallback results
-                                if delayed_scrape_enabled and minimum_scrape_score > 0:
-                                    # Split fallback results by score
-                                    high_score_fallback = [r for r in current_filtered_fallback_results if r.get('score_breakdown', {}).get('total_score', 0) >= minimum_scrape_score]
-                                    low_score_fallback = [r for r in current_filtered_fallback_results if r not in high_score_fallback]
-                                    
-                                    logging.info(f"[{item_identifier}] Fallback Delayed Scrape Filter: Found {len(high_score_fallback)} high-score results and {len(low_score_fallback)} low-score results.")
-                                    
-                                    if high_score_fallback:
-                                        current_filtered_fallback_results = high_score_fallback
-                                    elif low_score_fallback:
-                                        # Check if enough time has passed for low score results
-                                        if release_datetime:
-                                            hours_since_release = (now - release_datetime).total_seconds() / 3600.0
-                                            if hours_since_release >= delayed_scrape_time_limit:
-                                                logging.info(f"Delayed scrape (fallback): {hours_since_release:.2f}h since release+airtime, allowing lower scored fallback results for {item_identifier}.")
-                                                current_filtered_fallback_results = low_score_fallback
-                                            else:
-                                                logging.info(f"Delayed scrape (fallback): Only {hours_since_release:.2f}h since release+airtime, not enough to allow lower scored fallback results for {item_identifier}. Discarding {len(low_score_fallback)} results.")
-                                                current_filtered_fallback_results = []
-                                        else:
-                                            # No valid release date, allow all fallback results
-                                            logging.info(f"Delayed scrape (fallback): No valid release date/airtime, allowing lower scored fallback results for {item_identifier}.")
+                        # Apply delayed scrape filter to fallback results
+                        if current_filtered_fallback_results:
+                            logging.info(f"Applying delayed scrape filter to {len(current_filtered_fallback_results)} fallback results.")
+                            # Apply the same delayed scrape logic to fallback results
+                            if delayed_scrape_enabled and minimum_scrape_score > 0:
+                                # Split fallback results by score
+                                high_score_fallback = [r for r in current_filtered_fallback_results if r.get('score_breakdown', {}).get('total_score', 0) >= minimum_scrape_score]
+                                low_score_fallback = [r for r in current_filtered_fallback_results if r not in high_score_fallback]
+                                
+                                logging.info(f"[{item_identifier}] Fallback Delayed Scrape Filter: Found {len(high_score_fallback)} high-score results and {len(low_score_fallback)} low-score results.")
+                                
+                                if high_score_fallback:
+                                    current_filtered_fallback_results = high_score_fallback
+                                elif low_score_fallback:
+                                    # Check if enough time has passed for low score results
+                                    if release_datetime:
+                                        hours_since_release = (now - release_datetime).total_seconds() / 3600.0
+                                        if hours_since_release >= delayed_scrape_time_limit:
+                                            logging.info(f"Delayed scrape (fallback): {hours_since_release:.2f}h since release+airtime, allowing lower scored fallback results for {item_identifier}.")
                                             current_filtered_fallback_results = low_score_fallback
+                                        else:
+                                            logging.info(f"Delayed scrape (fallback): Only {hours_since_release:.2f}h since release+airtime, not enough to allow lower scored fallback results for {item_identifier}. Discarding {len(low_score_fallback)} results.")
+                                            current_filtered_fallback_results = []
                                     else:
-                                        # No results at all after score filtering
-                                        current_filtered_fallback_results = []
-                            
-                            if current_filtered_fallback_results:
-                                logging.info(f"Found {len(current_filtered_fallback_results)} results in final multi-pack fallback for {item_identifier} after score filtering.")
-                                filtered_results = current_filtered_fallback_results # Use these results
-                            else:
-                                logging.info(f"No valid (post-filter) results from final multi-pack fallback for {item_identifier}.")
+                                        # No valid release date, allow all fallback results
+                                        logging.info(f"Delayed scrape (fallback): No valid release date/airtime, allowing lower scored fallback results for {item_identifier}.")
+                                        current_filtered_fallback_results = low_score_fallback
+                                else:
+                                    # No results at all after score filtering
+                                    current_filtered_fallback_results = []
+                        
+                        if current_filtered_fallback_results:
+                            logging.info(f"Found {len(current_filtered_fallback_results)} results in final multi-pack fallback for {item_identifier} after score filtering.")
+                            filtered_results = current_filtered_fallback_results # Use these results
                         else:
-                            logging.info(f"No raw results from final multi-pack fallback for {item_identifier}.")
-
-                    # After all scraping attempts, check if we have any filtered_results
-                    if not filtered_results:
-                        logging.warning(f"No suitable results found for {item_identifier} after all scraping attempts.")
-                        self.handle_no_results(item_to_process, queue_manager)
-                        processed_successfully_or_moved = True
-                        processed_count += 1
+                            logging.info(f"No valid (post-filter) results from final multi-pack fallback for {item_identifier}.")
                     else:
-                        # We have filtered_results, proceed to process them
-                        best_result = filtered_results[0]
-                        logging.info(f"Best result for {item_identifier}: {best_result['title']}")
-
-                        if get_setting("Debug", "enable_reverse_order_scraping", default=False):
-                            filtered_results.reverse()
+                        logging.info(f"No raw results from final multi-pack fallback for {item_identifier}.")
 
-                        logging.info(f"Moving {item_identifier} to Adding queue with {len(filtered_results)} results")
-                        try:
-                            queue_manager.move_to_adding(item_to_process, "Scraping", best_result['title'], filtered_results)
-                            self.reset_not_wanted_check(item_to_process['id'])
-                            processed_successfully_or_moved = True
-                        except Exception as e:
-                            logging.error(f"Failed to move {item_identifier} to Adding queue: {str(e)}", exc_info=True)
-                            had_error = True
-            except Exception as e:
-                logging.error(f"Error processing item {item_identifier}: {str(e)}", exc_info=True)
-                try:
-                    # Attempt to move to sleeping on error
-                    queue_manager.move_to_sleeping(item_to_process, "Scraping")
-                    processed_successfully_or_moved = True # Mark as handled (moved to sleeping)
-                except Exception as move_err:
-                    logging.error(f"Failed to move item {item_identifier} to sleeping after error: {move_err}")
-                    # If move fails, processed_successfully_or_moved remains False
-                had_error = True
-                # Don't increment processed_count here, let the main logic do it if needed
-
-            finally:
-                # Check if the item we processed is *still* at the front of the list.
-                # This means it wasn't successfully moved by any of the processing steps or error handling.
-                if not processed_successfully_or_moved:
-                    # Double check it's the same item we started with
-                    if self.items and self.items[0]['id'] == item_id_being_processed:
-                        logging.warning(f"Item {item_identifier} completed processing cycle in ScrapingQueue without being moved. Removing explicitly.")
-                        self.remove_item(item_to_process) # Remove the item we peeked at
-                    elif not self.items or self.items[0]['id'] != item_id_being_processed:
-                         logging.warning(f"Item {item_identifier} was expected at index 0 for removal but wasn't found (likely removed concurrently or list empty).")
-
-                # Increment processed count if we actually started processing this item
-                if processed_an_item_this_cycle:
+                # After all scraping attempts, check if we have any filtered_results
+                if not filtered_results:
+                    logging.warning(f"No suitable results found for {item_identifier} after all scraping attempts.")
+                    self.handle_no_results(item_to_process, queue_manager)
+                    processed_successfully_or_moved = True
                     processed_count += 1
+                else:
+                    # We have filtered_results, proceed to process them
+                    best_result = filtered_results[0]
+                    logging.info(f"Best result for {item_identifier}: {best_result['title']}")
+
+                    if get_setting("Debug", "enable_reverse_order_scraping", default=False):
+                        filtered_results.reverse()
 
-            # --- START EDIT: Fetch setting from Queue section ---
+                    logging.info(f"Moving {item_identifier} to Adding queue with {len(filtered_results)} results")
+                    try:
+                        queue_manager.move_to_adding(item_to_process, "Scraping", best_result['title'], filtered_results)
+                        self.reset_not_wanted_check(item_to_process['id'])
+                        processed_successfully_or_moved = True
+                    except Exception as e:
+                        logging.error(f"Failed to move {item_identifier} to Adding queue: {str(e)}", exc_info=True)
+                        had_error = True
+        except Exception as e:
+            logging.error(f"Error processing item {item_identifier}: {str(e)}", exc_info=True)
+            try:
+                # Attempt to move to sleeping on error
+                queue_manager.move_to_sleeping(item_to_process, "Scraping")
+                processed_successfully_or_moved = True # Mark as handled (moved to sleeping)
+            except Exception as move_err:
+                logging.error(f"Failed to move item {item_identifier} to sleeping after error: {move_err}")
+                # If move fails, processed_successfully_or_moved remains False
+            had_error = True
+            # Don't increment processed_count here, let the main logic do it if needed
+
+        finally:
+            # Check if the item we processed is *still* at the front of the list.
+            # This means it wasn't successfully moved by any of the processing steps or error handling.
+            if not processed_successfully_or_moved:
+                # Double check the item we started with is still queued
+                if self.contains_item_id(item_id_being_processed):
+                    logging.warning(f"Item {item_identifier} completed processing cycle in ScrapingQueue without being moved. Removing explicitly.")
+                    self.remove_item(item_to_process)
+                else:
+                     logging.warning(f"Item {item_identifier} was expected in the queue for removal but wasn't found (likely removed concurrently or list empty).")
+
+            # Increment processed count if we actually started processing this item
             if processed_an_item_this_cycle:
-                # --- START EDIT: Add try-except for float conversion ---
-                try:
-                    delay_seconds = float(get_setting('Queue', 'item_process_delay_seconds', 0.0))
-                except (ValueError, TypeError):
-                    delay_seconds = 0.0
-                # --- END EDIT ---
-                if delay_seconds > 0:
-                    time.sleep(delay_seconds)
+                processed_count += 1
+
+        # --- START EDIT: Fetch setting from Queue section ---
+        if processed_an_item_this_cycle:
+            # --- START EDIT: Add try-except for float conversion ---
+            try:
+                delay_seconds = float(get_setting('Queue', 'item_process_delay_seconds', 0.0))
+            except (ValueError, TypeError):
+                delay_seconds = 0.0
             # --- END EDIT ---
+            if delay_seconds > 0:
+                time.sleep(delay_seconds)
+        # --- END EDIT ---
 
         # Return True if there are more items potentially left to process in the queue
         # Or if we actually processed an item in this call (even if it resulted in removal)
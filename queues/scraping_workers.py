@@ -0,0 +1,236 @@
+"""
+Concurrent scraping worker pool for the Scraping queue.
+
+With `Queue.scraping_workers` > 1, `ScrapingQueue.process` no longer handles one
+item per run. It dispatches items to a pool of worker threads and returns
+straight away:
+
+- Show affinity: a show (imdb_id) is leased to a single worker at a time, and
+  its episodes are dispatched in queue order. The next episode of a show is only
+  dispatched after the previous one was handed off, so pack detection in
+  `scrape_with_fallback` and the "related item in Adding" check see the same
+  state as with sequential processing.
+- Safe handoff: workers get a `DeferredQueueTransitions` instead of the queue
+  manager. Queue moves (to Adding, Wanted, Sleeping, ...) are recorded and
+  replayed on the scheduler thread the next time the Scraping queue runs, so
+  queues are only ever mutated by the thread that owns them.
+- Per-scraper and global caps on concurrent scraper requests live in
+  `scraper.scraper_concurrency`.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, List, Optional, Set, Tuple
+
+from utilities.settings import get_setting
+
+# Queue manager methods that change queue membership; these are deferred for workers
+DEFERRED_QUEUE_MANAGER_METHODS = {'initiate_final_check_or_blacklist'}
+
+# Window used for items/hour and worker utilization
+STATS_WINDOW_SECONDS = 3600
+
+# Ceiling for the scraping_workers setting
+MAX_SCRAPING_WORKERS = 16
+
+
+def get_configured_worker_count() -> int:
+    """Number of scraping workers from settings; 1 keeps sequential processing."""
+    try:
+        workers = int(get_setting('Queue', 'scraping_workers', 1))
+    except (ValueError, TypeError):
+        workers = 1
+    return max(1, min(workers, MAX_SCRAPING_WORKERS))
+
+
+class DeferredQueueTransitions:
+    """
+    Queue manager stand-in handed to scraping workers.
+
+    Reads (generate_identifier, queues, get_item_queue, ...) pass through to the
+    real queue manager. Queue moves are recorded in order and applied later by
+    `ScrapingWorkerPool.apply_completed` on the scheduler thread.
+    """
+
+    def __init__(self, queue_manager):
+        self._queue_manager = queue_manager
+        self.transitions: List[Tuple[str, tuple, dict]] = []
+
+    def __getattr__(self, name):
+        attr = getattr(self._queue_manager, name)
+        if callable(attr) and (name.startswith('move_') or name in DEFERRED_QUEUE_MANAGER_METHODS):
+            def record(*args, **kwargs):
+                self.transitions.append((name, args, kwargs))
+            return record
+        return attr
+
+    def record_removal(self, item: Dict[str, Any]):
+        """Record removing `item` from the in-memory Scraping queue."""
+        self.transitions.append(('remove_item', (item,), {}))
+
+
+class _WorkerStats:
+    __slots__ = ('busy_intervals', 'items', 'current', 'current_started')
+
+    def __init__(self):
+        self.busy_intervals: Deque[Tuple[float, float]] = deque()
+        self.items = 0
+        self.current: Optional[str] = None
+        self.current_started: Optional[float] = None
+
+
+class ScrapingWorkerPool:
+    """Dispatches Scraping queue items to worker threads with per-show affinity."""
+
+    def __init__(self, process_item: Callable[[Dict[str, Any], Any], Any], num_workers: int):
+        self._process_item = process_item
+        self.num_workers = num_workers
+        self._executor = ThreadPoolExecutor(max_workers=num_workers, thread_name_prefix='ScrapingWorker')
+        self._lock = threading.Lock()
+        self._context = threading.local()
+        self._in_flight: Dict[Any, str] = {}  # item id -> affinity key
+        self._active_keys: Set[str] = set()
+        self._completed: Deque[Tuple[Dict[str, Any], DeferredQueueTransitions]] = deque()
+        self._worker_stats: Dict[str, _WorkerStats] = {}
+        self._completions: Deque[float] = deque()
+        self._started_at = time.time()
+
+    @staticmethod
+    def affinity_key(item: Dict[str, Any]) -> str:
+        """Items sharing a key are never processed concurrently (one show at a time)."""
+        if item.get('type') == 'episode' and item.get('imdb_id'):
+            return f"show:{item['imdb_id']}"
+        if item.get('imdb_id'):
+            return f"imdb:{item['imdb_id']}"
+        return f"item:{item.get('id')}"
+
+    @property
+    def current_transitions(self) -> Optional[DeferredQueueTransitions]:
+        """Transition recorder of the worker running on the calling thread, if any."""
+        return getattr(self._context, 'transitions', None)
+
+    def is_in_flight(self, item_id) -> bool:
+        with self._lock:
+            return item_id in self._in_flight
+
+    def is_idle(self) -> bool:
+        with self._lock:
+            return not self._in_flight and not self._completed
+
+    def has_dispatchable(self, items: List[Dict[str, Any]]) -> bool:
+        """True if at least one item could be dispatched right now."""
+        with self._lock:
+            if len(self._in_flight) >= self.num_workers:
+                return False
+            return any(
+                item['id'] not in self._in_flight and self.affinity_key(item) not in self._active_keys
+                for item in items
+            )
+
+    def dispatch(self, items: List[Dict[str, Any]], queue_manager) -> int:
+        """Submit items in queue order to free workers, respecting show affinity. Returns the number submitted."""
+        submitted = 0
+        with self._lock:
+            for item in items:
+                if len(self._in_flight) >= self.num_workers:
+                    break
+                key = self.affinity_key(item)
+                if item['id'] in self._in_flight or key in self._active_keys:
+                    continue
+                self._in_flight[item['id']] = key
+                self._active_keys.add(key)
+                transitions = DeferredQueueTransitions(queue_manager)
+                self._executor.submit(self._run, item, transitions, queue_manager)
+                submitted += 1
+        return submitted
+
+    def _run(self, item: Dict[str, Any], transitions: DeferredQueueTransitions, queue_manager):
+        worker_name = threading.current_thread().name
+        identifier = queue_manager.generate_identifier(item)
+        started = time.time()
+        with self._lock:
+            stats = self._worker_stats.setdefault(worker_name, _WorkerStats())
+            stats.current = identifier
+            stats.current_started = started
+        self._context.transitions = transitions
+        try:
+            self._process_item(item, transitions)
+        except Exception as e:
+            logging.error(f"Scraping worker {worker_name} failed on {identifier}: {e}", exc_info=True)
+        finally:
+            self._context.transitions = None
+            finished = time.time()
+            with self._lock:
+                stats.busy_intervals.append((started, finished))
+                stats.items += 1
+                stats.current = None
+                stats.current_started = None
+                self._completed.append((item, transitions))
+            logging.debug(f"Scraping worker {worker_name} finished {identifier} in {finished - started:.1f}s "
+                          f"({len(transitions.transitions)} queue transitions pending handoff)")
+            # Get the Scraping queue to run soon so the handoff is applied promptly
+            wakeup_dispatcher = getattr(queue_manager, 'wakeup_dispatcher', None)
+            if wakeup_dispatcher:
+                wakeup_dispatcher.notify("Scraping", reason="worker handoff")
+
+    def apply_completed(self, queue_manager, scraping_queue) -> int:
+        """Replay the queue transitions of finished items. Must run on the scheduler thread."""
+        with self._lock:
+            completed = list(self._completed)
+            self._completed.clear()
+
+        for item, transitions in completed:
+            identifier = queue_manager.generate_identifier(item)
+            for name, args, kwargs in transitions.transitions:
+                try:
+                    if name == 'remove_item':
+                        scraping_queue.remove_item(*args, **kwargs)
+                    else:
+                        getattr(queue_manager, name)(*args, **kwargs)
+                except Exception as e:
+                    logging.error(f"Failed to apply {name} handoff for {identifier}: {e}", exc_info=True)
+            with self._lock:
+                key = self._in_flight.pop(item['id'], None)
+                if key is not None:
+                    self._active_keys.discard(key)
+                if transitions.transitions:
+                    self._completions.append(time.time())
+        return len(completed)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Items/hour and per-worker utilization over the last hour."""
+        now = time.time()
+        window_start = max(now - STATS_WINDOW_SECONDS, self._started_at)
+        window = max(now - window_start, 1.0)
+        with self._lock:
+            while self._completions and self._completions[0] < now - STATS_WINDOW_SECONDS:
+                self._completions.popleft()
+            completed_in_window = len(self._completions)
+            workers = []
+            for worker_name, stats in sorted(self._worker_stats.items()):
+                while stats.busy_intervals and stats.busy_intervals[0][1] < window_start:
+                    stats.busy_intervals.popleft()
+                busy = sum(end - max(start, window_start) for start, end in stats.busy_intervals)
+                if stats.current_started is not None:
+                    busy += now - max(stats.current_started, window_start)
+                workers.append({
+                    'worker': worker_name,
+                    'utilization': round(100.0 * min(busy / window, 1.0), 1),
+                    'items': stats.items,
+                    'current': stats.current,
+                })
+            in_flight = len(self._in_flight)
+
+        return {
+            'workers': self.num_workers,
+            'in_flight': in_flight,
+            'items_per_hour': round(completed_in_window * 3600.0 / window, 1),
+            'worker_utilization': workers,
+        }
+
+    def shutdown(self, wait: bool = False, cancel_pending: bool = False):
+        """Stop the worker threads. With cancel_pending, submitted items that have not started are dropped."""
+        self._executor.shutdown(wait=wait, cancel_futures=cancel_pending)
@@ -519,6 +519,7 @@ class UpgradingQueue:
         """Calculate a score for the current item when current_score is 0"""
         from scraper.functions.rank_results import rank_result_key
         from scraper.functions.file_processing import parse_torrent_info
+        from scraper.functions.version_profile import get_version_profile
         from utilities.settings import get_setting
         
         # Get the current item's title for scoring
@@ -597,7 +598,8 @@ class UpgradingQueue:
                 version_settings,
                 preferred_language=preferred_language,
                 translated_title=translated_title,
-                show_season_episode_counts=show_season_episode_counts
+                show_season_episode_counts=show_season_episode_counts,
+                profile=get_version_profile(version_settings)
             )
             
             # Extract the total score from the result
@@ -605,9 +605,8 @@ class WantedQueue:
                                 
                             if current_show_batch_ready_to_move:
                                 logging.info(f"Moving full batch of {len(current_show_batch_ready_to_move)} ready episodes for show {item_imdb_id} to Scraping.")
-                                for batch_item_to_move in current_show_batch_ready_to_move:
-                                    queue_manager.move_to_scraping(batch_item_to_move, "Wanted")
-                                    moved_to_scraping_count += 1
+                                moved_batch = queue_manager.move_items(current_show_batch_ready_to_move, "Scraping", from_queue="Wanted")
+                                moved_to_scraping_count += len(moved_batch)
                             
                             prev_idx = idx
                             idx = self._advance_idx_past_show(candidate_items, idx, item_imdb_id) # Advance past this show in candidate_items
@@ -71,9 +71,19 @@ def get_basic_collection_counts():
     extra overhead. This still honours the business rules of counting only
     collected / upgrading items, deduplicating movies by `imdb_id`, shows by
     episode `imdb_id`, and episodes by the (imdb_id, season, episode) tuple.
+    The trigger-maintained statistics counters are used when they are built.
     """
 
     from database import get_db_connection
+    from database.statistics_counters import get_summary_counts
+
+    counters = get_summary_counts()
+    if counters is not None:
+        return {
+            'total_movies': counters['total_movies'],
+            'total_shows': counters['total_shows'],
+            'total_episodes': counters['total_episodes'],
+        }
 
     conn = None
     try:
@@ -598,6 +608,7 @@ def bulk_queue_action():
     from database import get_db_connection
     
     program_runner = get_program_runner()
+    queue_manager = getattr(program_runner, 'queue_manager', None) if program_runner else None
     bulk_action_paused_queue = False # Flag to track if this function paused the queue
 
     try:
@@ -676,9 +687,36 @@ def bulk_queue_action():
                         errors.append(f"Error processing item {item_id}: {str(e)}")
                         logging.error(f"Error processing item {item_id} in bulk delete: {str(e)}")
                         
+            elif action == 'move' and target_queue and queue_manager and target_queue in queue_manager.queues:
+                logging.info("Entering 'move' block (queue manager).")
+                # Move through the queue manager so in-memory queues, timings and wakeups stay in sync,
+                # one batch per source state
+                conn = get_db_connection()
+                try:
+                    placeholders = ','.join('?' * len(batch))
+                    rows = conn.execute(f'SELECT * FROM media_items WHERE id IN ({placeholders})', batch).fetchall()
+                finally:
+                    conn.close()
+                items_by_state = {}
+                for row in rows:
+                    items_by_state.setdefault(row['state'], []).append(dict(row))
+                try:
+                    for from_state, state_items in items_by_state.items():
+                        moved_items = queue_manager.move_items(state_items, target_queue, from_queue=from_state)
+                        total_processed += len(moved_items)
+                        if len(moved_items) < len(state_items):
+                            error_count += 1
+                            errors.append(f"Error in batch {i//BATCH_SIZE + 1}: failed to move {len(state_items) - len(moved_items)} items from {from_state}")
+                except sqlite3.OperationalError as e:
+                    if "database is locked" in str(e):
+                        logging.error("Database is locked during bulk move.")
+                        return jsonify({'success': False, 'error': 'database is locked', 'database_locked': True}), 503
+                    error_count += 1
+                    errors.append(f"Error in batch {i//BATCH_SIZE + 1}: {str(e)}")
+                    logging.error(f"Error in batch {i//BATCH_SIZE + 1}: {str(e)}")
             elif action == 'move' and target_queue:
                 logging.info("Entering 'move' block.")
-                # Keep existing move functionality
+                # Targets that aren't queues (e.g. ghostlist) are plain state updates
                 conn = get_db_connection()
                 try:
                     cursor = conn.cursor()
@@ -1679,6 +1679,8 @@ def get_available_tasks():
         {'id': 'task_update_show_titles', 'display_name': 'Update Show Titles'},
         {'id': 'task_get_plex_watch_history', 'display_name': 'Get Plex Watch History'},
         {'id': 'task_check_database_health', 'display_name': 'Check Database Health'},
+        {'id': 'task_backup_databases', 'display_name': 'Backup Databases'},
+        {'id': 'task_verify_statistics_counters', 'display_name': 'Verify Statistics Counters'},
         {'id': 'task_run_library_maintenance', 'display_name': 'Run Library Maintenance'},
         {'id': 'task_update_movie_ids', 'display_name': 'Update Movie IDs'},
         {'id': 'task_update_movie_titles', 'display_name': 'Update Movie Titles'},
@@ -5034,3 +5036,117 @@ def remove_duplicate_items():
             'success': False,
             'error': f'An error occurred: {str(e)}'
         })
+
+@debug_bp.route('/api/profiler/start', methods=['POST'])
+@admin_required
+def start_sampling_profiler():
+    from utilities.sampling_profiler import start_profiler
+    interval_ms = request.form.get('interval_ms', type=int) or (request.get_json(silent=True) or {}).get('interval_ms')
+    try:
+        profiler = start_profiler(int(interval_ms) if interval_ms else None)
+        return jsonify({'success': True, 'status': profiler.status()})
+    except (TypeError, ValueError) as e:
+        return jsonify({'success': False, 'error': f'Invalid interval: {e}'}), 400
+
+@debug_bp.route('/api/profiler/stop', methods=['POST'])
+@admin_required
+def stop_sampling_profiler():
+    from utilities.sampling_profiler import stop_profiler
+    profiler = stop_profiler()
+    return jsonify({'success': True, 'status': profiler.status() if profiler else {'running': False, 'samples': 0}})
+
+@debug_bp.route('/api/profiler/reset', methods=['POST'])
+@admin_required
+def reset_sampling_profiler():
+    from utilities.sampling_profiler import get_profiler
+    profiler = get_profiler()
+    if profiler:
+        profiler.reset()
+    return jsonify({'success': True})
+
+@debug_bp.route('/api/profiler/status', methods=['GET'])
+@admin_required
+def sampling_profiler_status():
+    from utilities.sampling_profiler import get_profiler
+    profiler = get_profiler()
+    if profiler is None:
+        return jsonify({'running': False, 'samples': 0, 'tasks': []})
+    status = profiler.status()
+    status['tasks'] = profiler.task_summary(limit=request.args.get('limit', 20, type=int))
+    return jsonify(status)
+
+@debug_bp.route('/api/profiler/collapsed', methods=['GET'])
+@admin_required
+def sampling_profiler_collapsed():
+    """Collapsed stacks for flamegraph.pl / speedscope."""
+    from utilities.sampling_profiler import get_profiler
+    profiler = get_profiler()
+    body = profiler.collapsed_stacks() if profiler else ''
+    filename = f"profile_{datetime.now().strftime('%Y%m%d_%H%M%S')}.folded"
+    return Response(body, mimetype='text/plain',
+                    headers={'Content-Disposition': f'attachment; filename={filename}'})
+
+@debug_bp.route('/api/logging_stats', methods=['GET'])
+@admin_required
+def logging_stats():
+    """Dropped and rate-limited log record counters."""
+    from logging_config import get_logging_stats
+    return jsonify(get_logging_stats())
+
+@debug_bp.route('/api/query_advisor/<action>', methods=['GET', 'POST'])
+@admin_required
+def query_advisor_action(action):
+    """Start/stop/reset SQL capture, or report EXPLAIN QUERY PLAN findings for captured and hot queries."""
+    from database import query_advisor
+    if action == 'start':
+        query_advisor.start_capture()
+    elif action == 'stop':
+        query_advisor.stop_capture()
+    elif action == 'reset':
+        query_advisor.reset_capture()
+    elif action == 'report':
+        report = query_advisor.capture_report()
+        report['hot_queries'] = query_advisor.check_hot_queries()
+        return jsonify(report)
+    else:
+        return jsonify({'success': False, 'error': f'Unknown action: {action}'}), 404
+    return jsonify({'success': True, 'capturing': query_advisor.is_capturing()})
+
+@debug_bp.route('/api/statistics_counters', methods=['GET', 'POST'])
+@admin_required
+def statistics_counters():
+    """GET: current counters and a consistency check against a full recount. POST: rebuild them."""
+    from database.statistics_counters import get_summary_counts, rebuild_statistics_counters, verify_statistics_counters
+    if request.method == 'POST':
+        return jsonify({'success': rebuild_statistics_counters(), 'summary': get_summary_counts()})
+    return jsonify({'summary': get_summary_counts(), 'check': verify_statistics_counters()})
+
+@debug_bp.route('/api/rclone_ingest_stats', methods=['GET'])
+@admin_required
+def rclone_ingest_stats():
+    """Queue depth, outcome counts and latency of the batched rclone webhook ingestion."""
+    from utilities.rclone_ingest import get_rclone_ingest_stats
+    stats = get_rclone_ingest_stats()
+    if stats is None:
+        return jsonify({'running': False, 'message': 'No rclone webhook received yet'})
+    return jsonify(stats)
+
+@debug_bp.route('/api/cache_stats', methods=['GET', 'DELETE'])
+@admin_required
+def cache_stats():
+    """GET: size, hit ratio and eviction counts of every TTL cache. DELETE: clear them all."""
+    from utilities.ttl_cache import clear_caches, get_cache_stats
+    if request.method == 'DELETE':
+        clear_caches()
+        return jsonify({'success': True, 'message': 'Caches cleared'})
+    return jsonify(get_cache_stats())
+
+@debug_bp.route('/api/database_backup', methods=['GET', 'POST'])
+@admin_required
+def database_backup():
+    """GET: backup status and existing backups. POST: start a backup now in the background."""
+    from database.backup import run_database_backups, get_backup_status
+    if request.method == 'POST':
+        threading.Thread(target=run_database_backups, name='DatabaseBackup', daemon=True).start()
+        return jsonify({'success': True, 'message': 'Database backup started'})
+    return jsonify(get_backup_status())
@@ -6,6 +6,7 @@ from werkzeug.middleware.proxy_fix import ProxyFix
 from flask_login import current_user
 import logging
 from routes.utils import is_user_system_enabled
+from utilities.sampling_profiler import set_thread_task, clear_thread_task
 from flask_cors import CORS
 import threading
 import uuid
@@ -394,6 +395,14 @@ def configure_session():
         app.config['SESSION_COOKIE_SAMESITE'] = 'Lax'
         app.config['REMEMBER_COOKIE_SAMESITE'] = 'Lax'
 
+@app.before_request
+def label_profiler_samples():
+    set_thread_task(f"route:{request.endpoint or request.path}")
+
+@app.teardown_request
+def clear_profiler_label(exc):
+    clear_thread_task()
+
 @app.after_request
 def add_security_headers(response):
     response.headers['X-Content-Type-Options'] = 'nosniff'
@@ -1,7 +1,10 @@
-from flask import Blueprint, render_template, jsonify, request
+from flask import Blueprint, render_template, jsonify, request, Response, stream_with_context
 from flask_login import login_required, current_user
 from functools import wraps
 import os
+import json
+import queue
+import threading
 from pathlib import Path
 from utilities.local_library_scan import scan_for_broken_symlinks, repair_broken_symlink
 import arrow # Import arrow
@@ -78,6 +81,44 @@ def scan_broken_symlinks():
     results = scan_for_broken_symlinks(library_path)
     return jsonify(results)
 
+@library_management.route('/api/libraries/scan-broken/stream', methods=['GET'])
+@admin_required
+def stream_broken_symlinks_scan():
+    """
+    Scan for broken symlinks, streaming progress and broken symlinks as server-sent events.
+    """
+    library_path = request.args.get('path') or None
+    events = queue.Queue()
+    stop_event = threading.Event()
+
+    def run_scan():
+        try:
+            result = scan_for_broken_symlinks(library_path, progress_callback=lambda progress: events.put({'type': 'progress', **progress}),
+                                              stop_event=stop_event)
+            summary = {key: value for key, value in result.items() if key != 'broken_symlinks'}
+            events.put({'type': 'complete', **summary})
+        except Exception as e:
+            logging.error(f"Error in streamed broken symlink scan: {e}", exc_info=True)
+            events.put({'type': 'complete', 'error': str(e)})
+
+    def generate():
+        threading.Thread(target=run_scan, name='BrokenSymlinkScan', daemon=True).start()
+        try:
+            while True:
+                try:
+                    event = events.get(timeout=15)
+                except queue.Empty:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"data: {json.dumps(event)}\n\n"
+                if event['type'] == 'complete':
+                    break
+        finally:
+            # The client disconnected (or the scan finished): stop the scan instead of letting it run unobserved
+            stop_event.set()
+
+    return Response(stream_with_context(generate()), mimetype='text/event-stream')
+
 @library_management.route('/api/libraries/repair-symlink', methods=['POST'])
 @admin_required
 def repair_symlink():
@@ -1,20 +1,14 @@
 from flask import redirect, url_for
-from functools import wraps, lru_cache
+from functools import wraps
 from flask_login import current_user, login_required
 from .utils import is_user_system_enabled
+from utilities.ttl_cache import ttl_cache
 import logging
-import time
-
-# Cache the logging calls for 5 minutes
-@lru_cache(maxsize=128)
-def _cached_log_debug(message, timestamp):
-    # timestamp is used to ensure we get a new cache entry every 5 minutes
-    logging.debug(message)
 
+# Log each message at most once every 5 minutes
+@ttl_cache(300, maxsize=128)
 def _rate_limited_log_debug(message):
-    # Create a new timestamp every 5 minutes
-    timestamp = int(time.time() / 300)  # 300 seconds = 5 minutes
-    _cached_log_debug(message, timestamp)
+    logging.debug(message)
 
 def admin_required(f):
     @wraps(f)
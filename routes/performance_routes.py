@@ -1,11 +1,25 @@
-from flask import Blueprint, render_template, jsonify, request
-import json
-import os
-from datetime import datetime, timedelta
+from flask import Blueprint, render_template, jsonify, request, Response
+import hmac
+import time
+from functools import wraps
 from .models import user_required
+from utilities.settings import get_setting
 
 performance_bp = Blueprint('performance', __name__)
 
+def metrics_token_or_user_required(f):
+    """Allow a request carrying the Debug metrics_token as a bearer token, otherwise require a login."""
+    login_required_view = user_required(f)
+
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        token = get_setting('Debug', 'metrics_token', '')
+        auth = request.headers.get('Authorization', '')
+        if token and auth.startswith('Bearer ') and hmac.compare_digest(auth[len('Bearer '):].encode(), token.encode()):
+            return f(*args, **kwargs)
+        return login_required_view(*args, **kwargs)
+    return decorated_function
+
 @performance_bp.route('/dashboard')
 @user_required
 def performance_dashboard():
@@ -15,50 +29,25 @@ def performance_dashboard():
 @performance_bp.route('/api/performance/log')
 @user_required
 def get_performance_log():
-    """Get the performance data from JSON file."""
-    log_dir = os.environ.get('USER_LOGS', '/user/logs')
-    log_file = os.path.join(log_dir, 'performance_log.json')
-    
+    """Get recent performance entries from the performance store."""
+    from queues.performance_store import get_performance_store
+
     # Get optional time range parameters
     hours = request.args.get('hours', type=int, default=24)
     limit = request.args.get('limit', type=int, default=1000)
     entry_type = request.args.get('type', type=str)  # Optional type filter
     metric_type = request.args.get('metric', type=str)  # Optional metric filter
-    cutoff_time = datetime.utcnow() - timedelta(hours=hours)
     
     try:
-        entries = []
-        if os.path.exists(log_file):
-            with open(log_file, 'r') as f:
-                for line in f:
-                    try:
-                        entry = json.loads(line.strip())
-                        # Skip if doesn't have timestamp
-                        if 'timestamp' not in entry:
-                            continue
-                            
-                        # Apply type filter if specified
-                        if entry_type and entry.get('type') != entry_type:
-                            continue
-                            
-                        # Apply metric filter if specified
-                        if metric_type and ('metrics' not in entry or metric_type not in entry['metrics']):
-                            continue
-                            
-                        entry_time = datetime.fromisoformat(entry['timestamp'].replace('Z', '+00:00'))
-                        if entry_time >= cutoff_time:
-                            entries.append(entry)
-                    except (json.JSONDecodeError, KeyError, ValueError) as e:
-                        continue
-        
-        # Sort entries by timestamp in descending order (newest first)
-        entries.sort(key=lambda x: x.get('timestamp', ''), reverse=True)
-        
-        # Take only the most recent entries up to the limit
-        entries = entries[:limit]
-        
-        # Re-sort in ascending order for display
-        entries.sort(key=lambda x: x.get('timestamp', ''))
+        # Most recent entries up to the limit, in ascending order for display
+        entries = get_performance_store().get_entries(
+            since=time.time() - hours * 3600,
+            entry_types=[entry_type] if entry_type else None,
+            limit=limit,
+            newest_first=True
+        )
+        if metric_type:
+            entries = [e for e in entries if metric_type in e.get('metrics', {})]
         
         # Get system info for metadata
         metadata = {
@@ -79,40 +68,23 @@ def get_performance_log():
 @performance_bp.route('/api/performance/cpu')
 @user_required
 def get_cpu_metrics():
-    """Get CPU performance metrics from the log file."""
-    log_dir = os.environ.get('USER_LOGS', '/user/logs')
-    log_file = os.path.join(log_dir, 'performance_log.json')
-    
+    """Get CPU performance metrics from the performance store."""
+    from queues.performance_store import get_performance_store
+
     # Get optional time range parameters
     hours = request.args.get('hours', type=int, default=1)  # Default to last hour
     limit = request.args.get('limit', type=int, default=60)  # Default to 60 entries (1 per minute)
     include_threads = request.args.get('threads', type=bool, default=False)  # Option to include thread data
-    cutoff_time = datetime.now() - timedelta(hours=hours)
     
     try:
-        entries = []
-        if os.path.exists(log_file):
-            with open(log_file, 'r') as f:
-                for line in f:
-                    try:
-                        entry = json.loads(line.strip())
-                        # Only process CPU metric entries
-                        if entry.get('type') != 'cpu_metrics':
-                            continue
-                            
-                        entry_time = datetime.fromisoformat(entry['timestamp'])
-                        if entry_time >= cutoff_time:
-                            # Optionally exclude thread data to reduce payload size
-                            if not include_threads and 'metrics' in entry:
-                                entry['metrics'].pop('thread_times', None)
-                            entries.append(entry)
-                            if len(entries) >= limit:
-                                break
-                    except (json.JSONDecodeError, KeyError, ValueError) as e:
-                        continue
-        
-        # Sort entries by timestamp
-        entries.sort(key=lambda x: x.get('timestamp', ''))
+        entries = get_performance_store().get_entries(
+            since=time.time() - hours * 3600, entry_types=['cpu_metrics'], limit=limit,
+            newest_first=True
+        )
+        # Optionally exclude thread data to reduce payload size
+        if not include_threads:
+            for entry in entries:
+                entry.get('metrics', {}).pop('thread_times', None)
         
         # Calculate summary statistics
         summary = {}
@@ -137,36 +109,18 @@ def get_cpu_metrics():
 @performance_bp.route('/api/performance/memory')
 @user_required
 def get_memory_metrics():
-    """Get memory performance metrics from the log file."""
-    log_dir = os.environ.get('USER_LOGS', '/user/logs')
-    log_file = os.path.join(log_dir, 'performance_log.json')
-    
+    """Get memory performance metrics from the performance store."""
+    from queues.performance_store import get_performance_store
+
     # Get optional time range parameters
     hours = request.args.get('hours', type=int, default=1)  # Default to last hour
     limit = request.args.get('limit', type=int, default=60)  # Default to 60 entries
-    cutoff_time = datetime.now() - timedelta(hours=hours)
     
     try:
-        entries = []
-        if os.path.exists(log_file):
-            with open(log_file, 'r') as f:
-                for line in f:
-                    try:
-                        entry = json.loads(line.strip())
-                        # Only process memory metric entries
-                        if entry.get('type') not in ['basic_metrics', 'detailed_memory']:
-                            continue
-                            
-                        entry_time = datetime.fromisoformat(entry['timestamp'])
-                        if entry_time >= cutoff_time:
-                            entries.append(entry)
-                            if len(entries) >= limit:
-                                break
-                    except (json.JSONDecodeError, KeyError, ValueError) as e:
-                        continue
-        
-        # Sort entries by timestamp
-        entries.sort(key=lambda x: x.get('timestamp', ''))
+        entries = get_performance_store().get_entries(
+            since=time.time() - hours * 3600, entry_types=['basic_metrics', 'detailed_memory'], limit=limit,
+            newest_first=True
+        )
         
         # Calculate summary statistics
         summary = {}
@@ -195,3 +149,79 @@ def get_memory_metrics():
                 
     except Exception as e:
         return jsonify({'error': str(e)}), 500
+
+@performance_bp.route('/api/performance/series')
+@user_required
+def get_metric_series():
+    """
+    Get one metric over a time range, e.g. metric=basic_metrics.cpu_percent&hours=720.
+    Long ranges are served from minute or hour rollups (avg/min/max per bucket).
+    """
+    from queues.performance_store import get_performance_store
+
+    store = get_performance_store()
+    metric = request.args.get('metric', type=str)
+    if not metric:
+        return jsonify({'metrics': store.list_metrics()})
+    hours = request.args.get('hours', type=float, default=24)
+    resolution = request.args.get('resolution', default='auto')
+    if resolution not in ('auto', 'raw', '60', '3600'):
+        return jsonify({'error': "resolution must be one of auto, raw, 60, 3600"}), 400
+
+    try:
+        return jsonify(store.query_series(metric, start=time.time() - hours * 3600, resolution=resolution))
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@performance_bp.route('/api/performance/queue_timing')
+@user_required
+def get_queue_timing():
+    """Get p50/p90/p99 queue dwell times for a time window."""
+    from database.queue_timing import get_queue_dwell_percentiles, QUEUE_TIMING_GROUP_COLUMNS
+
+    hours = request.args.get('hours', type=float, default=24)
+    group_by = [column for column in request.args.get('group_by', 'queue_name').split(',') if column in QUEUE_TIMING_GROUP_COLUMNS]
+    queue_name = request.args.get('queue', type=str)
+    content_source = request.args.get('content_source', type=str)
+    version = request.args.get('version', type=str)
+
+    try:
+        # Flush buffered transitions when the queue manager is running in this process
+        from queues.queue_manager import QueueManager
+        if QueueManager._instance is not None:
+            QueueManager._instance.queue_timer.save_timing_data(force=True)
+    except Exception:
+        pass
+
+    try:
+        groups = get_queue_dwell_percentiles(
+            hours=hours,
+            group_by=group_by or ['queue_name'],
+            queue_name=queue_name,
+            content_source=content_source,
+            version=version
+        )
+        groups.sort(key=lambda g: g.get('p90', 0), reverse=True)
+        return jsonify({
+            'hours': hours,
+            'group_by': group_by or ['queue_name'],
+            'groups': groups
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@performance_bp.route('/metrics')
+@metrics_token_or_user_required
+def prometheus_metrics():
+    """Stage latency histograms and counters in Prometheus text format."""
+    from utilities.metrics import render_prometheus
+    return Response(render_prometheus(), mimetype='text/plain; version=0.0.4')
+
+@performance_bp.route('/api/performance/stage_latency')
+@user_required
+def get_stage_latency():
+    """Count, average and estimated p50/p90/p99 per instrumented stage since startup."""
+    from utilities.metrics import latency_summary
+    rows = latency_summary()
+    rows.sort(key=lambda row: row['sum'], reverse=True)
+    return jsonify({'stages': rows})
@@ -1138,7 +1138,9 @@ def queue_stream():
                         "currently_processing_upgrade_id": currently_processing_upgrade_id,
                         "items_per_hour": items_per_hour,
                         "remaining_scrape_time": remaining_scrape_time,
-                        "items_remaining": items_remaining
+                        "items_remaining": items_remaining,
+                        # None unless the Scraping queue runs with more than one worker
+                        "scraping_workers": queue_manager.queues['Scraping'].get_worker_stats()
                     }
 
                     # Performance optimization: Only send if data has changed
@@ -14,38 +14,10 @@ from debrid import get_debrid_provider, TooManyDownloadsError, ProviderUnavailab
 from .program_operation_routes import get_program_status
 import json
 import math
-from functools import wraps
 # Provider-agnostic: avoid direct Real-Debrid import
-from typing import Optional, Dict, List, Any
+from typing import Optional, Dict, List, Any, Tuple
 import calendar
 
-def cache_for_seconds(seconds):
-    """Cache the result of a function for the specified number of seconds."""
-    def decorator(func):
-        cache = {}
-        
-        @wraps(func)
-        def wrapper(*args, **kwargs):
-            now = time.time()
-            
-            # Create a cache key from the function name and arguments
-            key = (func.__name__, args, frozenset(kwargs.items()))
-            
-            # Check if we have a cached value and it's still valid
-            if key in cache:
-                result, timestamp = cache[key]
-                if now - timestamp < seconds:
-                    logging.debug(f"Cache hit for {func.__name__}")
-                    return result
-            
-            # If no valid cached value, call the function
-            result = func(*args, **kwargs)
-            cache[key] = (result, now)
-            return result
-            
-        return wrapper
-    return decorator
-
 def get_cached_active_downloads():
     """Get active downloads with caching"""
     from database import get_cached_download_stats
@@ -61,6 +33,11 @@ def get_cached_user_traffic():
 statistics_bp = Blueprint('statistics', __name__)
 root_bp = Blueprint('root', __name__)
 
+def _air_local_window(start_date_iso: str, end_date_iso: str) -> Tuple[str, str]:
+    """Half-open media_calendar.air_local bounds covering whole days from start to end, both included."""
+    end_exclusive = datetime.fromisoformat(end_date_iso[:10]).date() + timedelta(days=1)
+    return start_date_iso[:10], end_exclusive.isoformat()
+
 def get_airing_soon():
     from database import get_db_connection
     conn = get_db_connection()
@@ -71,12 +48,12 @@ def get_airing_soon():
     
     query = """
     SELECT title, release_date, airtime
-    FROM media_items
-    WHERE type = 'episode' AND release_date BETWEEN ? AND ?
-    ORDER BY release_date, airtime
+    FROM media_calendar
+    WHERE type = 'episode' AND air_local >= ? AND air_local < ?
+    ORDER BY air_local
     """
     
-    cursor.execute(query, (today.isoformat(), tomorrow.isoformat()))
+    cursor.execute(query, _air_local_window(today.isoformat(), tomorrow.isoformat()))
     results = cursor.fetchall()
     
     conn.close()
@@ -104,12 +81,12 @@ def get_upcoming_releases():
     start_day = today - timedelta(days=upcoming_releases_start_limit)
     end_day = start_day + timedelta(days=upcoming_releases_end_limit)
     
-    # Simplified query - directly filter out existing movies in the main query
+    # Range scan of the calendar index, filtering out movies that are already collected
     query = """
     SELECT m.title, m.release_date, m.tmdb_id, m.imdb_id
-    FROM media_items m
+    FROM media_calendar m
     WHERE m.type = 'movie' 
-      AND m.release_date BETWEEN ? AND ?
+      AND m.air_local >= ? AND m.air_local < ?
       AND NOT EXISTS (
           SELECT 1 
           FROM media_items e 
@@ -118,10 +95,10 @@ def get_upcoming_releases():
             AND e.state IN ('Collected', 'Upgrading', 'Checking')
       )
     GROUP BY m.title  -- Group by date and title to remove duplicates
-    ORDER BY m.release_date ASC
+    ORDER BY m.air_local ASC
     """
     
-    cursor.execute(query, (start_day.isoformat(), end_day.isoformat()))
+    cursor.execute(query, _air_local_window(start_day.isoformat(), end_day.isoformat()))
     results = cursor.fetchall()
     
     conn.close()
@@ -189,14 +166,14 @@ def get_movies_for_calendar(days_past: int = 7, days_future: int = 28, start_dat
         m.tmdb_id, 
         m.imdb_id,
         COALESCE(MAX(m.state), 'Unknown') as state 
-    FROM media_items m
+    FROM media_calendar m
     WHERE m.type = 'movie' 
-      AND m.release_date BETWEEN ? AND ?
+      AND m.air_local >= ? AND m.air_local < ?
     GROUP BY m.title, m.release_date, m.tmdb_id, m.imdb_id
-    ORDER BY m.release_date ASC, m.title ASC
+    ORDER BY m.air_local ASC, m.title ASC
     """
     
-    cursor.execute(query, (query_start_date_iso, query_end_date_iso))
+    cursor.execute(query, _air_local_window(query_start_date_iso, query_end_date_iso))
     results = cursor.fetchall()
     conn.close()
     
@@ -234,20 +211,14 @@ def get_recently_aired_and_airing_soon(days_past: int = 2, days_future: int = 1,
             query_start_date_for_sql = two_days_ago.date().isoformat()
             query_end_date_for_sql = tomorrow.date().isoformat()
         
-        # New optimized approach:
-        # 1. First, get all unique episode combinations in one query
-        # 2. Process results in memory (which was already fast in the original code)
-        
-        prefilter_start = time.perf_counter()
-        
-        # Use a single optimized query with GROUP BY instead of temporary tables and joins
+        # Range scan of idx_media_calendar_type_air (kept current by triggers on media_items);
+        # air_local already combines the release date with the airtime or the 19:00 default
         optimized_query = """
         SELECT 
             title,
             season_number,
             episode_number,
-            release_date,
-            airtime,
+            air_local,
             imdb_id,
             tmdb_id,
             -- Determine effective state: if any version is 'Collected', report 'Collected'.
@@ -257,24 +228,17 @@ def get_recently_aired_and_airing_soon(days_past: int = 2, days_future: int = 1,
                 ELSE MAX(state)
             END as state,
             MAX(upgrading_from) as upgrading_from -- Get upgrading_from if present
-        FROM media_items
+        FROM media_calendar
         WHERE type = 'episode' 
-          AND release_date BETWEEN ? AND ?
+          AND air_local >= ? AND air_local < ?
           AND state != 'Blacklisted'  -- Exclude blacklisted items
         GROUP BY title, season_number, episode_number
-        ORDER BY release_date, airtime, title
+        ORDER BY air_local, title
         LIMIT 1000  -- Limit to reasonable number of results
         """
         
-        # Log the query plan to help optimize in the future
-        try:
-            cursor.execute("EXPLAIN QUERY PLAN " + optimized_query, (query_start_date_for_sql, query_end_date_for_sql))
-            query_plan = cursor.fetchall()
-        except Exception as e:
-            logging.warning(f"Could not get query plan: {e}")
-        
         query_start = time.perf_counter()
-        cursor.execute(optimized_query, (query_start_date_for_sql, query_end_date_for_sql))
+        cursor.execute(optimized_query, _air_local_window(query_start_date_for_sql, query_end_date_for_sql))
         results = cursor.fetchall()
         query_time = time.perf_counter() - query_start
         
@@ -296,27 +260,9 @@ def get_recently_aired_and_airing_soon(days_past: int = 2, days_future: int = 1,
         now_timestamp = now.timestamp()
         
         for result in results:
-            title, season, episode, release_date, airtime, imdb_id, tmdb_id, state, upgrading_from = result
+            title, season, episode, air_local, imdb_id, tmdb_id, state, upgrading_from = result
             try:
-                release_date = datetime.fromisoformat(release_date) if isinstance(release_date, str) else release_date
-                
-                # Get default airtime if none provided
-                if not airtime:
-                    airtime = "19:00"  # Default to 7 PM
-                
-                # Parse airtime more efficiently
-                try:
-                    if isinstance(airtime, str):
-                        hour, minute = map(int, airtime.split(':'))
-                        airtime = datetime.min.replace(hour=hour, minute=minute).time()
-                    elif not isinstance(airtime, time):
-                        airtime = datetime.min.replace(hour=19, minute=0).time()
-                except (ValueError, TypeError):
-                    airtime = datetime.min.replace(hour=19, minute=0).time()
-                
-                # Create datetime in local timezone more efficiently
-                air_datetime = datetime.combine(release_date.date(), airtime)
-                air_datetime = air_datetime.replace(tzinfo=local_tz) if hasattr(local_tz, 'localize') else air_datetime.replace(tzinfo=local_tz)
+                air_datetime = datetime.strptime(air_local, '%Y-%m-%d %H:%M').replace(tzinfo=local_tz)
                 
                 # Determine display status
                 display_status = 'uncollected' # Default
@@ -331,7 +277,7 @@ def get_recently_aired_and_airing_soon(days_past: int = 2, days_future: int = 1,
                 # If state is 'Wanted', 'Searching', etc., it will remain 'uncollected'
                 
                 # Create a key for grouping
-                show_key = f"{title}_{season}_{release_date.date()}"
+                show_key = f"{title}_{season}_{air_datetime.date()}"
                 
                 if show_key not in shows:
                     shows[show_key] = {
@@ -339,7 +285,7 @@ def get_recently_aired_and_airing_soon(days_past: int = 2, days_future: int = 1,
                         'season': season,
                         'episodes': set(),
                         'air_datetime': air_datetime,
-                        'release_date': release_date.date(),
+                        'release_date': air_datetime.date(),
                         'display_status': display_status, # Store first status found for the group
                         'imdb_id': imdb_id,
                         'tmdb_id': tmdb_id
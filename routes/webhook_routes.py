@@ -7,6 +7,8 @@ from utilities.local_library_scan import check_local_file_for_item, get_symlink_
 from utilities.plex_functions import plex_update_item
 from utilities.emby_functions import emby_update_item
 from utilities.settings import get_setting
+from utilities.mount_index import notify_mount_change
+from utilities.rclone_ingest import IngestPath, get_rclone_ingest_queue
 from urllib.parse import unquote
 import unicodedata
 import os.path
@@ -21,12 +23,10 @@ from database.core import get_db_connection
 from utilities.reverse_parser import parse_filename_for_version
 from datetime import datetime, timezone
 from database.database_writing import update_media_item_state, add_media_item, update_release_date_and_state
-from database.database_reading import get_media_item_by_id, get_media_item_presence, get_media_item_by_filename, check_item_exists_by_directory_name, check_item_exists_by_symlink_path, check_item_exists_with_symlink_path_containing
+from database.database_reading import get_media_item_by_id, get_media_item_presence, get_media_item_by_filename
 import json
 import time
 import requests # Added for TMDB API calls
-import threading # Added for background task
-import uuid # Added for task_id generation
 from pathlib import Path # Added for path manipulation
 from routes.debug_routes import _run_rclone_to_symlink_task # Added for the rclone processing task
 import os # Added for os.path.basename and os.path.join
@@ -108,16 +108,25 @@ def webhook():
         logging.error(f"Error processing webhook: {str(e)}")
         return jsonify({"status": "error", "message": str(e)}), 500
 
+def _process_rclone_path(item: IngestPath):
+    """Run the rclone-to-symlink task for one path taken from the ingestion queue."""
+    symlink_base_path_str = get_setting('File Management', 'symlinked_files_path')
+    if not symlink_base_path_str:
+        symlink_base_path_str = "/mnt/symlinked_media"
+        logging.warning(f"Symlink base path not found in settings, using default: {symlink_base_path_str}")
+    logging.info(f"Initiating rclone to symlinks task. Task ID: {item.task_id}, Scan Path: {item.scan_path}, Symlink Base: {symlink_base_path_str}, Assumed Title: {item.directory_name}")
+    _run_rclone_to_symlink_task(item.scan_path, symlink_base_path_str, False, item.task_id, True, item.directory_name)
+
 @webhook_bp.route('/rclone', methods=['POST', 'GET'])
 def rclone_webhook():
     """
-    Receives a relative path from rclone, extracts the final directory component,
-    checks if any item for this directory name already exists in the DB based on title fields, 
-    OR if the original_path_for_symlink contains this component,
-    and if not, triggers a background task to process it.
-    Returns 202 Accepted immediately if processing is initiated.
+    Receives a relative path from rclone, extracts the final directory component
+    and hands it to the rclone ingestion queue. The queue de-duplicates paths,
+    checks the database for existing items in batches (matching title fields, or
+    an original_path_for_symlink containing the component) and processes new
+    paths in the background with bounded concurrency.
+    Returns 202 Accepted immediately with the task ID the path is processed under.
     Ignores requests if file management mode is set to Plex.
-    Ignores requests if an item matching the criteria already exists in the database.
     """
     try:
         # Check file management mode first
@@ -157,58 +166,22 @@ def rclone_webhook():
         # This is the absolute path to the directory/file that rclone is reporting and needs scanning.
         absolute_item_dir_or_file_path = os.path.join(original_files_base_path, final_dir_component)
         logging.info(f"Constructed absolute item path to check/scan: {absolute_item_dir_or_file_path}")
+        notify_mount_change(absolute_item_dir_or_file_path)
 
-        # --- Check database for existing item ---
-        # Check 1: Match directory name against title fields
-        logging.info(f"DB Check 1: Calling check_item_exists_by_directory_name with argument: '{final_dir_component}'")
-        exists_by_dir_name = check_item_exists_by_directory_name(final_dir_component)
-        logging.info(f"DB Check 1 Result (exists_by_dir_name): {exists_by_dir_name}")
-        
-        # Check 2: Match final_dir_component against original_path_for_symlink (contains check)
-        # This replaces the previous check_item_exists_by_symlink_path(absolute_item_dir_or_file_path)
-        logging.info(f"DB Check 2: Calling check_item_exists_with_symlink_path_containing with argument: '{final_dir_component}'")
-        exists_by_symlink_path_contains_component = check_item_exists_with_symlink_path_containing(final_dir_component)
-        logging.info(f"DB Check 2 Result (exists_by_symlink_path_contains_component): {exists_by_symlink_path_contains_component}")
-
-        if exists_by_dir_name or exists_by_symlink_path_contains_component:
-            ignore_reason = []
-            if exists_by_dir_name:
-                ignore_reason.append(f"matching directory/title name '{final_dir_component}' found")
-            if exists_by_symlink_path_contains_component:
-                 ignore_reason.append(f"original_path_for_symlink containing component '{final_dir_component}' found")
-            
-            logging.info(f"Ignoring rclone webhook. Reason(s): {'; '.join(ignore_reason)}.")
-            return jsonify({
-                "status": "ignored",
-                "message": f"Item already exists based on: {'; '.join(ignore_reason)}."
-            }), 200
+        # Existence checks and processing happen in batches on the ingestion queue
+        result = get_rclone_ingest_queue(_process_rclone_path).submit(final_dir_component, absolute_item_dir_or_file_path)
+        if result['status'] == 'duplicate':
+            logging.info(f"rclone path '{final_dir_component}' is already queued or being processed (task {result['task_id']})")
+            message = f"Path already queued or being processed (task ID: {result['task_id']})."
         else:
-            logging.info(f"No existing database entries found matching directory/title name '{final_dir_component}' OR where original_path_for_symlink contains component '{final_dir_component}'. Proceeding with webhook processing.")
-        # --- End database checks ---
-
-        symlink_base_path_str = get_setting('File Management', 'symlinked_files_path')
-        if not symlink_base_path_str:
-            symlink_base_path_str = "/mnt/symlinked_media" 
-            logging.warning(f"Symlink base path not found in settings, using default: {symlink_base_path_str}")
-        
-        task_id = str(uuid.uuid4())
-        dry_run = False
-
-        # The path passed to the task should still be the full path for scanning.
-        scan_path = absolute_item_dir_or_file_path 
-        logging.info(f"Initiating rclone to symlinks task. Task ID: {task_id}, Scan Path: {scan_path}, Symlink Base: {symlink_base_path_str}, Assumed Title: {final_dir_component}")
-
-        thread = threading.Thread(
-            target=_run_rclone_to_symlink_task,
-            args=(scan_path, symlink_base_path_str, dry_run, task_id, True, final_dir_component)
-        )
-        thread.daemon = True
-        thread.start()
+            logging.info(f"Queued rclone path '{absolute_item_dir_or_file_path}' for batched processing (task {result['task_id']})")
+            message = f"Path queued for processing (task ID: {result['task_id']}): {absolute_item_dir_or_file_path}."
 
         return jsonify({
             "status": "accepted",
-            "message": f"Path received. Background task (ID: {task_id}) initiated to process: {scan_path}.",
-            "task_id": task_id
+            "queue_status": result['status'],
+            "message": message,
+            "task_id": result['task_id']
         }), 202
 
     except Exception as e:
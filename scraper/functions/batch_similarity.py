@@ -0,0 +1,136 @@
+"""
+Batched fuzzy title similarity.
+
+`filter_results` compares every result against the query title, the matching
+aliases, the translated title and the DirectAPI aliases, and `rank_result_key`
+compares them against the query again. Instead of one scalar fuzzywuzzy call per
+pair, `TitleSimilarityScorer.prime` scores all rows against each candidate title
+in one C-backed RapidFuzz call and memoizes the scores.
+
+Scores are identical to fuzzywuzzy's (same preprocessing, same integer rounding),
+so similarity thresholds are unaffected. Pairs that were never primed, or
+environments without RapidFuzz, fall back to the scalar fuzzywuzzy scorers.
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Tuple
+
+from fuzzywuzzy import fuzz
+from fuzzywuzzy import utils as fuzz_utils
+
+try:
+    from rapidfuzz import fuzz as rf_fuzz, process as rf_process
+except ImportError:
+    rf_fuzz = None
+    rf_process = None
+
+# fuzzywuzzy only computes the same Indel ratio as RapidFuzz when it runs on
+# python-Levenshtein. Its difflib fallback scores differently, so don't batch then.
+BATCH_SCORING_AVAILABLE = rf_process is not None and fuzz.SequenceMatcher.__module__ == 'fuzzywuzzy.StringMatcher'
+
+# Upper bound on memoized pair scores; the least recently used are evicted first
+MAX_CACHED_SCORES = 200000
+
+
+def _full_process(text: str) -> str:
+    # The token scorers in fuzzywuzzy run full_process with force_ascii before comparing
+    return fuzz_utils.full_process(text, force_ascii=True)
+
+
+# kind -> (scalar fuzzywuzzy scorer, batched RapidFuzz scorer, preprocessor)
+_SCORERS = {
+    'ratio': (fuzz.ratio, rf_fuzz.ratio if rf_fuzz else None, None),
+    'token_set_ratio': (fuzz.token_set_ratio, rf_fuzz.token_set_ratio if rf_fuzz else None, _full_process),
+    'token_sort_ratio': (fuzz.token_sort_ratio, rf_fuzz.token_sort_ratio if rf_fuzz else None, _full_process),
+}
+
+
+class TitleSimilarityScorer:
+    """Memoized fuzzywuzzy-compatible scores (0-100 ints) with batched priming."""
+
+    def __init__(self, max_entries: int = MAX_CACHED_SCORES):
+        self.max_entries = max_entries
+        # LRU order, oldest first. Scraping workers share the scorer, so evicting one
+        # entry at a time keeps the scores other workers are still using.
+        self._scores: 'OrderedDict[Tuple[str, str, str], int]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(kind: str, a: str, b: str) -> Tuple[str, str, str]:
+        # All three scorers are symmetric, so store each pair once
+        return (kind, a, b) if a <= b else (kind, b, a)
+
+    def _store(self, scores: Dict[Tuple[str, str, str], int]):
+        with self._lock:
+            for key, value in scores.items():
+                self._scores[key] = value
+                self._scores.move_to_end(key)
+            while len(self._scores) > self.max_entries:
+                self._scores.popitem(last=False)
+
+    def prime(self, kind: str, rows: Iterable[Optional[str]], candidates: Iterable[Optional[str]]) -> int:
+        """
+        Score every row against every candidate in batch and memoize the results.
+
+        Returns:
+            Number of pair scores computed.
+        """
+        if not BATCH_SCORING_AVAILABLE:
+            return 0
+        _, batch_scorer, processor = _SCORERS[kind]
+        rows = [row for row in dict.fromkeys(rows) if row is not None]
+        candidates = [candidate for candidate in dict.fromkeys(candidates) if candidate is not None]
+        if not rows or not candidates:
+            return 0
+
+        processed_rows = [processor(row) for row in rows] if processor else rows
+        computed = 0
+        scores: Dict[Tuple[str, str, str], int] = {}
+        for candidate in candidates:
+            processed_candidate = processor(candidate) if processor else candidate
+            # One-to-many: the whole row list is scored against the candidate in C
+            matches = rf_process.extract(
+                processed_candidate, processed_rows, scorer=batch_scorer, processor=None, limit=None
+            )
+            for _, score, index in matches:
+                # fuzzywuzzy rounds with int(round(...)); do the same so thresholds match exactly
+                scores[self._key(kind, rows[index], candidate)] = int(round(score))
+            computed += len(matches)
+        self._store(scores)
+        return computed
+
+    def score(self, kind: str, a: str, b: str) -> int:
+        key = self._key(kind, a, b)
+        with self._lock:
+            cached = self._scores.get(key)
+            if cached is not None:
+                self._scores.move_to_end(key)
+                return cached
+        value = _SCORERS[kind][0](a, b)
+        self._store({key: value})
+        return value
+
+    def ratio(self, a: str, b: str) -> int:
+        return self.score('ratio', a, b)
+
+    def token_set_ratio(self, a: str, b: str) -> int:
+        return self.score('token_set_ratio', a, b)
+
+    def token_sort_ratio(self, a: str, b: str) -> int:
+        return self.score('token_sort_ratio', a, b)
+
+    def clear(self):
+        with self._lock:
+            self._scores.clear()
+
+
+_shared_scorer = TitleSimilarityScorer()
+if not BATCH_SCORING_AVAILABLE:
+    logging.debug("Batched title similarity unavailable (RapidFuzz or python-Levenshtein missing); using scalar fuzzywuzzy.")
+
+
+def get_title_similarity_scorer() -> TitleSimilarityScorer:
+    """Process-wide scorer shared by filtering and ranking so primed scores are reused."""
+    return _shared_scorer
@@ -1,13 +1,11 @@
 import logging
 import re
 from typing import List, Dict, Any, Tuple, Optional
-from fuzzywuzzy import fuzz
 from PTT import parse_title
-from utilities.settings import get_setting
 from scraper.functions.similarity_checks import improved_title_similarity, normalize_title
 from scraper.functions.file_processing import compare_resolutions, parse_size, calculate_bitrate
-from scraper.functions.other_functions import smart_search
-from scraper.functions.adult_terms import adult_terms
+from scraper.functions.version_profile import get_version_profile
+from scraper.functions.batch_similarity import get_title_similarity_scorer
 from scraper.functions.common import *
 from datetime import datetime, timezone
 # --- Import DirectAPI if type hinting is desired, ensure it's available in the execution path ---
@@ -71,6 +69,142 @@ def extract_year_from_title(title: str) -> Optional[int]:
     
     return None
 
+def _prepare_api_alias_context(
+    imdb_id: Optional[str], content_type: str, direct_api: Optional[Any], title: str,
+    matching_aliases: Optional[List[str]], _aliases_cache: Dict, _show_metadata_cache: Dict
+) -> Tuple[Dict[str, List[str]], List[str], List[Tuple[str, str]]]:
+    """
+    Fetch the API aliases for an item and detect language codes in its titles.
+
+    This only depends on the item, not on the result being filtered, so
+    filter_results computes it once per call instead of once per result.
+
+    Returns:
+        (item_aliases, detected language codes, [(alias, normalized alias), ...])
+    """
+    # --- Fetch additional aliases via DirectAPI ---
+    item_aliases = {}
+
+    # Check cache first for aliases
+    if imdb_id in _aliases_cache:
+        item_aliases = _aliases_cache[imdb_id]
+        # logging.debug(f"Using cached aliases for {imdb_id}")
+    else:
+        try:
+            if direct_api:
+                if content_type.lower() == 'movie':
+                    item_aliases, _ = direct_api.get_movie_aliases(imdb_id)
+                else:
+                    item_aliases, _ = direct_api.get_show_aliases(imdb_id)
+        except Exception as alias_err:
+            logging.warning(f"Failed to fetch aliases for {imdb_id}: {alias_err}")
+            item_aliases = {}
+
+        # Cache the result (even if empty or failed)
+        _aliases_cache[imdb_id] = item_aliases
+
+    # Ensure item_aliases is a dictionary even if the API returned None or an unexpected value
+    if not isinstance(item_aliases, dict):
+        item_aliases = {}
+
+    # -------------------------------------------------------------
+    # Include original_title from metadata in alias pool
+    # -------------------------------------------------------------
+    try:
+        if imdb_id and direct_api:
+            # Check metadata cache first
+            if imdb_id in _show_metadata_cache:
+                meta_data = _show_metadata_cache[imdb_id]
+                # logging.debug(f"Using cached metadata for original_title lookup for {imdb_id}")
+            else:
+                if content_type.lower() == 'movie':
+                    meta_data, _ = direct_api.get_movie_metadata(imdb_id)
+                else:
+                    meta_data, _ = direct_api.get_show_metadata(imdb_id)
+                # Cache the result
+                _show_metadata_cache[imdb_id] = meta_data
+
+            if meta_data and isinstance(meta_data, dict):
+                orig_title_val = meta_data.get('original_title') or meta_data.get('originalTitle')
+                if orig_title_val:
+                    if isinstance(orig_title_val, list):
+                        orig_title_list = [str(t) for t in orig_title_val if t]
+                    else:
+                        orig_title_list = [str(orig_title_val)]
+
+                    existing_orig_list = item_aliases.get('original_title', [])
+                    # Merge and ensure uniqueness later in dedup step
+                    existing_orig_list.extend(orig_title_list)
+                    item_aliases['original_title'] = existing_orig_list
+    except Exception as meta_err:
+        logging.warning(f"Failed to fetch original_title for {imdb_id}: {meta_err}")
+
+    # Deduplicate and log aliases
+    item_aliases = {k: list(set(v)) for k, v in item_aliases.items()}
+
+    # --- Language Code Detection (after API aliases are fetched) ---
+    # Check for language codes in original title, matching_aliases, and API aliases
+    all_titles_to_check = [title]
+    if matching_aliases:
+        all_titles_to_check.extend(matching_aliases)
+
+    # Add API aliases to the check
+    for alias_list in item_aliases.values():
+        all_titles_to_check.extend(alias_list)
+
+    detected_codes_in_original = []
+    for check_title in all_titles_to_check:
+        # Use PTT parser to detect country codes in titles/aliases
+        try:
+            from scraper.functions.ptt_parser import parse_with_ptt
+            parsed_alias = parse_with_ptt(check_title)
+            if parsed_alias.get('country'):
+                country_code_mapping = {'gb': 'UK', 'us': 'US', 'au': 'AU', 'ca': 'CA', 'nz': 'NZ'}
+                detected_code = country_code_mapping.get(parsed_alias['country'].lower(), parsed_alias['country'].upper())
+                detected_codes_in_original.append(detected_code)
+        except Exception as e:
+            # Fallback to our custom detection if PTT parsing fails
+            codes = detect_language_codes(check_title)
+            detected_codes_in_original.extend(codes)
+
+    # Remove duplicates while preserving order
+    detected_codes_in_original = list(dict.fromkeys(detected_codes_in_original))
+
+    prepared_api_aliases = [
+        (alias, normalize_title(alias).lower())
+        for alias_list in item_aliases.values()
+        for alias in alias_list
+    ]
+    return item_aliases, detected_codes_in_original, prepared_api_aliases
+
+def _result_similarity_rows(results: List[Dict[str, Any]]) -> Tuple[List[str], List[str]]:
+    """
+    Normalized full and parsed titles of the results, as filter_results computes them per result.
+
+    Used to batch-score all results up front; rows that end up different in the
+    loop (e.g. documentary re-tagging) just fall back to scalar scoring.
+    """
+    result_titles = []
+    parsed_titles = []
+    for result in results:
+        parsed_info = result.get('parsed_info') or {}
+        original_title = result.get('original_title', result.get('title', ''))
+        if not parsed_info or not isinstance(original_title, str):
+            continue
+        normalized_result_title = normalize_title(original_title).lower()
+        if parsed_info.get('documentary', False):
+            normalized_result_title = f"{normalized_result_title} documentary"
+        result_titles.append(normalized_result_title)
+        parsed_title_str = parsed_info.get('title', '')
+        if parsed_title_str and isinstance(parsed_title_str, str):
+            parsed_titles.append(normalize_title(parsed_title_str).lower())
+    return result_titles, parsed_titles
+
+
+def _simple_title(normalized_title: str) -> str:
+    return re.sub(r'[^a-z0-9]', '', normalized_title)
+
+
 def filter_results(
     results: List[Dict[str, Any]], tmdb_id: str, title: str, year: int, content_type: str,
     season: int, episode: int, multi: bool, version_settings: Dict[str, Any],
@@ -94,26 +228,27 @@ def filter_results(
     _season_year_cache = {}  # Cache for season year lookups: {(imdb_id, season): year}
     _show_metadata_cache = {}  # Cache for show metadata: {imdb_id: metadata}
     _aliases_cache = {}  # Cache for aliases: {imdb_id: aliases}
+    _api_alias_context_cache = {}  # Cache for prepared API aliases and language codes: {imdb_id: context}
 
     filtered_results = []
     pre_size_filtered_results = []  # Track results before size filtering
-    resolution_wanted = version_settings.get('resolution_wanted', '<=')
-    max_resolution = version_settings.get('max_resolution', '2160p')
-    min_size_gb = float(version_settings.get('min_size_gb', 0.01))
-    max_size_gb = float(version_settings.get('max_size_gb', float('inf')) or float('inf'))
-    filter_in = version_settings.get('filter_in', [])
-    filter_out = version_settings.get('filter_out', [])
-    enable_hdr = version_settings.get('enable_hdr', False)
-    disable_adult = get_setting('Scraping', 'disable_adult', False)
+    # Version settings, compiled patterns and global settings are resolved once per version
+    profile = get_version_profile(version_settings)
+    resolution_wanted = profile.resolution_wanted
+    max_resolution = profile.max_resolution
+    min_size_gb = profile.min_size_gb
+    max_size_gb = profile.max_size_gb
+    enable_hdr = profile.enable_hdr
+    filter_trash_releases = profile.filter_trash_releases
     
     #logging.debug(f"Starting filter_results with {len(results)} results")
     #logging.debug(f"Version settings: resolution={max_resolution}({resolution_wanted}), size={min_size_gb}-{max_size_gb}GB, HDR={enable_hdr}")
     #logging.debug(f"Filter patterns - in: {filter_in}, out: {filter_out}")
     
-    # Pre-compile patterns
-    filter_in_patterns = filter_in if filter_in else []
-    filter_out_patterns = filter_out if filter_out else []
-    adult_pattern = re.compile('|'.join(adult_terms), re.IGNORECASE) if disable_adult else None
+    # Pre-compiled patterns
+    filter_in_patterns = profile.filter_in
+    filter_out_patterns = profile.filter_out
+    adult_pattern = profile.adult_pattern
     
     # Determine content type specific settings
     is_movie = content_type.lower() == 'movie'
@@ -135,9 +270,9 @@ def filter_results(
     
     # Determine base similarity threshold
     # Override anime similarity threshold to be more restrictive to prevent false matches
-    original_anime_setting = version_settings.get('similarity_threshold_anime', 0.60)
+    original_anime_setting = profile.similarity_threshold_anime
     anime_threshold = max(0.80, float(original_anime_setting))
-    base_similarity_threshold = anime_threshold if is_anime else float(version_settings.get('similarity_threshold', 0.8))
+    base_similarity_threshold = anime_threshold if is_anime else profile.similarity_threshold
     
     # Debug logging for threshold issues
     if is_anime:
@@ -171,6 +306,21 @@ def filter_results(
     
     # --- Cache for API fallback results within this filter_results call ---
     _fetched_detailed_seasons_data_cache = None
+
+    # --- Batched title similarity ---
+    # Score all results against the query, aliases and translated title up front in
+    # one batched call per candidate; the per-result checks below then hit the cache.
+    similarity_scorer = get_title_similarity_scorer()
+    result_similarity_titles, parsed_similarity_titles = _result_similarity_rows(results)
+    primary_similarity_titles = [normalized_query_title, normalized_translated_title]
+    similarity_scorer.prime('token_set_ratio', result_similarity_titles, primary_similarity_titles)
+    similarity_scorer.prime('token_sort_ratio', parsed_similarity_titles, primary_similarity_titles + normalized_aliases)
+    similarity_scorer.prime('token_set_ratio', parsed_similarity_titles + [normalized_query_title], normalized_aliases)
+    similarity_scorer.prime(
+        'ratio',
+        [_simple_title(t) for t in result_similarity_titles + parsed_similarity_titles],
+        [_simple_title(t) for t in primary_similarity_titles if t]
+    )
     
     for result in results:
         try:
@@ -210,7 +360,6 @@ def filter_results(
                 logging.info(f"  - parsed episodes: {parsed_info.get('season_episode_info', {}).get('episodes')}")
             
             # Check if it's marked as trash by PTT and filter_trash_releases is enabled
-            filter_trash_releases = get_setting('Scraping', 'filter_trash_releases', True)
             if filter_trash_releases and parsed_info.get('trash', False):
                 result['filter_reason'] = "Marked as trash by parser"
                 logging.info(f"Rejected: Marked as trash by parser for '{original_title}' (Size: {result['size']:.2f}GB)")
@@ -263,9 +412,9 @@ def filter_results(
             simple_parsed = re.sub(r'[^a-z0-9]', '', normalized_parsed_title) if normalized_parsed_title else None
             
             # --- Main Title Similarity ---
-            main_sim_set = fuzz.token_set_ratio(normalized_result_title, normalized_query_title) / 100.0
+            main_sim_set = similarity_scorer.token_set_ratio(normalized_result_title, normalized_query_title) / 100.0
             if normalized_parsed_title:
-                main_sim_sort = fuzz.token_sort_ratio(normalized_parsed_title, normalized_query_title) / 100.0
+                main_sim_sort = similarity_scorer.token_sort_ratio(normalized_parsed_title, normalized_query_title) / 100.0
                 main_title_sim = (main_sim_set + main_sim_sort) / 2.0
             else:
                 main_title_sim = main_sim_set
@@ -354,9 +503,9 @@ def filter_results(
 
             if main_title_sim < 0.8 and not penalty_was_applied:
                 # Check if this might be an acronym mismatch (like S.H.I.E.L.D. vs S H I E L D)
-                simple_sim_result = fuzz.ratio(simple_result, simple_query) / 100.0
+                simple_sim_result = similarity_scorer.ratio(simple_result, simple_query) / 100.0
                 if simple_parsed:
-                    simple_sim_parsed = fuzz.ratio(simple_parsed, simple_query) / 100.0
+                    simple_sim_parsed = similarity_scorer.ratio(simple_parsed, simple_query) / 100.0
                     simple_sim = max(simple_sim_result, simple_sim_parsed)
                 else:
                     simple_sim = simple_sim_result
@@ -374,20 +523,20 @@ def filter_results(
                 for alias in normalized_aliases:
                     # Compare parsed title against alias when available, otherwise query against alias
                     if normalized_parsed_title:
-                        alias_sim_set = fuzz.token_set_ratio(normalized_parsed_title, alias) / 100.0
-                        alias_sim_sort = fuzz.token_sort_ratio(normalized_parsed_title, alias) / 100.0
+                        alias_sim_set = similarity_scorer.token_set_ratio(normalized_parsed_title, alias) / 100.0
+                        alias_sim_sort = similarity_scorer.token_sort_ratio(normalized_parsed_title, alias) / 100.0
                         alias_sim = (alias_sim_set + alias_sim_sort) / 2.0
                     else:
-                        alias_sim_set = fuzz.token_set_ratio(normalized_query_title, alias) / 100.0
+                        alias_sim_set = similarity_scorer.token_set_ratio(normalized_query_title, alias) / 100.0
                         alias_sim = alias_sim_set
 
                     # Apply same acronym handling for aliases
                     if alias_sim < 0.8:
                         simple_alias = re.sub(r'[^a-z0-9]', '', alias)
                         # Compare query vs alias for acronym handling, not result vs alias
-                        simple_sim_result = fuzz.ratio(simple_query, simple_alias) / 100.0
+                        simple_sim_result = similarity_scorer.ratio(simple_query, simple_alias) / 100.0
                         if simple_parsed:
-                            simple_sim_parsed = fuzz.ratio(simple_query, simple_alias) / 100.0
+                            simple_sim_parsed = similarity_scorer.ratio(simple_query, simple_alias) / 100.0
                             simple_sim = max(simple_sim_result, simple_sim_parsed)
                         else:
                             simple_sim = simple_sim_result
@@ -410,9 +559,9 @@ def filter_results(
             # --- Translated Title Similarity ---
             translated_title_sim = 0.0
             if normalized_translated_title:
-                trans_sim_set = fuzz.token_set_ratio(normalized_result_title, normalized_translated_title) / 100.0
+                trans_sim_set = similarity_scorer.token_set_ratio(normalized_result_title, normalized_translated_title) / 100.0
                 if normalized_parsed_title:
-                    trans_sim_sort = fuzz.token_sort_ratio(normalized_parsed_title, normalized_translated_title) / 100.0
+                    trans_sim_sort = similarity_scorer.token_sort_ratio(normalized_parsed_title, normalized_translated_title) / 100.0
                     translated_title_sim = (trans_sim_set + trans_sim_sort) / 2.0
                 else:
                     translated_title_sim = trans_sim_set
@@ -420,9 +569,9 @@ def filter_results(
                 # Apply same acronym handling for translated titles
                 if translated_title_sim < 0.8:
                     simple_translated = re.sub(r'[^a-z0-9]', '', normalized_translated_title)
-                    simple_sim_result = fuzz.ratio(simple_result, simple_translated) / 100.0
+                    simple_sim_result = similarity_scorer.ratio(simple_result, simple_translated) / 100.0
                     if simple_parsed:
-                        simple_sim_parsed = fuzz.ratio(simple_parsed, simple_translated) / 100.0
+                        simple_sim_parsed = similarity_scorer.ratio(simple_parsed, simple_translated) / 100.0
                         simple_sim = max(simple_sim_result, simple_sim_parsed)
                     else:
                         simple_sim = simple_sim_result
@@ -441,93 +590,15 @@ def filter_results(
             # Compute initial best similarity score (without API aliases)
             best_sim = max(main_title_sim, best_alias_sim, translated_title_sim)
 
-            # --- Fetch additional aliases via DirectAPI ---
-            item_aliases = {}
-            
-            # Check cache first for aliases
-            if imdb_id in _aliases_cache:
-                item_aliases = _aliases_cache[imdb_id]
-                # logging.debug(f"Using cached aliases for {imdb_id}")
-            else:
-                try:
-                    if direct_api:
-                        if content_type.lower() == 'movie':
-                            item_aliases, _ = direct_api.get_movie_aliases(imdb_id)
-                        else:
-                            item_aliases, _ = direct_api.get_show_aliases(imdb_id)
-                except Exception as alias_err:
-                    logging.warning(f"Failed to fetch aliases for {imdb_id}: {alias_err}")
-                    item_aliases = {}
-
-                # Cache the result (even if empty or failed)
-                _aliases_cache[imdb_id] = item_aliases
-
-            # Ensure item_aliases is a dictionary even if the API returned None or an unexpected value
-            if not isinstance(item_aliases, dict):
-                item_aliases = {}
-
-            # -------------------------------------------------------------
-            # Include original_title from metadata in alias pool
-            # -------------------------------------------------------------
-            try:
-                if imdb_id and direct_api:
-                    # Check metadata cache first
-                    if imdb_id in _show_metadata_cache:
-                        meta_data = _show_metadata_cache[imdb_id]
-                        # logging.debug(f"Using cached metadata for original_title lookup for {imdb_id}")
-                    else:
-                        if content_type.lower() == 'movie':
-                            meta_data, _ = direct_api.get_movie_metadata(imdb_id)
-                        else:
-                            meta_data, _ = direct_api.get_show_metadata(imdb_id)
-                        # Cache the result
-                        _show_metadata_cache[imdb_id] = meta_data
-
-                    if meta_data and isinstance(meta_data, dict):
-                        orig_title_val = meta_data.get('original_title') or meta_data.get('originalTitle')
-                        if orig_title_val:
-                            if isinstance(orig_title_val, list):
-                                orig_title_list = [str(t) for t in orig_title_val if t]
-                            else:
-                                orig_title_list = [str(orig_title_val)]
-
-                            existing_orig_list = item_aliases.get('original_title', [])
-                            # Merge and ensure uniqueness later in dedup step
-                            existing_orig_list.extend(orig_title_list)
-                            item_aliases['original_title'] = existing_orig_list
-            except Exception as meta_err:
-                logging.warning(f"Failed to fetch original_title for {imdb_id}: {meta_err}")
-
-            # Deduplicate and log aliases
-            item_aliases = {k: list(set(v)) for k, v in item_aliases.items()}
-            
-            # --- Language Code Detection (after API aliases are fetched) ---
-            # Check for language codes in original title, matching_aliases, and API aliases
-            all_titles_to_check = [title]
-            if matching_aliases:
-                all_titles_to_check.extend(matching_aliases)
-            
-            # Add API aliases to the check
-            for alias_list in item_aliases.values():
-                all_titles_to_check.extend(alias_list)
-            
-            detected_codes_in_original = []
-            for check_title in all_titles_to_check:
-                # Use PTT parser to detect country codes in titles/aliases
-                try:
-                    from scraper.functions.ptt_parser import parse_with_ptt
-                    parsed_alias = parse_with_ptt(check_title)
-                    if parsed_alias.get('country'):
-                        country_code_mapping = {'gb': 'UK', 'us': 'US', 'au': 'AU', 'ca': 'CA', 'nz': 'NZ'}
-                        detected_code = country_code_mapping.get(parsed_alias['country'].lower(), parsed_alias['country'].upper())
-                        detected_codes_in_original.append(detected_code)
-                except Exception as e:
-                    # Fallback to our custom detection if PTT parsing fails
-                    codes = detect_language_codes(check_title)
-                    detected_codes_in_original.extend(codes)
-            
-            # Remove duplicates while preserving order
-            detected_codes_in_original = list(dict.fromkeys(detected_codes_in_original))
+            # --- Fetch additional aliases via DirectAPI and detect language codes (once per call) ---
+            if imdb_id not in _api_alias_context_cache:
+                _api_alias_context_cache[imdb_id] = _prepare_api_alias_context(
+                    imdb_id, content_type, direct_api, title, matching_aliases, _aliases_cache, _show_metadata_cache
+                )
+                normalized_api_aliases = [normalized for _, normalized in _api_alias_context_cache[imdb_id][2]]
+                similarity_scorer.prime('token_set_ratio', parsed_similarity_titles + [normalized_query_title], normalized_api_aliases)
+                similarity_scorer.prime('token_sort_ratio', parsed_similarity_titles, normalized_api_aliases)
+            item_aliases, detected_codes_in_original, prepared_api_aliases = _api_alias_context_cache[imdb_id]
             
             if detected_codes_in_original:
                 should_filter_language = True
@@ -554,83 +625,81 @@ def filter_results(
             alias_debug_info = []  # For debugging
             if item_aliases:
                 pass
-            for alias_list in item_aliases.values():
-                for alias in alias_list:
-                    normalized_api_alias = normalize_title(alias).lower()
-                    # Compare parsed title against API alias when available, otherwise query against API alias
-                    if normalized_parsed_title:
-                        alias_sim_set = fuzz.token_set_ratio(normalized_parsed_title, normalized_api_alias) / 100.0
-                        alias_sim_sort = fuzz.token_sort_ratio(normalized_parsed_title, normalized_api_alias) / 100.0
-                        final_alias_sim = (alias_sim_set + alias_sim_sort) / 2.0
+            for alias, normalized_api_alias in prepared_api_aliases:
+                # Compare parsed title against API alias when available, otherwise query against API alias
+                if normalized_parsed_title:
+                    alias_sim_set = similarity_scorer.token_set_ratio(normalized_parsed_title, normalized_api_alias) / 100.0
+                    alias_sim_sort = similarity_scorer.token_sort_ratio(normalized_parsed_title, normalized_api_alias) / 100.0
+                    final_alias_sim = (alias_sim_set + alias_sim_sort) / 2.0
+                else:
+                    alias_sim_set = similarity_scorer.token_set_ratio(normalized_query_title, normalized_api_alias) / 100.0
+                    final_alias_sim = alias_sim_set
+
+                # Apply same acronym handling for API aliases
+                if final_alias_sim < 0.8:
+                    simple_api_alias = re.sub(r'[^a-z0-9]', '', normalized_api_alias)
+                    # Compare query vs API alias for acronym handling, not result vs API alias
+                    simple_sim_result = similarity_scorer.ratio(simple_query, simple_api_alias) / 100.0
+                    if simple_parsed:
+                        simple_sim_parsed = similarity_scorer.ratio(simple_query, simple_api_alias) / 100.0
+                        simple_sim = max(simple_sim_result, simple_sim_parsed)
                     else:
-                        alias_sim_set = fuzz.token_set_ratio(normalized_query_title, normalized_api_alias) / 100.0
-                        final_alias_sim = alias_sim_set
-
-                    # Apply same acronym handling for API aliases
-                    if final_alias_sim < 0.8:
-                        simple_api_alias = re.sub(r'[^a-z0-9]', '', normalized_api_alias)
-                        # Compare query vs API alias for acronym handling, not result vs API alias
-                        simple_sim_result = fuzz.ratio(simple_query, simple_api_alias) / 100.0
-                        if simple_parsed:
-                            simple_sim_parsed = fuzz.ratio(simple_query, simple_api_alias) / 100.0
-                            simple_sim = max(simple_sim_result, simple_sim_parsed)
-                        else:
-                            simple_sim = simple_sim_result
-                        final_alias_sim = max(final_alias_sim, min(simple_sim, 0.95))
+                        simple_sim = simple_sim_result
+                    final_alias_sim = max(final_alias_sim, min(simple_sim, 0.95))
+
+                # Apply length penalty when parsed title is longer than API alias OR contains different content
+                # This penalizes when the parsed title contains additional/different content beyond the alias
+                # (e.g., "Dragon Ball Daima" vs alias "Dragon Ball" or "Dragon Ball 1986" - indicates a different show)
+                api_alias_length = len(normalized_api_alias)
+                comparison_length = len(normalized_parsed_title) if normalized_parsed_title else len(normalized_query_title)
+
+                # Check if parsed title is longer than the API alias (lowered threshold to 1.2x for better detection)
+                # Also check for significant word differences even at similar lengths
+                if api_alias_length > 0 and comparison_length > api_alias_length * 1.2:
+                    length_ratio = api_alias_length / comparison_length
+                    api_alias_penalty_factor = max(0.3, length_ratio)  # Minimum 30% of original similarity
+                    api_alias_original_sim = final_alias_sim
+                    final_alias_sim *= api_alias_penalty_factor
+
+                # Additional check: If titles are similar length but have different non-year content, apply penalty
+                # This catches cases like "dragon.ball.daima" vs "dragon.ball.1986" or "dragon.ball.z" vs "dragon.ball"
+                elif api_alias_length > 0 and final_alias_sim > 0.7:
+                    # Extract non-numeric words from both titles to check for content differences
+                    # Include single-character words (like 'Z', 'X', 'GT') which are significant in anime titles
+                    alias_words = set(w.lower() for w in normalized_api_alias.split('.') if not w.isdigit() and w)
+                    parsed_words = set(w.lower() for w in normalized_parsed_title.split('.') if not w.isdigit() and w)
+
+                    # Check if there are significant word differences (excluding years)
+                    unique_to_parsed = parsed_words - alias_words
+                    unique_to_alias = alias_words - parsed_words
+
+                    # Special handling for known problematic series with very similar names
+                    # Dragon Ball series: original, Z, GT, Super, Daima are all different shows
+                    dragon_ball_variant_words = ['z', 'gt', 'super', 'kai', 'daima', '1986', '1989', '1996', '2009', '2015', '2024']
+                    is_dragon_ball_variant = ('dragon' in alias_words and 'ball' in alias_words and
+                                            (any(word in unique_to_parsed for word in dragon_ball_variant_words) or
+                                             any(word in unique_to_alias for word in dragon_ball_variant_words)))
+                    if is_dragon_ball_variant and (unique_to_parsed or unique_to_alias):
+                        # Apply severe penalty for Dragon Ball variants
+                        content_penalty = 0.2  # Reduce similarity by 80% for different Dragon Ball series (more severe)
+                        api_alias_original_sim = final_alias_sim
+                        final_alias_sim *= content_penalty
+                        logging.debug(f"Applied severe Dragon Ball API alias penalty for '{alias}' vs parsed title (unique_to_parsed: {unique_to_parsed}, unique_to_alias: {unique_to_alias})")
+                    elif unique_to_parsed or unique_to_alias:
+                        # Apply standard penalty for different content even at similar lengths
+                        content_penalty = 0.5  # Reduce similarity by 50% for different content
+                        api_alias_original_sim = final_alias_sim
+                        final_alias_sim *= content_penalty
 
-                    # Apply length penalty when parsed title is longer than API alias OR contains different content
-                    # This penalizes when the parsed title contains additional/different content beyond the alias
-                    # (e.g., "Dragon Ball Daima" vs alias "Dragon Ball" or "Dragon Ball 1986" - indicates a different show)
-                    api_alias_length = len(normalized_api_alias)
-                    comparison_length = len(normalized_parsed_title) if normalized_parsed_title else len(normalized_query_title)
+                item_alias_similarities.append(final_alias_sim)
 
-                    # Check if parsed title is longer than the API alias (lowered threshold to 1.2x for better detection)
-                    # Also check for significant word differences even at similar lengths
-                    if api_alias_length > 0 and comparison_length > api_alias_length * 1.2:
-                        length_ratio = api_alias_length / comparison_length
-                        api_alias_penalty_factor = max(0.3, length_ratio)  # Minimum 30% of original similarity
-                        api_alias_original_sim = final_alias_sim
-                        final_alias_sim *= api_alias_penalty_factor
-
-                    # Additional check: If titles are similar length but have different non-year content, apply penalty
-                    # This catches cases like "dragon.ball.daima" vs "dragon.ball.1986" or "dragon.ball.z" vs "dragon.ball"
-                    elif api_alias_length > 0 and final_alias_sim > 0.7:
-                        # Extract non-numeric words from both titles to check for content differences
-                        # Include single-character words (like 'Z', 'X', 'GT') which are significant in anime titles
-                        alias_words = set(w.lower() for w in normalized_api_alias.split('.') if not w.isdigit() and w)
-                        parsed_words = set(w.lower() for w in normalized_parsed_title.split('.') if not w.isdigit() and w)
-
-                        # Check if there are significant word differences (excluding years)
-                        unique_to_parsed = parsed_words - alias_words
-                        unique_to_alias = alias_words - parsed_words
-
-                        # Special handling for known problematic series with very similar names
-                        # Dragon Ball series: original, Z, GT, Super, Daima are all different shows
-                        dragon_ball_variant_words = ['z', 'gt', 'super', 'kai', 'daima', '1986', '1989', '1996', '2009', '2015', '2024']
-                        is_dragon_ball_variant = ('dragon' in alias_words and 'ball' in alias_words and
-                                                (any(word in unique_to_parsed for word in dragon_ball_variant_words) or
-                                                 any(word in unique_to_alias for word in dragon_ball_variant_words)))
-                        if is_dragon_ball_variant and (unique_to_parsed or unique_to_alias):
-                            # Apply severe penalty for Dragon Ball variants
-                            content_penalty = 0.2  # Reduce similarity by 80% for different Dragon Ball series (more severe)
-                            api_alias_original_sim = final_alias_sim
-                            final_alias_sim *= content_penalty
-                            logging.debug(f"Applied severe Dragon Ball API alias penalty for '{alias}' vs parsed title (unique_to_parsed: {unique_to_parsed}, unique_to_alias: {unique_to_alias})")
-                        elif unique_to_parsed or unique_to_alias:
-                            # Apply standard penalty for different content even at similar lengths
-                            content_penalty = 0.5  # Reduce similarity by 50% for different content
-                            api_alias_original_sim = final_alias_sim
-                            final_alias_sim *= content_penalty
-
-                    item_alias_similarities.append(final_alias_sim)
-
-                    # Store debug info for troublesome titles
-                    if "araiguma" in original_title.lower() or "calcal" in original_title.lower():
-                        alias_debug_info.append({
-                            'alias': alias,
-                            'normalized_alias': normalized_api_alias,
-                            'similarity': final_alias_sim
-                        })
+                # Store debug info for troublesome titles
+                if "araiguma" in original_title.lower() or "calcal" in original_title.lower():
+                    alias_debug_info.append({
+                        'alias': alias,
+                        'normalized_alias': normalized_api_alias,
+                        'similarity': final_alias_sim
+                    })
 
             # Combine and (re)compute best alias / best overall similarity
             if item_alias_similarities:
@@ -1715,8 +1784,8 @@ def filter_results(
             #logging.debug("✓ Passed size checks")
             
             # Bitrate filters
-            min_bitrate_mbps = float(version_settings.get('min_bitrate_mbps', 0.0))
-            max_bitrate_mbps = float(version_settings.get('max_bitrate_mbps', float('inf')) or float('inf'))
+            min_bitrate_mbps = profile.min_bitrate_mbps
+            max_bitrate_mbps = profile.max_bitrate_mbps
             
             if result.get('bitrate', 0) > 0:
                 bitrate_mbps = result['bitrate'] / 1000  # Convert Kbps to Mbps for comparison
@@ -1735,15 +1804,8 @@ def filter_results(
             if filter_out_patterns:
                 # Only check content fields, exclude technical identifiers like binge_group
                 original_fields_to_check = [original_title, filename]
-                matched_pre_norm_pattern = None
-                for pattern in filter_out_patterns:
-                    for field_value in original_fields_to_check:
-                        # Check only if field_value exists (is not None or empty string)
-                        if field_value and smart_search(pattern, field_value):
-                            matched_pre_norm_pattern = pattern
-                            break # Found a match for this pattern, stop checking fields
-                    if matched_pre_norm_pattern:
-                        break # Found a matching pattern, stop checking patterns
+                matched_pre_norm = profile.matching_patterns(filter_out_patterns, original_fields_to_check, first_only=True)
+                matched_pre_norm_pattern = matched_pre_norm[0] if matched_pre_norm else None
 
                 if matched_pre_norm_pattern:
                     result['filter_reason'] = f"Matching filter_out pattern(s) before normalization: {matched_pre_norm_pattern}"
@@ -1756,23 +1818,13 @@ def filter_results(
             normalized_filename = normalize_title(filename).lower() if filename else None
             normalized_binge_group = normalize_title(binge_group).lower() if binge_group else None
 
-            # Function to check patterns against multiple fields
-            def check_patterns(patterns, fields_to_check):
-                matched = []
-                for pattern in patterns:
-                    for field_value in fields_to_check:
-                        if field_value and smart_search(pattern, field_value):
-                            matched.append(pattern)
-                            break # Stop checking fields for this pattern once matched
-                return matched
-
             # Only check content fields, exclude technical identifiers like binge_group
             fields_to_check_patterns = [normalized_filter_title, normalized_filename]
             
             # Filter Out Check (on normalized fields - keep this as well)
             if filter_out_patterns:
                 # Note: This check now runs *after* the pre-normalization check
-                matched_out_patterns = check_patterns(filter_out_patterns, fields_to_check_patterns)
+                matched_out_patterns = profile.matching_patterns(filter_out_patterns, fields_to_check_patterns)
                 if matched_out_patterns:
                     # Only reject if it wasn't already rejected by the pre-norm check
                     # (This check is now slightly redundant for patterns caught pre-norm, but harmless)
@@ -1782,7 +1834,7 @@ def filter_results(
 
             # Filter In Check (on normalized fields - keep this)
             if filter_in_patterns:
-                matched_in_patterns = check_patterns(filter_in_patterns, fields_to_check_patterns)
+                matched_in_patterns = profile.matching_patterns(filter_in_patterns, fields_to_check_patterns)
                 if not matched_in_patterns: # Reject if NO patterns matched ANY field
                     result['filter_reason'] = "Not matching any filter_in patterns (post-normalization)"
                     logging.info(f"Rejected (post-norm): No matching filter_in patterns for '{original_title}' (Size: {result['size']:.2f}GB)")
@@ -3,7 +3,8 @@ import re
 from typing import List, Dict, Any, Tuple, Optional
 from scraper.functions.similarity_checks import similarity, normalize_title
 from scraper.functions.other_functions import smart_search
-from fuzzywuzzy import fuzz
+from scraper.functions.version_profile import VersionProfile, get_version_profile
+from scraper.functions.batch_similarity import get_title_similarity_scorer
 
 # Function to normalize filter patterns for tracking duplicates
 def _normalize_filter_pattern(pattern: str) -> str:
@@ -37,14 +38,53 @@ def check_preferred(patterns_weights, fields, is_bonus):
 
     return score_change, breakdown
 
+def _check_preferred_compiled(compiled_patterns, fields, is_bonus):
+    """check_preferred for a VersionProfile's pre-compiled (pattern, weight, normalized) entries."""
+    score_change = 0
+    breakdown = {}
+    matched_normalized_patterns = set()
+
+    for compiled, weight, normalized_pattern in compiled_patterns:
+        if normalized_pattern in matched_normalized_patterns:
+            continue
+        for field_value in fields:
+            field_str = field_value if isinstance(field_value, str) else ""
+            if compiled.search(field_str):
+                score_change += weight if is_bonus else -weight
+                breakdown[compiled.pattern] = weight if is_bonus else -weight
+                matched_normalized_patterns.add(normalized_pattern)
+                break
+
+    return score_change, breakdown
+
+def prime_rank_similarities(results: List[Dict[str, Any]], query: str, translated_title: str = None) -> None:
+    """Batch-score the title similarities rank_result_key needs for `results` before sorting them."""
+    rows = []
+    for result in results:
+        extracted_title = result.get('parsed_info', {}).get('title', result.get('title', ''))
+        filename = result.get('additional_metadata', {}).get('filename')
+        if extracted_title:
+            rows.append(normalize_title(extracted_title).lower())
+        if filename:
+            rows.append(normalize_title(filename).lower())
+    candidates = [normalize_title(query).lower()]
+    if translated_title:
+        candidates.append(normalize_title(translated_title).lower())
+    get_title_similarity_scorer().prime('ratio', rows, candidates)
+
 def rank_result_key(
     result: Dict[str, Any], all_results: List[Dict[str, Any]],
     query: str, query_year: int, query_season: int, query_episode: int,
     multi: bool, content_type: str, version_settings: Dict[str, Any],
     preferred_language: str = None,
     translated_title: str = None,
-    show_season_episode_counts: Optional[Dict[int, int]] = None
+    show_season_episode_counts: Optional[Dict[int, int]] = None,
+    profile: Optional[VersionProfile] = None
 ) -> Tuple:
+    # Callers ranking many results should pass the profile built once for the version
+    if profile is None:
+        profile = get_version_profile(version_settings)
+
     torrent_title = result.get('title', '')
     parsed_info = result.get('parsed_info', {})
     additional_metadata = result.get('additional_metadata', {}) # Get additional metadata
@@ -56,14 +96,14 @@ def rank_result_key(
     torrent_season, torrent_episode = parsed_info.get('season'), parsed_info.get('episode')
 
     # Get user-defined weights
-    resolution_weight = float(version_settings.get('resolution_weight', 3.0))
-    hdr_weight = float(version_settings.get('hdr_weight', 3.0))
-    similarity_weight = float(version_settings.get('similarity_weight', 3.0))
-    size_weight = float(version_settings.get('size_weight', 3.0))
-    bitrate_weight = float(version_settings.get('bitrate_weight', 3.0))
-    country_weight = float(version_settings.get('country_weight', 3.0))
-    language_weight = float(version_settings.get('language_weight', 3.0))
-    year_match_weight = float(version_settings.get('year_match_weight', 3.0)) # New weight
+    resolution_weight = profile.resolution_weight
+    hdr_weight = profile.hdr_weight
+    similarity_weight = profile.similarity_weight
+    size_weight = profile.size_weight
+    bitrate_weight = profile.bitrate_weight
+    country_weight = profile.country_weight
+    language_weight = profile.language_weight
+    year_match_weight = profile.year_match_weight
 
     # Calculate base scores
     normalized_query = normalize_title(query).lower()
@@ -71,8 +111,10 @@ def rank_result_key(
     normalized_filename = normalize_title(filename).lower() if filename else None
     # Exclude bingeGroup from fuzzy matching unless format is reliable
 
-    sim_extracted = fuzz.ratio(normalized_extracted_title, normalized_query) / 100.0
-    sim_filename = fuzz.ratio(normalized_filename, normalized_query) / 100.0 if normalized_filename else 0.0
+    # Scores primed in batch by the caller (or by filter_results) are reused here
+    similarity_scorer = get_title_similarity_scorer()
+    sim_extracted = similarity_scorer.ratio(normalized_extracted_title, normalized_query) / 100.0
+    sim_filename = similarity_scorer.ratio(normalized_filename, normalized_query) / 100.0 if normalized_filename else 0.0
     title_similarity = max(sim_extracted, sim_filename)
     
     resolution_score = parsed_info.get('resolution_rank', 0)
@@ -81,7 +123,7 @@ def rank_result_key(
         if resolution == 'unknown':
             resolution_score = 1
     
-    hdr_score = 1 if parsed_info.get('is_hdr', False) and version_settings.get('enable_hdr', True) else 0
+    hdr_score = 1 if parsed_info.get('is_hdr', False) and profile.rank_enable_hdr else 0
 
     media_country = result.get('media_country_code')
     result_country = parsed_info.get('country')
@@ -249,11 +291,8 @@ def rank_result_key(
     bitrate = float(result.get('bitrate', 0)) # Use the already calculated overall bitrate
 
     # --- New Absolute Normalized Size Score (uses the direct comparison_size) ---
-    min_s_setting = version_settings.get('min_size_gb', 0.01)
-    min_s = float(min_s_setting if min_s_setting is not None else 0.01)
-    
-    max_s_setting = version_settings.get('max_size_gb', float('inf'))
-    max_s = float(max_s_setting if max_s_setting is not None else float('inf'))
+    min_s = profile.rank_min_size_gb
+    max_s = profile.rank_max_size_gb
 
     current_s = comparison_size # current_s is now always the (average) per-item size
 
@@ -283,11 +322,8 @@ def rank_result_key(
         normalized_size = (normalized_size_factor ** 1.5) * 20.0 
     
     # --- New Absolute Normalized Bitrate Score ---
-    min_b_mbps_setting = version_settings.get('min_bitrate_mbps', 0.0)
-    min_b_mbps = float(min_b_mbps_setting if min_b_mbps_setting is not None else 0.0)
-
-    max_b_mbps_setting = version_settings.get('max_bitrate_mbps', float('inf'))
-    max_b_mbps = float(max_b_mbps_setting if max_b_mbps_setting is not None else float('inf'))
+    min_b_mbps = profile.rank_min_bitrate_mbps
+    max_b_mbps = profile.rank_max_bitrate_mbps
     
     current_b_kbps = bitrate # This is in Kbps from result
     current_b_mbps = current_b_kbps / 1000.0
@@ -330,7 +366,7 @@ def rank_result_key(
         parsed_title_lang = parsed_info.get('title', '') # Use 'title' from parsed_info for language matching
         normalized_parsed_title_lang = normalize_title(parsed_title_lang).lower()
         normalized_translated_q_title = normalize_title(translated_title).lower()
-        title_lang_sim = fuzz.ratio(normalized_parsed_title_lang, normalized_translated_q_title) / 100.0
+        title_lang_sim = similarity_scorer.ratio(normalized_parsed_title_lang, normalized_translated_q_title) / 100.0
 
         similarity_threshold_lang = 0.90 
         if title_lang_sim >= similarity_threshold_lang:
@@ -425,12 +461,12 @@ def rank_result_key(
     fields_to_check_pref = [torrent_title_lower, filename_lower, binge_group_lower]
 
     # Apply preferred_filter_in bonus
-    in_score, in_breakdown = check_preferred(version_settings.get('preferred_filter_in', []), fields_to_check_pref, is_bonus=True)
+    in_score, in_breakdown = _check_preferred_compiled(profile.preferred_filter_in, fields_to_check_pref, is_bonus=True)
     preferred_filter_score += in_score
     preferred_filter_in_breakdown = in_breakdown
 
     # Apply preferred_filter_out penalty
-    out_score, out_breakdown = check_preferred(version_settings.get('preferred_filter_out', []), fields_to_check_pref, is_bonus=False)
+    out_score, out_breakdown = _check_preferred_compiled(profile.preferred_filter_out, fields_to_check_pref, is_bonus=False)
     preferred_filter_score += out_score # Remember out_score is already negative if matched
     preferred_filter_out_breakdown = out_breakdown
 
@@ -467,8 +503,7 @@ def rank_result_key(
     )
 
     # Add points based on num_items
-    from utilities.settings import get_setting
-    if get_setting('Debug', 'emphasize_number_of_items_over_quality', False):
+    if profile.emphasize_number_of_items:
         total_score += num_items * 1
 
     # Content type matching score
@@ -2,12 +2,12 @@ import logging
 import re
 from typing import Dict, Any
 from difflib import SequenceMatcher
-from fuzzywuzzy import fuzz
 from PTT import parse_title
 import unicodedata
 from scraper.functions import *
 from scraper.functions.ptt_parser import parse_with_ptt
 from functools import lru_cache
+from scraper.functions.batch_similarity import get_title_similarity_scorer
 
 # Pre-compiled regex patterns for better performance
 _SHIELD_PATTERN = re.compile(r'S\.H\.I\.E\.L\.D\.?|S\s+H\s+I\s+E\s+L\s+D', re.IGNORECASE)
@@ -65,7 +65,7 @@ def improved_title_similarity(query_title: str, result: Dict[str, Any], is_anime
 
     else:
         # For non-anime, use the existing logic with improved word matching
-        token_sort_similarity = fuzz.token_sort_ratio(query_title, ptt_title) / 100
+        token_sort_similarity = get_title_similarity_scorer().token_sort_ratio(query_title, ptt_title) / 100
         
         # Split into words and remove 's' from the end of words for comparison
         query_words = set(word.rstrip('s') for word in query_title.split())
@@ -0,0 +1,163 @@
+"""
+Compiled version profiles for result filtering and ranking.
+
+`filter_results` and `rank_result_key` used to re-read the version settings,
+re-evaluate every filter pattern and re-read global settings (which reloads
+config.json) for every single result. A `VersionProfile` does that work once per
+(version settings, config revision) and is shared by both.
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from utilities.settings import get_setting, get_config_file_path
+from scraper.functions.adult_terms import adult_terms
+from scraper.functions.other_functions import is_regex
+
+# Profiles are tiny; this only bounds growth when many version variants are scraped
+MAX_CACHED_PROFILES = 32
+
+_profile_cache: Dict[Tuple, 'VersionProfile'] = {}
+_profile_cache_lock = threading.Lock()
+
+
+class CompiledPattern:
+    """A filter pattern compiled once, matching exactly like `smart_search`."""
+
+    __slots__ = ('pattern', '_needle', '_regex')
+
+    def __init__(self, pattern: str):
+        self.pattern = pattern
+        self._needle = None
+        self._regex = None
+        if pattern.startswith('"') and pattern.endswith('"'):
+            # Quoted: case-insensitive substring search without the quotes
+            self._needle = pattern[1:-1].lower()
+        elif is_regex(pattern):
+            try:
+                self._regex = re.compile(pattern, re.IGNORECASE)
+            except re.error as e:
+                logging.error(f"Invalid regex pattern '{pattern}': {e}")
+                # Fall back to simple string matching
+                self._needle = pattern.lower()
+        else:
+            self._needle = pattern.lower()
+
+    def search(self, text: str, text_lower: Optional[str] = None) -> bool:
+        """Check the pattern against `text`; pass `text_lower` to reuse an already lowercased copy."""
+        if self._regex is not None:
+            return self._regex.search(text) is not None
+        return self._needle in (text_lower if text_lower is not None else text.lower())
+
+
+def _compile_patterns(patterns: Optional[Iterable[str]]) -> List[CompiledPattern]:
+    return [CompiledPattern(pattern) for pattern in (patterns or [])]
+
+
+def _compile_weighted_patterns(patterns_weights: Optional[Iterable]) -> List[Tuple[CompiledPattern, Any, str]]:
+    compiled = []
+    for pattern, weight in (patterns_weights or []):
+        # Normalized form is used to score equivalent patterns (e.g. 'WEB-DL' and 'WEBDL') only once
+        compiled.append((CompiledPattern(pattern), weight, re.sub(r'[\s-]+', '', pattern).lower()))
+    return compiled
+
+
+def _float_or(value, default):
+    return float(value if value is not None else default)
+
+
+class VersionProfile:
+    """Everything filtering and ranking need from one version's settings, precomputed."""
+
+    def __init__(self, version_settings: Dict[str, Any]):
+        self.version_settings = version_settings
+
+        # --- Filtering ---
+        self.resolution_wanted = version_settings.get('resolution_wanted', '<=')
+        self.max_resolution = version_settings.get('max_resolution', '2160p')
+        self.min_size_gb = float(version_settings.get('min_size_gb', 0.01))
+        self.max_size_gb = float(version_settings.get('max_size_gb', float('inf')) or float('inf'))
+        self.min_bitrate_mbps = float(version_settings.get('min_bitrate_mbps', 0.0))
+        self.max_bitrate_mbps = float(version_settings.get('max_bitrate_mbps', float('inf')) or float('inf'))
+        self.enable_hdr = version_settings.get('enable_hdr', False)
+        self.filter_in = _compile_patterns(version_settings.get('filter_in', []))
+        self.filter_out = _compile_patterns(version_settings.get('filter_out', []))
+        self.similarity_threshold = float(version_settings.get('similarity_threshold', 0.8))
+        self.similarity_threshold_anime = version_settings.get('similarity_threshold_anime', 0.60)
+
+        # Global settings that used to be re-read (and config.json reloaded) per result
+        self.disable_adult = get_setting('Scraping', 'disable_adult', False)
+        self.filter_trash_releases = get_setting('Scraping', 'filter_trash_releases', True)
+        self.emphasize_number_of_items = get_setting('Debug', 'emphasize_number_of_items_over_quality', False)
+        self.adult_pattern = re.compile('|'.join(adult_terms), re.IGNORECASE) if self.disable_adult else None
+
+        # --- Ranking ---
+        self.resolution_weight = float(version_settings.get('resolution_weight', 3.0))
+        self.hdr_weight = float(version_settings.get('hdr_weight', 3.0))
+        self.similarity_weight = float(version_settings.get('similarity_weight', 3.0))
+        self.size_weight = float(version_settings.get('size_weight', 3.0))
+        self.bitrate_weight = float(version_settings.get('bitrate_weight', 3.0))
+        self.country_weight = float(version_settings.get('country_weight', 3.0))
+        self.language_weight = float(version_settings.get('language_weight', 3.0))
+        self.year_match_weight = float(version_settings.get('year_match_weight', 3.0))
+        # Ranking treats a missing HDR setting as enabled and only maps None to the defaults
+        self.rank_enable_hdr = version_settings.get('enable_hdr', True)
+        self.rank_min_size_gb = _float_or(version_settings.get('min_size_gb', 0.01), 0.01)
+        self.rank_max_size_gb = _float_or(version_settings.get('max_size_gb', float('inf')), float('inf'))
+        self.rank_min_bitrate_mbps = _float_or(version_settings.get('min_bitrate_mbps', 0.0), 0.0)
+        self.rank_max_bitrate_mbps = _float_or(version_settings.get('max_bitrate_mbps', float('inf')), float('inf'))
+        self.preferred_filter_in = _compile_weighted_patterns(version_settings.get('preferred_filter_in', []))
+        self.preferred_filter_out = _compile_weighted_patterns(version_settings.get('preferred_filter_out', []))
+
+    @staticmethod
+    def matching_patterns(patterns: List[CompiledPattern], fields: Iterable[Optional[str]], first_only: bool = False) -> List[str]:
+        """Return the patterns that match any of the (non-empty) fields, in pattern order."""
+        fields = [(field, field.lower()) for field in fields if field]
+        matched = []
+        for compiled in patterns:
+            for field, field_lower in fields:
+                if compiled.search(field, field_lower):
+                    matched.append(compiled.pattern)
+                    break
+            if matched and first_only:
+                break
+        return matched
+
+
+def _settings_revision() -> Tuple:
+    """Cheap revision marker for config.json so profiles pick up global setting changes."""
+    try:
+        stat = os.stat(get_config_file_path())
+        return (stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        return (None, None)
+
+
+def get_version_profile(version_settings: Dict[str, Any]) -> VersionProfile:
+    """
+    Get the compiled profile for a version's settings, building it if needed.
+
+    Profiles are cached by the settings' content and the config file revision,
+    so edited versions or global settings are picked up on the next scrape.
+    """
+    try:
+        fingerprint = json.dumps(version_settings, sort_keys=True, default=str)
+    except (TypeError, ValueError):
+        fingerprint = repr(version_settings)
+    key = (fingerprint, _settings_revision())
+
+    with _profile_cache_lock:
+        profile = _profile_cache.get(key)
+    if profile is not None:
+        return profile
+
+    profile = VersionProfile(version_settings)
+    with _profile_cache_lock:
+        if len(_profile_cache) >= MAX_CACHED_PROFILES:
+            _profile_cache.clear()
+        _profile_cache[key] = profile
+    return profile
@@ -14,6 +14,7 @@ from utilities.plex_functions import filter_genres
 import pykakasi
 from babelfish import Language
 from .scraper_manager import ScraperManager
+from .season_scrape_session import get_season_scrape_session
 from queues.config_manager import load_config
 import unicodedata
 import sys
@@ -21,7 +22,10 @@ from PTT import parse_title
 from pathlib import Path
 from scraper.functions import *
 from scraper.functions.anime_utils import convert_anime_episode_format_smart, detect_absolute_numbering
+from scraper.functions.version_profile import get_version_profile
+from scraper.functions.rank_results import prime_rank_similarities
 from cli_battery.app.direct_api import DirectAPI
+from utilities.metrics import SCRAPE_STAGE_SECONDS
 import json
 import threading
 from concurrent.futures import ThreadPoolExecutor, as_completed
@@ -1061,8 +1065,14 @@ def scrape(imdb_id: str, tmdb_id: str, title: str, year: int, content_type: str,
             titles = [result.get('title', '') for result in all_results]
             sizes = [result.get('size', None) for result in all_results]
             
-            # Batch process all titles
-            parsed_results = batch_parse_torrent_info(titles, sizes)
+            # Batch process all titles; titles already parsed for this season are reused
+            season_session = get_season_scrape_session(imdb_id_for_fallback or tmdb_id, content_type, season)
+            if season_session is not None:
+                parsed_results = season_session.parse_titles(titles, sizes, batch_parse_torrent_info)
+            else:
+                parsed_results = batch_parse_torrent_info(titles, sizes)
+            task_timings['parsing'] = time.time() - task_start
+            task_start = time.time()
             
             # Create normalized results and capture parsing failures
             normalized_results = []
@@ -1149,6 +1159,9 @@ def scrape(imdb_id: str, tmdb_id: str, title: str, year: int, content_type: str,
                     result['xem_scene_mapping'] = {'season': scene_season_map, 'episode': scene_episode_map}
             # --- End attaching scene mapping --- 
 
+            for stage, duration in task_timings.items():
+                SCRAPE_STAGE_SECONDS.observe(duration, stage=stage)
+
             return filtered_results, comprehensive_filtered_out_list, task_timings # Return the comprehensive list
 
         # Determine titles to scrape with
@@ -1401,7 +1414,10 @@ def scrape(imdb_id: str, tmdb_id: str, title: str, year: int, content_type: str,
         # Parse scraping settings for final sorting
         # version_settings already loaded and defaulted/merged above
 
-        # Sort all results together
+        # Sort all results together; the version profile is compiled once for the whole sort
+        rank_profile = get_version_profile(version_settings)
+        prime_rank_similarities(deduplicated_results, title, translated_title)
+
         def stable_rank_key(x):
             # Make sure is_anime flag is set in each result
             if is_anime and 'is_anime' not in x:
@@ -1412,18 +1428,20 @@ def scrape(imdb_id: str, tmdb_id: str, title: str, year: int, content_type: str,
                 content_type, version_settings,
                 preferred_language=preferred_language, # Pass new arg
                 translated_title=translated_title,     # Pass new arg
-                show_season_episode_counts=show_season_episode_counts_for_query # MODIFIED: Pass the fetched counts
+                show_season_episode_counts=show_season_episode_counts_for_query, # MODIFIED: Pass the fetched counts
+                profile=rank_profile
             )
 
         # Apply ultimate sort order if present
-        if get_setting('Scraping', 'ultimate_sort_order')=='Size: large to small':
-            deduplicated_results = sorted(deduplicated_results, key=stable_rank_key)
-            deduplicated_results = sorted(deduplicated_results, key=lambda x: x.get('size', 0), reverse=True)
-        elif get_setting('Scraping', 'ultimate_sort_order')=='Size: small to large':
-            deduplicated_results = sorted(deduplicated_results, key=stable_rank_key)
-            deduplicated_results = sorted(deduplicated_results, key=lambda x: x.get('size', 0))
-        else:
-            deduplicated_results = sorted(deduplicated_results, key=stable_rank_key)
+        with SCRAPE_STAGE_SECONDS.time(stage='ranking'):
+            if get_setting('Scraping', 'ultimate_sort_order')=='Size: large to small':
+                deduplicated_results = sorted(deduplicated_results, key=stable_rank_key)
+                deduplicated_results = sorted(deduplicated_results, key=lambda x: x.get('size', 0), reverse=True)
+            elif get_setting('Scraping', 'ultimate_sort_order')=='Size: small to large':
+                deduplicated_results = sorted(deduplicated_results, key=stable_rank_key)
+                deduplicated_results = sorted(deduplicated_results, key=lambda x: x.get('size', 0))
+            else:
+                deduplicated_results = sorted(deduplicated_results, key=stable_rank_key)
 
         # --- Apply Minimum Scrape Score Filter ---
         minimum_scrape_score_setting = get_setting('Scraping', 'minimum_scrape_score', 0.0)
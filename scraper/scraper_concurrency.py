@@ -0,0 +1,70 @@
+"""
+Caps on concurrent scraper requests.
+
+With several scraping workers (`Queue.scraping_workers`), each running its own
+`scrape_all` with a thread per scraper instance, the number of requests hitting
+one indexer can multiply. `scraper_slot` bounds concurrent calls per scraper
+instance and, optionally, across all scrapers.
+"""
+
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Dict, Optional, Tuple
+
+from utilities.settings import get_setting
+
+_lock = threading.Lock()
+# instance -> (limit, semaphore); rebuilt when the configured limit changes
+_instance_semaphores: Dict[str, Tuple[int, threading.BoundedSemaphore]] = {}
+_global_semaphore: Optional[Tuple[int, threading.BoundedSemaphore]] = None
+
+
+def _read_limit(key: str, default: int) -> int:
+    try:
+        return max(0, int(get_setting('Queue', key, default)))
+    except (ValueError, TypeError):
+        return default
+
+
+def _get_semaphores(instance: str):
+    global _global_semaphore
+    per_scraper_limit = _read_limit('scraping_max_concurrent_per_scraper', 2)
+    global_limit = _read_limit('scraping_max_concurrent_requests', 0)
+
+    with _lock:
+        instance_semaphore = None
+        if per_scraper_limit > 0:
+            current = _instance_semaphores.get(instance)
+            if current is None or current[0] != per_scraper_limit:
+                # Requests holding the old semaphore finish against it; new ones use the new limit
+                current = (per_scraper_limit, threading.BoundedSemaphore(per_scraper_limit))
+                _instance_semaphores[instance] = current
+            instance_semaphore = current[1]
+
+        global_semaphore = None
+        if global_limit > 0:
+            if _global_semaphore is None or _global_semaphore[0] != global_limit:
+                _global_semaphore = (global_limit, threading.BoundedSemaphore(global_limit))
+            global_semaphore = _global_semaphore[1]
+    return instance_semaphore, global_semaphore
+
+
+@contextmanager
+def scraper_slot(instance: str):
+    """Hold a request slot for `instance` (and a global one) while a scraper call runs. 0 disables a cap."""
+    instance_semaphore, global_semaphore = _get_semaphores(instance)
+    # Always take the per-instance slot first so waiting never holds a global slot
+    acquired = []
+    try:
+        for semaphore in (instance_semaphore, global_semaphore):
+            if semaphore is None:
+                continue
+            if not semaphore.acquire(blocking=False):
+                logging.debug(f"Waiting for a free request slot for scraper {instance}")
+                semaphore.acquire()
+            acquired.append(semaphore)
+        yield
+    finally:
+        for semaphore in reversed(acquired):
+            semaphore.release()
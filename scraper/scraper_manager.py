@@ -14,6 +14,9 @@ from .torrentio import scrape_torrentio_instance
 from .zilean import scrape_zilean_instance
 from .old_nyaa import scrape_nyaa_instance as scrape_old_nyaa_instance
 from utilities.settings import get_setting
+from .scraper_concurrency import scraper_slot
+from utilities.metrics import SCRAPER_CALL_SECONDS, SCRAPER_RESULTS
+from .season_scrape_session import get_season_scrape_session, scraper_request_key
 import re
 
 class ScraperManager:
@@ -89,6 +92,9 @@ class ScraperManager:
         self.use_timeout = self.scraper_timeout > 0
         self.scraper_timeout = None if self.scraper_timeout == 0 else self.scraper_timeout
         self.batch_timeout = None if self.batch_timeout == 0 else self.batch_timeout
+
+        # Episodes of the same season share scraper responses for equivalent requests
+        season_session = get_season_scrape_session(imdb_id or tmdb_id, content_type, season)
         
         # Helper function to check if results contain target episode
         def contains_target_episode(results, target_episode, target_season):
@@ -109,7 +115,7 @@ class ScraperManager:
                 
                 for pattern in explicit_patterns:
                     if pattern in title:
-                        logging.debug(f"Found explicit SxxExx pattern '{pattern}' in title: {result.get('title')}")
+                        logging.debug("Found explicit SxxExx pattern '%s' in title: %s", pattern, result.get('title'))
                         return True
                 
                 # For standalone episode patterns (E01, 01), we need to be more careful
@@ -153,7 +159,7 @@ class ScraperManager:
                         try:
                             season_in_title = int(season_num)
                             if season_in_title != target_season:
-                                logging.debug(f"Found conflicting season {season_in_title} in title: {result.get('title')}")
+                                logging.debug("Found conflicting season %s in title: %s", season_in_title, result.get('title'))
                                 break
                         except ValueError:
                             pass
@@ -189,7 +195,7 @@ class ScraperManager:
                                 if after_match.endswith('e'):
                                     continue
                             
-                            logging.debug(f"Found standalone episode pattern '{pattern}' in title: {result.get('title')}")
+                            logging.debug("Found standalone episode pattern '%s' in title: %s", pattern, result.get('title'))
                             return True
             
             return False
@@ -204,50 +210,66 @@ class ScraperManager:
                      logging.error(f"Scraper function for type \'{scraper_type}\' not found.")
                      return instance, scraper_type, []
 
-                scraper_call_start_time = time.time()
-                if scraper_type in ['Nyaa', 'OldNyaa']:
-                     # Nyaa has a different function signature
-                     if scraper_type == 'Nyaa':
-                         # Nyaa scrape function needs its specific args
-                          results = self.scrapers[scraper_type](
-                              title=title, year=year, content_type=content_type,
-                              season=season, episode=episode,
-                              episode_formats=episode_formats if is_anime and is_episode else None,
-                              tmdb_id=tmdb_id, multi=multi,
-                              is_translated_search=is_translated
-                          )
-                     else: # OldNyaa
-                          results = self.scrapers[scraper_type](
-                              instance=instance, settings=settings, imdb_id=imdb_id,
-                              title=title, year=year, content_type=content_type,
-                              season=season, episode=episode, multi=multi
-                          )
-                else:
-                    # Prepare common arguments
-                    common_args = {
-                        "instance": instance, "settings": settings, "imdb_id": imdb_id,
-                        "title": title, "year": year, "content_type": content_type,
-                        "season": season, "episode": episode, "multi": multi
-                        # tmdb_id will be added specifically below if needed by the scraper type
-                    }
-                    # Add specific args only if the scraper accepts them
-                    if scraper_type == 'Jackett':
-                         common_args["genres"] = genres
-                         common_args["tmdb_id"] = tmdb_id 
-                         common_args["is_translated_search"] = is_translated
-                    elif scraper_type == 'Prowlarr':
-                         common_args["tmdb_id"] = tmdb_id 
-                         # Prowlarr's scrape_prowlarr_instance function signature:
-                         # (instance, settings, imdb_id, title, year, content_type, 
-                         #  season, episode, multi, tmdb_id)
-                         # Most are in common_args. tmdb_id is added here.
-                         # It doesn't take 'genres' or 'is_translated_search'.
-                    # Add more elif for other scrapers if they need specific args
-
-                    results = self.scrapers[scraper_type](**common_args)
+                request_key = None
+                if season_session is not None:
+                    request_key = scraper_request_key(
+                        scraper_type, instance, imdb_id, title, season, episode, multi, is_translated,
+                        genres=genres, episode_formats=episode_formats if is_anime and is_episode else None
+                    )
+                    shared_results = season_session.get_results(request_key)
+                    if shared_results is not None:
+                        logging.info(f"Scraper {instance} ({scraper_type}): reusing {len(shared_results)} results from this season's scrape session.")
+                        return instance, scraper_type, shared_results
+
+                with scraper_slot(instance):
+                    scraper_call_start_time = time.time()
+                    if scraper_type in ['Nyaa', 'OldNyaa']:
+                         # Nyaa has a different function signature
+                         if scraper_type == 'Nyaa':
+                             # Nyaa scrape function needs its specific args
+                              results = self.scrapers[scraper_type](
+                                  title=title, year=year, content_type=content_type,
+                                  season=season, episode=episode,
+                                  episode_formats=episode_formats if is_anime and is_episode else None,
+                                  tmdb_id=tmdb_id, multi=multi,
+                                  is_translated_search=is_translated
+                              )
+                         else: # OldNyaa
+                              results = self.scrapers[scraper_type](
+                                  instance=instance, settings=settings, imdb_id=imdb_id,
+                                  title=title, year=year, content_type=content_type,
+                                  season=season, episode=episode, multi=multi
+                              )
+                    else:
+                        # Prepare common arguments
+                        common_args = {
+                            "instance": instance, "settings": settings, "imdb_id": imdb_id,
+                            "title": title, "year": year, "content_type": content_type,
+                            "season": season, "episode": episode, "multi": multi
+                            # tmdb_id will be added specifically below if needed by the scraper type
+                        }
+                        # Add specific args only if the scraper accepts them
+                        if scraper_type == 'Jackett':
+                             common_args["genres"] = genres
+                             common_args["tmdb_id"] = tmdb_id 
+                             common_args["is_translated_search"] = is_translated
+                        elif scraper_type == 'Prowlarr':
+                             common_args["tmdb_id"] = tmdb_id 
+                             # Prowlarr's scrape_prowlarr_instance function signature:
+                             # (instance, settings, imdb_id, title, year, content_type, 
+                             #  season, episode, multi, tmdb_id)
+                             # Most are in common_args. tmdb_id is added here.
+                             # It doesn't take 'genres' or 'is_translated_search'.
+                        # Add more elif for other scrapers if they need specific args
+
+                        results = self.scrapers[scraper_type](**common_args)
 
                 scraper_call_duration = time.time() - scraper_call_start_time
+                SCRAPER_CALL_SECONDS.observe(scraper_call_duration, scraper=scraper_type, instance=instance)
+                SCRAPER_RESULTS.inc(len(results), scraper=scraper_type, instance=instance)
                 logging.info(f"Scraper {instance} ({scraper_type}) call took {scraper_call_duration:.2f}s, found {len(results)} results.")
+                if request_key is not None:
+                    season_session.store_results(request_key, results)
                 return instance, scraper_type, results
             except Exception as e:
                 if scraper_call_start_time > 0: # Check if timing started
@@ -0,0 +1,154 @@
+"""
+Season-level scrape sharing.
+
+Scraping the Wanted episodes of a season used to repeat the same work for every
+episode: the multi-pack scrape sends the same season query (e.g. "Show.s01")
+to Jackett, Prowlarr, Zilean and OldNyaa for each episode, the single-episode
+fallback refetches the same Torrentio/MediaFusion stream list the pack scrape
+just got, and every result title is parsed again.
+
+A `SeasonScrapeSession` is kept briefly per (show, season). It stores raw scraper
+responses under a key that only includes what actually changes the request, so
+episode-independent requests are made once per season, and it memoizes parsed
+titles. Filtering and ranking stay per episode and per version, since both
+depend on the target episode and the version's settings.
+"""
+
+import copy
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from utilities.settings import get_setting
+
+# Scrapers whose season-pack (multi) request does not include the episode number
+EPISODE_INDEPENDENT_MULTI_SCRAPERS = {'Jackett', 'Prowlarr', 'Zilean', 'OldNyaa'}
+
+# Stremio-style scrapers request imdb:season:episode regardless of multi or title
+STREAM_ID_SCRAPERS = {'Torrentio', 'MediaFusion'}
+
+# Upper bound on live sessions; the oldest are dropped first
+MAX_SESSIONS = 64
+
+
+def _get_ttl() -> int:
+    try:
+        return max(0, int(get_setting('Scraping', 'season_scrape_session_ttl', 600)))
+    except (ValueError, TypeError):
+        return 600
+
+
+class SeasonScrapeSession:
+    """Shared scraper responses and parsed titles for one season of a show."""
+
+    def __init__(self, show_id: str, season: int, ttl: int):
+        self.show_id = show_id
+        self.season = season
+        self.expires_at = time.time() + ttl
+        self._lock = threading.Lock()
+        self._responses: Dict[Tuple, List[Dict[str, Any]]] = {}
+        self._parsed: Dict[Tuple[str, Any], Dict[str, Any]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def expired(self) -> bool:
+        return time.time() >= self.expires_at
+
+    def get_results(self, request_key: Tuple) -> Optional[List[Dict[str, Any]]]:
+        """Return a copy of a stored scraper response, or None if the request wasn't made yet."""
+        with self._lock:
+            results = self._responses.get(request_key)
+            if results is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        # Results are annotated and normalized in place downstream
+        return copy.deepcopy(results)
+
+    def store_results(self, request_key: Tuple, results: List[Dict[str, Any]]):
+        """
+        Store a scraper response for the rest of the season. Empty responses are not
+        stored: scrapers return [] on timeouts and HTTP errors too, and a transient
+        failure must not be replayed to every later episode.
+        """
+        if not results:
+            return
+        stored = copy.deepcopy(results)
+        with self._lock:
+            self._responses[request_key] = stored
+
+    def parse_titles(self, titles: List[str], sizes: List[Any],
+                     parse_func: Callable[[List[str], List[Any]], List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """Parse titles with `parse_func`, reusing results for titles already parsed in this season."""
+        keys = [(title, size) for title, size in zip(titles, sizes)]
+        with self._lock:
+            missing = [i for i, key in enumerate(keys) if key not in self._parsed]
+        if missing:
+            parsed = parse_func([titles[i] for i in missing], [sizes[i] for i in missing])
+            with self._lock:
+                for i, parsed_info in zip(missing, parsed):
+                    self._parsed[keys[i]] = parsed_info
+        with self._lock:
+            return [copy.deepcopy(self._parsed[key]) for key in keys]
+
+
+_sessions: Dict[Tuple[str, int], SeasonScrapeSession] = {}
+_sessions_lock = threading.Lock()
+
+
+def get_season_scrape_session(show_id: Optional[str], content_type: str, season: Optional[int]) -> Optional[SeasonScrapeSession]:
+    """
+    Get (or start) the scrape session for a show's season.
+
+    Returns None for movies, searches without a show id or season, or when
+    sharing is disabled (Scraping.season_scrape_session_ttl = 0).
+    """
+    if not show_id or season is None or (content_type or '').lower() != 'episode':
+        return None
+    ttl = _get_ttl()
+    if ttl <= 0:
+        return None
+
+    key = (str(show_id), int(season))
+    with _sessions_lock:
+        for expired_key in [k for k, s in _sessions.items() if s.expired]:
+            session = _sessions.pop(expired_key)
+            logging.debug(f"Season scrape session {expired_key} ended ({session.hits} shared, {session.misses} fetched)")
+        session = _sessions.get(key)
+        if session is None:
+            if len(_sessions) >= MAX_SESSIONS:
+                oldest = min(_sessions, key=lambda k: _sessions[k].expires_at)
+                _sessions.pop(oldest)
+            session = SeasonScrapeSession(key[0], key[1], ttl)
+            _sessions[key] = session
+        return session
+
+
+def scraper_request_key(scraper_type: str, instance: str, imdb_id: Optional[str], title: str,
+                        season: Optional[int], episode: Optional[int], multi: bool,
+                        is_translated: bool, genres: Optional[List[str]] = None,
+                        episode_formats: Optional[Dict[str, str]] = None) -> Tuple:
+    """
+    Key identifying the request a scraper instance will make.
+
+    Parameters a scraper ignores are left out so that equivalent requests for
+    different episodes (or pack vs. single-episode scrapes) share one response.
+    """
+    if scraper_type in STREAM_ID_SCRAPERS:
+        # Both build the stream id from imdb:season:episode, with episode 1 for packs without one
+        return (instance, imdb_id, season, episode if episode is not None else 1)
+
+    is_news = bool(genres) and 'news' in [g.lower() for g in genres]
+    if multi and scraper_type in EPISODE_INDEPENDENT_MULTI_SCRAPERS and not (scraper_type == 'Jackett' and is_news):
+        # Season query; Jackett adds an air-date query for news shows, which is per episode
+        return (instance, imdb_id, title, season, None, True, is_translated)
+
+    formats = tuple(sorted(episode_formats.items())) if isinstance(episode_formats, dict) else None
+    return (instance, imdb_id, title, season, episode, bool(multi), is_translated, formats)
+
+
+def clear_season_scrape_sessions():
+    with _sessions_lock:
+        _sessions.clear()
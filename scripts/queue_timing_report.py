@@ -1,35 +1,87 @@
 #!/usr/bin/env python3
 import argparse
-import json
 import math
 import os
+import sqlite3
 import sys
 from datetime import datetime
 from typing import Any, Dict, List, Tuple
 
 
-DEFAULT_FILE_PATH = "/user/db_content/queue_timing_data.json"
+DEFAULT_DB_PATH = "/user/db_content/media_items.db"
 
+QUEUE_NAMES = {
+    "Wanted", "Scraping", "Adding", "Checking", "Sleeping", "Unreleased", "Blacklisted",
+    "Pending Uncached", "Upgrading", "Final_Check", "Pre_release",
+}
 
-def load_data(file_path: str) -> Tuple[Dict[str, Any], Dict[str, Any]]:
-    if not os.path.exists(file_path):
-        print(f"File not found: {file_path}")
+
+def load_data(db_path: str, hours: float) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """Load open queue entries and completed transitions from the queue timing tables."""
+    if not os.path.exists(db_path):
+        print(f"File not found: {db_path}")
         sys.exit(1)
 
     try:
-        with open(file_path, "r") as f:
-            data = json.load(f)
-        queue_times = data.get("queue_times", {}) or {}
-        queue_stats = data.get("queue_stats", {}) or {}
-        return queue_times, queue_stats
-    except json.JSONDecodeError as e:
-        print(f"Failed to parse JSON: {e}")
-        sys.exit(1)
-    except Exception as e:
-        print(f"Error reading file: {e}")
+        conn = sqlite3.connect(db_path)
+        conn.row_factory = sqlite3.Row
+        try:
+            queue_times: Dict[str, Any] = {}
+            for row in conn.execute("SELECT item_id, queue_name, entered_at FROM queue_open_entries"):
+                # Skip the Wanted -> Collected pipeline starts, which are not a queue
+                if row["queue_name"] not in QUEUE_NAMES:
+                    continue
+                queue_times.setdefault(str(row["item_id"]), {})[row["queue_name"]] = [row["entered_at"], None]
+
+            cutoff = datetime.now().timestamp() - hours * 3600
+            transitions = [
+                dict(row)
+                for row in conn.execute(
+                    "SELECT item_id, queue_name, scheduling_mode, entered_at, exited_at, duration_seconds "
+                    "FROM queue_transitions WHERE exited_at >= ? ORDER BY exited_at",
+                    (cutoff,),
+                )
+            ]
+        finally:
+            conn.close()
+        return queue_times, transitions
+    except sqlite3.Error as e:
+        print(f"Failed to read queue timing tables: {e}")
         sys.exit(1)
 
 
+def percentile(sorted_values: List[float], pct: float) -> float:
+    if len(sorted_values) == 1:
+        return sorted_values[0]
+    rank = (pct / 100.0) * (len(sorted_values) - 1)
+    lower = int(rank)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (rank - lower)
+
+
+def build_stats(transitions: List[Dict[str, Any]]) -> Dict[str, Any]:
+    durations: Dict[str, List[float]] = {}
+    for row in transitions:
+        name = row["queue_name"]
+        if row.get("scheduling_mode"):
+            name = f"{name} ({row['scheduling_mode']})"
+        durations.setdefault(name, []).append(float(row["duration_seconds"]))
+
+    stats = {}
+    for name, values in sorted(durations.items()):
+        values.sort()
+        stats[name] = {
+            "count": len(values),
+            "total_time": sum(values),
+            "min_time": values[0],
+            "max_time": values[-1],
+            "p50": percentile(values, 50),
+            "p90": percentile(values, 90),
+            "p99": percentile(values, 99),
+        }
+    return stats
+
+
 def format_duration(seconds: float) -> str:
     try:
         seconds = float(seconds)
@@ -74,6 +126,8 @@ def print_stats(queue_stats: Dict[str, Any]) -> None:
         print(f"{queue_name}:")
         print(f"  Items processed: {count}")
         print(f"  Average time:   {format_duration(avg_time) if math.isfinite(avg_time) else '-'}")
+        if "p50" in stats:
+            print(f"  p50/p90/p99:    {format_duration(stats['p50'])} / {format_duration(stats['p90'])} / {format_duration(stats['p99'])}")
         print(f"  Min time:       {format_duration(min_time) if math.isfinite(min_time) else '-'}")
         print(f"  Max time:       {format_duration(max_time) if math.isfinite(max_time) else '-'}\n")
 
@@ -171,13 +225,19 @@ def print_item_detail(queue_times: Dict[str, Any], item_id: str) -> None:
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(
-        description="Display queue timing information from queue_timing_data.json",
+        description="Display queue timing information from the queue timing tables",
     )
     parser.add_argument(
         "-f",
         "--file",
-        default=DEFAULT_FILE_PATH,
-        help=f"Path to queue timing JSON (default: {DEFAULT_FILE_PATH})",
+        default=DEFAULT_DB_PATH,
+        help=f"Path to the media items database (default: {DEFAULT_DB_PATH})",
+    )
+    parser.add_argument(
+        "--hours",
+        type=float,
+        default=24,
+        help="Time window for aggregated statistics (default: 24)",
     )
     parser.add_argument(
         "--current",
@@ -206,17 +266,24 @@ def parse_args() -> argparse.Namespace:
 
 def main() -> None:
     args = parse_args()
-    queue_times, queue_stats = load_data(args.file)
+    queue_times, transitions = load_data(args.file, args.hours)
 
     if args.item:
-        print_item_detail(queue_times, args.item)
+        # Completed visits inside the window plus the queue the item is in now
+        item_times: Dict[str, Any] = {}
+        for row in transitions:
+            if str(row["item_id"]) == args.item and row["queue_name"] in QUEUE_NAMES:
+                item_times[row["queue_name"]] = [row["entered_at"], row["exited_at"]]
+        item_times.update(queue_times.get(args.item, {}))
+        print_item_detail({args.item: item_times} if item_times else {}, args.item)
         return
 
     show_current = args.current or not (args.current or args.stats)
     show_stats = args.stats or not (args.current or args.stats)
 
     if show_stats:
-        print_stats(queue_stats)
+        # Stats are split by scheduling mode (polling vs event-driven)
+        print_stats(build_stats(transitions))
 
     if show_current:
         grouped = build_current_items(queue_times)
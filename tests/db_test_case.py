@@ -0,0 +1,78 @@
+"""Base test case for tests that need their own databases under a temporary USER_DB_CONTENT."""
+
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+# Add the project root to the path so we can import modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.core import get_db_connection
+from database.schema_management import create_tables
+
+
+class TempDatabaseTestCase(unittest.TestCase):
+    """
+    Points USER_DB_CONTENT at a fresh temporary directory for each test.
+
+    Set `shared_database = True` to create it once in setUpClass instead, for
+    tests that seed a large table. `create_media_tables` runs create_tables()
+    after the directory is set up. `db_subdir` keeps the databases in a
+    subdirectory of `tmp_path`, for tests that put other files there too.
+    """
+
+    create_media_tables = True
+    shared_database = False
+    db_subdir = ''
+
+    @classmethod
+    def _start_temp_database(cls, add_cleanup):
+        tmpdir = tempfile.TemporaryDirectory()
+        add_cleanup(tmpdir.cleanup)
+        db_dir = os.path.join(tmpdir.name, cls.db_subdir) if cls.db_subdir else tmpdir.name
+        env = mock.patch.dict(os.environ, {'USER_DB_CONTENT': db_dir})
+        env.start()
+        add_cleanup(env.stop)
+        if cls.create_media_tables:
+            create_tables()
+        return tmpdir.name, db_dir
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        if cls.shared_database:
+            cls.tmp_path, cls.db_dir = cls._start_temp_database(cls.addClassCleanup)
+
+    def setUp(self):
+        super().setUp()
+        if not self.shared_database:
+            self.tmp_path, self.db_dir = self._start_temp_database(self.addCleanup)
+
+    @staticmethod
+    def execute(sql, params=()):
+        """Run one statement on media_items.db and commit."""
+        conn = get_db_connection()
+        try:
+            conn.execute(sql, params)
+            conn.commit()
+        finally:
+            conn.close()
+
+    @staticmethod
+    def execute_many(sql, rows):
+        conn = get_db_connection()
+        try:
+            conn.executemany(sql, rows)
+            conn.commit()
+        finally:
+            conn.close()
+
+    @staticmethod
+    def fetch(sql, params=()):
+        conn = get_db_connection()
+        try:
+            return conn.execute(sql, params).fetchall()
+        finally:
+            conn.close()
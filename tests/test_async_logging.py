@@ -0,0 +1,83 @@
+import unittest
+import sys
+import os
+import queue
+import logging
+import tempfile
+import time
+from unittest import mock
+
+# Add the project root to the path so we can import modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import logging_config
+from logging_config import (
+    AsyncQueueHandler, BatchingQueueListener, GroupCommitRotatingFileHandler, RateLimitFilter, get_logging_stats
+)
+
+
+class TestAsyncLogging(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.logger = logging.getLogger('test_async_logging')
+        self.logger.propagate = False
+        self.logger.setLevel(logging.DEBUG)
+        self.stats = mock.patch.dict(logging_config._log_stats, {'dropped': 0, 'suppressed': 0})
+        self.stats.start()
+
+    def tearDown(self):
+        self.logger.handlers.clear()
+        self.stats.stop()
+        self.tmpdir.cleanup()
+
+    def test_listener_writes_queued_records_with_one_commit_per_batch(self):
+        path = os.path.join(self.tmpdir.name, 'debug.log')
+        file_handler = GroupCommitRotatingFileHandler(path, maxBytes=1024 * 1024, backupCount=1)
+        file_handler.setFormatter(logging.Formatter('%(levelname)s %(message)s'))
+        log_queue = queue.Queue()
+        self.logger.addHandler(AsyncQueueHandler(log_queue))
+        for i in range(50):
+            self.logger.debug("line %d", i)
+
+        listener = BatchingQueueListener(log_queue, file_handler)
+        with mock.patch.object(file_handler, 'commit', wraps=file_handler.commit) as commit:
+            listener.start()
+            listener.stop()
+        file_handler.close()
+
+        with open(path) as f:
+            lines = f.read().splitlines()
+        self.assertEqual(lines, [f"DEBUG line {i}" for i in range(50)])
+        self.assertLessEqual(commit.call_count, 2)
+
+    def test_rate_limit_suppresses_repeats_per_call_site(self):
+        log_queue = queue.Queue()
+        handler = AsyncQueueHandler(log_queue)
+        handler.addFilter(RateLimitFilter(burst=3, window=0.05))
+        self.logger.addHandler(handler)
+
+        def log_repeated(count):
+            for i in range(count):
+                self.logger.debug("repeated %d", i)
+
+        log_repeated(10)
+        self.logger.warning("warnings are never limited")
+        self.assertEqual(log_queue.qsize(), 4)
+        self.assertEqual(get_logging_stats()['suppressed'], 7)
+
+        time.sleep(0.06)
+        log_repeated(2)
+        messages = [log_queue.get_nowait().getMessage() for _ in range(log_queue.qsize())]
+        self.assertEqual(messages[-2], "repeated 0 [7 similar messages suppressed]")
+
+    def test_full_queue_drops_and_counts_low_priority_records(self):
+        log_queue = queue.Queue(maxsize=1)
+        self.logger.addHandler(AsyncQueueHandler(log_queue))
+        self.logger.info("fits")
+        self.logger.debug("dropped")
+        self.assertEqual(get_logging_stats()['dropped'], 1)
+        self.assertEqual(log_queue.get_nowait().getMessage(), "fits")
+
+
+if __name__ == '__main__':
+    unittest.main()
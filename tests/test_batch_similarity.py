@@ -0,0 +1,61 @@
+import unittest
+import sys
+import os
+import itertools
+
+# Add the project root to the path so we can import modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fuzzywuzzy import fuzz
+
+from scraper.functions.batch_similarity import TitleSimilarityScorer, BATCH_SCORING_AVAILABLE
+from scraper.functions.similarity_checks import normalize_title
+
+
+class TestTitleSimilarityScorer(unittest.TestCase):
+    """Batched scores must be identical to the scalar fuzzywuzzy scores they replace."""
+
+    def setUp(self):
+        words = ['the', 'dragon', 'ball', 'z', 'daima', 'office', 'christmas', 'party', 'S.H.I.E.L.D.',
+                 'agents', 'of', '2016', '1986', '&', '-', 'café', 'Über', '...']
+        raw_titles = [' '.join(combo) for size in (1, 2, 3) for combo in itertools.permutations(words, size)][:3000]
+        self.rows = [normalize_title(t).lower() for t in raw_titles[::2]] + raw_titles[1::2] + ['', '...']
+        self.candidates = [normalize_title(t).lower() for t in ('Dragon Ball Z', 'The Office Christmas Party',
+                                                                 "Marvel's Agents of S.H.I.E.L.D.", 'Café')]
+        self.candidates += ['dragonballz', '', '...', 'the & of']
+
+    def test_batched_scores_match_fuzzywuzzy(self):
+        if not BATCH_SCORING_AVAILABLE:
+            self.skipTest("RapidFuzz or python-Levenshtein not installed")
+        for kind, scalar in (('ratio', fuzz.ratio), ('token_set_ratio', fuzz.token_set_ratio),
+                             ('token_sort_ratio', fuzz.token_sort_ratio)):
+            scorer = TitleSimilarityScorer()
+            self.assertGreater(scorer.prime(kind, self.rows, self.candidates), 0)
+            for row in self.rows:
+                for candidate in self.candidates:
+                    self.assertEqual(scorer.score(kind, row, candidate), scalar(row, candidate), (kind, row, candidate))
+                    self.assertEqual(scorer.score(kind, candidate, row), scalar(candidate, row), (kind, candidate, row))
+
+    def test_unprimed_pairs_fall_back_to_fuzzywuzzy(self):
+        scorer = TitleSimilarityScorer()
+        self.assertEqual(scorer.token_set_ratio('dragon.ball.z', 'dragon.ball'), fuzz.token_set_ratio('dragon.ball.z', 'dragon.ball'))
+        self.assertEqual(scorer.ratio('dragonballz', 'dragonball'), fuzz.ratio('dragonballz', 'dragonball'))
+
+    def test_cache_is_bounded(self):
+        scorer = TitleSimilarityScorer(max_entries=10)
+        for i in range(25):
+            scorer.ratio(f'title {i}', 'title')
+        self.assertLessEqual(len(scorer._scores), 10)
+
+    def test_eviction_keeps_recently_used_scores(self):
+        scorer = TitleSimilarityScorer(max_entries=10)
+        scorer.ratio('in use', 'title')
+        for i in range(25):
+            scorer.ratio(f'title {i}', 'title')
+            scorer.ratio('in use', 'title')  # another worker keeps reading this score
+        self.assertEqual(len(scorer._scores), 10)
+        self.assertIn(scorer._key('ratio', 'in use', 'title'), scorer._scores)
+
+
+if __name__ == '__main__':
+    unittest.main()
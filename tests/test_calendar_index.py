@@ -0,0 +1,59 @@
+import unittest
+import sys
+import os
+
+# Add the project root to the path so we can import modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tests.db_test_case import TempDatabaseTestCase
+from database.calendar_index import create_calendar_index, rebuild_calendar_index, verify_calendar_index
+
+
+class TestCalendarIndex(TempDatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.execute("INSERT INTO media_items (id, title, type, state, release_date, airtime, season_number, episode_number) "
+                     "VALUES (1, 'Show', 'episode', 'Wanted', '2024-05-01', '21:30', 1, 1)")
+        self.execute("INSERT INTO media_items (id, title, type, state, release_date) VALUES (2, 'Movie', 'movie', 'Wanted', 'Unknown')")
+        create_calendar_index()
+
+    def calendar(self):
+        return {row['item_id']: (row['air_local'], row['state'])
+                for row in self.fetch('SELECT item_id, air_local, state FROM media_calendar')}
+
+    def test_existing_items_are_indexed_with_local_air_time(self):
+        # Items without a parseable release date stay out of the calendar
+        self.assertEqual(self.calendar(), {1: ('2024-05-01 21:30', 'Wanted')})
+
+    def test_triggers_follow_release_date_airtime_and_state_changes(self):
+        self.execute("UPDATE media_items SET release_date = '2024-06-15' WHERE id = 2")
+        self.execute("UPDATE media_items SET airtime = NULL, state = 'Collected' WHERE id = 1")
+        self.execute("INSERT INTO media_items (id, title, type, state, release_date) VALUES (3, 'Other', 'movie', 'Wanted', '2024-07-01')")
+        self.assertEqual(self.calendar(), {1: ('2024-05-01 19:00', 'Collected'),
+                                           2: ('2024-06-15 19:00', 'Wanted'),
+                                           3: ('2024-07-01 19:00', 'Wanted')})
+        self.execute("DELETE FROM media_items WHERE id = 3")
+        self.assertNotIn(3, self.calendar())
+        self.assertTrue(verify_calendar_index()['consistent'])
+
+    def test_air_local_window_uses_the_calendar_index(self):
+        plan = ' '.join(row['detail'] for row in self.fetch(
+            "EXPLAIN QUERY PLAN SELECT title FROM media_calendar "
+            "WHERE type = 'episode' AND air_local >= ? AND air_local < ? ORDER BY air_local",
+            ('2024-05-01', '2024-05-02')))
+        rows = self.fetch("SELECT item_id FROM media_calendar WHERE type = 'episode' AND air_local >= ? AND air_local < ?",
+                          ('2024-05-01', '2024-05-02'))
+        self.assertIn('idx_media_calendar_type_air', plan)
+        self.assertNotIn('TEMP B-TREE', plan)
+        self.assertEqual([row['item_id'] for row in rows], [1])
+
+    def test_verify_repairs_drift(self):
+        self.execute("UPDATE media_calendar SET air_local = '1999-01-01 00:00' WHERE item_id = 1")
+        result = verify_calendar_index(repair=True)
+        self.assertEqual((result['missing'], result['stale'], result['repaired']), (1, 1, True))
+        self.assertEqual(self.calendar()[1][0], '2024-05-01 21:30')
+        self.assertTrue(rebuild_calendar_index())
+
+
+if __name__ == '__main__':
+    unittest.main()
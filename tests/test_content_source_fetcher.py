@@ -0,0 +1,91 @@
+import unittest
+import sys
+import os
+import threading
+import time
+
+# Add the project root to the path so we can import modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from content_checkers.content_source_fetcher import ServiceRateLimiter, fetch_in_order, iter_pages, get_service_limiter
+
+
+class TestContentSourceFetcher(unittest.TestCase):
+
+    def test_fetch_in_order_runs_concurrently_and_keeps_order(self):
+        running = []
+        peak = []
+        lock = threading.Lock()
+
+        def job(n, delay):
+            def fetch():
+                with lock:
+                    running.append(n)
+                    peak.append(len(running))
+                time.sleep(delay)
+                with lock:
+                    running.remove(n)
+                if n == 2:
+                    raise ValueError("list 2 is private")
+                return [n]
+            return fetch
+
+        jobs = [(f"list{n}", job(n, 0.05 * (4 - n))) for n in range(4)]
+        results = list(fetch_in_order(jobs, 'mdblist'))
+        self.assertEqual([label for label, _, _ in results], ['list0', 'list1', 'list2', 'list3'])
+        self.assertEqual([result for _, result, _ in results], [[0], [1], None, [3]])
+        self.assertIsInstance(results[2][2], ValueError)
+        self.assertGreater(max(peak), 1)
+        self.assertLessEqual(max(peak), get_service_limiter('mdblist').max_concurrent)
+
+    def test_fetch_in_order_with_more_jobs_than_slots_and_nested_requests(self):
+        # Trakt fetchers take the same limiter again for each HTTP request they make
+        limiter = get_service_limiter('trakt')
+
+        def job(n):
+            def fetch():
+                with limiter.request():
+                    return n
+            return fetch
+
+        jobs = [(f"list{n}", job(n)) for n in range(limiter.max_concurrent + 2)]
+        results = []
+        worker = threading.Thread(target=lambda: results.extend(fetch_in_order(jobs, 'trakt')), daemon=True)
+        worker.start()
+        worker.join(5)
+        self.assertFalse(worker.is_alive(), "fetch_in_order deadlocked on nested limiter requests")
+        self.assertEqual([result for _, result, _ in results], list(range(len(jobs))))
+
+    def test_iter_pages_fetches_all_pages_in_order(self):
+        requested = []
+
+        def fetch_page(page):
+            requested.append(page)
+            results = list(range((page - 1) * 10, min(page * 10, 45)))
+            return results, 5
+
+        pages = list(iter_pages(fetch_page, 'overseerr'))
+        self.assertEqual([len(page) for page in pages], [10, 10, 10, 10, 5])
+        self.assertEqual(sorted(requested), [1, 2, 3, 4, 5])
+
+    def test_iter_pages_without_page_count_stops_at_empty_page(self):
+        requested = []
+
+        def fetch_page(page):
+            requested.append(page)
+            return (['x'] if page <= 3 else []), None
+
+        self.assertEqual(len(list(iter_pages(fetch_page, 'overseerr'))), 3)
+        self.assertEqual(sorted(requested), [1, 2, 3, 4])
+
+    def test_backoff_delays_next_request(self):
+        limiter = ServiceRateLimiter('test', 2)
+        limiter.backoff(0.2)
+        start = time.time()
+        with limiter.request():
+            pass
+        self.assertGreaterEqual(time.time() - start, 0.15)
+
+
+if __name__ == '__main__':
+    unittest.main()
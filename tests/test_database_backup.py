@@ -0,0 +1,71 @@
+import unittest
+import sys
+import os
+import gzip
+import sqlite3
+import tempfile
+from unittest import mock
+
+# Add the project root to the path so we can import modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import backup
+from database.backup import backup_sqlite_database, list_backups
+
+
+class TestDatabaseBackup(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.source = os.path.join(self.tmpdir.name, 'media_items.db')
+        self.backup_dir = os.path.join(self.tmpdir.name, 'backups')
+        # Keep a writer connection open so committed rows stay in the -wal file
+        self.writer = sqlite3.connect(self.source)
+        self.writer.execute('PRAGMA journal_mode=WAL')
+        self.writer.execute('PRAGMA wal_autocheckpoint=0')
+        self.writer.execute('CREATE TABLE media_items (id INTEGER PRIMARY KEY, title TEXT)')
+        self.writer.executemany('INSERT INTO media_items (title) VALUES (?)', [(f'Item {i}',) for i in range(2000)])
+        self.writer.commit()
+
+    def tearDown(self):
+        self.writer.close()
+        self.tmpdir.cleanup()
+
+    def count_rows(self, path):
+        conn = sqlite3.connect(path)
+        try:
+            return conn.execute('SELECT COUNT(*) FROM media_items').fetchone()[0]
+        finally:
+            conn.close()
+
+    def test_backup_includes_wal_content_and_reports_progress(self):
+        self.assertTrue(os.path.getsize(self.source + '-wal') > 0)
+        progress = []
+        with mock.patch.object(backup, 'BACKUP_PAGES_PER_STEP', 2):
+            result = backup_sqlite_database(self.source, 'media_items', backup_dir=self.backup_dir,
+                                            progress_callback=lambda copied, total: progress.append((copied, total)))
+        self.assertTrue(result['verified'])
+        self.assertNotIn('error', result)
+        self.assertEqual(self.count_rows(result['path']), 2000)
+        self.assertGreater(len(progress), 1)
+        self.assertEqual(progress[-1][0], progress[-1][1])
+
+    def test_gzip_compression_and_retention(self):
+        for i in range(3):
+            with mock.patch.object(backup, 'datetime') as fake_datetime:
+                fake_datetime.now.return_value.strftime.return_value = f'20240101_00000{i}'
+                result = backup_sqlite_database(self.source, 'media_items', backup_dir=self.backup_dir,
+                                                compression='gzip', retention=2)
+            os.utime(result['path'], (1000 + i, 1000 + i))
+        backups = list_backups('media_items', self.backup_dir)
+        self.assertEqual([os.path.basename(b) for b in backups],
+                         ['media_items_20240101_000002.db.gz', 'media_items_20240101_000001.db.gz'])
+
+        restored = os.path.join(self.tmpdir.name, 'restored.db')
+        with gzip.open(backups[0], 'rb') as src, open(restored, 'wb') as dst:
+            dst.write(src.read())
+        self.assertEqual(self.count_rows(restored), 2000)
+        self.assertFalse([f for f in os.listdir(self.backup_dir) if f.endswith('.partial')])
+
+
+if __name__ == '__main__':
+    unittest.main()
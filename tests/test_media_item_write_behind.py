@@ -0,0 +1,91 @@
+import unittest
+import sys
+import os
+import time
+from unittest import mock
+
+# Add the project root to the path so we can import modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tests.db_test_case import TempDatabaseTestCase
+from database import write_behind
+from database.database_reading import get_media_item_by_id, get_wake_count
+from database.database_writing import (
+    update_media_item, increment_wake_count, update_blacklisted_date, update_media_item_state,
+    update_release_dates_and_states_batch
+)
+
+
+class TestMediaItemWriteBehind(TempDatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.execute("INSERT INTO media_items (id, title, type, state, wake_count) VALUES (1, 'Movie', 'movie', 'Sleeping', 0)")
+        # A buffer that only flushes when asked to
+        self.buffer = write_behind.MediaItemWriteBuffer(flush_interval_ms=60000)
+        self.patches = [mock.patch.object(write_behind, '_buffer', self.buffer),
+                        mock.patch.object(write_behind, '_settings_checked_at', time.time() + 3600)]
+        for patch in self.patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def stored(self, column):
+        return self.fetch(f"SELECT {column} FROM media_items WHERE id = 1")[0][0]
+
+    def test_buffered_updates_are_visible_before_flush(self):
+        self.assertTrue(update_media_item(1, title='Renamed'))
+        self.assertEqual(increment_wake_count(1), 1)
+        self.assertEqual(increment_wake_count(1), 2)
+        self.assertEqual(self.stored('wake_count'), 0)
+        self.assertEqual(get_wake_count(1), 2)
+        self.assertEqual(get_media_item_by_id(1)['title'], 'Renamed')
+
+        self.assertEqual(self.buffer.flush(), 1)
+        self.assertEqual((self.stored('title'), self.stored('wake_count')), ('Renamed', 2))
+        self.assertEqual(self.buffer.pending_fields(1), {})
+
+    def test_state_change_writes_pending_fields_with_it(self):
+        update_blacklisted_date(1, None)
+        increment_wake_count(1)
+        updated = update_media_item_state(1, 'Wanted')
+        self.assertEqual((updated['state'], updated['wake_count']), ('Wanted', 1))
+        self.assertEqual(self.buffer.pending_fields(1), {})
+        self.assertEqual(self.buffer.flush(), 0)
+
+    def test_batch_being_flushed_stays_visible_until_commit(self):
+        increment_wake_count(1)
+        seen = []
+        real_get_db_connection = write_behind.get_db_connection
+
+        def connection_during_flush():
+            # The flush has taken the batch but not committed it yet
+            seen.append((self.buffer.pending_fields(1).get('wake_count'), get_wake_count(1)))
+            return real_get_db_connection()
+
+        with mock.patch.object(write_behind, 'get_db_connection', connection_during_flush):
+            self.buffer.flush()
+        self.assertEqual(seen, [(1, 1)])
+        self.assertEqual(increment_wake_count(1), 2)
+
+    def test_direct_write_discards_older_buffered_value(self):
+        update_media_item(1, title='Buffered')
+        update_media_item(1, title='Direct', state='Wanted')
+        self.buffer.flush()
+        self.assertEqual(self.stored('title'), 'Direct')
+        self.assertEqual(get_media_item_by_id(1)['title'], 'Direct')
+
+    def test_batch_release_date_write_discards_older_buffered_value(self):
+        update_media_item(1, release_date='2020-01-01')
+        self.assertEqual(update_release_dates_and_states_batch([{'id': 1, 'release_date': '2024-05-01', 'state': 'Wanted'}]), 1)
+        self.buffer.flush()
+        self.assertEqual((self.stored('release_date'), self.stored('state')), ('2024-05-01', 'Wanted'))
+        self.assertEqual(get_media_item_by_id(1)['release_date'], '2024-05-01')
+
+    def test_state_is_never_buffered_and_stop_flushes(self):
+        self.assertFalse(write_behind.buffer_media_item_update(1, state='Wanted'))
+        update_media_item(1, title='Before stop')
+        self.buffer.stop()
+        self.assertEqual(self.stored('title'), 'Before stop')
+
+
+if __name__ == '__main__':
+    unittest.main()
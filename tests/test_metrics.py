@@ -0,0 +1,39 @@
+import unittest
+import sys
+import os
+
+# Add the project root to the path so we can import modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utilities.metrics import Histogram, Counter
+
+
+class TestMetrics(unittest.TestCase):
+    def test_histogram_renders_cumulative_buckets_and_estimates_percentiles(self):
+        hist = Histogram('test_stage_seconds', 'Test stage', ('stage',), buckets=(0.1, 1.0))
+        for value in (0.05, 0.05, 0.5, 5.0):
+            hist.observe(value, stage='parse')
+        with hist.time(stage='rank'):
+            pass
+
+        lines = hist.render()
+        self.assertIn('# TYPE test_stage_seconds histogram', lines)
+        self.assertIn('test_stage_seconds_bucket{stage="parse",le="0.1"} 2', lines)
+        self.assertIn('test_stage_seconds_bucket{stage="parse",le="1.0"} 3', lines)
+        self.assertIn('test_stage_seconds_bucket{stage="parse",le="+Inf"} 4', lines)
+        self.assertIn('test_stage_seconds_count{stage="parse"} 4', lines)
+
+        summary = {row['labels']['stage']: row for row in hist.summary()}
+        self.assertEqual(summary['parse']['count'], 4)
+        self.assertAlmostEqual(summary['parse']['p50'], 0.1)
+        self.assertEqual(summary['rank']['count'], 1)
+
+    def test_counter_labels_are_escaped(self):
+        counter = Counter('test_errors_total', 'Errors', ('endpoint',))
+        counter.inc(endpoint='/torrents/"info"')
+        counter.inc(2, endpoint='/torrents/"info"')
+        self.assertIn('test_errors_total{endpoint="/torrents/\\"info\\""} 3.0', counter.render())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import unittest
+import sys
+import os
+import tempfile
+
+# Add the project root to the path so we can import modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utilities.mount_index import MountIndex
+
+
+def touch(path, size=1):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(b'x' * size)
+
+
+class TestMountIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.root = os.path.join(self.tmpdir.name, 'mount')
+        touch(os.path.join(self.root, 'Movie.2020.1080p', 'Movie.2020.1080p.mkv'), size=10)
+        touch(os.path.join(self.root, 'Show.S01', 'Season 1', 'Show.S01E01.mkv'))
+        touch(os.path.join(self.root, 'Loose.File.mkv'))
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_lookup_order_and_fallbacks(self):
+        index = MountIndex(self.root)
+        index.build()
+        self.assertEqual(index.file_count, 3)
+        self.assertEqual(index.find_file('Movie.2020.1080p.mkv', ['Wrong.Title', 'Movie.2020.1080p', None]),
+                         os.path.join(self.root, 'Movie.2020.1080p', 'Movie.2020.1080p.mkv'))
+        # Folder names match case-insensitively
+        self.assertEqual(index.find_file('Movie.2020.1080p.mkv', ['movie.2020.1080P']),
+                         os.path.join(self.root, 'Movie.2020.1080p', 'Movie.2020.1080p.mkv'))
+        self.assertEqual(index.find_file('Loose.File.mkv', ['Other', None]), os.path.join(self.root, 'Loose.File.mkv'))
+        # Nested files are only found by filename with search_everywhere
+        self.assertIsNone(index.find_file('Show.S01E01.mkv', ['Show.S01', None]))
+        self.assertEqual(index.find_file('Show.S01E01.mkv', ['Show.S01', None], search_everywhere=True),
+                         os.path.join(self.root, 'Show.S01', 'Season 1', 'Show.S01E01.mkv'))
+        self.assertEqual(index.get_file_info(os.path.join(self.root, 'Movie.2020.1080p', 'Movie.2020.1080p.mkv'))[0], 10)
+
+    def test_miss_and_notify_pick_up_new_files(self):
+        index = MountIndex(self.root)
+        index.build()
+        touch(os.path.join(self.root, 'New.Release', 'New.Release.mkv'))
+        # A miss re-lists the root and the candidate folders
+        self.assertEqual(index.find_file('New.Release.mkv', ['New.Release']),
+                         os.path.join(self.root, 'New.Release', 'New.Release.mkv'))
+
+        touch(os.path.join(self.root, 'Webhook.Release', 'Webhook.Release.mkv'))
+        index.notify_change(os.path.join(self.root, 'Webhook.Release'))
+        self.assertEqual(index.find_by_filename('Webhook.Release.mkv'),
+                         os.path.join(self.root, 'Webhook.Release', 'Webhook.Release.mkv'))
+
+    def test_refresh_and_persistence(self):
+        persist_path = os.path.join(self.tmpdir.name, 'mount_index.json')
+        index = MountIndex(self.root, persist_path=persist_path)
+        index.build()
+        os.remove(os.path.join(self.root, 'Loose.File.mkv'))
+        os.remove(os.path.join(self.root, 'Show.S01', 'Season 1', 'Show.S01E01.mkv'))
+        os.rmdir(os.path.join(self.root, 'Show.S01', 'Season 1'))
+        touch(os.path.join(self.root, 'Later', 'Deep', 'Later.mkv'))
+
+        reloaded = MountIndex(self.root, persist_path=persist_path)
+        self.assertTrue(reloaded.load())
+        self.assertEqual(reloaded.file_count, 3)
+        reloaded.refresh()
+        self.assertIsNone(reloaded.find_by_filename('Loose.File.mkv'))
+        self.assertIsNone(reloaded.find_by_filename('Show.S01E01.mkv'))
+        self.assertEqual(reloaded.find_by_filename('Later.mkv'), os.path.join(self.root, 'Later', 'Deep', 'Later.mkv'))
+
+        # An index saved for another root is not reused
+        self.assertFalse(MountIndex(self.tmpdir.name, persist_path=persist_path).load())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import unittest
+import sys
+import os
+import tempfile
+import time
+
+# Add the project root to the path so we can import modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from queues.performance_store import PerformanceStore, MINUTE, HOUR, RAW_RETENTION_SECONDS
+
+
+class TestPerformanceStore(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.store = PerformanceStore(os.path.join(self.tmpdir.name, 'performance_metrics.db'))
+        self.now = (int(time.time()) // HOUR) * HOUR
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def record_cpu(self, ts, value):
+        self.store.record({'timestamp': 'ignored', 'type': 'basic_metrics',
+                           'metrics': {'cpu_percent': value, 'label': 'x', 'nested': {'rss': value * 2}}}, ts=ts)
+
+    def test_rollups_are_maintained_on_write(self):
+        for offset, value in ((0, 10.0), (15, 30.0), (60, 50.0)):
+            self.record_cpu(self.now + offset, value)
+
+        raw = self.store.query_series('basic_metrics.cpu_percent', self.now, self.now + 100, resolution='raw')
+        self.assertEqual([p['avg'] for p in raw['points']], [10.0, 30.0, 50.0])
+
+        minutes = self.store.query_series('basic_metrics.cpu_percent', self.now, self.now + 100, resolution=MINUTE)
+        self.assertEqual([(p['ts'], p['avg'], p['min'], p['max'], p['count']) for p in minutes['points']],
+                         [(self.now, 20.0, 10.0, 30.0, 2), (self.now + 60, 50.0, 50.0, 50.0, 1)])
+
+        hours = self.store.query_series('basic_metrics.nested.rss', self.now, self.now + 100, resolution=HOUR)
+        self.assertEqual(hours['points'][0]['avg'], 60.0)
+        self.assertEqual(self.store.list_metrics(), ['basic_metrics.cpu_percent', 'basic_metrics.nested.rss'])
+
+    def test_auto_resolution_and_entries(self):
+        self.record_cpu(self.now - 20 * 24 * HOUR, 5.0)
+        self.record_cpu(self.now, 15.0)
+        month = self.store.query_series('basic_metrics.cpu_percent', self.now - 30 * 24 * HOUR, self.now + 1)
+        self.assertEqual(month['resolution'], HOUR)
+        self.assertEqual(len(month['points']), 2)
+        recent = self.store.query_series('basic_metrics.cpu_percent', self.now - HOUR, self.now + 1)
+        self.assertEqual(recent['resolution'], 'raw')
+
+        entries = self.store.get_entries(since=self.now - 30 * 24 * HOUR, entry_types=['basic_metrics'],
+                                         limit=1, newest_first=True)
+        self.assertEqual([e['metrics']['cpu_percent'] for e in entries], [15.0])
+
+    def test_prune_applies_retention_per_resolution(self):
+        self.record_cpu(self.now - RAW_RETENTION_SECONDS - HOUR, 5.0)
+        self.record_cpu(self.now, 15.0)
+        removed = self.store.prune(now=self.now)
+        self.assertEqual((removed['entries'], removed['samples'], removed['minute_rollups'], removed['hour_rollups']),
+                         (1, 2, 0, 0))
+        hours = self.store.query_series('basic_metrics.cpu_percent', self.now - 3 * 24 * HOUR, self.now + 1, resolution=HOUR)
+        self.assertEqual(len(hours['points']), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
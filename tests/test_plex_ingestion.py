@@ -0,0 +1,68 @@
+import unittest
+import sys
+import os
+from unittest import mock
+
+# Add the project root to the path so we can import modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tests.db_test_case import TempDatabaseTestCase
+from database.plex_ingestion import (
+    create_plex_ingestion_tables, get_plex_watchlist_entries, get_plex_ingestion_cursor,
+    set_plex_ingestion_cursor, reset_plex_ingestion_cursors
+)
+
+
+class FakeWatchlistItem:
+    def __init__(self, rating_key, title):
+        self.ratingKey = rating_key
+        self.key = f'/library/metadata/{rating_key}'
+        self.title = title
+        self.type = 'movie'
+        self._server = mock.Mock(url=lambda key: f'https://discover.example{key}')
+
+
+class TestPlexIngestion(TempDatabaseTestCase):
+    create_media_tables = False
+
+    def setUp(self):
+        super().setUp()
+        create_plex_ingestion_tables()
+
+    def test_cursor_only_moves_forward(self):
+        self.assertIsNone(get_plex_ingestion_cursor('alice', 'history_account'))
+        set_plex_ingestion_cursor('alice', 'history_account', 2000)
+        set_plex_ingestion_cursor('alice', 'history_account', 1000)
+        self.assertEqual(get_plex_ingestion_cursor('alice', 'history_account'), 2000)
+        self.assertIsNone(get_plex_ingestion_cursor('bob', 'history_account'))
+        reset_plex_ingestion_cursors('alice')
+        self.assertIsNone(get_plex_ingestion_cursor('alice', 'history_account'))
+
+    def test_watchlist_details_fetched_once_per_entry(self):
+        from content_checkers import plex_watchlist
+
+        def fake_fetches(items, token):
+            return [{'imdb_id': f"tt{item['original_plex_item'].ratingKey}", 'tmdb_id': None,
+                     'media_type': 'movie', 'original_plex_item': item['original_plex_item']} for item in items]
+
+        fake_run = mock.AsyncMock(side_effect=fake_fetches)
+        watchlist = [FakeWatchlistItem('1', 'One'), FakeWatchlistItem('2', 'Two')]
+        with mock.patch.object(plex_watchlist, 'run_async_fetches', fake_run):
+            details = plex_watchlist.resolve_watchlist_details('alice', watchlist, 'token')
+            self.assertEqual([d['imdb_id'] for d in details], ['tt1', 'tt2'])
+            plex_watchlist.remember_watchlist_details('alice', details)
+
+            # Entry 1 left the watchlist, entry 3 is new: only entry 3 is fetched
+            watchlist = [FakeWatchlistItem('2', 'Two'), FakeWatchlistItem('3', 'Three')]
+            details = plex_watchlist.resolve_watchlist_details('alice', watchlist, 'token')
+            plex_watchlist.remember_watchlist_details('alice', details)
+
+        self.assertEqual([d['imdb_id'] for d in details], ['tt2', 'tt3'])
+        self.assertEqual([d['cached'] for d in details], [True, False])
+        fetched_keys = [item['original_plex_item'].ratingKey for item in fake_run.call_args_list[1].args[0]]
+        self.assertEqual(fetched_keys, ['3'])
+        self.assertEqual(sorted(get_plex_watchlist_entries('alice')), ['2', '3'])
+
+
+if __name__ == '__main__':
+    unittest.main()
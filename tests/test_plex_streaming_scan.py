@@ -0,0 +1,80 @@
+import unittest
+import sys
+import os
+import asyncio
+import tempfile
+from unittest import mock
+
+# Add the project root to the path so we can import modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utilities import plex_functions
+from utilities.plex_functions import (
+    PlexScanError, iter_library_pages, stream_library_section,
+    load_plex_scan_checkpoint, save_plex_scan_checkpoint, clear_plex_scan_checkpoint
+)
+
+
+def make_movie(i):
+    return {'title': f'Movie {i}', 'ratingKey': str(i), 'addedAt': 0,
+            'Guid': [{'id': f'imdb://tt{i:07d}'}],
+            'Media': [{'Part': [{'file': f'/movies/Movie {i}.mkv'}]}]}
+
+
+def fake_library(total, empty_offsets=()):
+    requested = []
+
+    async def fetch_data(session, url, headers, semaphore):
+        start = int(headers['X-Plex-Container-Start'])
+        size = int(headers['X-Plex-Container-Size'])
+        requested.append(start)
+        if start in empty_offsets:
+            return {'MediaContainer': {'Metadata': []}}
+        items = [make_movie(i) for i in range(start, min(start + size, total))]
+        return {'MediaContainer': {'Metadata': items, 'totalSize': total}}
+
+    return fetch_data, requested
+
+
+async def collect(async_iterable):
+    return [item async for item in async_iterable]
+
+
+class TestStreamingPlexScan(unittest.TestCase):
+    def test_pages_are_yielded_in_order(self):
+        fetch_data, requested = fake_library(25)
+        with mock.patch.object(plex_functions, 'fetch_data', fetch_data):
+            pages = asyncio.run(collect(iter_library_pages(None, 'http://plex', '1', {}, None, page_size=10)))
+        self.assertEqual([len(page) for page in pages], [10, 10, 5])
+        self.assertEqual([m['ratingKey'] for page in pages for m in page], [str(i) for i in range(25)])
+        self.assertEqual(sorted(requested), [0, 10, 20])
+
+    def test_empty_page_fails_the_section(self):
+        fetch_data, _ = fake_library(25, empty_offsets=(10,))
+        with mock.patch.object(plex_functions, 'fetch_data', fetch_data):
+            with self.assertRaises(PlexScanError):
+                asyncio.run(collect(iter_library_pages(None, 'http://plex', '1', {}, None, page_size=10)))
+
+    def test_section_items_come_in_bounded_chunks(self):
+        fetch_data, _ = fake_library(23)
+        with mock.patch.object(plex_functions, 'fetch_data', fetch_data):
+            chunks = asyncio.run(collect(stream_library_section(
+                None, 'http://plex', {}, None, '1', 'movie', page_size=10, chunk_size=7)))
+        self.assertEqual([len(chunk) for chunk in chunks], [7, 7, 7, 2])
+        self.assertEqual(chunks[0][0]['imdb_id'], 'tt0000000')
+        self.assertEqual(chunks[-1][-1]['location'], '/movies/Movie 22.mkv')
+
+    def test_checkpoint_only_resumes_same_libraries(self):
+        with tempfile.TemporaryDirectory() as tmpdir, mock.patch.dict(os.environ, {'USER_DB_CONTENT': tmpdir}):
+            self.assertIsNone(load_plex_scan_checkpoint(['1'], ['2']))
+            save_plex_scan_checkpoint({'started_at': plex_functions.time.time(), 'movie_libraries': ['1'],
+                                       'show_libraries': ['2'], 'completed_sections': ['1'],
+                                       'seen_filenames': ['a.mkv'], 'movies_count': 1, 'episodes_count': 0})
+            self.assertEqual(load_plex_scan_checkpoint(['1'], ['2'])['completed_sections'], ['1'])
+            self.assertIsNone(load_plex_scan_checkpoint(['1'], ['2', '3']))
+            clear_plex_scan_checkpoint()
+            self.assertIsNone(load_plex_scan_checkpoint(['1'], ['2']))
+
+
+if __name__ == '__main__':
+    unittest.main()
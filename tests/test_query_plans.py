@@ -0,0 +1,86 @@
+import unittest
+import sys
+import os
+
+# Add the project root to the path so we can import modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tests.db_test_case import TempDatabaseTestCase
+from database import query_advisor
+from database.core import get_db_connection
+from database.schema_management import migrate_schema
+from database.database_reading import get_media_item_by_filename
+
+SEED_ROWS = 200000
+
+
+class TestHotQueryPlans(TempDatabaseTestCase):
+    """Known hot media_items lookups must keep using an index on a realistically sized table."""
+
+    shared_database = True
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        migrate_schema()
+        cls.execute(f'''
+            INSERT INTO media_items (imdb_id, tmdb_id, title, type, state, filled_by_file, location_on_disk,
+                                     force_priority, upgrading_from)
+            WITH RECURSIVE seq(i) AS (SELECT 0 UNION ALL SELECT i + 1 FROM seq WHERE i < {SEED_ROWS - 1})
+            SELECT printf('tt%07d', i / 20), CAST(i / 20 AS TEXT), 'Title ' || (i / 20),
+                   CASE WHEN i % 3 THEN 'episode' ELSE 'movie' END,
+                   CASE i % 5 WHEN 0 THEN 'Wanted' WHEN 1 THEN 'Collected' WHEN 2 THEN 'Checking'
+                              WHEN 3 THEN 'Scraping' ELSE 'Blacklisted' END,
+                   CASE WHEN i % 5 = 1 THEN 'File.' || i || '.mkv' END,
+                   CASE WHEN i % 5 = 1 THEN '/mnt/media/File.' || i || '.mkv' END,
+                   CASE WHEN i % 5000 = 0 THEN 1 ELSE 0 END,
+                   CASE WHEN i % 97 = 0 THEN 'Old.' || i || '.mkv' END
+            FROM seq
+        ''')
+
+    def assert_no_full_scans(self):
+        conn = get_db_connection()
+        try:
+            results = query_advisor.check_hot_queries(conn)
+        finally:
+            conn.close()
+        for name, result in results.items():
+            with self.subTest(query=name):
+                self.assertNotIn('error', result)
+                self.assertFalse([flag for flag in result['flags'] if flag.startswith('full_scan')],
+                                 f"{name} plan: {result['plan']}")
+        self.assertIn('idx_media_items_force_priority', ' '.join(results['wanted_force_priority']['plan']))
+
+    def test_hot_queries_use_indexes(self):
+        self.assert_no_full_scans()
+
+    def test_hot_queries_use_indexes_after_analyze(self):
+        self.execute('ANALYZE')
+        self.assert_no_full_scans()
+
+    def test_capture_flags_scans_and_proposes_index(self):
+        query_advisor.start_capture()
+        try:
+            get_media_item_by_filename('File.1.mkv')
+        finally:
+            query_advisor.stop_capture()
+            self.addCleanup(query_advisor.reset_capture)
+        report = query_advisor.capture_report()
+        by_filename = [s for s in report['statements'] if 'location_on_disk LIKE' in s['fingerprint']]
+        self.assertEqual(len(by_filename), 1)
+        # The leading-wildcard LIKE branch cannot use an index
+        self.assertTrue(by_filename[0]['flags'][0].startswith('full_scan'))
+
+        conn = get_db_connection()
+        try:
+            result = query_advisor.analyze_statement(
+                conn, "SELECT id, title FROM media_items WHERE episode_title = ? ORDER BY release_date", ('x',))
+        finally:
+            conn.close()
+        self.assertEqual(result['suggestion'],
+                         'CREATE INDEX IF NOT EXISTS idx_media_items_episode_title_release_date_id_title '
+                         'ON media_items(episode_title, release_date, id, title)')
+
+
+if __name__ == '__main__':
+    unittest.main()
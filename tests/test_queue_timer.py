@@ -0,0 +1,47 @@
+import unittest
+import sys
+import os
+from unittest import mock
+
+# Add the project root to the path so we can import modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tests.db_test_case import TempDatabaseTestCase  # imports database before queues, avoiding the debrid import cycle
+from queues.queue_manager import QueueTimer
+
+
+class TestQueueTimer(TempDatabaseTestCase):
+    create_media_tables = False
+
+    def new_timer(self):
+        timer = QueueTimer()
+        self.addCleanup(lambda: timer._flush_timer and timer._flush_timer.cancel())
+        return timer
+
+    def test_queue_moves_do_not_write_synchronously(self):
+        timer = self.new_timer()
+        with mock.patch('queues.queue_manager.write_queue_timing_batch') as write:
+            timer.item_entered_queue(1, 'Wanted')
+            timer.item_exited_queue(1, 'Wanted')
+            write.assert_not_called()
+        self.assertIsNotNone(timer._flush_timer)
+
+    def test_pipeline_start_survives_restart(self):
+        timer = self.new_timer()
+        timer.item_entered_queue(1, 'Wanted', content_source='trakt')
+        timer.item_exited_queue(1, 'Wanted')
+        timer.item_entered_queue(1, 'Scraping')
+        timer.save_timing_data(force=True)
+
+        restarted = self.new_timer()
+        self.assertNotIn('Wanted', restarted.get_item_timing(1))
+        self.assertIsNotNone(restarted.record_pipeline_completion(1))
+        restarted.save_timing_data(force=True)
+
+        self.assertNotIn(1, self.new_timer()._pipeline_starts)
+        pipeline = restarted.get_dwell_percentiles(queue_name='Wanted -> Collected', group_by=('content_source',))
+        self.assertEqual([(row['content_source'], row['count']) for row in pipeline], [('trakt', 1)])
+
+
+if __name__ == '__main__':
+    unittest.main()
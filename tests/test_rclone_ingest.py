@@ -0,0 +1,79 @@
+import unittest
+import sys
+import os
+import time
+import threading
+
+# Add the project root to the path so we can import modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tests.db_test_case import TempDatabaseTestCase
+from database.database_reading import find_existing_directory_names
+from utilities.rclone_ingest import RcloneIngestQueue
+
+
+class TestFindExistingDirectoryNames(TempDatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.execute("INSERT INTO media_items (title, type, state, filled_by_title) VALUES ('A', 'movie', 'Collected', 'Фильм (2020)')")
+        self.execute("INSERT INTO media_items (title, type, state, original_path_for_symlink) "
+                     "VALUES ('B', 'episode', 'Collected', '/mnt/zurg/shows/Show.S01E01/Show.S01E01.mkv')")
+
+    def test_batch_matches_single_name_checks(self):
+        names = ['ФИЛЬМ (2020)', 'show.s01e01', 'Unknown (1999)']
+        self.assertEqual(find_existing_directory_names(names), {'ФИЛЬМ (2020)', 'show.s01e01'})
+        self.assertEqual(find_existing_directory_names([]), set())
+
+
+class TestRcloneIngestQueue(unittest.TestCase):
+    def test_duplicates_existing_and_bounded_concurrency(self):
+        release = threading.Event()
+        lock = threading.Lock()
+        active = [0, 0]  # current, peak
+        processed = []
+        resolved_batches = []
+
+        def process(item):
+            with lock:
+                active[0] += 1
+                active[1] = max(active[1], active[0])
+            release.wait(5)
+            with lock:
+                active[0] -= 1
+                processed.append(item.directory_name)
+
+        def resolve(names):
+            resolved_batches.append(sorted(names))
+            return {'Old Movie'}
+
+        queue = RcloneIngestQueue(process, resolve, batch_window=0.2, max_workers=2)
+        try:
+            first = queue.submit('Show A', '/mnt/Show A')
+            self.assertEqual(queue.submit('show a', '/mnt/show a'), {'status': 'duplicate', 'task_id': first['task_id']})
+            for name in ('Show B', 'Show C', 'Old Movie'):
+                self.assertEqual(queue.submit(name, f'/mnt/{name}')['status'], 'queued')
+
+            deadline = time.time() + 5
+            while queue.get_stats()['counts']['batches'] == 0 and time.time() < deadline:
+                time.sleep(0.02)
+            # Still in flight, so a repeat callback is not queued again
+            self.assertEqual(queue.submit('Show B', '/mnt/Show B')['status'], 'duplicate')
+            release.set()
+            while len(processed) < 3 and time.time() < deadline:
+                time.sleep(0.02)
+        finally:
+            release.set()
+            queue.stop()
+
+        self.assertEqual(resolved_batches, [['Old Movie', 'Show A', 'Show B', 'Show C']])
+        self.assertEqual(sorted(processed), ['Show A', 'Show B', 'Show C'])
+        self.assertLessEqual(active[1], 2)
+        stats = queue.get_stats()
+        self.assertEqual((stats['pending'], stats['in_flight']), (0, 0))
+        self.assertEqual(stats['counts']['existing'], 1)
+        self.assertEqual(stats['counts']['duplicate'], 2)
+        self.assertEqual(stats['counts']['processed'], 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
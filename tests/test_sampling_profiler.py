@@ -0,0 +1,70 @@
+import unittest
+import sys
+import os
+import threading
+import time
+
+# Add the project root to the path so we can import modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utilities import sampling_profiler
+from utilities.sampling_profiler import SamplingProfiler, set_thread_task, clear_thread_task
+
+
+def busy_worker(stop_event):
+    while not stop_event.is_set():
+        sum(range(1000))
+
+
+class TestSamplingProfiler(unittest.TestCase):
+    def setUp(self):
+        self.stop_event = threading.Event()
+
+    def tearDown(self):
+        self.stop_event.set()
+        sampling_profiler.stop_profiler()
+
+    def test_samples_are_grouped_by_task_and_exported_collapsed(self):
+        def labelled_worker():
+            set_thread_task('job:Scraping')
+            try:
+                busy_worker(self.stop_event)
+            finally:
+                clear_thread_task()
+
+        profiler = sampling_profiler.start_profiler(interval_ms=1)
+        worker = threading.Thread(target=labelled_worker, name='Worker-1')
+        worker.start()
+        time.sleep(0.2)
+        profiler.stop()
+        self.stop_event.set()
+        worker.join()
+
+        self.assertGreater(profiler.samples, 0)
+        lines = profiler.collapsed_stacks().splitlines()
+        scraping = [line for line in lines if line.startswith('job:Scraping;')]
+        self.assertTrue(scraping)
+        stack, count = scraping[0].rsplit(' ', 1)
+        self.assertGreater(int(count), 0)
+        self.assertIn('busy_worker (test_sampling_profiler.py:', stack)
+        tasks = {entry['task']: entry for entry in profiler.task_summary()}
+        self.assertEqual(tasks['job:Scraping']['samples'], sum(int(line.rsplit(' ', 1)[1]) for line in scraping))
+
+    def test_unlabelled_threads_use_thread_name_and_labels_need_running_profiler(self):
+        set_thread_task('job:Ignored')
+        self.assertEqual(sampling_profiler._thread_tasks, {})
+
+        profiler = SamplingProfiler(interval_ms=1)
+        worker = threading.Thread(target=busy_worker, args=(self.stop_event,), name='Queue Worker')
+        worker.start()
+        profiler.sample()
+        self.stop_event.set()
+        worker.join()
+        self.assertIn('Queue_Worker;', profiler.collapsed_stacks())
+        self.assertFalse(profiler.running)
+        profiler.reset()
+        self.assertEqual(profiler.collapsed_stacks(), '')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+import unittest
+import sys
+import os
+import threading
+import time
+
+# Add the project root to the path so we can import modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from queues.scraping_workers import ScrapingWorkerPool
+
+
+class FakeQueueManager:
+    def __init__(self):
+        self.moves = []
+
+    def generate_identifier(self, item):
+        return f"item {item['id']}"
+
+    def move_to_adding(self, item, from_queue, filled_by, scrape_results):
+        self.moves.append((threading.current_thread().name, item['id'], from_queue))
+
+
+class FakeScrapingQueue:
+    def __init__(self, items):
+        self.items = list(items)
+
+    def remove_item(self, item):
+        self.items = [i for i in self.items if i['id'] != item['id']]
+
+
+class TestScrapingWorkerPool(unittest.TestCase):
+
+    def setUp(self):
+        self.running = set()
+        self.overlaps = []
+        self.lock = threading.Lock()
+
+        def process_item(item, queue_manager):
+            key = ScrapingWorkerPool.affinity_key(item)
+            with self.lock:
+                if key in self.running:
+                    self.overlaps.append(key)
+                self.running.add(key)
+            time.sleep(0.02)
+            with self.lock:
+                self.running.discard(key)
+            queue_manager.move_to_adding(item, "Scraping", "torrent", [])
+            self.scraping_queue.remove_item(item)
+
+        self.process_item = process_item
+
+    def _drain(self, pool, queue_manager):
+        deadline = time.time() + 10
+        while self.scraping_queue.items and time.time() < deadline:
+            pool.apply_completed(queue_manager, self.scraping_queue)
+            pool.dispatch(self.scraping_queue.items, queue_manager)
+            time.sleep(0.005)
+
+    def test_show_affinity_and_deferred_handoff(self):
+        items = [{'id': i, 'type': 'episode', 'imdb_id': f"tt{i % 3}"} for i in range(9)]
+        items += [{'id': 100 + i, 'type': 'movie', 'imdb_id': f"tt10{i}"} for i in range(3)]
+        self.scraping_queue = FakeScrapingQueue(items)
+        queue_manager = FakeQueueManager()
+        pool = ScrapingWorkerPool(self.process_item, 4)
+        # Removals from workers must go through the recorder, like ScrapingQueue.remove_item does
+        real_remove = self.scraping_queue.remove_item
+        self.scraping_queue.remove_item = lambda item: (
+            pool.current_transitions.record_removal(item) if pool.current_transitions is not None else real_remove(item)
+        )
+        try:
+            self._drain(pool, queue_manager)
+        finally:
+            pool.shutdown(wait=True)
+
+        self.assertEqual(self.scraping_queue.items, [])
+        self.assertEqual(self.overlaps, [])
+        # Moves are replayed on this thread, never on a worker
+        self.assertEqual(len(queue_manager.moves), 12)
+        self.assertTrue(all(thread == threading.current_thread().name for thread, _, _ in queue_manager.moves))
+        # Episodes of one show are handed off in queue order
+        show_order = [item_id for _, item_id, _ in queue_manager.moves if item_id < 100 and item_id % 3 == 1]
+        self.assertEqual(show_order, [1, 4, 7])
+        stats = pool.get_stats()
+        self.assertEqual(stats['workers'], 4)
+        self.assertEqual(stats['in_flight'], 0)
+        self.assertEqual(sum(w['items'] for w in stats['worker_utilization']), 12)
+
+    def test_shutdown_waits_for_running_items_and_keeps_their_moves(self):
+        started = threading.Event()
+
+        def slow_process_item(item, queue_manager):
+            started.set()
+            time.sleep(0.1)
+            queue_manager.move_to_adding(item, "Scraping", "torrent", [])
+
+        self.scraping_queue = FakeScrapingQueue([{'id': 1, 'type': 'movie', 'imdb_id': 'tt1'}])
+        queue_manager = FakeQueueManager()
+        pool = ScrapingWorkerPool(slow_process_item, 2)
+        pool.dispatch(self.scraping_queue.items, queue_manager)
+        self.assertTrue(started.wait(5))
+
+        pool.shutdown(wait=True, cancel_pending=True)
+        self.assertEqual(pool.apply_completed(queue_manager, self.scraping_queue), 1)
+        self.assertEqual([item_id for _, item_id, _ in queue_manager.moves], [1])
+        self.assertTrue(pool.is_idle())
+
+
+if __name__ == '__main__':
+    unittest.main()
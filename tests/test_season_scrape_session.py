@@ -0,0 +1,65 @@
+import unittest
+from unittest.mock import patch
+import sys
+import os
+
+# Add the project root to the path so we can import modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scraper import season_scrape_session
+from scraper.season_scrape_session import get_season_scrape_session, scraper_request_key, clear_season_scrape_sessions
+
+
+class TestSeasonScrapeSession(unittest.TestCase):
+
+    def setUp(self):
+        clear_season_scrape_sessions()
+        patcher = patch.object(season_scrape_session, '_get_ttl', return_value=600)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(clear_season_scrape_sessions)
+
+    def test_season_pack_requests_are_shared_across_episodes(self):
+        keys = {scraper_request_key('Jackett', 'Jackett_1', 'tt1', 'Show', 1, episode, True, False)
+                for episode in range(1, 21)}
+        self.assertEqual(len(keys), 1)
+        # News shows add a per-episode air date query, and single-episode searches include the episode
+        self.assertNotEqual(scraper_request_key('Jackett', 'Jackett_1', 'tt1', 'Show', 1, 1, True, False, genres=['News']),
+                            scraper_request_key('Jackett', 'Jackett_1', 'tt1', 'Show', 1, 2, True, False, genres=['News']))
+        self.assertNotEqual(scraper_request_key('Prowlarr', 'Prowlarr_1', 'tt1', 'Show', 1, 1, False, False),
+                            scraper_request_key('Prowlarr', 'Prowlarr_1', 'tt1', 'Show', 1, 2, False, False))
+
+    def test_stream_scrapers_share_pack_and_single_episode_requests(self):
+        self.assertEqual(scraper_request_key('Torrentio', 'Torrentio_1', 'tt1', 'Show', 1, 5, True, False),
+                         scraper_request_key('Torrentio', 'Torrentio_1', 'tt1', 'Alias', 1, 5, False, True))
+        self.assertNotEqual(scraper_request_key('Torrentio', 'Torrentio_1', 'tt1', 'Show', 1, 5, True, False),
+                            scraper_request_key('Torrentio', 'Torrentio_1', 'tt1', 'Show', 1, 6, True, False))
+
+    def test_session_returns_independent_copies(self):
+        session = get_season_scrape_session('tt1', 'episode', 1)
+        self.assertIs(session, get_season_scrape_session('tt1', 'episode', 1))
+        self.assertIsNone(get_season_scrape_session('tt1', 'movie', None))
+
+        key = ('Jackett_1', 'tt1', 'Show', 1, None, True, False)
+        self.assertIsNone(session.get_results(key))
+        # An empty response may be a swallowed timeout, so the next episode asks again
+        session.store_results(key, [])
+        self.assertIsNone(session.get_results(key))
+        session.store_results(key, [{'title': 'Show.S01.1080p', 'additional_metadata': {}}])
+        first = session.get_results(key)
+        first[0]['additional_metadata']['filename'] = 'changed'
+        self.assertEqual(session.get_results(key), [{'title': 'Show.S01.1080p', 'additional_metadata': {}}])
+
+        calls = []
+
+        def parse(titles, sizes):
+            calls.append(list(titles))
+            return [{'title': title} for title in titles]
+
+        self.assertEqual(session.parse_titles(['a', 'b'], [1, 2], parse), [{'title': 'a'}, {'title': 'b'}])
+        self.assertEqual(session.parse_titles(['b', 'c'], [2, 3], parse), [{'title': 'b'}, {'title': 'c'}])
+        self.assertEqual(calls, [['a', 'b'], ['c']])
+
+
+if __name__ == '__main__':
+    unittest.main()
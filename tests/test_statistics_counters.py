@@ -0,0 +1,60 @@
+import unittest
+import sys
+import os
+
+# Add the project root to the path so we can import modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tests.db_test_case import TempDatabaseTestCase
+from database.statistics_counters import (
+    create_statistics_counters, get_summary_counts, rebuild_statistics_counters, verify_statistics_counters
+)
+
+
+class TestStatisticsCounters(TempDatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.execute_many(
+            "INSERT INTO media_items (imdb_id, title, type, state, season_number, episode_number, version) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [('tt1', 'Movie', 'movie', 'Collected', None, None, '1080p'),
+             ('tt1', 'Movie', 'movie', 'Upgrading', None, None, '2160p'),
+             ('tt2', 'Show', 'episode', 'Collected', 1, 1, '1080p'),
+             ('tt2', 'Show', 'episode', 'Wanted', 1, 2, '1080p')])
+        create_statistics_counters()
+
+    def test_counters_are_built_from_existing_rows(self):
+        summary = get_summary_counts()
+        self.assertEqual((summary['total_movies'], summary['total_shows'], summary['total_episodes']), (1, 1, 1))
+        self.assertEqual(summary['collected_items'], 3)
+        self.assertEqual(summary['states'], {'Collected': 2, 'Upgrading': 1, 'Wanted': 1})
+        self.assertEqual(summary['versions'], {'1080p': 2, '2160p': 1})
+
+    def test_triggers_follow_inserts_updates_and_deletes(self):
+        self.execute("UPDATE media_items SET state = 'Collected' WHERE episode_number = 2")
+        self.execute("DELETE FROM media_items WHERE imdb_id = 'tt1' AND version = '1080p'")
+        self.execute("INSERT INTO media_items (imdb_id, title, type, state, season_number, episode_number) "
+                     "VALUES ('tt3', 'Other', 'episode', 'Checking', 1, 1)")
+        summary = get_summary_counts()
+        # tt1 is still collected through the Upgrading row
+        self.assertEqual((summary['total_movies'], summary['total_shows'], summary['total_episodes']), (1, 1, 2))
+        self.assertEqual(summary['states'], {'Collected': 2, 'Upgrading': 1, 'Checking': 1})
+
+        self.execute("UPDATE media_items SET state = 'Wanted' WHERE imdb_id = 'tt1'")
+        summary = get_summary_counts()
+        self.assertEqual(summary['total_movies'], 0)
+        self.assertEqual(verify_statistics_counters()['mismatches'], [])
+
+    def test_checker_detects_drift_and_rebuilds(self):
+        self.execute("UPDATE statistics_counters SET value = 42 WHERE metric = 'collected' AND key = 'shows'")
+        result = verify_statistics_counters(repair=True)
+        self.assertFalse(result['consistent'])
+        self.assertEqual(result['mismatches'], [{'metric': 'collected', 'key': 'shows', 'stored': 42, 'expected': 1}])
+        self.assertTrue(result['repaired'])
+        self.assertTrue(verify_statistics_counters()['consistent'])
+        self.assertTrue(rebuild_statistics_counters())
+        self.assertEqual(get_summary_counts()['total_shows'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
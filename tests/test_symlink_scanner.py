@@ -0,0 +1,78 @@
+import unittest
+import sys
+import os
+import threading
+from unittest import mock
+
+# Add the project root to the path so we can import modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tests.db_test_case import TempDatabaseTestCase
+from utilities.symlink_scanner import (
+    scan_symlink_library, load_symlink_scan_checkpoint, prune_empty_directories
+)
+
+
+class TestSymlinkScanner(TempDatabaseTestCase):
+    create_media_tables = False
+    db_subdir = 'db'
+
+    def setUp(self):
+        super().setUp()
+        self.mount = os.path.join(self.tmp_path, 'mount')
+        self.library = os.path.join(self.tmp_path, 'library')
+        for folder in ('Release.A', 'Release.B'):
+            os.makedirs(os.path.join(self.mount, folder))
+        for name in ('a1.mkv', 'a2.mkv'):
+            open(os.path.join(self.mount, 'Release.A', name), 'w').close()
+        self.link('Movies/A (2020)/a1.mkv', 'Release.A/a1.mkv')
+        self.link('Movies/A (2020)/a2.mkv', 'Release.A/a2.mkv')
+        self.link('Movies/A (2020)/a3.mkv', 'Release.A/a3.mkv')  # broken: file missing
+        self.link('Shows/B/Season 01/b1.mkv', 'Release.B/b1.mkv')  # broken: file missing
+        self.link('Shows/C/c1.mkv', 'Release.C/c1.mkv')  # broken: folder missing
+        os.makedirs(os.path.join(self.library, 'Shows', 'Empty', 'Season 01'))
+
+    def link(self, relative_link, relative_target):
+        path = os.path.join(self.library, relative_link)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        os.symlink(os.path.join(self.mount, relative_target), path)
+
+    def test_finds_broken_symlinks_and_streams_them(self):
+        progress = []
+        result = scan_symlink_library(self.library, progress_callback=progress.append, workers=3)
+        self.assertEqual(result['total_symlinks'], 5)
+        self.assertEqual(result['broken_count'], 3)
+        self.assertEqual(sorted(b['relative_path'] for b in result['broken_symlinks']),
+                         [os.path.join('Movies', 'A (2020)', 'a3.mkv'),
+                          os.path.join('Shows', 'B', 'Season 01', 'b1.mkv'),
+                          os.path.join('Shows', 'C', 'c1.mkv')])
+        self.assertEqual(sum(len(p['new_broken']) for p in progress), 3)
+        self.assertEqual(progress[-1]['checked_symlinks'], 5)
+        self.assertIsNone(load_symlink_scan_checkpoint(self.library))
+
+    def test_interrupted_scan_resumes_from_checkpoint(self):
+        stop_event = threading.Event()
+        stop_event.set()
+        result = scan_symlink_library(self.library, workers=1, stop_event=stop_event)
+        self.assertTrue(result['interrupted'])
+        checkpoint = load_symlink_scan_checkpoint(self.library)
+        self.assertEqual(len(checkpoint['validated_dirs']), 1)
+
+        validated = []
+        from utilities import symlink_scanner
+        original = symlink_scanner._validate_target_dir
+        with mock.patch.object(symlink_scanner, '_validate_target_dir',
+                               side_effect=lambda d, names: validated.append(d) or original(d, names)):
+            result = scan_symlink_library(self.library, workers=2)
+        self.assertEqual(result['broken_count'], 3)
+        self.assertEqual(len(validated), 2)
+        self.assertNotIn(list(checkpoint['validated_dirs'])[0], validated)
+
+    def test_prune_empty_directories(self):
+        self.assertEqual(prune_empty_directories(self.library), 2)
+        self.assertFalse(os.path.exists(os.path.join(self.library, 'Shows', 'Empty')))
+        self.assertTrue(os.path.exists(os.path.join(self.library, 'Shows', 'C')))
+
+
+if __name__ == '__main__':
+    unittest.main()
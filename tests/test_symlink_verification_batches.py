@@ -0,0 +1,82 @@
+import unittest
+import sys
+import os
+from unittest import mock
+
+# Add the project root to the path so we can import modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tests.db_test_case import TempDatabaseTestCase
+from database.core import get_db_connection
+from database.symlink_verification import (
+    create_verification_indexes, get_unverified_file_ids, iter_unverified_files,
+    mark_verified_many, record_attempts_many, mark_failed_many
+)
+from utilities import plex_verification
+
+
+class TestSymlinkVerificationBatches(TempDatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        create_verification_indexes()
+        conn = get_db_connection()
+        for i in range(1, 6):
+            conn.execute("INSERT INTO media_items (id, title, type, location_on_disk) VALUES (?, ?, 'movie', ?)",
+                         (i, f'Movie {i}', f'/library/movie{i}.mkv'))
+            conn.execute("""INSERT INTO symlinked_files_verification
+                            (media_item_id, filename, full_path, added_at, verification_attempts)
+                            VALUES (?, ?, ?, ?, ?)""",
+                         (i, f'movie{i}.mkv', f'/library/movie{i}.mkv', f'2024-01-0{i} 00:00:00', 5 - i))
+        conn.commit()
+        conn.close()
+
+    def test_pending_ids_follow_attempt_order_and_use_index(self):
+        ids = get_unverified_file_ids(limit=3)
+        self.assertEqual(ids, [5, 4, 3])
+        files = list(iter_unverified_files(ids, page_size=2))
+        self.assertEqual([f['verification_id'] for f in files], [5, 4, 3])
+        self.assertEqual(files[0]['location_on_disk'], '/library/movie5.mkv')
+
+        plan = ' '.join(row[3] for row in self.fetch("""
+            EXPLAIN QUERY PLAN SELECT id FROM symlinked_files_verification
+            WHERE verified = FALSE AND permanently_failed = FALSE
+            ORDER BY verification_attempts ASC, added_at ASC LIMIT 10"""))
+        self.assertIn('idx_symlink_verification_pending', plan)
+        self.assertNotIn('TEMP B-TREE', plan)
+
+    def test_batched_outcomes(self):
+        self.assertEqual(mark_verified_many([1, 2]), 2)
+        self.assertEqual(record_attempts_many([3]), 1)
+        self.assertEqual(mark_failed_many([(4, 'gone'), (5, 'stale')]), 2)
+
+        rows = {row['id']: row for row in self.fetch(
+            "SELECT id, verified, verification_attempts, permanently_failed, failure_reason FROM symlinked_files_verification")}
+        self.assertTrue(rows[1]['verified'] and rows[2]['verified'])
+        self.assertEqual(rows[3]['verification_attempts'], 3)
+        self.assertEqual((rows[5]['permanently_failed'], rows[5]['failure_reason']), (1, 'stale'))
+        verified_items = [row[0] for row in self.fetch("SELECT id FROM media_items WHERE plex_verified = TRUE ORDER BY id")]
+        self.assertEqual(verified_items, [1, 2])
+        self.assertEqual(get_unverified_file_ids(limit=10), [3])
+
+    def test_outcomes_are_written_when_the_scan_fails_part_way(self):
+        def failing_files(ids):
+            for i, file_data in enumerate(iter_unverified_files(ids)):
+                if i == 2:
+                    raise RuntimeError('lost the database connection')
+                yield file_data
+
+        with mock.patch.object(plex_verification, 'get_setting', return_value='configured'), \
+             mock.patch.object(plex_verification, 'sync_run_get_collected_from_plex',
+                               return_value={'movies': [], 'episodes': []}), \
+             mock.patch.object(plex_verification, 'iter_unverified_files', failing_files):
+            with self.assertRaises(RuntimeError):
+                plex_verification._run_plex_verification_scan(max_files=10, recent_only=False, max_attempts=10)
+
+        # The files do not exist, so both checked records got an attempt recorded before the failure
+        attempts = {row['id']: row['verification_attempts'] for row in self.fetch(
+            "SELECT id, verification_attempts FROM symlinked_files_verification")}
+        self.assertEqual(attempts, {1: 4, 2: 3, 3: 2, 4: 2, 5: 1})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+import unittest
+import sys
+import os
+import asyncio
+import threading
+import time
+
+# Add the project root to the path so we can import modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utilities.ttl_cache import TTLCache, ttl_cache
+
+
+class TestTTLCache(unittest.TestCase):
+    def test_lru_eviction_and_expiry(self):
+        cache = TTLCache('test.lru', ttl=0.05, maxsize=2)
+        cache.get_or_compute('a', lambda: 1)
+        cache.get_or_compute('b', lambda: 2)
+        cache.get_or_compute('a', lambda: 'unused')  # 'a' becomes most recent
+        cache.get_or_compute('c', lambda: 3)         # evicts 'b'
+        self.assertEqual(cache.get_or_compute('a', lambda: 'recomputed'), 1)
+        self.assertEqual(cache.get_or_compute('b', lambda: 'recomputed'), 'recomputed')
+        time.sleep(0.06)
+        self.assertEqual(cache.get_or_compute('a', lambda: 'expired'), 'expired')
+        stats = cache.get_stats()
+        self.assertEqual((stats['size'], stats['evicted'], stats['expired']), (2, 2, 1))
+
+    def test_concurrent_misses_compute_once(self):
+        calls = []
+        release = threading.Event()
+
+        @ttl_cache(60)
+        def slow(x):
+            calls.append(x)
+            release.wait(1)
+            return x * 2
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(slow(21))) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.05)
+        release.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(calls, [21])
+        self.assertEqual(results, [42] * 8)
+        self.assertEqual(slow.cache.get_stats()['coalesced'], 7)
+
+    def test_errors_reach_waiters_and_are_not_cached(self):
+        attempts = []
+
+        @ttl_cache(60)
+        def flaky():
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise ValueError('boom')
+            return 'ok'
+
+        with self.assertRaises(ValueError):
+            flaky()
+        self.assertEqual(flaky(), 'ok')
+
+    def test_async_calls_share_results_across_event_loops(self):
+        calls = []
+
+        @ttl_cache(60)
+        async def fetch(limit=None):
+            calls.append(limit)
+            await asyncio.sleep(0.01)
+            return [limit]
+
+        async def burst():
+            return await asyncio.gather(*(fetch(limit=5) for _ in range(5)))
+
+        self.assertEqual(asyncio.run(burst()), [[5]] * 5)
+        # The statistics pages run each request in a new event loop
+        self.assertEqual(asyncio.run(fetch(limit=5)), [5])
+        self.assertEqual(calls, [5])
+
+    def test_stale_while_revalidate_serves_old_value_and_refreshes(self):
+        values = iter(['first', 'second'])
+        cache = TTLCache('test.swr', ttl=0.02, stale_while_revalidate=5)
+        self.assertEqual(cache.get_or_compute('k', lambda: next(values)), 'first')
+        time.sleep(0.03)
+        self.assertEqual(cache.get_or_compute('k', lambda: next(values)), 'first')
+        deadline = time.monotonic() + 1
+        while cache.get_stats()['in_flight'] and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(cache.get_or_compute('k', lambda: 'unused'), 'second')
+        self.assertEqual(cache.get_stats()['stale_hits'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,155 @@
+import unittest
+from unittest.mock import Mock, patch
+import sys
+import os
+import copy
+import logging
+import time
+
+# Add the project root to the path so we can import modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scraper.functions.filter_results import filter_results
+from scraper.functions import rank_results
+from scraper.functions.rank_results import rank_result_key, check_preferred, _check_preferred_compiled
+from scraper.functions.other_functions import smart_search
+from scraper.functions.file_processing import parse_torrent_info
+from scraper.functions.version_profile import CompiledPattern, get_version_profile
+
+logger = logging.getLogger(__name__)
+
+# Set RUN_BENCHMARKS=1 to run the timed benchmarks; run pytest with --log-cli-level=INFO to see the timings
+RUN_BENCHMARKS = os.environ.get('RUN_BENCHMARKS') == '1'
+
+
+class TestVersionProfile(unittest.TestCase):
+    """Compiled patterns must match exactly like the per-result code they replace."""
+
+    def test_compiled_pattern_matches_smart_search(self):
+        patterns = ['"WEB-DL"', 'remux', r'\bHDR\b', 'x26[45]', '[invalid', 'Dolby Vision']
+        texts = ['Movie.2020.2160p.WEB-DL.HDR.x265-GRP', 'Movie 2020 REMUX', 'movie.2020.hdr10.x264',
+                 'Movie [invalid] 2020', 'Movie.2020.Dolby.Vision', '']
+        for pattern in patterns:
+            compiled = CompiledPattern(pattern)
+            for text in texts:
+                self.assertEqual(compiled.search(text), smart_search(pattern, text), (pattern, text))
+
+    def test_compiled_preferred_matches_check_preferred(self):
+        patterns_weights = [['WEB-DL', 50], ['webdl', 50], ['"remux"', 100], [r'x26[45]', 25]]
+        profile = get_version_profile({'preferred_filter_in': patterns_weights})
+        fields = ['movie.2020.2160p.web-dl.x265-grp', 'movie.2020.remux.mkv', '']
+        for is_bonus in (True, False):
+            self.assertEqual(
+                _check_preferred_compiled(profile.preferred_filter_in, fields, is_bonus),
+                check_preferred(patterns_weights, fields, is_bonus)
+            )
+
+
+class TestFilterRankLargeResultSet(unittest.TestCase):
+    """Filtering and ranking many results builds the version profile and aliases once."""
+
+    RESULT_COUNT = 1000
+
+    def setUp(self):
+        self.version_settings = {
+            'resolution_wanted': '<=',
+            'max_resolution': '2160p',
+            'min_size_gb': 0.1,
+            'max_size_gb': 100.0,
+            'filter_in': [],
+            'filter_out': ['"CAM"', r'\bTS\b'],
+            'enable_hdr': True,
+            'similarity_threshold': 0.8,
+            'similarity_threshold_anime': 0.6,
+            'min_bitrate_mbps': 0.0,
+            'max_bitrate_mbps': 1000.0,
+            'preferred_filter_in': [['REMUX', 100], ['WEB-DL', 50]],
+            'preferred_filter_out': [['x264', 25]],
+        }
+        self.mock_direct_api = Mock()
+        self.mock_direct_api.get_movie_aliases.return_value = ({'us': ['The Test Movie']}, None)
+        self.mock_direct_api.get_movie_metadata.return_value = ({'original_title': 'The Test Movie'}, None)
+
+        templates = [
+            'The.Test.Movie.2020.2160p.UHD.BluRay.REMUX.HDR.HEVC.Atmos-GRP{n}',
+            'The.Test.Movie.2020.1080p.WEB-DL.DDP5.1.H.264-GRP{n}',
+            'The.Test.Movie.2020.720p.BluRay.x264-GRP{n}',
+            'The.Test.Movie.2020.HDCAM.x264-GRP{n}',
+            'Another.Film.2019.1080p.WEB-DL.x265-GRP{n}',
+        ]
+        self.results = []
+        for n in range(self.RESULT_COUNT):
+            title = templates[n % len(templates)].format(n=n)
+            parsed_info = parse_torrent_info(title)
+            self.results.append({
+                'title': title,
+                'original_title': title,
+                'size': 2.0 + (n % 40),
+                'parsed_info': parsed_info,
+                'scraper_type': 'Generic',
+                'scraper_instance': 'bench_instance',
+                'additional_metadata': {'filename': title, 'bingeGroup': None},
+            })
+
+    def filter(self, results):
+        return filter_results(
+            results=results,
+            tmdb_id='12345', title='The Test Movie', year=2020, content_type='movie',
+            season=None, episode=None, multi=False, version_settings=self.version_settings,
+            runtime=120, episode_count=None, season_episode_counts={}, genres=['drama'],
+            matching_aliases=['The Test Movie'], imdb_id='tt1234567', direct_api=self.mock_direct_api,
+        )[0]
+
+    def rank(self, results, profile):
+        return sorted(results, key=lambda result: rank_result_key(
+            result, results, 'The Test Movie', 2020, None, None, False, 'movie',
+            self.version_settings, profile=profile
+        ))
+
+    def test_filter_and_rank_results(self):
+        filtered_results = self.filter(copy.deepcopy(self.results))
+
+        # Only the CAM releases are rejected
+        self.assertEqual(len(filtered_results), self.RESULT_COUNT * 4 // 5)
+        self.assertFalse(any('HDCAM' in result['title'] for result in filtered_results))
+        # Aliases are fetched once per call, not once per result
+        self.assertEqual(self.mock_direct_api.get_movie_aliases.call_count, 1)
+
+        profile = get_version_profile(self.version_settings)
+        with patch.object(rank_results, 'get_version_profile', wraps=get_version_profile) as build_profile:
+            ranked = self.rank(filtered_results, profile)
+            build_profile.assert_not_called()
+
+        self.assertEqual(len(ranked), len(filtered_results))
+        self.assertIn('REMUX', ranked[0]['title'])
+        # Passing the prebuilt profile ranks exactly like building it per result
+        sample = ranked[:20]
+        self.assertEqual(
+            [rank_result_key(r, sample, 'The Test Movie', 2020, None, None, False, 'movie', self.version_settings, profile=profile)
+             for r in sample],
+            [rank_result_key(r, sample, 'The Test Movie', 2020, None, None, False, 'movie', self.version_settings)
+             for r in sample])
+
+
+@unittest.skipUnless(RUN_BENCHMARKS, 'set RUN_BENCHMARKS=1 to run timed benchmarks')
+class BenchmarkFilterRank(TestFilterRankLargeResultSet):
+    """Times filtering and ranking 5,000 synthetic results for one movie."""
+
+    RESULT_COUNT = 5000
+
+    def test_filter_and_rank_results(self):
+        results = copy.deepcopy(self.results)
+
+        start = time.perf_counter()
+        filtered_results = self.filter(results)
+        filtered_at = time.perf_counter()
+        ranked = self.rank(filtered_results, get_version_profile(self.version_settings))
+        ranked_at = time.perf_counter()
+
+        self.assertEqual(len(ranked), self.RESULT_COUNT * 4 // 5)
+        logger.info(f"Filtered {self.RESULT_COUNT} results in {filtered_at - start:.3f}s and ranked "
+                    f"{len(ranked)} in {ranked_at - filtered_at:.3f}s ({ranked_at - start:.3f}s total)")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -8,6 +8,7 @@ from pathlib import Path
 import re
 from datetime import datetime
 import time
+import threading
 from utilities.anidb_functions import format_filename_with_anidb
 from database.database_writing import update_media_item_state, update_media_item
 from utilities.post_processing import handle_state_change
@@ -16,6 +17,8 @@ from database.database_reading import get_all_media_items, get_media_item_by_id,
 from scraper.functions.ptt_parser import parse_with_ptt
 import json # Ensure json is imported
 from concurrent.futures import ThreadPoolExecutor, TimeoutError
+from utilities.mount_index import get_mount_index
+from utilities.symlink_scanner import scan_symlink_library, prune_empty_directories
 
 def sanitize_filename(filename: str) -> str:
     """Sanitize filename to be safe for symlinks."""
@@ -570,10 +573,22 @@ def check_local_file_for_item(item: Dict[str, Any], is_webhook: bool = False, ex
             found_file = False
             source_file = None # Initialize source_file
 
+            # 0. Look the file up in the mount index (same folder order as the checks below)
+            mount_index = get_mount_index()
+            if mount_index:
+                folder_candidates = _candidate_source_folders(original_torrent_title, real_debrid_original_title, filled_by_title)
+                indexed_path = mount_index.find_file(current_filename, folder_candidates, search_everywhere=extended_search)
+                if indexed_path and os.path.exists(indexed_path):
+                    source_file = indexed_path
+                    found_file = True
+                    logging.info(f"Found file using the mount index: {source_file}")
+                elif indexed_path:
+                    mount_index.forget_file(indexed_path)
+
             # --- Check Order: Original Torrent Title -> Filled By Title ---
 
             # 1. Check original_scraped_torrent_title (raw)
-            if original_torrent_title:
+            if not found_file and original_torrent_title:
                 potential_path = os.path.join(original_path, original_torrent_title, current_filename)
                 logging.debug(f"Attempt 1: Checking path using original_scraped_torrent_title: {potential_path}")
                 if os.path.exists(potential_path):
@@ -666,7 +681,7 @@ def check_local_file_for_item(item: Dict[str, Any], is_webhook: bool = False, ex
             # Check if this is a potential upgrade based on release date
             if str(item.get('release_date', '')).lower() in ['unknown', 'none', '']:
                 # Treat unknown release dates as very recent (0 days since release)
-                logging.debug(f"[UPGRADE] Unknown release date for {item_identifier} - treating as new content")
+                logging.debug("[UPGRADE] Unknown release date for %s - treating as new content", item_identifier)
                 days_since_release = 0
             else:
                 try:
@@ -674,7 +689,7 @@ def check_local_file_for_item(item: Dict[str, Any], is_webhook: bool = False, ex
                     days_since_release = (datetime.now().date() - release_date).days
                 except ValueError:
                     # Handle invalid but non-empty release dates by treating them as new
-                    logging.debug(f"[UPGRADE] Invalid release date format: {item.get('release_date')} - treating as new content")
+                    logging.debug("[UPGRADE] Invalid release date format: %s - treating as new content", item.get('release_date'))
                     days_since_release = 0
             
             # Add check for content_source to prevent manual assignments from triggering upgrades
@@ -683,14 +698,13 @@ def check_local_file_for_item(item: Dict[str, Any], is_webhook: bool = False, ex
                                     get_setting("Scraping", "enable_upgrading", default=False) and
                                     not is_manually_assigned) # Check if NOT manually assigned
             
-            # Log upgrade status
-            logging.debug(f"[UPGRADE] Processing item: {item_identifier}")
-            logging.debug(f"[UPGRADE] Days since release: {days_since_release}")
-            logging.debug(f"[UPGRADE] Is manually assigned (Magnet_Assigner): {is_manually_assigned}")
-            logging.debug(f"[UPGRADE] Is upgrade candidate: {is_upgrade_candidate}")
-            logging.debug(f"[UPGRADE] Current file: {item.get('filled_by_file')}")
-            logging.debug(f"[UPGRADE] Upgrading from: {item.get('upgrading_from')}")
-            logging.debug(f"[UPGRADE] Torrent ID: {item.get('filled_by_torrent_id')}")
+            # Log upgrade status as one record; arguments are only formatted if DEBUG is enabled
+            logging.debug(
+                "[UPGRADE] Processing item: %s | days_since_release=%s manually_assigned=%s upgrade_candidate=%s "
+                "current_file=%s upgrading_from=%s torrent_id=%s",
+                item_identifier, days_since_release, is_manually_assigned, is_upgrade_candidate,
+                item.get('filled_by_file'), item.get('upgrading_from'), item.get('filled_by_torrent_id')
+            )
 
             # Only handle cleanup if we have a confirmed upgrade (upgrading_from is set)
             if item.get('upgrading_from'):
@@ -1013,12 +1027,15 @@ def convert_item_to_symlink(item: Dict[str, Any], skip_verification: bool = Fals
             'new_location': new_symlink_path # Return path even on failure for logging
         }
 
-def scan_for_broken_symlinks(library_path: str = None) -> Dict[str, Any]:
+def scan_for_broken_symlinks(library_path: str = None, progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+                             stop_event: Optional[threading.Event] = None) -> Dict[str, Any]:
     """
     Scan the library for broken symlinks.
     
     Args:
         library_path: Optional specific library path to scan. If None, uses default symlinked path from settings.
+        progress_callback: Optional function called with incremental progress (see symlink_scanner.scan_symlink_library).
+        stop_event: Optional event that interrupts the scan (it resumes from its checkpoint next time).
         
     Returns:
         Dict containing:
@@ -1040,70 +1057,7 @@ def scan_for_broken_symlinks(library_path: str = None) -> Dict[str, Any]:
             }
             
         logging.info(f"Starting symlink scan in: {library_path}")
-        total_symlinks = 0
-        broken_symlinks = []
-        processed_files = 0
-        
-        # First count total files for progress tracking
-        total_files = sum(len(files) for _, _, files in os.walk(library_path))
-        logging.info(f"Found {total_files} total files to check")
-        
-        # Walk through the library
-        for root, _, files in os.walk(library_path):
-            relative_root = os.path.relpath(root, library_path)
-            logging.debug(f"Scanning directory: {relative_root}")
-            
-            for file in files:
-                processed_files += 1
-                if processed_files % 100 == 0:  # Log progress every 100 files
-                    progress = (processed_files / total_files) * 100
-                    logging.info(f"Progress: {progress:.1f}% ({processed_files}/{total_files} files)")
-                
-                file_path = os.path.join(root, file)
-                
-                # Check if it's a symlink
-                if os.path.islink(file_path):
-                    total_symlinks += 1
-                    target_path = os.path.realpath(file_path)
-                    relative_path = os.path.relpath(file_path, library_path)
-                    
-                    logging.debug(f"Checking symlink: {relative_path} -> {target_path}")
-                    
-                    # Check if the target exists
-                    if not os.path.exists(target_path):
-                        logging.warning(f"Found broken symlink: {relative_path} -> {target_path}")
-                        broken_symlinks.append({
-                            'symlink_path': file_path,
-                            'relative_path': relative_path,
-                            'target_path': target_path,
-                            'filename': file
-                        })
-                    else:
-                        logging.debug(f"Symlink OK: {relative_path}")
-        
-        # Calculate health metrics
-        health_percentage = ((total_symlinks - len(broken_symlinks)) / total_symlinks * 100) if total_symlinks > 0 else 100
-        
-        result = {
-            'total_symlinks': total_symlinks,
-            'broken_symlinks': broken_symlinks,
-            'broken_count': len(broken_symlinks),
-            'total_files_scanned': processed_files,
-            'health_percentage': round(health_percentage, 1)
-        }
-        
-        logging.info(f"Symlink scan complete:")
-        logging.info(f"- Total files scanned: {processed_files}")
-        logging.info(f"- Total symlinks found: {total_symlinks}")
-        logging.info(f"- Broken symlinks found: {len(broken_symlinks)}")
-        logging.info(f"- Health score: {health_percentage:.1f}%")
-        
-        if broken_symlinks:
-            logging.info("Broken symlinks summary:")
-            for symlink in broken_symlinks:
-                logging.info(f"- {symlink['relative_path']} -> {symlink['target_path']}")
-        
-        return result
+        return scan_symlink_library(library_path, progress_callback=progress_callback, stop_event=stop_event)
         
     except Exception as e:
         logging.error(f"Error scanning for broken symlinks: {str(e)}", exc_info=True)
@@ -1180,6 +1134,18 @@ def repair_broken_symlink(symlink_path: str, new_target_path: str = None) -> Dic
             'new_target': new_target_path if 'new_target_path' in locals() else None
         }
 
+def _candidate_source_folders(*folder_names: str) -> List[Optional[str]]:
+    """Folders a downloaded file may be in, in lookup order: each name raw, then trimmed, then the base path (None)."""
+    candidates: List[Optional[str]] = []
+    for folder_name in folder_names:
+        if not folder_name:
+            continue
+        for candidate in (folder_name, os.path.splitext(folder_name)[0]):
+            if candidate not in candidates:
+                candidates.append(candidate)
+    candidates.append(None)
+    return candidates
+
 # --- Add Helper Function for Source File Searching ---
 def _find_source_file_in_base(item: Dict[str, Any], base_search_path: str, filename_only: str) -> Optional[str]:
     """Helper to search for filename_only under base_search_path using common folder structures."""
@@ -1188,6 +1154,18 @@ def _find_source_file_in_base(item: Dict[str, Any], base_search_path: str, filen
 
     logging.debug(f"[_find_source_file_in_base] Searching for '{filename_only}' under '{base_search_path}' for item ID {item.get('id')}")
 
+    mount_index = get_mount_index()
+    if mount_index and mount_index.root == os.path.normpath(base_search_path):
+        folder_candidates = _candidate_source_folders(item.get('original_scraped_torrent_title', ''),
+                                                      item.get('real_debrid_original_title', ''),
+                                                      item.get('filled_by_title', ''))
+        indexed_path = mount_index.find_file(filename_only, folder_candidates)
+        if indexed_path and os.path.exists(indexed_path):
+            logging.debug(f"[_find_source_file_in_base] Found in mount index: '{indexed_path}'")
+            return os.path.normpath(indexed_path)
+        if indexed_path:
+            mount_index.forget_file(indexed_path)
+
     possible_folder_names = [
         item.get('original_scraped_torrent_title', ''),
         item.get('real_debrid_original_title', ''),
@@ -1435,18 +1413,7 @@ def resync_symlinks_with_new_settings(
     symlink_base_path = get_setting('File Management', 'symlinked_files_path')
     if symlink_base_path and os.path.exists(symlink_base_path):
         logging.info(f"Starting pruning of empty directories in {symlink_base_path}")
-        pruned_count = 0
-        # Walk the directory tree from bottom up
-        for root, dirs, files in os.walk(symlink_base_path, topdown=False):
-            for name in dirs:
-                dir_path = os.path.join(root, name)
-                try:
-                    if not os.listdir(dir_path):  # Check if directory is empty
-                        os.rmdir(dir_path)
-                        logging.info(f"Pruned empty directory: {dir_path}")
-                        pruned_count += 1
-                except OSError as e:
-                    logging.warning(f"Could not prune directory {dir_path}: {e}")
+        pruned_count = prune_empty_directories(symlink_base_path)
         logging.info(f"Finished pruning. Removed {pruned_count} empty directories.")
     # --- End Prune empty folders ---
 
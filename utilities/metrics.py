@@ -0,0 +1,246 @@
+"""
+In-process latency histograms and counters for the main pipeline stages.
+
+The instruments below are always on. An observation is one bisect and a
+locked increment, so timings can be compared under real load without
+enabling the sampling profiler.
+
+- The data is exported in Prometheus text format at /performance/metrics.
+- The performance dashboard shows it as a percentile table, fed by
+  /performance/api/performance/stage_latency.
+- Values are kept since process start, like Prometheus counters.
+  Percentiles are estimated from the histogram buckets.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Request-style latencies, 1 ms to 5 minutes
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+# Queue dwell times, 1 second to 7 days
+DWELL_BUCKETS = (1, 5, 15, 30, 60, 300, 900, 1800, 3600, 7200, 21600, 43200, 86400, 259200, 604800)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(labelnames: Sequence[str], labelvalues: Sequence[str], extra: str = '') -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(labelnames, labelvalues)]
+    if extra:
+        parts.append(extra)
+    return '{' + ','.join(parts) + '}' if parts else ''
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if value != float('inf') else '+Inf'
+
+
+class Counter:
+    """Monotonic counter per label set."""
+    kind = 'counter'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, object]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, '')) for name in self.labelnames)
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self) -> List[Tuple[Tuple[str, ...], float]]:
+        with self._lock:
+            return sorted(self._values.items())
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        for key, value in self.samples():
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+    def reset(self):
+        with self._lock:
+            self._values.clear()
+
+
+class Histogram:
+    """Cumulative-bucket histogram per label set, in seconds."""
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [per-bucket counts (last is +Inf), sum, count]
+        self._series: Dict[Tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, object]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, '')) for name in self.labelnames)
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the duration of the with-block, also when it raises."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def _snapshot(self) -> List[Tuple[Tuple[str, ...], List[int], float, int]]:
+        with self._lock:
+            return sorted((key, list(series[0]), series[1], series[2]) for key, series in self._series.items())
+
+    def _quantile(self, counts: List[int], total: int, q: float) -> float:
+        """Estimate a quantile by linear interpolation inside the bucket that contains it."""
+        if total == 0:
+            return 0.0
+        rank = q * total
+        cumulative = 0
+        for index, count in enumerate(counts):
+            if cumulative + count >= rank and count:
+                lower = self.buckets[index - 1] if index > 0 else 0.0
+                if index == len(self.buckets):
+                    return lower  # above the last finite bucket
+                upper = self.buckets[index]
+                return lower + (upper - lower) * ((rank - cumulative) / count)
+            cumulative += count
+        return self.buckets[-1]
+
+    def summary(self) -> List[Dict[str, object]]:
+        rows = []
+        for key, counts, total_sum, count in self._snapshot():
+            rows.append({
+                'labels': dict(zip(self.labelnames, key)),
+                'count': count,
+                'sum': total_sum,
+                'avg': total_sum / count if count else 0.0,
+                'p50': self._quantile(counts, count, 0.5),
+                'p90': self._quantile(counts, count, 0.9),
+                'p99': self._quantile(counts, count, 0.99),
+            })
+        return rows
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        for key, counts, total_sum, count in self._snapshot():
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += bucket_count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            label_str = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{label_str} {_format_value(total_sum)}")
+            lines.append(f"{self.name}_count{label_str} {count}")
+        return lines
+
+    def reset(self):
+        with self._lock:
+            self._series.clear()
+
+
+_registry: Dict[str, object] = {}
+_registry_lock = threading.Lock()
+
+
+def _register(metric):
+    with _registry_lock:
+        existing = _registry.get(metric.name)
+        if existing is not None:
+            return existing
+        _registry[metric.name] = metric
+        return metric
+
+
+def counter(name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+    return _register(Counter(name, documentation, labelnames))
+
+
+def histogram(name: str, documentation: str, labelnames: Sequence[str] = (),
+              buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+    return _register(Histogram(name, documentation, labelnames, buckets))
+
+
+def get_metric(name: str) -> Optional[object]:
+    return _registry.get(name)
+
+
+def render_prometheus() -> str:
+    """All registered metrics in Prometheus text exposition format 0.0.4."""
+    with _registry_lock:
+        metrics = list(_registry.values())
+    lines: List[str] = []
+    for metric in metrics:
+        lines.extend(metric.render())
+    return '\n'.join(lines) + '\n'
+
+
+def latency_summary() -> List[Dict[str, object]]:
+    """Per-series count, average and estimated percentiles of every histogram, for the dashboard."""
+    with _registry_lock:
+        metrics = [m for m in _registry.values() if isinstance(m, Histogram)]
+    rows = []
+    for metric in metrics:
+        for row in metric.summary():
+            row['metric'] = metric.name
+            rows.append(row)
+    return rows
+
+
+def reset_metrics():
+    with _registry_lock:
+        metrics = list(_registry.values())
+    for metric in metrics:
+        metric.reset()
+
+
+# --- Pipeline instruments ---
+SCRAPER_CALL_SECONDS = histogram(
+    'scraper_call_seconds', 'Duration of one scraper call', ('scraper', 'instance'))
+SCRAPER_RESULTS = counter(
+    'scraper_results_total', 'Results returned by scraper calls', ('scraper', 'instance'))
+SCRAPE_STAGE_SECONDS = histogram(
+    'scrape_stage_seconds', 'Duration of a scrape stage (title parsing, filtering, ranking, ...) per search', ('stage',))
+DEBRID_REQUEST_SECONDS = histogram(
+    'debrid_request_seconds', 'Duration of debrid API requests', ('provider', 'endpoint', 'method'))
+DEBRID_REQUEST_ERRORS = counter(
+    'debrid_request_errors_total', 'Debrid API requests that returned an HTTP error', ('provider', 'endpoint', 'status'))
+DB_CALL_SECONDS = histogram(
+    'db_call_seconds', 'Duration of database functions wrapped with retry_on_db_lock, retries included', ('function',))
+DB_LOCK_RETRIES = counter(
+    'db_lock_retries_total', 'Retries caused by "database is locked"', ('function',))
+QUEUE_DWELL_SECONDS = histogram(
+    'queue_dwell_seconds', 'Time items spent in a queue before leaving it', ('queue',), buckets=DWELL_BUCKETS)
+SCHEDULER_JOB_SECONDS = histogram(
+    'scheduler_job_seconds', 'Duration of scheduled task runs', ('job',))
+RCLONE_WEBHOOK_SECONDS = histogram(
+    'rclone_webhook_seconds', 'Time rclone webhook paths spent waiting for a batch and being processed', ('stage',))
+RCLONE_WEBHOOK_PATHS = counter(
+    'rclone_webhook_paths_total', 'rclone webhook paths by outcome (queued, duplicate, existing, processed, failed)', ('outcome',))
+CACHE_REQUESTS = counter(
+    'cache_requests_total', 'TTL cache lookups by result (hits, misses, stale_hits, coalesced)', ('cache', 'result'))
+CACHE_EVICTIONS = counter(
+    'cache_evictions_total', 'TTL cache entries removed for capacity (evicted) or age (expired)', ('cache', 'reason'))
@@ -0,0 +1,409 @@
+"""
+Filesystem index of the original files mount (Zurg/rclone).
+
+`check_local_file_for_item` looks for a downloaded file by probing up to seven
+`<original_files_path>/<folder>/<filename>` paths. On a FUSE mount every probe is
+a round-trip to the remote. `MountIndex` keeps a map of the mount instead,
+listing each directory's files with their size and mtime. This turns lookups
+into dictionary hits:
+
+- The first build lists the mount with `os.scandir`, one directory per task on
+  a small thread pool. It runs in the background; until it is ready, callers
+  keep probing the filesystem.
+- Background refreshes stat every known directory in parallel and list only
+  the directories whose mtime changed, plus new ones.
+- `notify_change` (called from the rclone webhook) re-lists one directory
+  straight away. A miss re-lists the root and the candidate folders,
+  rate-limited, so files that arrived since the last refresh are found.
+- The index is saved to `mount_index.json` in the db_content directory. After
+  a restart it is loaded from there and brought up to date by a refresh
+  instead of a full walk.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from utilities.settings import get_setting
+
+INDEX_FILE_NAME = 'mount_index.json'
+INDEX_FORMAT_VERSION = 1
+
+SCAN_WORKERS = 8
+DEFAULT_REFRESH_SECONDS = 300
+# Minimum time between re-listings of the same directory after a lookup miss
+MISS_RESCAN_SECONDS = 10
+
+
+def normalize_name(name: str) -> str:
+    """Case- and whitespace-insensitive form of a file or folder name."""
+    return ' '.join(name.casefold().split())
+
+
+class MountIndex:
+    """Directory -> files (size, mtime) map of one mount, with filename and folder-name lookups."""
+
+    def __init__(self, root: str, persist_path: Optional[str] = None, workers: int = SCAN_WORKERS):
+        self.root = os.path.normpath(root)
+        self.persist_path = persist_path
+        self.workers = max(1, workers)
+        self._lock = threading.RLock()
+        # rel_dir ('' for the root) -> {'mtime': float, 'files': {name: [size, mtime]}, 'subdirs': [name, ...]}
+        self._dirs: Dict[str, Dict[str, Any]] = {}
+        self._by_filename: Dict[str, Set[str]] = {}
+        self._by_folder_name: Dict[str, Set[str]] = {}
+        self._last_rescan: Dict[str, float] = {}
+        self._refresh_thread: Optional[threading.Thread] = None
+        self.ready = False
+        self.refreshed_at = 0.0
+        self.stats = {'hits': 0, 'misses': 0, 'dirs_listed': 0, 'refreshes': 0}
+
+    # --- Building and refreshing -------------------------------------------------
+
+    def _abs(self, rel_dir: str) -> str:
+        return os.path.join(self.root, rel_dir) if rel_dir else self.root
+
+    def _list_dir(self, rel_dir: str) -> Optional[Dict[str, Any]]:
+        """List one directory. Returns None if it no longer exists."""
+        path = self._abs(rel_dir)
+        try:
+            dir_mtime = os.stat(path).st_mtime
+            files: Dict[str, List[float]] = {}
+            subdirs: List[str] = []
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.name)
+                        elif entry.is_file():
+                            st = entry.stat()
+                            files[entry.name] = [st.st_size, st.st_mtime]
+                    except OSError:
+                        continue
+        except (FileNotFoundError, NotADirectoryError):
+            return None
+        except OSError as e:
+            logging.warning(f"[MountIndex] Could not list {path}: {e}")
+            return None
+        self.stats['dirs_listed'] += 1
+        return {'mtime': dir_mtime, 'files': files, 'subdirs': subdirs}
+
+    def _list_tree(self, rel_dirs: Iterable[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """List directories and, recursively, all their subdirectories in parallel."""
+        listed: Dict[str, Optional[Dict[str, Any]]] = {}
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='MountIndex') as executor:
+            pending = {executor.submit(self._list_dir, rel_dir): rel_dir for rel_dir in rel_dirs}
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    rel_dir = pending.pop(future)
+                    entry = future.result()
+                    listed[rel_dir] = entry
+                    if entry:
+                        for name in entry['subdirs']:
+                            child = os.path.join(rel_dir, name) if rel_dir else name
+                            if child not in listed:
+                                pending[executor.submit(self._list_dir, child)] = child
+        return listed
+
+    def _apply(self, listed: Dict[str, Optional[Dict[str, Any]]]):
+        """Replace the listed directories in the index (None = directory is gone)."""
+        with self._lock:
+            for rel_dir, entry in listed.items():
+                old = self._dirs.pop(rel_dir, None)
+                if old is not None:
+                    for name in old['files']:
+                        dirs = self._by_filename.get(name)
+                        if dirs:
+                            dirs.discard(rel_dir)
+                            if not dirs:
+                                del self._by_filename[name]
+                    folder_dirs = self._by_folder_name.get(normalize_name(os.path.basename(rel_dir)))
+                    if folder_dirs:
+                        folder_dirs.discard(rel_dir)
+                    if entry is None:
+                        # Drop the whole subtree of a removed directory
+                        prefix = rel_dir + os.sep
+                        gone = {d: None for d in self._dirs if d.startswith(prefix)}
+                        if gone:
+                            self._apply(gone)
+                if entry is None:
+                    continue
+                self._dirs[rel_dir] = entry
+                for name in entry['files']:
+                    self._by_filename.setdefault(name, set()).add(rel_dir)
+                if rel_dir:
+                    self._by_folder_name.setdefault(normalize_name(os.path.basename(rel_dir)), set()).add(rel_dir)
+
+    def build(self):
+        """List the whole mount."""
+        start = time.time()
+        listed = self._list_tree([''])
+        with self._lock:
+            self._dirs.clear()
+            self._by_filename.clear()
+            self._by_folder_name.clear()
+            self._apply(listed)
+            self.ready = True
+            self.refreshed_at = time.time()
+        logging.info(f"[MountIndex] Indexed {self.file_count} files in {len(self._dirs)} directories under "
+                     f"{self.root} in {time.time() - start:.1f}s")
+        self.save()
+
+    def refresh(self):
+        """Re-list directories whose mtime changed (and everything under new directories)."""
+        start = time.time()
+        with self._lock:
+            known = {rel_dir: entry['mtime'] for rel_dir, entry in self._dirs.items()}
+
+        def changed(rel_dir):
+            try:
+                return os.stat(self._abs(rel_dir)).st_mtime != known[rel_dir]
+            except OSError:
+                return True
+
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='MountIndex') as executor:
+            stale = [rel_dir for rel_dir, is_changed in zip(known, executor.map(changed, known)) if is_changed]
+        self._rescan(stale)
+        with self._lock:
+            self.refreshed_at = time.time()
+            self.stats['refreshes'] += 1
+        if stale:
+            logging.debug(f"[MountIndex] Refresh re-listed {len(stale)} changed directories in {time.time() - start:.1f}s")
+            self.save()
+
+    def _rescan(self, rel_dirs: Iterable[str]):
+        """Re-list directories, then list any subdirectories that are new to the index."""
+        rel_dirs = list(dict.fromkeys(rel_dirs))
+        if not rel_dirs:
+            return
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='MountIndex') as executor:
+            listed = dict(zip(rel_dirs, executor.map(self._list_dir, rel_dirs)))
+        new_dirs = []
+        with self._lock:
+            for rel_dir, entry in listed.items():
+                if entry:
+                    for name in entry['subdirs']:
+                        child = os.path.join(rel_dir, name) if rel_dir else name
+                        if child not in self._dirs and child not in listed:
+                            new_dirs.append(child)
+            # Subdirectories that disappeared from a re-listed directory
+            for rel_dir, entry in listed.items():
+                old = self._dirs.get(rel_dir)
+                if old and entry:
+                    for name in set(old['subdirs']) - set(entry['subdirs']):
+                        listed[os.path.join(rel_dir, name) if rel_dir else name] = None
+        if new_dirs:
+            listed.update(self._list_tree(new_dirs))
+        self._apply(listed)
+
+    def notify_change(self, path: str):
+        """Re-list the directory containing `path` (or `path` itself if it is a directory) now."""
+        rel = self._relative(path)
+        if rel is None:
+            return
+        target = rel if os.path.isdir(self._abs(rel)) else os.path.dirname(rel)
+        # Also re-list the parent so a brand-new folder shows up in its listing
+        parents = [target, os.path.dirname(target)] if target else ['']
+        self._rescan(parents)
+
+    def forget_file(self, path: str):
+        """Drop a file the index listed but that turned out to be gone."""
+        rel = self._relative(path)
+        if not rel:
+            return
+        rel_dir, name = os.path.split(rel)
+        with self._lock:
+            entry = self._dirs.get(rel_dir)
+            if entry:
+                entry['files'].pop(name, None)
+                # Force the directory to be re-listed on the next refresh
+                entry['mtime'] = 0.0
+            dirs = self._by_filename.get(name)
+            if dirs:
+                dirs.discard(rel_dir)
+
+    def _relative(self, path: str) -> Optional[str]:
+        path = os.path.normpath(path)
+        if path == self.root:
+            return ''
+        if not path.startswith(self.root + os.sep):
+            return None
+        return path[len(self.root) + 1:]
+
+    # --- Lookups -----------------------------------------------------------------
+
+    def _find_in(self, filename: str, folder_candidates: List[Optional[str]]) -> Optional[str]:
+        with self._lock:
+            for folder in folder_candidates:
+                rel_dir = folder or ''
+                entry = self._dirs.get(rel_dir)
+                if entry and filename in entry['files']:
+                    return self._abs(os.path.join(rel_dir, filename))
+            # Same folders, matched by normalized name (case, repeated whitespace)
+            for folder in folder_candidates:
+                if not folder:
+                    continue
+                for rel_dir in sorted(self._by_folder_name.get(normalize_name(folder), ())):
+                    if filename in self._dirs.get(rel_dir, {}).get('files', {}):
+                        return self._abs(os.path.join(rel_dir, filename))
+        return None
+
+    def find_file(self, filename: str, folder_candidates: List[Optional[str]], search_everywhere: bool = False) -> Optional[str]:
+        """
+        Find `filename` in the first candidate folder (relative to the root, None for
+        the root itself) that contains it.
+
+        With search_everywhere, fall back to any directory on the mount that holds a
+        file of that name. On a miss, the root and candidate folders are re-listed
+        (at most every MISS_RESCAN_SECONDS) before giving up.
+        """
+        found = self._find_in(filename, folder_candidates)
+        if not found and search_everywhere:
+            found = self.find_by_filename(filename)
+        if not found:
+            now = time.time()
+            to_rescan = []
+            for folder in [None] + list(folder_candidates):
+                rel_dir = folder or ''
+                if now - self._last_rescan.get(rel_dir, 0) >= MISS_RESCAN_SECONDS:
+                    self._last_rescan[rel_dir] = now
+                    to_rescan.append(rel_dir)
+            if to_rescan:
+                self._rescan([rel_dir for rel_dir in to_rescan if rel_dir == '' or os.path.isdir(self._abs(rel_dir))])
+                found = self._find_in(filename, folder_candidates)
+                if not found and search_everywhere:
+                    found = self.find_by_filename(filename)
+        self.stats['hits' if found else 'misses'] += 1
+        return found
+
+    def find_by_filename(self, filename: str) -> Optional[str]:
+        with self._lock:
+            dirs = sorted(self._by_filename.get(filename, ()))
+        return self._abs(os.path.join(dirs[0], filename)) if dirs else None
+
+    def get_file_info(self, path: str) -> Optional[Tuple[int, float]]:
+        """(size, mtime) of an indexed file, or None."""
+        rel = self._relative(path)
+        if not rel:
+            return None
+        rel_dir, name = os.path.split(rel)
+        with self._lock:
+            info = self._dirs.get(rel_dir, {}).get('files', {}).get(name)
+        return (info[0], info[1]) if info else None
+
+    @property
+    def file_count(self) -> int:
+        with self._lock:
+            return sum(len(entry['files']) for entry in self._dirs.values())
+
+    # --- Persistence -------------------------------------------------------------
+
+    def save(self):
+        if not self.persist_path:
+            return
+        with self._lock:
+            data = {'version': INDEX_FORMAT_VERSION, 'root': self.root, 'dirs': self._dirs}
+            payload = json.dumps(data)
+        tmp_path = f"{self.persist_path}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.persist_path), exist_ok=True)
+            with open(tmp_path, 'w') as f:
+                f.write(payload)
+            os.replace(tmp_path, self.persist_path)
+        except OSError as e:
+            logging.warning(f"[MountIndex] Could not save index to {self.persist_path}: {e}")
+
+    def load(self) -> bool:
+        """Load a saved index of the same root. Returns False if there is none."""
+        if not self.persist_path or not os.path.exists(self.persist_path):
+            return False
+        try:
+            with open(self.persist_path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logging.warning(f"[MountIndex] Ignoring unreadable index {self.persist_path}: {e}")
+            return False
+        if data.get('version') != INDEX_FORMAT_VERSION or data.get('root') != self.root:
+            return False
+        with self._lock:
+            self._dirs.clear()
+            self._by_filename.clear()
+            self._by_folder_name.clear()
+            self._apply(data.get('dirs', {}))
+            self.ready = True
+        logging.info(f"[MountIndex] Loaded saved index of {self.root} ({len(self._dirs)} directories)")
+        return True
+
+    # --- Background maintenance --------------------------------------------------
+
+    def ensure_fresh(self, max_age: float):
+        """Start a background build (not ready yet) or refresh (older than max_age), if none is running."""
+        with self._lock:
+            if self._refresh_thread and self._refresh_thread.is_alive():
+                return
+            if self.ready and time.time() - self.refreshed_at < max_age:
+                return
+            target = self.refresh if self.ready else self._load_or_build
+            self._refresh_thread = threading.Thread(target=self._run_maintenance, args=(target,),
+                                                    name='MountIndexRefresh', daemon=True)
+            self._refresh_thread.start()
+
+    def _load_or_build(self):
+        if self.load():
+            self.refresh()
+        else:
+            self.build()
+
+    def _run_maintenance(self, target):
+        try:
+            target()
+        except Exception as e:
+            logging.error(f"[MountIndex] Maintenance of {self.root} failed: {e}", exc_info=True)
+
+
+_index: Optional[MountIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_mount_index() -> Optional[MountIndex]:
+    """
+    Index of the configured original_files_path, kept up to date in the background.
+
+    Returns None when the index is disabled (File Management.use_mount_index) or
+    the path doesn't exist, and also while the first build is still running, so
+    callers fall back to probing the filesystem.
+    """
+    global _index
+    if not get_setting('File Management', 'use_mount_index', True):
+        return None
+    root = get_setting('File Management', 'original_files_path')
+    if not root or not os.path.isdir(root):
+        return None
+    try:
+        max_age = max(10, int(get_setting('File Management', 'mount_index_refresh_seconds', DEFAULT_REFRESH_SECONDS)))
+    except (ValueError, TypeError):
+        max_age = DEFAULT_REFRESH_SECONDS
+
+    with _index_lock:
+        if _index is None or _index.root != os.path.normpath(root):
+            db_content_dir = os.environ.get('USER_DB_CONTENT', '/user/db_content')
+            _index = MountIndex(root, persist_path=os.path.join(db_content_dir, INDEX_FILE_NAME))
+        index = _index
+    index.ensure_fresh(max_age)
+    return index if index.ready else None
+
+
+def notify_mount_change(path: str):
+    """Tell the mount index that something under `path` changed (e.g. from the rclone webhook)."""
+    with _index_lock:
+        index = _index
+    if index is not None and index.ready:
+        try:
+            index.notify_change(path)
+        except Exception as e:
+            logging.warning(f"[MountIndex] Could not re-list {path}: {e}")
@@ -1,6 +1,9 @@
 import asyncio
 import aiohttp
+import itertools
+import json
 import logging
+from collections import deque
 from utilities.settings import get_setting
 import time
 from typing import Dict, List, Any, Tuple, Optional
@@ -27,6 +30,11 @@ CHUNK_SIZE = 10
 MAX_RETRIES = 3
 RETRY_DELAY = 1
 
+# Streamed full scans: items per database chunk, pages fetched ahead, checkpoint lifetime
+STREAM_CHUNK_SIZE = 500
+STREAM_PAGE_PREFETCH = 2
+STREAM_CHECKPOINT_MAX_AGE_HOURS = 24
+
 def process_library_names(library_names: str, all_libraries: dict, libraries_by_key: dict) -> list:
     """
     Process a comma-separated string of library names/ids and return their corresponding library keys.
@@ -389,6 +397,59 @@ async def process_movie(movie: Dict[str, Any]) -> List[Dict[str, Any]]:
     # logger.debug(f"Processed {len(movie_entries)} entries for movie: {movie['title']}")
     return movie_entries
 
+def select_scan_libraries(libraries_data: Dict[str, Any], specific_library_keys: Optional[List[str]] = None,
+                          scan_all_libraries: bool = False) -> Tuple[List[str], List[str]]:
+    """Pick the movie and show library keys to scan from the /library/sections response."""
+    libraries_by_key = {str(library['key']): library['title'] for library in libraries_data['MediaContainer']['Directory']}
+    all_libraries = {library['title']: str(library['key']) for library in libraries_data['MediaContainer']['Directory']}
+
+    movie_libraries = []
+    show_libraries = []
+
+    if scan_all_libraries:
+         logger.info("Scan All Libraries requested. Identifying all Movie and Show libraries.")
+         for library in libraries_data['MediaContainer']['Directory']:
+             lib_key = str(library.get('key'))
+             lib_type = library.get('type')
+             lib_title = library.get('title', 'Unknown')
+             if lib_type == 'movie':
+                 movie_libraries.append(lib_key)
+                 logger.debug(f"Including all-scan movie library: {lib_title} (Key: {lib_key})")
+             elif lib_type == 'show':
+                 show_libraries.append(lib_key)
+                 logger.debug(f"Including all-scan show library: {lib_title} (Key: {lib_key})")
+    elif specific_library_keys:
+         logger.info(f"Specific library keys provided: {specific_library_keys}. Overriding settings.")
+         # Assume specific_library_keys contains only valid keys for movie/show libs for now
+         # Or add logic here to check their type if needed
+         # This part needs refinement based on how specific_library_keys is intended to be used with types
+         # For now, assign all to both and let the content fetch handle it.
+         # A better approach would be to fetch section details for each key.
+         logger.warning("Specific library keys provided, assuming they are movie/show types. Type filtering during fetch will apply.")
+         # Fetch section details to determine type
+         all_sections_details = libraries_data['MediaContainer']['Directory']
+         for key in specific_library_keys:
+             found = False
+             for section_detail in all_sections_details:
+                 if str(section_detail.get('key')) == key:
+                     if section_detail.get('type') == 'movie':
+                         movie_libraries.append(key)
+                         found = True
+                         break
+                     elif section_detail.get('type') == 'show':
+                         show_libraries.append(key)
+                         found = True
+                         break
+             if not found:
+                 logger.warning(f"Specific library key {key} not found or is not a movie/show library.")
+
+    else:
+         logger.info("Using libraries specified in settings.")
+         movie_libraries = process_library_names(get_setting('Plex', 'movie_libraries', ''), all_libraries, libraries_by_key)
+         show_libraries = process_library_names(get_setting('Plex', 'shows_libraries', ''), all_libraries, libraries_by_key)
+
+    return movie_libraries, show_libraries
+
 async def get_collected_from_plex(request='all', progress_callback=None, bypass=False,
                                 page_size: int = OPTIMAL_PAGE_SIZE,
                                 max_concurrent_requests: int = MAX_CONCURRENT_REQUESTS,
@@ -452,55 +513,10 @@ async def get_collected_from_plex(request='all', progress_callback=None, bypass=
         logger.debug(f"Fetching library sections from: {libraries_url}")
         libraries_data = await fetch_data(session, libraries_url, headers, semaphore)
         
-        libraries_by_key = {str(library['key']): library['title'] for library in libraries_data['MediaContainer']['Directory']}
-        all_libraries = {library['title']: str(library['key']) for library in libraries_data['MediaContainer']['Directory']}
         t_libs_end = time.perf_counter()
         stats["time_connect_libs"] = t_libs_end - t_libs_start
 
-        movie_libraries = []
-        show_libraries = []
-
-        if scan_all_libraries:
-             logger.info("Scan All Libraries requested. Identifying all Movie and Show libraries.")
-             for library in libraries_data['MediaContainer']['Directory']:
-                 lib_key = str(library.get('key'))
-                 lib_type = library.get('type')
-                 lib_title = library.get('title', 'Unknown')
-                 if lib_type == 'movie':
-                     movie_libraries.append(lib_key)
-                     logger.debug(f"Including all-scan movie library: {lib_title} (Key: {lib_key})")
-                 elif lib_type == 'show':
-                     show_libraries.append(lib_key)
-                     logger.debug(f"Including all-scan show library: {lib_title} (Key: {lib_key})")
-        elif specific_library_keys:
-             logger.info(f"Specific library keys provided: {specific_library_keys}. Overriding settings.")
-             # Assume specific_library_keys contains only valid keys for movie/show libs for now
-             # Or add logic here to check their type if needed
-             # This part needs refinement based on how specific_library_keys is intended to be used with types
-             # For now, assign all to both and let the content fetch handle it.
-             # A better approach would be to fetch section details for each key.
-             logger.warning("Specific library keys provided, assuming they are movie/show types. Type filtering during fetch will apply.")
-             # Fetch section details to determine type
-             all_sections_details = libraries_data['MediaContainer']['Directory']
-             for key in specific_library_keys:
-                 found = False
-                 for section_detail in all_sections_details:
-                     if str(section_detail.get('key')) == key:
-                         if section_detail.get('type') == 'movie':
-                             movie_libraries.append(key)
-                             found = True
-                             break
-                         elif section_detail.get('type') == 'show':
-                             show_libraries.append(key)
-                             found = True
-                             break
-                 if not found:
-                     logger.warning(f"Specific library key {key} not found or is not a movie/show library.")
-
-        else:
-             logger.info("Using libraries specified in settings.")
-             movie_libraries = process_library_names(get_setting('Plex', 'movie_libraries', ''), all_libraries, libraries_by_key)
-             show_libraries = process_library_names(get_setting('Plex', 'shows_libraries', ''), all_libraries, libraries_by_key)
+        movie_libraries, show_libraries = select_scan_libraries(libraries_data, specific_library_keys, scan_all_libraries)
 
         stats["movie_libs"] = len(movie_libraries)
         stats["show_libs"] = len(show_libraries)
@@ -760,6 +776,296 @@ def sync_run_get_collected_from_plex(request='all', progress_callback=None, bypa
     else:
         return loop.run_until_complete(run_get_collected_from_plex(request, progress_callback, bypass, **filtered_kwargs))
 
+class PlexScanError(Exception):
+    """A library section could not be read completely."""
+
+def _plex_scan_checkpoint_path() -> str:
+    db_content_dir = os.environ.get('USER_DB_CONTENT', '/user/db_content')
+    return os.path.join(db_content_dir, 'plex_full_scan_checkpoint.json')
+
+def load_plex_scan_checkpoint(movie_libraries: List[str], show_libraries: List[str]) -> Optional[Dict[str, Any]]:
+    """
+    Load the checkpoint of an interrupted streamed full scan.
+
+    Returns None if there is none, it is older than STREAM_CHECKPOINT_MAX_AGE_HOURS,
+    or it was taken for a different set of libraries.
+    """
+    path = _plex_scan_checkpoint_path()
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'r') as f:
+            checkpoint = json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable Plex scan checkpoint {path}: {e}")
+        return None
+    if time.time() - checkpoint.get('started_at', 0) > STREAM_CHECKPOINT_MAX_AGE_HOURS * 3600:
+        logger.info("Ignoring Plex scan checkpoint older than "
+                    f"{STREAM_CHECKPOINT_MAX_AGE_HOURS}h; starting the full scan over.")
+        return None
+    if checkpoint.get('movie_libraries') != movie_libraries or checkpoint.get('show_libraries') != show_libraries:
+        logger.info("Library selection changed since the Plex scan checkpoint was taken; starting the full scan over.")
+        return None
+    return checkpoint
+
+def save_plex_scan_checkpoint(checkpoint: Dict[str, Any]):
+    path = _plex_scan_checkpoint_path()
+    tmp_path = f"{path}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp_path, 'w') as f:
+            json.dump(checkpoint, f)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.error(f"Failed to save Plex scan checkpoint: {e}")
+
+def clear_plex_scan_checkpoint():
+    try:
+        os.remove(_plex_scan_checkpoint_path())
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logger.warning(f"Failed to remove Plex scan checkpoint: {e}")
+
+async def iter_library_pages(session: aiohttp.ClientSession, plex_url: str, library_key: str, headers: Dict[str, str],
+                             semaphore: asyncio.Semaphore, page_size: int = OPTIMAL_PAGE_SIZE,
+                             item_type: Optional[int] = None, prefetch: int = STREAM_PAGE_PREFETCH):
+    """
+    Yield a library section's metadata page by page, in order.
+
+    Like get_library_contents, but at most `prefetch` pages are requested ahead of
+    the consumer, so memory is bounded by the page size rather than the library
+    size. Raises PlexScanError when a page that should have items comes back
+    empty (fetch_data gives up after its retries), so an incomplete section is
+    never mistaken for a complete one.
+    """
+    effective_page_size = max(1, page_size)
+    base_url = f"{plex_url}/library/sections/{library_key}/all?includeGuids=1"
+    if item_type is not None:
+        base_url += f"&type={item_type}"
+    type_str = f" (Type={item_type})" if item_type is not None else ""
+
+    def fetch_page(offset):
+        page_headers = headers.copy()
+        page_headers['X-Plex-Container-Start'] = str(offset)
+        page_headers['X-Plex-Container-Size'] = str(effective_page_size)
+        return fetch_data(session, base_url, page_headers, semaphore)
+
+    first_page = await fetch_page(0)
+    container = first_page.get('MediaContainer', {})
+    metadata = container.get('Metadata') or []
+    total_size = container.get('totalSize')
+
+    if total_size is None:
+        if not metadata:
+            raise PlexScanError(f"Could not read library {library_key}{type_str}")
+        # Serial fallback, as in get_library_contents
+        logger.warning(f"totalSize missing in response; falling back to serial pagination for library {library_key}{type_str}")
+        start_index = 0
+        while metadata:
+            yield metadata
+            if len(metadata) < effective_page_size:
+                return
+            start_index += len(metadata)
+            page = await fetch_page(start_index)
+            metadata = page.get('MediaContainer', {}).get('Metadata') or []
+        return
+
+    total_size = int(total_size)
+    if total_size and not metadata:
+        raise PlexScanError(f"First page of library {library_key}{type_str} came back empty (totalSize={total_size})")
+    logger.info(f"Streaming library {library_key}{type_str}: totalSize={total_size}, page_size={effective_page_size}")
+    yield metadata
+
+    offsets = iter(range(effective_page_size, total_size, effective_page_size))
+    pending = deque()
+    try:
+        for offset in itertools.islice(offsets, max(1, prefetch)):
+            pending.append((offset, asyncio.ensure_future(fetch_page(offset))))
+        while pending:
+            offset, task = pending.popleft()
+            page = await task
+            next_offset = next(offsets, None)
+            if next_offset is not None:
+                pending.append((next_offset, asyncio.ensure_future(fetch_page(next_offset))))
+            metadata = page.get('MediaContainer', {}).get('Metadata') or []
+            if not metadata:
+                raise PlexScanError(f"Page at offset {offset} of library {library_key}{type_str} came back empty")
+            yield metadata
+    finally:
+        for _, task in pending:
+            task.cancel()
+
+async def stream_library_section(session: aiohttp.ClientSession, plex_url: str, headers: Dict[str, str],
+                                 semaphore: asyncio.Semaphore, library_key: str, library_type: str,
+                                 page_size: int = OPTIMAL_PAGE_SIZE, chunk_size: int = STREAM_CHUNK_SIZE,
+                                 fallback_show_metadata_cache: Optional[Dict[str, Optional[Dict[str, Any]]]] = None):
+    """
+    Yield processed items (the same dicts get_collected_from_plex returns) of one
+    movie or show library section in chunks of up to `chunk_size`.
+
+    Show details are fetched once per show as its first episode comes up and are
+    only kept for the duration of the section.
+    """
+    if fallback_show_metadata_cache is None:
+        fallback_show_metadata_cache = {}
+    show_details_cache: Dict[str, Optional[Dict[str, Any]]] = {}
+    buffer: List[Dict[str, Any]] = []
+
+    item_type = 4 if library_type == 'show' else None
+    async for page in iter_library_pages(session, plex_url, library_key, headers, semaphore,
+                                         page_size=page_size, item_type=item_type):
+        if library_type == 'movie':
+            for movie in page:
+                buffer.extend(await process_movie(movie))
+        else:
+            new_show_keys = {episode.get('grandparentRatingKey') for episode in page} - show_details_cache.keys()
+            new_show_keys.discard(None)
+            if new_show_keys:
+                show_keys = list(new_show_keys)
+                show_details = await asyncio.gather(*[
+                    get_detailed_show_metadata(session, plex_url, show_key, headers, semaphore) for show_key in show_keys
+                ])
+                for show_key, show_detail in zip(show_keys, show_details):
+                    show_details_cache[show_key] = show_detail if show_detail and 'ratingKey' in show_detail else None
+
+            processing_tasks = []
+            for episode_meta in page:
+                show_key = episode_meta.get('grandparentRatingKey')
+                if not show_key:
+                    logger.warning(f"Episode missing grandparentRatingKey: {episode_meta.get('title')} ratingKey {episode_meta.get('ratingKey')}")
+                    continue
+                show_detail = show_details_cache.get(show_key)
+                if show_detail:
+                    processing_tasks.append(process_episode(episode_meta, show_detail, fallback_show_metadata_cache))
+                else:
+                    logger.error(f"Missing show details for show key {show_key} (Episode: {episode_meta.get('title')}) because fetch failed. Skipping episode.")
+            for result_list in await asyncio.gather(*processing_tasks):
+                buffer.extend(result_list)
+
+        while len(buffer) >= chunk_size:
+            yield buffer[:chunk_size]
+            del buffer[:chunk_size]
+
+    if buffer:
+        yield buffer
+
+async def add_collected_from_plex_streaming(progress_callback=None, chunk_size: int = STREAM_CHUNK_SIZE,
+                                            page_size: int = OPTIMAL_PAGE_SIZE,
+                                            max_concurrent_requests: int = MAX_CONCURRENT_REQUESTS,
+                                            specific_library_keys: List[str] = None,
+                                            scan_all_libraries: bool = False) -> Optional[Dict[str, Any]]:
+    """
+    Full library scan that writes to the database as it goes.
+
+    Instead of building the whole library in memory like get_collected_from_plex,
+    each section is streamed page by page and its processed items are passed to
+    add_collected_items in chunks. Missing-file cleanup runs once, after every
+    section was read. Progress is checkpointed after each section; if the scan
+    fails, the next full scan resumes after the last completed section.
+
+    Returns:
+        Summary dict with 'movies_count', 'episodes_count' and 'sections_scanned',
+        or None if the scan failed.
+    """
+    from database import add_collected_items, remove_missing_collected_items
+
+    start_time = time.perf_counter()
+    if progress_callback: progress_callback('scanning', 'Connecting to Plex server...')
+    try:
+        plex_url = get_setting('Plex', 'url').rstrip('/')
+        plex_token = get_setting('Plex', 'token')
+    except Exception as e:
+        logger.error(f"Failed to get Plex settings: {e}")
+        if progress_callback: progress_callback('error', f'Failed to get Plex settings: {e}')
+        return None
+
+    headers = {'X-Plex-Token': plex_token, 'Accept': 'application/json'}
+    semaphore = asyncio.Semaphore(max(1, max_concurrent_requests))
+    chunk_size = max(1, chunk_size)
+
+    async with aiohttp.ClientSession() as session:
+        libraries_data = await fetch_data(session, f"{plex_url}/library/sections", headers, semaphore)
+        if 'Directory' not in libraries_data.get('MediaContainer', {}):
+            logger.error("Failed to retrieve Plex library sections; aborting streamed full scan.")
+            if progress_callback: progress_callback('error', 'Failed to retrieve Plex library sections')
+            return None
+        movie_libraries, show_libraries = select_scan_libraries(libraries_data, specific_library_keys, scan_all_libraries)
+        sections = [(key, 'movie') for key in movie_libraries] + [(key, 'show') for key in show_libraries]
+        section_titles = {str(library['key']): library['title'] for library in libraries_data['MediaContainer']['Directory']}
+
+        checkpoint = load_plex_scan_checkpoint(movie_libraries, show_libraries)
+        if checkpoint:
+            logger.info(f"Resuming streamed Plex scan after {len(checkpoint['completed_sections'])} completed section(s).")
+        else:
+            checkpoint = {
+                'started_at': time.time(),
+                'movie_libraries': movie_libraries,
+                'show_libraries': show_libraries,
+                'completed_sections': [],
+                'seen_filenames': [],
+                'movies_count': 0,
+                'episodes_count': 0,
+            }
+        seen_filenames = set(checkpoint['seen_filenames'])
+        fallback_show_metadata_cache: Dict[str, Optional[Dict[str, Any]]] = {}
+
+        for index, (section_key, section_type) in enumerate(sections, start=1):
+            section_title = section_titles.get(section_key, section_key)
+            if section_key in checkpoint['completed_sections']:
+                logger.info(f"Skipping library '{section_title}' ({section_key}); completed before the last interruption.")
+                continue
+
+            section_start = time.perf_counter()
+            section_items = 0
+            if progress_callback:
+                progress_callback('scanning', f"Scanning library '{section_title}' ({index}/{len(sections)})...")
+            try:
+                async for chunk in stream_library_section(session, plex_url, headers, semaphore, section_key, section_type,
+                                                          page_size=page_size, chunk_size=chunk_size,
+                                                          fallback_show_metadata_cache=fallback_show_metadata_cache):
+                    # Database writes run off the event loop so prefetched pages keep downloading
+                    await asyncio.to_thread(add_collected_items, chunk, False, seen_filenames)
+                    section_items += len(chunk)
+                    if progress_callback:
+                        progress_callback('scanning', f"Library '{section_title}': {section_items} items added...")
+            except Exception as e:
+                logger.error(f"Streamed Plex scan failed in library '{section_title}' ({section_key}) after "
+                             f"{section_items} items: {e}. The next full scan resumes from this library.", exc_info=True)
+                save_plex_scan_checkpoint({**checkpoint, 'seen_filenames': sorted(seen_filenames)})
+                if progress_callback: progress_callback('error', f"Scan failed in library '{section_title}': {e}")
+                return None
+
+            count_key = 'movies_count' if section_type == 'movie' else 'episodes_count'
+            checkpoint[count_key] += section_items
+            checkpoint['completed_sections'].append(section_key)
+            checkpoint['seen_filenames'] = sorted(seen_filenames)
+            save_plex_scan_checkpoint(checkpoint)
+            logger.info(f"Library '{section_title}' ({section_type}): {section_items} items in {time.perf_counter() - section_start:.2f}s")
+
+    if not seen_filenames:
+        # Same as the in-memory scan: an empty result never clears the collection
+        logger.warning("Streamed Plex scan found no files; skipping missing-file cleanup.")
+        clear_plex_scan_checkpoint()
+        if progress_callback: progress_callback('complete', 'Scan complete, no items found/processed.')
+        return {'movies_count': 0, 'episodes_count': 0, 'sections_scanned': len(sections)}
+
+    if progress_callback: progress_callback('scanning', 'Removing items whose files are gone...')
+    if not await asyncio.to_thread(remove_missing_collected_items, seen_filenames):
+        logger.error("Missing-file cleanup failed; keeping the Plex scan checkpoint so it runs again.")
+        return None
+    clear_plex_scan_checkpoint()
+
+    summary = {
+        'movies_count': checkpoint['movies_count'],
+        'episodes_count': checkpoint['episodes_count'],
+        'sections_scanned': len(sections),
+    }
+    logger.info(f"Streamed Plex scan complete in {time.perf_counter() - start_time:.2f}s: "
+                f"{summary['movies_count']} movie and {summary['episodes_count']} episode file entries from {len(sections)} libraries.")
+    if progress_callback: progress_callback('complete', 'Scan complete', summary)
+    return summary
+
 async def get_recent_from_plex(scan_all_libraries: bool = False):
     try:
         start_time = time.time()
@@ -10,12 +10,13 @@ from datetime import datetime
 
 from utilities.settings import get_setting
 from database.symlink_verification import (
-    get_unverified_files,
-    mark_file_as_verified,
-    update_verification_attempt,
+    get_unverified_file_ids,
+    iter_unverified_files,
+    get_recent_unverified_files,
     get_verification_stats,
-    mark_file_as_permanently_failed,
-    mark_verification_as_max_attempts_failed
+    mark_verified_many,
+    record_attempts_many,
+    mark_failed_many
 )
 # Import the new functions
 from utilities.plex_functions import (
@@ -25,10 +26,49 @@ from utilities.plex_functions import (
 )
 # Removed original plex_update_item as it's now imported
 
-from database.database_reading import get_media_item_by_id # Moved import here
-
 logger = logging.getLogger(__name__)
 
+# Number of pending outcomes after which VerificationUpdates writes them out
+VERIFICATION_FLUSH_SIZE = 200
+
+class VerificationUpdates:
+    """
+    Collects the outcome of each checked file during a verification run and writes
+    them in batches (one transaction per kind of outcome) instead of one commit per file.
+    """
+
+    def __init__(self, flush_size: int = VERIFICATION_FLUSH_SIZE):
+        self.flush_size = flush_size
+        self.verified_count = 0
+        self._verified: List[int] = []
+        self._attempts: List[int] = []
+        self._failures: List[Tuple[int, str]] = []
+
+    def verified(self, verification_id: int):
+        self._verified.append(verification_id)
+        self._maybe_flush()
+
+    def attempt_failed(self, verification_id: int):
+        self._attempts.append(verification_id)
+        self._maybe_flush()
+
+    def permanently_failed(self, verification_id: int, reason: str):
+        self._failures.append((verification_id, reason))
+        self._maybe_flush()
+
+    def _maybe_flush(self):
+        if len(self._verified) + len(self._attempts) + len(self._failures) >= self.flush_size:
+            self.flush()
+
+    def flush(self):
+        if self._verified:
+            self.verified_count += mark_verified_many(self._verified)
+        if self._attempts:
+            record_attempts_many(self._attempts)
+        if self._failures:
+            mark_failed_many(self._failures)
+        self._verified, self._attempts, self._failures = [], [], []
+
 # Removed the entire get_plex_library_contents function (approx. lines 17-212 of original)
 # ... existing code ...
 
@@ -200,15 +240,15 @@ def _run_jellyfin_verification_scan(max_files: int, max_attempts: int) -> Tuple[
     Returns:
         Tuple of (verified_count, total_processed)
     """
-    # Get unverified files
-    from database.symlink_verification import get_unverified_files
-    unverified_files = get_unverified_files(limit=max_files)
+    # Get unverified files; their details are loaded page by page while processing
+    verification_ids = get_unverified_file_ids(limit=max_files)
     
-    if not unverified_files:
+    if not verification_ids:
         logger.info("No unverified files to process in Jellyfin/Emby scan")
         return (0, 0)
 
-    logger.info(f"Processing {len(unverified_files)} unverified files in Jellyfin/Emby scan")
+    logger.info(f"Processing {len(verification_ids)} unverified files in Jellyfin/Emby scan")
+    unverified_files = iter_unverified_files(verification_ids)
 
     # Get Jellyfin/Emby library contents
     media_library: Optional[Dict[str, Any]] = None
@@ -250,102 +290,100 @@ def _run_jellyfin_verification_scan(max_files: int, max_attempts: int) -> Tuple[
         logger.error(f"Unexpected error during Jellyfin/Emby scan: {e}", exc_info=True)
         return (0, 0)
 
-    verified_count = 0
+    updates = VerificationUpdates()
     total_processed = 0
 
-    for file_data in unverified_files:
-        total_processed += 1
-        verification_id = file_data['verification_id']
-
-        # --- Start: Consistency checks ---
-        media_item_id = file_data.get('media_item_id')
-        if not media_item_id:
-            logger.error(f"Verification record {verification_id} missing media_item_id. Marking as failed.")
-            mark_file_as_permanently_failed(verification_id, "Missing media_item_id in verification record")
-            continue
-
-        media_item = get_media_item_by_id(media_item_id)
-        if not media_item:
-            logger.warning(f"Media item ID {media_item_id} (Verification ID {verification_id}) not found in media_items. Marking verification as failed.")
-            mark_file_as_permanently_failed(verification_id, "Associated media item record not found in database")
-            continue
-
-        verification_path = file_data.get('full_path')
-        db_path = media_item.get('location_on_disk')
-
-        if not verification_path:
-             logger.error(f"Verification record {verification_id} (Media ID: {media_item_id}) missing 'full_path'. Marking as failed.")
-             mark_file_as_permanently_failed(verification_id, "Missing full_path in verification record")
-             continue
-
-        # Compare paths for staleness
-        if verification_path != db_path:
-            logger.warning(f"Path mismatch for Media ID {media_item_id} (Verification ID {verification_id}). Verification path: '{verification_path}', DB path: '{db_path}'. Marking verification record as failed (stale).")
-            base_verification_path = os.path.basename(verification_path)
-            base_db_path = os.path.basename(db_path or '')
-            mark_file_as_permanently_failed(verification_id, f"Path mismatch: Verification record path ('{base_verification_path}') differs from current DB path ('{base_db_path}')")
-            continue
-        # --- End: Consistency checks ---
-
-        logger.debug(f"Media item {media_item_id} found and path '{verification_path}' matches DB. Proceeding with verification for ID {verification_id}.")
-
-        # --- Max attempts check ---
-        if file_data.get('verification_attempts', 0) >= max_attempts:
-            failure_reason = f"Exceeded maximum verification attempts ({file_data.get('verification_attempts', 0)} >= {max_attempts})"
-            logger.warning(f"File {file_data['full_path']} (Media ID: {media_item_id}, Verification ID: {verification_id}) has reached max verification attempts. Marking as failed in verification queue only. Reason: {failure_reason}")
-            mark_verification_as_max_attempts_failed(verification_id, failure_reason)
-            continue
-
-        # Check if the file exists before calling verify_media_file
-        if not os.path.exists(file_data['full_path']):
-            logger.warning(f"File does not exist: {file_data['full_path']} (Attempt {file_data.get('verification_attempts', 0) + 1}). Incrementing attempt count.")
-            update_verification_attempt(verification_id)
-            continue
-
-        # Verify the file in Jellyfin/Emby
-        is_verified = verify_media_file(file_data, media_library)
-
-        if is_verified:
-            # Mark as verified
-            if mark_file_as_verified(verification_id):
-                verified_count += 1
-                logger.info(f"Successfully marked verification ID {verification_id} as verified for '{os.path.basename(file_data['full_path'])}'")
+    try:
+        for file_data in unverified_files:
+            total_processed += 1
+            verification_id = file_data['verification_id']
+
+            # --- Start: Consistency checks ---
+            media_item_id = file_data.get('media_item_id')
+            if not media_item_id:
+                logger.error(f"Verification record {verification_id} missing media_item_id. Marking as failed.")
+                updates.permanently_failed(verification_id, "Missing media_item_id in verification record")
+                continue
+
+            # Records come joined with their media item, so the item exists
+            verification_path = file_data.get('full_path')
+            db_path = file_data.get('location_on_disk')
+
+            if not verification_path:
+                 logger.error(f"Verification record {verification_id} (Media ID: {media_item_id}) missing 'full_path'. Marking as failed.")
+                 updates.permanently_failed(verification_id, "Missing full_path in verification record")
+                 continue
+
+            # Compare paths for staleness
+            if verification_path != db_path:
+                logger.warning(f"Path mismatch for Media ID {media_item_id} (Verification ID {verification_id}). Verification path: '{verification_path}', DB path: '{db_path}'. Marking verification record as failed (stale).")
+                base_verification_path = os.path.basename(verification_path)
+                base_db_path = os.path.basename(db_path or '')
+                updates.permanently_failed(verification_id, f"Path mismatch: Verification record path ('{base_verification_path}') differs from current DB path ('{base_db_path}')")
+                continue
+            # --- End: Consistency checks ---
+
+            logger.debug(f"Media item {media_item_id} found and path '{verification_path}' matches DB. Proceeding with verification for ID {verification_id}.")
+
+            # --- Max attempts check ---
+            if file_data.get('verification_attempts', 0) >= max_attempts:
+                failure_reason = f"Exceeded maximum verification attempts ({file_data.get('verification_attempts', 0)} >= {max_attempts})"
+                logger.warning(f"File {file_data['full_path']} (Media ID: {media_item_id}, Verification ID: {verification_id}) has reached max verification attempts. Marking as failed in verification queue only. Reason: {failure_reason}")
+                updates.permanently_failed(verification_id, failure_reason)
+                continue
+
+            # Check if the file exists before calling verify_media_file
+            if not os.path.exists(file_data['full_path']):
+                logger.warning(f"File does not exist: {file_data['full_path']} (Attempt {file_data.get('verification_attempts', 0) + 1}). Incrementing attempt count.")
+                updates.attempt_failed(verification_id)
+                continue
+
+            # Verify the file in Jellyfin/Emby
+            is_verified = verify_media_file(file_data, media_library)
+
+            if is_verified:
+                # Mark as verified (written with the next batch)
+                updates.verified(verification_id)
+                logger.info(f"Verification ID {verification_id} verified for '{os.path.basename(file_data['full_path'])}'")
             else:
-                logger.error(f"Failed to mark verification ID {verification_id} as verified in DB for '{os.path.basename(file_data['full_path'])}'")
-        else:
-            # Update attempt count
-            _ = update_verification_attempt(verification_id)
-            current_attempts = file_data.get('verification_attempts', 0) + 1
-            logger.warning(f"Verification failed for ID {verification_id} ('{os.path.basename(file_data['full_path'])}'). Attempt count updated to {current_attempts}.")
+                # Update attempt count
+                updates.attempt_failed(verification_id)
+                current_attempts = file_data.get('verification_attempts', 0) + 1
+                logger.warning(f"Verification failed for ID {verification_id} ('{os.path.basename(file_data['full_path'])}'). Attempt count updated to {current_attempts}.")
+
+                # Try to trigger a Jellyfin/Emby library update for the item's directory if verification failed
+                try:
+                    file_type = file_data.get('type', 'unknown')
+                    base_filename = os.path.basename(file_data['full_path'])
+
+                    if file_type == 'movie':
+                        logger.info(
+                            f"Attempting Jellyfin/Emby directory scan for failed movie verification: {file_data['title']} - {base_filename}"
+                        )
+                    else:  # TV show
+                        season_num = file_data.get('season_number', 'unknown')
+                        episode_num = file_data.get('episode_number', 'unknown')
+                        logger.info(
+                            f"Attempting Jellyfin/Emby directory scan for failed episode verification: {file_data['title']} - S{season_num}E{episode_num} - {file_data.get('episode_title', 'unknown')} - {base_filename}"
+                        )
+
+                    # Prepare item data for emby_update_item
+                    item_for_update = {'full_path': file_data['full_path'], 'title': file_data['title']}
+
+                    # Attempt the Jellyfin/Emby update
+                    from utilities.emby_functions import emby_update_item
+                    update_result = emby_update_item(item_for_update)
+                    if update_result:
+                        logger.info(f"Successfully triggered Jellyfin/Emby directory scan potentially including: {base_filename}")
+                    else:
+                        logger.warning(f"Jellyfin/Emby directory scan trigger failed or returned False for directory containing: {base_filename}")
+                except Exception as e:
+                    logger.error(f"Error triggering Jellyfin/Emby update after failed verification: {str(e)}", exc_info=True)
+    finally:
+        # Write the outcomes collected so far even if the loop stops part-way
+        updates.flush()
 
-            # Try to trigger a Jellyfin/Emby library update for the item's directory if verification failed
-            try:
-                file_type = file_data.get('type', 'unknown')
-                base_filename = os.path.basename(file_data['full_path'])
-
-                if file_type == 'movie':
-                    logger.info(
-                        f"Attempting Jellyfin/Emby directory scan for failed movie verification: {file_data['title']} - {base_filename}"
-                    )
-                else:  # TV show
-                    season_num = file_data.get('season_number', 'unknown')
-                    episode_num = file_data.get('episode_number', 'unknown')
-                    logger.info(
-                        f"Attempting Jellyfin/Emby directory scan for failed episode verification: {file_data['title']} - S{season_num}E{episode_num} - {file_data.get('episode_title', 'unknown')} - {base_filename}"
-                    )
-
-                # Prepare item data for emby_update_item
-                item_for_update = {'full_path': file_data['full_path'], 'title': file_data['title']}
-
-                # Attempt the Jellyfin/Emby update
-                from utilities.emby_functions import emby_update_item
-                update_result = emby_update_item(item_for_update)
-                if update_result:
-                    logger.info(f"Successfully triggered Jellyfin/Emby directory scan potentially including: {base_filename}")
-                else:
-                    logger.warning(f"Jellyfin/Emby directory scan trigger failed or returned False for directory containing: {base_filename}")
-            except Exception as e:
-                logger.error(f"Error triggering Jellyfin/Emby update after failed verification: {str(e)}", exc_info=True)
+    verified_count = updates.verified_count
 
     # Log stats
     try:
@@ -380,19 +418,21 @@ def _run_plex_verification_scan(max_files: int, recent_only: bool, max_attempts:
 
     # Get unverified files based on scan type
     if recent_only:
-        from database.symlink_verification import get_recent_unverified_files
         unverified_files = get_recent_unverified_files(hours=6, limit=max_files)
+        file_count = len(unverified_files)
         scan_type = "recent (all libraries)"
     else:
-        from database.symlink_verification import get_unverified_files
-        unverified_files = get_unverified_files(limit=max_files)
+        # Details are loaded page by page while processing
+        verification_ids = get_unverified_file_ids(limit=max_files)
+        file_count = len(verification_ids)
+        unverified_files = iter_unverified_files(verification_ids)
         scan_type = "full (all libraries)"
 
-    if not unverified_files:
+    if not file_count:
         logger.info(f"No unverified files to process in {scan_type} scan")
         return (0, 0)
 
-    logger.info(f"Processing {len(unverified_files)} unverified files in {scan_type} scan")
+    logger.info(f"Processing {file_count} unverified files in {scan_type} scan")
 
     # Get Plex library contents using the new functions, forcing scan_all_libraries=True
     plex_library: Optional[Dict[str, Any]] = None
@@ -437,101 +477,99 @@ def _run_plex_verification_scan(max_files: int, recent_only: bool, max_attempts:
          logger.error(f"Unexpected error during Plex scan ({scan_type}): {e}", exc_info=True)
          return (0, 0)
 
-    verified_count = 0
+    updates = VerificationUpdates()
     total_processed = 0
 
-    for file_data in unverified_files:
-        total_processed += 1
-        verification_id = file_data['verification_id']
-
-        # --- Start: Consistency checks ---
-        media_item_id = file_data.get('media_item_id')
-        if not media_item_id:
-            logger.error(f"Verification record {verification_id} missing media_item_id. Marking as failed.")
-            mark_file_as_permanently_failed(verification_id, "Missing media_item_id in verification record")
-            continue
-
-        media_item = get_media_item_by_id(media_item_id)
-        if not media_item:
-            logger.warning(f"Media item ID {media_item_id} (Verification ID {verification_id}) not found in media_items. Marking verification as failed.")
-            mark_file_as_permanently_failed(verification_id, "Associated media item record not found in database")
-            continue
-
-        verification_path = file_data.get('full_path')
-        db_path = media_item.get('location_on_disk')
-
-        if not verification_path:
-             logger.error(f"Verification record {verification_id} (Media ID: {media_item_id}) missing 'full_path'. Marking as failed.")
-             mark_file_as_permanently_failed(verification_id, "Missing full_path in verification record")
-             continue
-
-        # Compare paths for staleness
-        if verification_path != db_path:
-            logger.warning(f"Path mismatch for Media ID {media_item_id} (Verification ID {verification_id}). Verification path: '{verification_path}', DB path: '{db_path}'. Marking verification record as failed (stale).")
-            base_verification_path = os.path.basename(verification_path)
-            base_db_path = os.path.basename(db_path or '')
-            mark_file_as_permanently_failed(verification_id, f"Path mismatch: Verification record path ('{base_verification_path}') differs from current DB path ('{base_db_path}')")
-            continue
-        # --- End: Consistency checks ---
-
-        logger.debug(f"Media item {media_item_id} found and path '{verification_path}' matches DB. Proceeding with verification for ID {verification_id}.")
-
-        # --- Max attempts check ---
-        if file_data.get('verification_attempts', 0) >= max_attempts:
-            failure_reason = f"Exceeded maximum verification attempts ({file_data.get('verification_attempts', 0)} >= {max_attempts})"
-            logger.warning(f"File {file_data['full_path']} (Media ID: {media_item_id}, Verification ID: {verification_id}) has reached max verification attempts. Marking as failed in verification queue only. Reason: {failure_reason}")
-            mark_verification_as_max_attempts_failed(verification_id, failure_reason)
-            continue
-
-        # Check if the file exists before calling verify_media_file
-        if not os.path.exists(file_data['full_path']):
-            logger.warning(f"File does not exist: {file_data['full_path']} (Attempt {file_data.get('verification_attempts', 0) + 1}). Incrementing attempt count.")
-            update_verification_attempt(verification_id)
-            continue
-
-        # Verify the file in Plex
-        is_verified = verify_media_file(file_data, plex_library)
-
-        if is_verified:
-            # Mark as verified
-            if mark_file_as_verified(verification_id):
-                verified_count += 1
-                logger.info(f"Successfully marked verification ID {verification_id} as verified for '{os.path.basename(file_data['full_path'])}'")
+    try:
+        for file_data in unverified_files:
+            total_processed += 1
+            verification_id = file_data['verification_id']
+
+            # --- Start: Consistency checks ---
+            media_item_id = file_data.get('media_item_id')
+            if not media_item_id:
+                logger.error(f"Verification record {verification_id} missing media_item_id. Marking as failed.")
+                updates.permanently_failed(verification_id, "Missing media_item_id in verification record")
+                continue
+
+            # Records come joined with their media item, so the item exists
+            verification_path = file_data.get('full_path')
+            db_path = file_data.get('location_on_disk')
+
+            if not verification_path:
+                 logger.error(f"Verification record {verification_id} (Media ID: {media_item_id}) missing 'full_path'. Marking as failed.")
+                 updates.permanently_failed(verification_id, "Missing full_path in verification record")
+                 continue
+
+            # Compare paths for staleness
+            if verification_path != db_path:
+                logger.warning(f"Path mismatch for Media ID {media_item_id} (Verification ID {verification_id}). Verification path: '{verification_path}', DB path: '{db_path}'. Marking verification record as failed (stale).")
+                base_verification_path = os.path.basename(verification_path)
+                base_db_path = os.path.basename(db_path or '')
+                updates.permanently_failed(verification_id, f"Path mismatch: Verification record path ('{base_verification_path}') differs from current DB path ('{base_db_path}')")
+                continue
+            # --- End: Consistency checks ---
+
+            logger.debug(f"Media item {media_item_id} found and path '{verification_path}' matches DB. Proceeding with verification for ID {verification_id}.")
+
+            # --- Max attempts check ---
+            if file_data.get('verification_attempts', 0) >= max_attempts:
+                failure_reason = f"Exceeded maximum verification attempts ({file_data.get('verification_attempts', 0)} >= {max_attempts})"
+                logger.warning(f"File {file_data['full_path']} (Media ID: {media_item_id}, Verification ID: {verification_id}) has reached max verification attempts. Marking as failed in verification queue only. Reason: {failure_reason}")
+                updates.permanently_failed(verification_id, failure_reason)
+                continue
+
+            # Check if the file exists before calling verify_media_file
+            if not os.path.exists(file_data['full_path']):
+                logger.warning(f"File does not exist: {file_data['full_path']} (Attempt {file_data.get('verification_attempts', 0) + 1}). Incrementing attempt count.")
+                updates.attempt_failed(verification_id)
+                continue
+
+            # Verify the file in Plex
+            is_verified = verify_media_file(file_data, plex_library)
+
+            if is_verified:
+                # Mark as verified (written with the next batch)
+                updates.verified(verification_id)
+                logger.info(f"Verification ID {verification_id} verified for '{os.path.basename(file_data['full_path'])}'")
             else:
-                logger.error(f"Failed to mark verification ID {verification_id} as verified in DB for '{os.path.basename(file_data['full_path'])}'")
-        else:
-            # Update attempt count
-            _ = update_verification_attempt(verification_id)
-            current_attempts = file_data.get('verification_attempts', 0) + 1
-            logger.warning(f"Verification failed for ID {verification_id} ('{os.path.basename(file_data['full_path'])}'). Attempt count updated to {current_attempts}.")
-
-            # Try to trigger a Plex library update for the item's directory if verification failed
-            try:
-                file_type = file_data.get('type', 'unknown')
-                base_filename = os.path.basename(file_data['full_path'])
-
-                if file_type == 'movie':
-                    logger.info(
-                        f"Attempting Plex directory scan for failed movie verification: {file_data['title']} - {base_filename}"
-                    )
-                else:  # TV show
-                    season_num = file_data.get('season_number', 'unknown')
-                    episode_num = file_data.get('episode_number', 'unknown')
-                    logger.info(
-                        f"Attempting Plex directory scan for failed episode verification: {file_data['title']} - S{season_num}E{episode_num} - {file_data.get('episode_title', 'unknown')} - {base_filename}"
-                    )
-
-                # Prepare item data for plex_update_item
-                item_for_update = {'full_path': file_data['full_path'], 'title': file_data['title']}
-
-                # Attempt the Plex update using the imported function
-                update_result = plex_update_item(item_for_update)
-                if update_result:
-                    logger.info(f"Successfully triggered Plex directory scan potentially including: {base_filename}")
-                else:
-                    logger.warning(f"Plex directory scan trigger failed or returned False for directory containing: {base_filename}")
-            except Exception as e:
-                logger.error(f"Error triggering Plex update after failed verification: {str(e)}", exc_info=True)
+                # Update attempt count
+                updates.attempt_failed(verification_id)
+                current_attempts = file_data.get('verification_attempts', 0) + 1
+                logger.warning(f"Verification failed for ID {verification_id} ('{os.path.basename(file_data['full_path'])}'). Attempt count updated to {current_attempts}.")
+
+                # Try to trigger a Plex library update for the item's directory if verification failed
+                try:
+                    file_type = file_data.get('type', 'unknown')
+                    base_filename = os.path.basename(file_data['full_path'])
+
+                    if file_type == 'movie':
+                        logger.info(
+                            f"Attempting Plex directory scan for failed movie verification: {file_data['title']} - {base_filename}"
+                        )
+                    else:  # TV show
+                        season_num = file_data.get('season_number', 'unknown')
+                        episode_num = file_data.get('episode_number', 'unknown')
+                        logger.info(
+                            f"Attempting Plex directory scan for failed episode verification: {file_data['title']} - S{season_num}E{episode_num} - {file_data.get('episode_title', 'unknown')} - {base_filename}"
+                        )
+
+                    # Prepare item data for plex_update_item
+                    item_for_update = {'full_path': file_data['full_path'], 'title': file_data['title']}
+
+                    # Attempt the Plex update using the imported function
+                    update_result = plex_update_item(item_for_update)
+                    if update_result:
+                        logger.info(f"Successfully triggered Plex directory scan potentially including: {base_filename}")
+                    else:
+                        logger.warning(f"Plex directory scan trigger failed or returned False for directory containing: {base_filename}")
+                except Exception as e:
+                    logger.error(f"Error triggering Plex update after failed verification: {str(e)}", exc_info=True)
+    finally:
+        # Write the outcomes collected so far even if the loop stops part-way
+        updates.flush()
+
+    verified_count = updates.verified_count
 
     # Log stats
     try:
@@ -7,11 +7,43 @@ from utilities.settings import get_setting
 from cli_battery.app.trakt_metadata import TraktMetadata
 from datetime import datetime, timedelta
 import requests
+from database.plex_ingestion import get_plex_ingestion_cursor, set_plex_ingestion_cursor
+
+# Cursor sources in plex_ingestion_cursors
+HISTORY_CURSOR_ACCOUNT = 'history_account'
+HISTORY_CURSOR_SERVER = 'history_server'
+
+# Incremental fetches start this far before the cursor; re-fetched entries are deduplicated on insert
+HISTORY_CURSOR_OVERLAP_SECONDS = 300
+
+def _latest_viewed_at(items, latest=None):
+    """Latest viewedAt/lastViewedAt of the items (or `latest`, if later) as a Unix timestamp, or None."""
+    for item in items:
+        watched_at = getattr(item, 'viewedAt', None) or getattr(item, 'lastViewedAt', None)
+        if isinstance(watched_at, datetime):
+            timestamp = watched_at.timestamp()
+            if latest is None or timestamp > latest:
+                latest = timestamp
+    return latest
+
+def _store_history_rows(conn, cursor, rows):
+    if rows:
+        cursor.executemany('''
+            INSERT OR REPLACE INTO watch_history 
+            (title, type, watched_at, media_id, imdb_id, tmdb_id, tvdb_id, 
+             season, episode, show_title, duration, watch_progress, source)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', rows)
+        conn.commit()
 
 async def get_watch_history_from_plex():
     """
-    Retrieves the user's complete Plex watch history from both account history and server libraries,
+    Retrieves the user's Plex watch history from both account history and server libraries,
     then stores it in the database. This dual-source approach ensures maximum coverage of watch history.
+
+    The first run fetches everything. Later runs only fetch entries viewed since the
+    per-user cursors stored in plex_ingestion_cursors (one for the account history,
+    one for the server libraries). Use reset_plex_ingestion_cursors() to force a full fetch.
     Returns a dictionary with counts of processed movies and episodes.
     """
     try:
@@ -77,8 +109,19 @@ async def get_watch_history_from_plex():
         account = plex.myPlexAccount()
         logging.info(f"Authenticated as user: {account.username} (ID: {account.id})")
         
-        # Get history directly from the account
-        account_history = account.history()
+        # Only ask for entries newer than what earlier runs already stored
+        username = account.username
+        account_cursor = get_plex_ingestion_cursor(username, HISTORY_CURSOR_ACCOUNT)
+        server_cursor = get_plex_ingestion_cursor(username, HISTORY_CURSOR_SERVER)
+        show_ids_cache = {}
+
+        if account_cursor is not None:
+            account_since = datetime.fromtimestamp(account_cursor - HISTORY_CURSOR_OVERLAP_SECONDS)
+            logging.info(f"Fetching account history viewed since {account_since}")
+            account_history = account.history(mindate=account_since)
+        else:
+            account_history = account.history()
+        latest_account_view = _latest_viewed_at(account_history)
         
         # Process account history
         total_items = len(account_history)
@@ -95,7 +138,7 @@ async def get_watch_history_from_plex():
             current_batch.append(item)
             
             if len(current_batch) >= batch_size or i == total_items:
-                batch_results = await process_watch_history_items(cursor, current_batch, trakt, 'account', processed)
+                batch_results = await process_watch_history_items(cursor, current_batch, trakt, 'account', processed, show_ids_cache)
                 if batch_results:
                     cursor.executemany('''
                         INSERT OR REPLACE INTO watch_history 
@@ -107,15 +150,30 @@ async def get_watch_history_from_plex():
                     processed['account_items'] += len(batch_results)
                 current_batch = []
         
+        if latest_account_view is not None:
+            set_plex_ingestion_cursor(username, HISTORY_CURSOR_ACCOUNT, latest_account_view)
+
         # Process server libraries
         logging.info("\nFetching history from Plex server libraries...")
+        latest_server_view = None
         
         # Process each library
         for library in plex.library.sections():
             logging.info(f"Processing library: {library.title}")
             current_batch = []
             
-            if library.type == 'movie':
+            if server_cursor is not None and library.type in ('movie', 'show'):
+                # Incremental run: only items viewed since the last run, straight from the library index
+                libtype = 'movie' if library.type == 'movie' else 'episode'
+                server_since = datetime.fromtimestamp(server_cursor - HISTORY_CURSOR_OVERLAP_SECONDS)
+                recently_viewed = library.search(libtype=libtype, filters={'lastViewedAt>>': server_since})
+                logging.info(f"Found {len(recently_viewed)} {libtype}s viewed since {server_since} in {library.title}")
+                latest_server_view = _latest_viewed_at(recently_viewed, latest_server_view)
+                for start in range(0, len(recently_viewed), batch_size):
+                    batch = [video for video in recently_viewed[start:start + batch_size] if video.isWatched]
+                    batch_results = await process_watch_history_items(cursor, batch, trakt, 'server', processed, show_ids_cache)
+                    _store_history_rows(conn, cursor, batch_results)
+            elif library.type == 'movie':
                 # Get watched movies
                 watched_movies = library.search(unwatched=False)
                 total_movies = len(watched_movies)
@@ -127,9 +185,10 @@ async def get_watch_history_from_plex():
                     
                     if video.isWatched:
                         current_batch.append(video)
+                        latest_server_view = _latest_viewed_at([video], latest_server_view)
                         
                         if len(current_batch) >= batch_size or i == total_movies:
-                            batch_results = await process_watch_history_items(cursor, current_batch, trakt, 'server', processed)
+                            batch_results = await process_watch_history_items(cursor, current_batch, trakt, 'server', processed, show_ids_cache)
                             if batch_results:
                                 cursor.executemany('''
                                     INSERT OR REPLACE INTO watch_history 
@@ -155,9 +214,10 @@ async def get_watch_history_from_plex():
                         for episode in episodes:
                             if episode.isWatched:
                                 current_batch.append(episode)
+                                latest_server_view = _latest_viewed_at([episode], latest_server_view)
                                 
                                 if len(current_batch) >= batch_size:
-                                    batch_results = await process_watch_history_items(cursor, current_batch, trakt, 'server', processed)
+                                    batch_results = await process_watch_history_items(cursor, current_batch, trakt, 'server', processed, show_ids_cache)
                                     if batch_results:
                                         cursor.executemany('''
                                             INSERT OR REPLACE INTO watch_history 
@@ -174,7 +234,7 @@ async def get_watch_history_from_plex():
                 
                 # Process any remaining episodes in the last batch
                 if current_batch:
-                    batch_results = await process_watch_history_items(cursor, current_batch, trakt, 'server', processed)
+                    batch_results = await process_watch_history_items(cursor, current_batch, trakt, 'server', processed, show_ids_cache)
                     if batch_results:
                         cursor.executemany('''
                             INSERT OR REPLACE INTO watch_history 
@@ -189,6 +249,8 @@ async def get_watch_history_from_plex():
         
         conn.commit()
         conn.close()
+        if latest_server_view is not None:
+            set_plex_ingestion_cursor(username, HISTORY_CURSOR_SERVER, latest_server_view)
         
         logging.info("\nWatch history sync complete!")
         logging.info(f"Account history items processed: {processed['account_items']}")
@@ -394,8 +456,13 @@ def insert_or_update_episode(cursor, title, watched_at, media_id, imdb_id, tmdb_
         logging.error(f"Error preparing episode '{title}': {str(e)}")
         return None
 
-async def process_watch_history_items(cursor, items, trakt, source, processed):
-    """Process a batch of watch history items at once"""
+async def process_watch_history_items(cursor, items, trakt, source, processed, show_ids_cache=None):
+    """
+    Process a batch of watch history items at once.
+
+    show_ids_cache (optional dict) memoizes show IDs by show across batches, so an
+    episode only triggers a show metadata request for the first episode of its show.
+    """
     try:
         # Separate movies and episodes
         movies = []
@@ -529,64 +596,71 @@ async def process_watch_history_items(cursor, items, trakt, source, processed):
                 tmdb_id = None
                 tvdb_id = None
                 
-                #logging.info(f"Getting IDs for episode: {show_title} S{season}E{episode_num}")
-                try:
-                    # Try to get show IDs first
-                    if hasattr(episode, 'grandparentKey') and episode.grandparentKey:
-                        show = episode.show()
-                        if show and hasattr(show, 'guids'):
-                            #logging.info(f"Found show object with guids for '{show_title}'")
-                            for guid in show.guids:
-                                guid_str = str(guid.id)
-                                #logging.info(f"Processing show guid: {guid_str}")
-                                if 'imdb://' in guid_str:
-                                    imdb_id = guid_str.split('imdb://')[1].split('?')[0]
-                                    #logging.info(f"Found show IMDb ID: {imdb_id}")
-                                elif 'tmdb://' in guid_str:
-                                    tmdb_id = guid_str.split('tmdb://')[1].split('?')[0]
-                                    #logging.info(f"Found show TMDb ID: {tmdb_id}")
-                                elif 'tvdb://' in guid_str:
-                                    tvdb_id = guid_str.split('tvdb://')[1].split('?')[0]
-                                    #logging.info(f"Found show TVDb ID: {tvdb_id}")
-                    else:
-                        # Try to get IDs from grandparentRatingKey if available
-                        if hasattr(episode, 'grandparentRatingKey') and episode.grandparentRatingKey:
-                            try:
-                                #logging.info(f"Trying to get show via grandparentRatingKey: {episode.grandparentRatingKey}")
-                                show = episode._server.fetchItem(episode.grandparentRatingKey)
-                                if show and hasattr(show, 'guids'):
-                                    #logging.info(f"Found show object via grandparentRatingKey for '{show_title}'")
-                                    for guid in show.guids:
-                                        guid_str = str(guid.id)
-                                        #logging.info(f"Processing show guid: {guid_str}")
-                                        if 'imdb://' in guid_str:
-                                            imdb_id = guid_str.split('imdb://')[1].split('?')[0]
-                                            #logging.info(f"Found show IMDb ID: {imdb_id}")
-                                        elif 'tmdb://' in guid_str:
-                                            tmdb_id = guid_str.split('tmdb://')[1].split('?')[0]
-                                            #logging.info(f"Found show TMDb ID: {tmdb_id}")
-                                        elif 'tvdb://' in guid_str:
-                                            tvdb_id = guid_str.split('tvdb://')[1].split('?')[0]
-                                            #logging.info(f"Found show TVDb ID: {tvdb_id}")
-                            except Exception as e:
-                                logging.warning(f"Failed to get show via grandparentRatingKey for '{show_title}': {str(e)}")
-                        else:
-                            logging.warning(f"No grandparentKey or grandparentRatingKey available for '{show_title}'")
-                except Exception as e:
-                    logging.warning(f"Failed to get show IDs for '{show_title}': {str(e)}", exc_info=True)
-                
-                # If we couldn't get show IDs, try to find them via Trakt
-                if not imdb_id:
-                    #logging.info(f"No IMDb ID found from Plex, trying Trakt lookup for show: {show_title}")
+                # Episodes of the same show share the show's IDs; look them up once per run
+                show_key = getattr(episode, 'grandparentRatingKey', None) or show_title
+                if show_ids_cache is not None and show_key in show_ids_cache:
+                    imdb_id, tmdb_id, tvdb_id = show_ids_cache[show_key]
+                else:
+                    #logging.info(f"Getting IDs for episode: {show_title} S{season}E{episode_num}")
                     try:
-                        imdb_id = await find_imdb_id(cursor, {'type': 'episode', 'grandparentTitle': show_title}, show_title, trakt)
-                        if imdb_id:
-                            #logging.info(f"Found show IMDb ID via Trakt: {imdb_id}")
-                            pass
+                        # Try to get show IDs first
+                        if hasattr(episode, 'grandparentKey') and episode.grandparentKey:
+                            show = episode.show()
+                            if show and hasattr(show, 'guids'):
+                                #logging.info(f"Found show object with guids for '{show_title}'")
+                                for guid in show.guids:
+                                    guid_str = str(guid.id)
+                                    #logging.info(f"Processing show guid: {guid_str}")
+                                    if 'imdb://' in guid_str:
+                                        imdb_id = guid_str.split('imdb://')[1].split('?')[0]
+                                        #logging.info(f"Found show IMDb ID: {imdb_id}")
+                                    elif 'tmdb://' in guid_str:
+                                        tmdb_id = guid_str.split('tmdb://')[1].split('?')[0]
+                                        #logging.info(f"Found show TMDb ID: {tmdb_id}")
+                                    elif 'tvdb://' in guid_str:
+                                        tvdb_id = guid_str.split('tvdb://')[1].split('?')[0]
+                                        #logging.info(f"Found show TVDb ID: {tvdb_id}")
                         else:
-                            logging.warning(f"Failed to find show IMDb ID via Trakt for: {show_title}")
+                            # Try to get IDs from grandparentRatingKey if available
+                            if hasattr(episode, 'grandparentRatingKey') and episode.grandparentRatingKey:
+                                try:
+                                    #logging.info(f"Trying to get show via grandparentRatingKey: {episode.grandparentRatingKey}")
+                                    show = episode._server.fetchItem(episode.grandparentRatingKey)
+                                    if show and hasattr(show, 'guids'):
+                                        #logging.info(f"Found show object via grandparentRatingKey for '{show_title}'")
+                                        for guid in show.guids:
+                                            guid_str = str(guid.id)
+                                            #logging.info(f"Processing show guid: {guid_str}")
+                                            if 'imdb://' in guid_str:
+                                                imdb_id = guid_str.split('imdb://')[1].split('?')[0]
+                                                #logging.info(f"Found show IMDb ID: {imdb_id}")
+                                            elif 'tmdb://' in guid_str:
+                                                tmdb_id = guid_str.split('tmdb://')[1].split('?')[0]
+                                                #logging.info(f"Found show TMDb ID: {tmdb_id}")
+                                            elif 'tvdb://' in guid_str:
+                                                tvdb_id = guid_str.split('tvdb://')[1].split('?')[0]
+                                                #logging.info(f"Found show TVDb ID: {tvdb_id}")
+                                except Exception as e:
+                                    logging.warning(f"Failed to get show via grandparentRatingKey for '{show_title}': {str(e)}")
+                            else:
+                                logging.warning(f"No grandparentKey or grandparentRatingKey available for '{show_title}'")
                     except Exception as e:
-                        logging.warning(f"Error during Trakt lookup for '{show_title}': {str(e)}", exc_info=True)
+                        logging.warning(f"Failed to get show IDs for '{show_title}': {str(e)}", exc_info=True)
+                
+                    # If we couldn't get show IDs, try to find them via Trakt
+                    if not imdb_id:
+                        #logging.info(f"No IMDb ID found from Plex, trying Trakt lookup for show: {show_title}")
+                        try:
+                            imdb_id = await find_imdb_id(cursor, {'type': 'episode', 'grandparentTitle': show_title}, show_title, trakt)
+                            if imdb_id:
+                                #logging.info(f"Found show IMDb ID via Trakt: {imdb_id}")
+                                pass
+                            else:
+                                logging.warning(f"Failed to find show IMDb ID via Trakt for: {show_title}")
+                        except Exception as e:
+                            logging.warning(f"Error during Trakt lookup for '{show_title}': {str(e)}", exc_info=True)
+                    if show_ids_cache is not None:
+                        show_ids_cache[show_key] = (imdb_id, tmdb_id, tvdb_id)
                 
                 title = getattr(episode, 'title', None)
                 media_id = str(getattr(episode, 'ratingKey', None))
@@ -0,0 +1,237 @@
+"""
+Batched ingestion queue for the rclone webhook.
+
+A zurg refresh can fire hundreds of rclone callbacks a minute, often for the
+same directory. The webhook used to run two full media_items scans per
+callback and start one unbounded thread per path. It now hands the path to
+this queue and returns immediately:
+
+- Paths are de-duplicated by their normalized directory name, against both
+  the pending batch and the paths still being processed.
+- A dispatcher thread collects paths for `rclone_webhook_batch_window_seconds`
+  after the first one arrives. Then it resolves existence for the whole batch
+  with one `find_existing_directory_names` call.
+- New paths run on a ThreadPoolExecutor with `rclone_webhook_max_workers`
+  workers.
+
+Queue depth, outcome counts and wait/processing latency are available from
+`get_stats()` and the rclone_webhook_* metrics.
+"""
+
+import logging
+import threading
+import time
+import unicodedata
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, Optional, Set
+
+from utilities.metrics import RCLONE_WEBHOOK_PATHS, RCLONE_WEBHOOK_SECONDS
+
+DEFAULT_BATCH_WINDOW_SECONDS = 2.0
+DEFAULT_MAX_WORKERS = 2
+MAX_BATCH_SIZE = 500
+
+
+@dataclass
+class IngestPath:
+    directory_name: str
+    scan_path: str
+    task_id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    received_at: float = field(default_factory=time.monotonic)
+
+
+def _dedup_key(directory_name: str) -> str:
+    return unicodedata.normalize('NFC', directory_name).lower()
+
+
+class RcloneIngestQueue:
+    """Collects rclone webhook paths into batches and processes the new ones with bounded concurrency."""
+
+    def __init__(self, process_path: Callable[[IngestPath], None],
+                 resolve_existing: Callable[[Iterable[str]], Set[str]],
+                 batch_window: float = DEFAULT_BATCH_WINDOW_SECONDS,
+                 max_workers: int = DEFAULT_MAX_WORKERS,
+                 max_batch_size: int = MAX_BATCH_SIZE):
+        self.process_path = process_path
+        self.resolve_existing = resolve_existing
+        self.batch_window = max(batch_window, 0.0)
+        self.max_workers = max(max_workers, 1)
+        self.max_batch_size = max(max_batch_size, 1)
+        self._pending: 'OrderedDict[str, IngestPath]' = OrderedDict()
+        self._in_flight: Dict[str, IngestPath] = {}
+        self._condition = threading.Condition()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+        self._counts = {'received': 0, 'queued': 0, 'duplicate': 0, 'existing': 0,
+                        'processed': 0, 'failed': 0, 'batches': 0}
+        self._last_batch: Dict[str, object] = {}
+
+    def start(self):
+        with self._condition:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopping = False
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='RcloneIngest')
+            self._thread = threading.Thread(target=self._run, name='RcloneIngestDispatcher', daemon=True)
+            self._thread.start()
+
+    def stop(self, wait: bool = True):
+        """Stop the dispatcher. Paths still pending are dropped, running ones finish when wait is set."""
+        with self._condition:
+            self._stopping = True
+            self._condition.notify_all()
+            thread, executor = self._thread, self._executor
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=10)
+        if executor is not None:
+            executor.shutdown(wait=wait)
+        self._thread = self._executor = None
+
+    def submit(self, directory_name: str, scan_path: str) -> Dict[str, object]:
+        """
+        Queue a path reported by rclone.
+
+        Returns a dict with status 'queued' or 'duplicate' and the task_id the path
+        will be (or is already being) processed under.
+        """
+        key = _dedup_key(directory_name)
+        with self._condition:
+            self._counts['received'] += 1
+            existing = self._pending.get(key) or self._in_flight.get(key)
+            if existing is not None:
+                self._counts['duplicate'] += 1
+                RCLONE_WEBHOOK_PATHS.inc(outcome='duplicate')
+                return {'status': 'duplicate', 'task_id': existing.task_id}
+            item = IngestPath(directory_name, scan_path)
+            self._pending[key] = item
+            self._counts['queued'] += 1
+            self._condition.notify_all()
+        RCLONE_WEBHOOK_PATHS.inc(outcome='queued')
+        if self._thread is None or not self._thread.is_alive():
+            self.start()
+        return {'status': 'queued', 'task_id': item.task_id}
+
+    def _take_batch(self) -> Optional[Dict[str, IngestPath]]:
+        """Wait for the batch window of the oldest pending path and remove up to max_batch_size paths."""
+        with self._condition:
+            while not self._stopping:
+                if not self._pending:
+                    self._condition.wait()
+                    continue
+                oldest = next(iter(self._pending.values()))
+                remaining = oldest.received_at + self.batch_window - time.monotonic()
+                if remaining > 0 and len(self._pending) < self.max_batch_size:
+                    self._condition.wait(remaining)
+                    continue
+                batch: Dict[str, IngestPath] = {}
+                while self._pending and len(batch) < self.max_batch_size:
+                    key, item = self._pending.popitem(last=False)
+                    batch[key] = item
+                    self._in_flight[key] = item
+                return batch
+        return None
+
+    def _run(self):
+        while True:
+            batch = self._take_batch()
+            if batch is None:
+                return
+            try:
+                self._dispatch(batch)
+            except Exception as e:
+                logging.error(f"rclone ingest batch of {len(batch)} paths failed: {e}", exc_info=True)
+                with self._condition:
+                    for key in batch:
+                        self._in_flight.pop(key, None)
+
+    def _dispatch(self, batch: Dict[str, IngestPath]):
+        started = time.monotonic()
+        existing = self.resolve_existing([item.directory_name for item in batch.values()])
+        resolve_seconds = time.monotonic() - started
+
+        new_items = []
+        for key, item in batch.items():
+            RCLONE_WEBHOOK_SECONDS.observe(started - item.received_at, stage='wait')
+            if item.directory_name in existing:
+                logging.info(f"Ignoring rclone path '{item.directory_name}', a matching item already exists in the database")
+                with self._condition:
+                    self._in_flight.pop(key, None)
+                    self._counts['existing'] += 1
+                RCLONE_WEBHOOK_PATHS.inc(outcome='existing')
+            else:
+                new_items.append((key, item))
+
+        with self._condition:
+            self._counts['batches'] += 1
+            self._last_batch = {'size': len(batch), 'new': len(new_items),
+                                'resolve_seconds': round(resolve_seconds, 4), 'at': time.time()}
+        logging.info(f"rclone ingest batch: {len(batch)} paths, {len(new_items)} new, "
+                     f"existence resolved in {resolve_seconds * 1000:.1f} ms")
+
+        for key, item in new_items:
+            self._executor.submit(self._process, key, item)
+
+    def _process(self, key: str, item: IngestPath):
+        outcome = 'processed'
+        try:
+            with RCLONE_WEBHOOK_SECONDS.time(stage='process'):
+                self.process_path(item)
+        except Exception as e:
+            outcome = 'failed'
+            logging.error(f"Error processing rclone path '{item.scan_path}' (task {item.task_id}): {e}", exc_info=True)
+        finally:
+            with self._condition:
+                self._in_flight.pop(key, None)
+                self._counts[outcome] += 1
+            RCLONE_WEBHOOK_PATHS.inc(outcome=outcome)
+
+    def get_stats(self) -> Dict[str, object]:
+        with self._condition:
+            oldest = next(iter(self._pending.values()), None)
+            stats = {
+                'pending': len(self._pending),
+                'in_flight': len(self._in_flight),
+                'oldest_pending_seconds': round(time.monotonic() - oldest.received_at, 3) if oldest else 0.0,
+                'batch_window_seconds': self.batch_window,
+                'max_workers': self.max_workers,
+                'running': self._thread is not None and self._thread.is_alive(),
+                'counts': dict(self._counts),
+                'last_batch': dict(self._last_batch),
+            }
+        stats['latency'] = RCLONE_WEBHOOK_SECONDS.summary()
+        return stats
+
+
+_queue: Optional[RcloneIngestQueue] = None
+_queue_lock = threading.Lock()
+
+
+def get_rclone_ingest_queue(process_path: Callable[[IngestPath], None]) -> RcloneIngestQueue:
+    """The shared queue, created with the File Management batch settings on first use."""
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            from utilities.settings import get_setting
+            from database.database_reading import find_existing_directory_names
+            try:
+                batch_window = float(get_setting('File Management', 'rclone_webhook_batch_window_seconds',
+                                                 DEFAULT_BATCH_WINDOW_SECONDS))
+            except (TypeError, ValueError):
+                batch_window = DEFAULT_BATCH_WINDOW_SECONDS
+            try:
+                max_workers = int(get_setting('File Management', 'rclone_webhook_max_workers', DEFAULT_MAX_WORKERS))
+            except (TypeError, ValueError):
+                max_workers = DEFAULT_MAX_WORKERS
+            _queue = RcloneIngestQueue(process_path, find_existing_directory_names,
+                                       batch_window=batch_window, max_workers=max_workers)
+        return _queue
+
+
+def get_rclone_ingest_stats() -> Optional[Dict[str, object]]:
+    """Stats of the shared queue, or None when no webhook has been received yet."""
+    queue = _queue
+    return queue.get_stats() if queue is not None else None
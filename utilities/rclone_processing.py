@@ -12,6 +12,7 @@ from database.database_reading import get_media_item_presence, get_media_item_by
 
 # Utility Imports
 from utilities.settings import get_setting
+from utilities.mount_index import notify_mount_change
 from utilities.local_library_scan import get_symlink_path, create_symlink, check_local_file_for_item
 from utilities.plex_functions import plex_update_item
 from utilities.emby_functions import emby_update_item
@@ -56,6 +57,7 @@ def handle_rclone_file(file_path: str) -> Dict[str, Any]:
         if not original_path:
              raise ValueError("Original files path setting is missing or empty.")
         source_file = os.path.join(original_path, file_path) # Full path to the source file
+        notify_mount_change(os.path.dirname(source_file))
 
         # Check database for items in Checking state with matching filename
         conn = get_db_connection()
@@ -0,0 +1,198 @@
+"""
+On-demand statistical sampling profiler.
+
+Replaces the process-wide cProfile. cProfile hooked every Python call for the
+whole life of the process. This profiler starts a background thread that
+snapshots `sys._current_frames()` every `profiler_sample_interval_ms` and
+counts the stacks it sees.
+
+- Samples are grouped by task label. The label is the scheduler job or Flask
+  endpoint a thread is running, registered with `set_thread_task`. Threads
+  without a label are grouped by thread name.
+- `collapsed_stacks()` exports the counts in the collapsed format read by
+  flamegraph.pl, speedscope and inferno ("label;outer;...;inner count").
+- When the profiler is stopped no thread runs and `set_thread_task` returns
+  without recording anything.
+"""
+
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, List, Optional
+
+DEFAULT_SAMPLE_INTERVAL_MS = 10
+MAX_STACK_DEPTH = 128
+
+# Task labels by thread ident, only recorded while a profiler is running
+_thread_tasks: Dict[int, str] = {}
+
+
+class SamplingProfiler:
+    """Samples the stacks of all threads at a fixed interval and aggregates them per task."""
+
+    def __init__(self, interval_ms: int = DEFAULT_SAMPLE_INTERVAL_MS, max_depth: int = MAX_STACK_DEPTH):
+        self.interval = max(interval_ms, 1) / 1000
+        self.max_depth = max_depth
+        self._stacks: Counter = Counter()
+        self._frame_names: Dict[object, str] = {}
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.samples = 0
+        self.started_at: Optional[float] = None
+        self.sampling_seconds = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.running:
+            return
+        self._stopped.clear()
+        self.started_at = time.time()
+        self._thread = threading.Thread(target=self._run, name='SamplingProfiler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=5)
+        self._thread = None
+
+    def reset(self):
+        with self._lock:
+            self._stacks.clear()
+            self.samples = 0
+            self.sampling_seconds = 0.0
+            self.started_at = time.time() if self.running else None
+
+    def _run(self):
+        own_ident = threading.get_ident()
+        while not self._stopped.wait(self.interval):
+            try:
+                self.sample(skip_ident=own_ident)
+            except Exception as e:
+                logging.error(f"Sampling profiler failed to take a sample: {e}", exc_info=True)
+
+    def sample(self, skip_ident: Optional[int] = None):
+        """Take one snapshot of every thread's stack."""
+        begin = time.perf_counter()
+        frames = sys._current_frames()
+        thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+        collected = []
+        for ident, frame in frames.items():
+            if ident == skip_ident:
+                continue
+            label = _thread_tasks.get(ident) or thread_names.get(ident, f'thread-{ident}')
+            collected.append(self._collapse(label, frame))
+        del frames
+        with self._lock:
+            self._stacks.update(collected)
+            self.samples += 1
+            self.sampling_seconds += time.perf_counter() - begin
+
+    def _collapse(self, label: str, frame) -> str:
+        names: List[str] = []
+        while frame is not None and len(names) < self.max_depth:
+            code = frame.f_code
+            name = self._frame_names.get(code)
+            if name is None:
+                name = f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})".replace(';', ':')
+                self._frame_names[code] = name
+            names.append(name)
+            frame = frame.f_back
+        names.append(label.replace(';', ':').replace(' ', '_'))
+        names.reverse()
+        return ';'.join(names)
+
+    def collapsed_stacks(self) -> str:
+        """Stack counts in collapsed ("folded") flamegraph format, one stack per line."""
+        with self._lock:
+            stacks = sorted(self._stacks.items())
+        return ''.join(f"{stack} {count}\n" for stack, count in stacks)
+
+    def task_summary(self, limit: int = 20) -> List[Dict[str, object]]:
+        """Samples per task label with each task's most frequent leaf frames."""
+        tasks: Dict[str, Counter] = {}
+        with self._lock:
+            stacks = list(self._stacks.items())
+        for stack, count in stacks:
+            label, _, rest = stack.partition(';')
+            leaf = rest.rsplit(';', 1)[-1] if rest else '(idle)'
+            tasks.setdefault(label, Counter())[leaf] += count
+        summary = [
+            {'task': label, 'samples': sum(leaves.values()), 'top_frames': leaves.most_common(5)}
+            for label, leaves in tasks.items()
+        ]
+        summary.sort(key=lambda entry: entry['samples'], reverse=True)
+        return summary[:limit]
+
+    def status(self) -> Dict[str, object]:
+        with self._lock:
+            samples = self.samples
+            distinct = len(self._stacks)
+            sampling_seconds = self.sampling_seconds
+        return {
+            'running': self.running,
+            'interval_ms': round(self.interval * 1000, 3),
+            'samples': samples,
+            'distinct_stacks': distinct,
+            'started_at': self.started_at,
+            'avg_sample_ms': round(sampling_seconds * 1000 / samples, 3) if samples else 0.0,
+        }
+
+
+_profiler: Optional[SamplingProfiler] = None
+_profiler_lock = threading.Lock()
+
+
+def get_profiler() -> Optional[SamplingProfiler]:
+    """The current profiler (running or stopped with its samples), or None if never started."""
+    return _profiler
+
+
+def start_profiler(interval_ms: Optional[int] = None) -> SamplingProfiler:
+    """Start sampling. A new interval discards the samples of the previous run."""
+    global _profiler
+    if interval_ms is None:
+        from utilities.settings import get_setting
+        try:
+            interval_ms = int(get_setting('Debug', 'profiler_sample_interval_ms', DEFAULT_SAMPLE_INTERVAL_MS))
+        except (TypeError, ValueError):
+            interval_ms = DEFAULT_SAMPLE_INTERVAL_MS
+    with _profiler_lock:
+        if _profiler is None or round(_profiler.interval * 1000) != max(interval_ms, 1):
+            if _profiler is not None:
+                _profiler.stop()
+            _profiler = SamplingProfiler(interval_ms=interval_ms)
+        if not _profiler.running:
+            _profiler.start()
+            logging.info(f"Sampling profiler started ({interval_ms} ms interval)")
+        return _profiler
+
+
+def stop_profiler() -> Optional[SamplingProfiler]:
+    """Stop sampling and keep the collected samples for export."""
+    with _profiler_lock:
+        profiler = _profiler
+        if profiler is not None and profiler.running:
+            profiler.stop()
+            logging.info(f"Sampling profiler stopped after {profiler.samples} samples")
+        _thread_tasks.clear()
+        return profiler
+
+
+def set_thread_task(label: str):
+    """Label the calling thread's samples with a task name. Does nothing while not profiling."""
+    profiler = _profiler
+    if profiler is not None and profiler.running:
+        _thread_tasks[threading.get_ident()] = label
+
+
+def clear_thread_task():
+    if _thread_tasks:
+        _thread_tasks.pop(threading.get_ident(), None)
@@ -2,6 +2,7 @@ import urwid, os
 import configparser
 from typing import List, Dict, Any, Optional
 from scraper.scraper import scrape, rank_result_key, parse_size, calculate_bitrate
+from scraper.functions.version_profile import get_version_profile
 from utilities.settings import set_setting, get_scraping_settings, load_config, save_config
 from utilities.manual_scrape import run_manual_scrape
 import logging
@@ -176,6 +177,8 @@ class ScraperTester:
         logging.debug(f"Number of filtered out results: {len(self.filtered_out_results)}")
 
         # Calculate scores and ensure bitrate for each result
+        version_settings = self.config['Scraping']['versions'][self.current_version]
+        profile = get_version_profile(version_settings)
         for result_list in [self.results, self.filtered_out_results]:
             for result in result_list:
                 # Ensure bitrate is calculated and stored in the result
@@ -189,7 +192,7 @@ class ScraperTester:
                         logging.warning(f"Unable to calculate bitrate for result: {result.get('title', 'Unknown')}. Missing runtime.")
 
                 # Now that we ensure 'bitrate' exists, we can safely call rank_result_key
-                rank_result_key(result, self.results, self.title, self.year, self.season, self.episode, self.multi, self.movie_or_episode, self.config['Scraping']['versions'][self.current_version])
+                rank_result_key(result, self.results, self.title, self.year, self.season, self.episode, self.multi, self.movie_or_episode, version_settings, profile=profile)
 
         # Sort both result lists based on the total score
         self.results.sort(key=lambda x: x.get('score_breakdown', {}).get('total_score', 0), reverse=True)
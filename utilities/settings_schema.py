@@ -165,6 +165,18 @@ SETTINGS_SCHEMA = {
             "description": "Path to the original files (in Zurg use the /__all__ folder).",
             "default": "/mnt/zurg/__all__"
         },
+        "use_mount_index": {
+            "type": "boolean",
+            "description": "Keep an index of the original files path in the background and look downloaded files up there instead of probing the mount for every candidate folder.",
+            "default": True
+        },
+        "mount_index_refresh_seconds": {
+            "type": "integer",
+            "description": "How often (in seconds) the original files index checks the mount for changed folders.",
+            "default": 300,
+            "min": 10,
+            "max": 86400
+        },
         "symlinked_files_path": {
             "type": "string",
             "description": "Path to the destination folder (where you want your files linked to).",
@@ -195,6 +207,18 @@ SETTINGS_SCHEMA = {
             "description": "Process files in rclone webhook even if they don't match any items in the checking state",
             "default": False
         },
+        "rclone_webhook_batch_window_seconds": {
+            "type": "float",
+            "description": "Seconds the rclone webhook collects paths before checking them against the database as one batch",
+            "default": 2.0,
+            "min": 0
+        },
+        "rclone_webhook_max_workers": {
+            "type": "integer",
+            "description": "Maximum number of rclone webhook paths processed at the same time",
+            "default": 2,
+            "min": 1
+        },
         "plex_url_for_symlink": {
             "type": "string",
             "description": "Plex server URL for symlink updates (optional)",
@@ -341,6 +365,36 @@ SETTINGS_SCHEMA = {
              "default": 0.0,
              "min": 0.0
          },
+        "enable_event_driven_queues": {
+            "type": "boolean",
+            "description": "Wake the next queue as soon as an item moves into it instead of waiting for its polling interval. Interval polling is kept as a safety net. Requires a program restart.",
+            "default": True
+        },
+        "event_driven_safety_net_seconds": {
+            "type": "integer",
+            "description": "Polling interval (in seconds) used for the Scraping and Adding queues when event-driven queues are enabled. These queues are otherwise woken whenever items move into them.",
+            "default": 30,
+            "min": 1
+        },
+        "scraping_workers": {
+            "type": "integer",
+            "description": "Number of Scraping queue items processed concurrently. Episodes of the same show are never scraped at the same time. 1 processes one item at a time.",
+            "default": 1,
+            "min": 1,
+            "max": 16
+        },
+        "scraping_max_concurrent_per_scraper": {
+            "type": "integer",
+            "description": "Maximum concurrent requests to a single scraper instance across all scraping workers. Set to 0 for no limit.",
+            "default": 2,
+            "min": 0
+        },
+        "scraping_max_concurrent_requests": {
+            "type": "integer",
+            "description": "Maximum concurrent scraper requests across all scrapers. Set to 0 for no limit.",
+            "default": 0,
+            "min": 0
+        },
         "pre_release_scrape_days": {
             "type": "integer",
             "description": "Number of days before release date to start scraping for movies. For example, setting to 3 will start scraping movies 3 days before their release date. Set to 0 to disable pre-release scraping.",
@@ -439,6 +493,12 @@ SETTINGS_SCHEMA = {
             "default": 5,
             "min": 0
         },
+        "season_scrape_session_ttl": {
+            "type": "integer",
+            "description": "Seconds that scraper responses for a season are shared between its episodes. Season pack searches and repeated requests are then made once per season instead of once per episode. Set to 0 to disable.",
+            "default": 600,
+            "min": 0
+        },
         "versions": {
             "type": "dict",
             "description": "Scraping versions configuration",
@@ -579,11 +639,58 @@ SETTINGS_SCHEMA = {
             "default": "DEBUG",
             "choices": ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
         },
+        "async_logging": {
+            "type": "boolean",
+            "description": "Write debug.log and console output from a background thread, flushing once per batch instead of after every line. Takes effect on restart.",
+            "default": True
+        },
+        "log_queue_size": {
+            "type": "integer",
+            "description": "Maximum number of log records waiting for the logging thread. When full, DEBUG and INFO records are dropped and counted.",
+            "default": 10000,
+            "min": 100
+        },
+        "log_rate_limit_burst": {
+            "type": "integer",
+            "description": "Maximum DEBUG/INFO records per logging call site every 10 seconds with async logging. Extra records are suppressed and counted. 0 disables the limit.",
+            "default": 100,
+            "min": 0
+        },
+        "metrics_token": {
+            "type": "string",
+            "description": "Bearer token that lets a Prometheus scraper read /performance/metrics without logging in (Authorization: Bearer <token>). Leave empty to require a login.",
+            "default": "",
+            "sensitive": True
+        },
         "skip_initial_plex_update": {
             "type": "boolean",
             "description": "Skip Plex initial collection scan",
             "default": False
         },
+        "plex_streaming_full_scan": {
+            "type": "boolean",
+            "description": "Stream full Plex library scans into the database in chunks instead of loading the whole library into memory first. An interrupted scan resumes from the last completed library section.",
+            "default": True
+        },
+        "plex_streaming_chunk_size": {
+            "type": "integer",
+            "description": "Number of items written to the database per chunk during a streamed full Plex scan",
+            "default": 500,
+            "min": 50,
+            "max": 5000
+        },
+        "media_item_write_behind": {
+            "type": "boolean",
+            "description": "Buffer small media item updates (wake counts, blacklisted dates, field updates) and write them in batches instead of one transaction each",
+            "default": False
+        },
+        "media_item_write_behind_interval_ms": {
+            "type": "integer",
+            "description": "How often buffered media item updates are written to the database, in milliseconds",
+            "default": 250,
+            "min": 10,
+            "max": 5000
+        },
         "disable_unblacklisting": {
             "type": "boolean",
             "description": "Disable automatic unblacklisting of items from the blacklisted queue",
@@ -818,6 +925,36 @@ SETTINGS_SCHEMA = {
             "default": 100,
             "min": 1
         },
+        "database_backup_interval_hours": {
+            "type": "integer",
+            "description": "Hours between online backups of media_items.db and cli_battery.db (0 disables scheduled backups). Backups are checked with PRAGMA quick_check.",
+            "default": 24,
+            "min": 0
+        },
+        "database_backup_retention": {
+            "type": "integer",
+            "description": "Number of backups to keep per database",
+            "default": 2,
+            "min": 1
+        },
+        "database_backup_compression": {
+            "type": "string",
+            "description": "Compression for database backups. zstd needs the zstandard package and falls back to gzip without it.",
+            "default": "none",
+            "choices": ["none", "gzip", "zstd"]
+        },
+        "enable_sampling_profiler": {
+            "type": "boolean",
+            "description": "Start the sampling profiler at startup. It can also be started and stopped at runtime from the debug API (/debug/api/profiler/start and /stop).",
+            "default": False
+        },
+        "profiler_sample_interval_ms": {
+            "type": "integer",
+            "description": "How often the sampling profiler snapshots all thread stacks, in milliseconds. Lower values give finer profiles at more overhead.",
+            "default": 10,
+            "min": 1,
+            "max": 1000
+        },
         "plex_removal_cache_delay_minutes": {
             "type": "integer",
             "description": "Delay in minutes before processing a cached Plex removal operation. Default: 360 (6 hours).",
@@ -0,0 +1,267 @@
+"""
+Parallel scanner for broken symlinks in the symlinked library.
+
+The library is listed with `os.scandir` on a thread pool, one directory per
+task. Symlink targets are read with `os.readlink`, so the targets are not
+stat'ed one by one. The targets are then grouped by target directory, and each
+directory on the mount is listed once to validate all of its symlinks together.
+The run is bounded by the mount's round-trips rather than by a single walk
+thread making one `os.path.exists` call per symlink.
+
+Validated target directories are saved to a checkpoint file in the db_content
+directory. If a scan is interrupted, the next scan of the same library skips
+the target directories that were already checked. Progress, including the
+broken symlinks found so far, is reported through a callback so the UI can
+show results while the scan runs.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+SCAN_WORKERS = 8
+CHECKPOINT_FILE_NAME = 'symlink_scan_checkpoint.json'
+CHECKPOINT_MAX_AGE_HOURS = 24
+CHECKPOINT_INTERVAL_SECONDS = 10
+PROGRESS_INTERVAL_SECONDS = 1
+
+
+def _checkpoint_path() -> str:
+    db_content_dir = os.environ.get('USER_DB_CONTENT', '/user/db_content')
+    return os.path.join(db_content_dir, CHECKPOINT_FILE_NAME)
+
+
+def load_symlink_scan_checkpoint(library_path: str) -> Optional[Dict[str, Any]]:
+    """Load the checkpoint of an unfinished scan of library_path, if it is recent enough."""
+    path = _checkpoint_path()
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'r') as f:
+            checkpoint = json.load(f)
+    except (OSError, ValueError) as e:
+        logging.warning(f"Ignoring unreadable symlink scan checkpoint {path}: {e}")
+        return None
+    if checkpoint.get('library_path') != os.path.normpath(library_path):
+        return None
+    if time.time() - checkpoint.get('started_at', 0) > CHECKPOINT_MAX_AGE_HOURS * 3600:
+        logging.info("Symlink scan checkpoint is too old, starting a fresh scan")
+        return None
+    return checkpoint
+
+
+def save_symlink_scan_checkpoint(checkpoint: Dict[str, Any]):
+    path = _checkpoint_path()
+    tmp_path = f"{path}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp_path, 'w') as f:
+            json.dump(checkpoint, f)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logging.warning(f"Could not save symlink scan checkpoint: {e}")
+
+
+def clear_symlink_scan_checkpoint():
+    try:
+        os.remove(_checkpoint_path())
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logging.warning(f"Could not remove symlink scan checkpoint: {e}")
+
+
+def list_library(library_path: str, workers: int = SCAN_WORKERS) -> Tuple[Dict[str, List[Tuple[str, str]]], Dict[str, int], int]:
+    """
+    List library_path recursively in parallel.
+
+    Returns (symlinks, dir_entry_counts, total_files):
+    - symlinks maps each target directory to [(symlink_path, target_name), ...];
+    - dir_entry_counts maps every directory to its number of entries;
+    - total_files counts all non-directory entries.
+    """
+    symlinks: Dict[str, List[Tuple[str, str]]] = {}
+    dir_entry_counts: Dict[str, int] = {}
+    total_files = 0
+
+    def list_dir(path):
+        links, subdirs, file_count, entry_count = [], [], 0, 0
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    entry_count += 1
+                    try:
+                        if entry.is_symlink():
+                            file_count += 1
+                            target = os.readlink(entry.path)
+                            links.append((entry.path, os.path.normpath(os.path.join(path, target))))
+                        elif entry.is_dir():
+                            subdirs.append(entry.path)
+                        else:
+                            file_count += 1
+                    except OSError as e:
+                        logging.debug(f"Could not inspect {entry.path}: {e}")
+        except OSError as e:
+            logging.warning(f"Could not list {path}: {e}")
+        return links, subdirs, file_count, entry_count
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='SymlinkScan') as executor:
+        pending = {executor.submit(list_dir, library_path): library_path}
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                path = pending.pop(future)
+                links, subdirs, file_count, entry_count = future.result()
+                dir_entry_counts[path] = entry_count
+                total_files += file_count
+                for symlink_path, target_path in links:
+                    target_dir, target_name = os.path.split(target_path)
+                    symlinks.setdefault(target_dir, []).append((symlink_path, target_name))
+                for subdir in subdirs:
+                    pending[executor.submit(list_dir, subdir)] = subdir
+    return symlinks, dir_entry_counts, total_files
+
+
+def _validate_target_dir(target_dir: str, names: List[str]) -> List[str]:
+    """Return the names (of those given) that don't exist as usable files in target_dir."""
+    try:
+        present = {}
+        with os.scandir(target_dir) as entries:
+            for entry in entries:
+                present[entry.name] = entry.is_symlink()
+    except (FileNotFoundError, NotADirectoryError):
+        return list(names)
+    missing = []
+    for name in names:
+        if name not in present:
+            missing.append(name)
+        elif present[name] and not os.path.exists(os.path.join(target_dir, name)):
+            # Targets that are symlinks themselves (e.g. to another mount) must resolve too
+            missing.append(name)
+    return missing
+
+
+def scan_symlink_library(library_path: str, progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+                         resume: bool = True, workers: int = SCAN_WORKERS,
+                         stop_event: Optional[threading.Event] = None) -> Dict[str, Any]:
+    """
+    Scan library_path for broken symlinks.
+
+    progress_callback, if given, receives dicts with 'checked_symlinks', 'total_symlinks',
+    'broken_count' and 'new_broken' (broken symlinks found since the previous call) about
+    once a second. Setting stop_event interrupts the scan after saving a checkpoint.
+    Returns the same summary as local_library_scan.scan_for_broken_symlinks.
+    """
+    library_path = os.path.normpath(library_path)
+    start = time.time()
+    symlinks, _, total_files = list_library(library_path, workers)
+    total_symlinks = sum(len(links) for links in symlinks.values())
+    logging.info(f"Listed {total_files} files ({total_symlinks} symlinks into {len(symlinks)} directories) "
+                 f"in {time.time() - start:.1f}s")
+
+    checkpoint = load_symlink_scan_checkpoint(library_path) if resume else None
+    if checkpoint:
+        logging.info(f"Resuming symlink scan: {len(checkpoint['validated_dirs'])} target directories already checked")
+    else:
+        checkpoint = {'library_path': library_path, 'started_at': time.time(), 'validated_dirs': {}}
+    validated_dirs: Dict[str, List[str]] = checkpoint['validated_dirs']
+
+    broken_symlinks: List[Dict[str, Any]] = []
+    checked = 0
+    unreported: List[Dict[str, Any]] = []
+    last_progress = last_checkpoint = time.time()
+
+    def record(target_dir, missing):
+        nonlocal checked
+        missing = set(missing)
+        for symlink_path, target_name in symlinks[target_dir]:
+            checked += 1
+            if target_name in missing:
+                target_path = os.path.join(target_dir, target_name)
+                broken = {
+                    'symlink_path': symlink_path,
+                    'relative_path': os.path.relpath(symlink_path, library_path),
+                    'target_path': target_path,
+                    'filename': os.path.basename(symlink_path)
+                }
+                logging.warning(f"Found broken symlink: {broken['relative_path']} -> {target_path}")
+                broken_symlinks.append(broken)
+                unreported.append(broken)
+
+    def report(force=False):
+        nonlocal last_progress
+        if progress_callback and (force or unreported or time.time() - last_progress >= PROGRESS_INTERVAL_SECONDS):
+            progress_callback({'checked_symlinks': checked, 'total_symlinks': total_symlinks,
+                               'broken_count': len(broken_symlinks), 'new_broken': list(unreported)})
+            unreported.clear()
+            last_progress = time.time()
+
+    for target_dir in [d for d in symlinks if d in validated_dirs]:
+        record(target_dir, validated_dirs[target_dir])
+    report(force=True)
+
+    to_validate = [d for d in symlinks if d not in validated_dirs]
+    interrupted = False
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='SymlinkValidate') as executor:
+        futures = {executor.submit(_validate_target_dir, d, [name for _, name in symlinks[d]]): d for d in to_validate}
+        try:
+            for future in as_completed(futures):
+                target_dir = futures[future]
+                missing = future.result()
+                validated_dirs[target_dir] = missing
+                record(target_dir, missing)
+                report()
+                if time.time() - last_checkpoint >= CHECKPOINT_INTERVAL_SECONDS:
+                    save_symlink_scan_checkpoint(checkpoint)
+                    last_checkpoint = time.time()
+                if stop_event is not None and stop_event.is_set():
+                    interrupted = True
+                    break
+        finally:
+            if interrupted or any(d not in validated_dirs for d in symlinks):
+                for future in futures:
+                    future.cancel()
+                save_symlink_scan_checkpoint(checkpoint)
+    report(force=True)
+
+    if interrupted:
+        logging.info(f"Symlink scan interrupted after {checked}/{total_symlinks} symlinks; it will resume from the checkpoint")
+    else:
+        clear_symlink_scan_checkpoint()
+
+    health_percentage = ((total_symlinks - len(broken_symlinks)) / total_symlinks * 100) if total_symlinks > 0 else 100
+    result = {
+        'total_symlinks': total_symlinks,
+        'broken_symlinks': broken_symlinks,
+        'broken_count': len(broken_symlinks),
+        'total_files_scanned': total_files,
+        'health_percentage': round(health_percentage, 1)
+    }
+    if interrupted:
+        result['interrupted'] = True
+    logging.info(f"Symlink scan {'interrupted' if interrupted else 'complete'} in {time.time() - start:.1f}s: "
+                 f"{total_files} files, {total_symlinks} symlinks, {len(broken_symlinks)} broken "
+                 f"(health {health_percentage:.1f}%)")
+    return result
+
+
+def prune_empty_directories(base_path: str, workers: int = SCAN_WORKERS) -> int:
+    """Remove empty directories under base_path (deepest first). Returns the number removed."""
+    _, dir_entry_counts, _ = list_library(base_path, workers)
+    base_path = os.path.normpath(base_path)
+    pruned = 0
+    for dir_path in sorted(dir_entry_counts, key=lambda d: d.count(os.sep), reverse=True):
+        if dir_path == base_path:
+            continue
+        try:
+            # rmdir fails on non-empty directories, so no separate emptiness check is needed
+            os.rmdir(dir_path)
+            logging.info(f"Pruned empty directory: {dir_path}")
+            pruned += 1
+        except OSError:
+            continue
+    return pruned
@@ -0,0 +1,261 @@
+"""
+Bounded LRU + TTL cache with single-flight recomputation.
+
+This replaces the separate time-based memo decorators (debrid's
+timed_lru_cache, the statistics cache_for_seconds copies and the lru_cache
+in routes/models). None of those were bounded, cheap to evict or safe when an
+entry expired while several requests wanted it.
+
+- Entries live in an OrderedDict in LRU order. A hit moves the entry to the
+  end and an insert over `maxsize` pops the front, so both are O(1). Expired
+  entries are dropped when they are read.
+- Only one caller recomputes a missing or expired key. Concurrent callers
+  for the same key wait for that result instead of calling the function
+  again. Flights are concurrent.futures.Future objects, so waiters can be
+  threads or coroutines on any event loop. The statistics pages run each
+  request in a fresh loop.
+- With `stale_while_revalidate` seconds set, an entry that expired less than
+  that long ago is returned at once, and a background thread refreshes it.
+- Hits, misses, stale hits, coalesced waits and evictions are counted per
+  cache. They are available from `get_cache_stats()` and the cache_* metrics.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from functools import wraps
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from utilities.metrics import CACHE_EVICTIONS, CACHE_REQUESTS
+
+DEFAULT_MAXSIZE = 128
+
+_KWARGS_MARK = object()
+_MISSING = object()
+
+
+def make_key(args: tuple, kwargs: dict) -> Hashable:
+    """Key for a call. Falls back to repr() when an argument is unhashable."""
+    key = args
+    if kwargs:
+        key += (_KWARGS_MARK,) + tuple(sorted(kwargs.items()))
+    try:
+        hash(key)
+    except TypeError:
+        key = repr(key)
+    return key
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries expire `ttl` seconds after they were computed."""
+
+    def __init__(self, name: str, ttl: float, maxsize: int = DEFAULT_MAXSIZE,
+                 stale_while_revalidate: float = 0.0):
+        self.name = name
+        self.ttl = ttl
+        self.maxsize = max(maxsize, 1)
+        self.stale_while_revalidate = max(stale_while_revalidate, 0.0)
+        # key -> (value, expires_at); oldest use first
+        self._entries: 'OrderedDict[Hashable, Tuple[Any, float]]' = OrderedDict()
+        self._flights: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'stale_hits': 0, 'coalesced': 0,
+                       'evicted': 0, 'expired': 0, 'errors': 0}
+
+    def _count(self, result: str):
+        self._stats[result] += 1
+        if result in ('evicted', 'expired'):
+            CACHE_EVICTIONS.inc(cache=self.name, reason=result)
+        elif result != 'errors':
+            CACHE_REQUESTS.inc(cache=self.name, result=result)
+
+    def _lookup(self, key: Hashable, now: float) -> Tuple[Any, bool]:
+        """Return (value, fresh) for a usable entry or (_MISSING, False). Caller holds the lock."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return _MISSING, False
+        value, expires_at = entry
+        if now < expires_at:
+            self._entries.move_to_end(key)
+            return value, True
+        if now < expires_at + self.stale_while_revalidate:
+            return value, False
+        del self._entries[key]
+        self._count('expired')
+        return _MISSING, False
+
+    def _store(self, key: Hashable, value: Any):
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self._count('evicted')
+
+    def _begin(self, key: Hashable) -> Tuple[Any, Optional[Future], bool]:
+        """
+        Look the key up and join or start its flight.
+
+        Returns (value, flight, owner). A fresh or stale value comes back with
+        flight None. Otherwise `owner` tells the caller whether it must compute
+        the value and resolve the flight, or wait on someone else's.
+        """
+        with self._lock:
+            value, fresh = self._lookup(key, time.monotonic())
+            if value is not _MISSING:
+                if fresh:
+                    self._count('hits')
+                else:
+                    self._count('stale_hits')
+                    if key not in self._flights:
+                        self._flights[key] = Future()
+                        return value, self._flights[key], True
+                return value, None, False
+            flight = self._flights.get(key)
+            if flight is not None:
+                self._count('coalesced')
+                return _MISSING, flight, False
+            self._count('misses')
+            flight = self._flights[key] = Future()
+            return _MISSING, flight, True
+
+    def _finish(self, key: Hashable, flight: Future, value: Any = _MISSING, error: Optional[BaseException] = None):
+        if error is None:
+            self._store(key, value)
+        with self._lock:
+            if error is not None:
+                self._count('errors')
+            self._flights.pop(key, None)
+        if error is None:
+            flight.set_result(value)
+        else:
+            flight.set_exception(error)
+
+    def _revalidate(self, key: Hashable, flight: Future, compute: Callable[[], Any]):
+        def run():
+            try:
+                self._finish(key, flight, compute())
+            except BaseException as e:
+                logging.warning(f"Background refresh of cache {self.name} failed: {e}")
+                self._finish(key, flight, error=e)
+        threading.Thread(target=run, name=f'CacheRefresh-{self.name}', daemon=True).start()
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Return the cached value for `key`, calling `compute` at most once across concurrent callers."""
+        value, flight, owner = self._begin(key)
+        if flight is None:
+            return value
+        if value is not _MISSING:
+            self._revalidate(key, flight, compute)
+            return value
+        if not owner:
+            return flight.result()
+        try:
+            value = compute()
+        except BaseException as e:
+            self._finish(key, flight, error=e)
+            raise
+        self._finish(key, flight, value)
+        return value
+
+    async def get_or_compute_async(self, key: Hashable, compute: Callable[[], Awaitable[Any]]) -> Any:
+        """Async form of `get_or_compute`. Stale entries are refreshed with asyncio.run in a background thread."""
+        value, flight, owner = self._begin(key)
+        if flight is None:
+            return value
+        if value is not _MISSING:
+            self._revalidate(key, flight, lambda: asyncio.run(compute()))
+            return value
+        if not owner:
+            return await asyncio.wrap_future(flight)
+        try:
+            value = await compute()
+        except BaseException as e:
+            self._finish(key, flight, error=e)
+            raise
+        self._finish(key, flight, value)
+        return value
+
+    def invalidate(self, key: Hashable):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats.update(name=self.name, size=len(self._entries), maxsize=self.maxsize, ttl=self.ttl,
+                         stale_while_revalidate=self.stale_while_revalidate, in_flight=len(self._flights))
+        lookups = stats['hits'] + stats['stale_hits'] + stats['coalesced'] + stats['misses']
+        stats['hit_ratio'] = (stats['hits'] + stats['stale_hits'] + stats['coalesced']) / lookups if lookups else 0.0
+        return stats
+
+
+_caches: Dict[str, TTLCache] = {}
+_caches_lock = threading.Lock()
+
+
+def _register(cache: TTLCache) -> TTLCache:
+    with _caches_lock:
+        # Two caches with the same name (e.g. redefined functions) stay separately visible
+        base, suffix = cache.name, 1
+        while cache.name in _caches:
+            suffix += 1
+            cache.name = f'{base}#{suffix}'
+        _caches[cache.name] = cache
+    return cache
+
+
+def get_cache(name: str, ttl: float, maxsize: int = DEFAULT_MAXSIZE, stale_while_revalidate: float = 0.0) -> TTLCache:
+    """Create a registered cache, for call sites that key it themselves."""
+    return _register(TTLCache(name, ttl, maxsize, stale_while_revalidate))
+
+
+def get_cache_stats() -> Dict[str, Dict[str, Any]]:
+    with _caches_lock:
+        caches = list(_caches.values())
+    return {cache.name: cache.get_stats() for cache in caches}
+
+
+def clear_caches():
+    with _caches_lock:
+        caches = list(_caches.values())
+    for cache in caches:
+        cache.clear()
+
+
+def ttl_cache(seconds: float, maxsize: int = DEFAULT_MAXSIZE, stale_while_revalidate: float = 0.0,
+              name: Optional[str] = None):
+    """
+    Cache a function's results per argument tuple for `seconds`.
+
+    Works on plain functions, methods and coroutine functions. The wrapper
+    exposes the cache as `.cache` and `cache_clear()` like functools.lru_cache.
+    """
+    def decorator(func: Callable) -> Callable:
+        cache = get_cache(name or f'{func.__module__}.{func.__qualname__}', seconds, maxsize, stale_while_revalidate)
+
+        if asyncio.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                return await cache.get_or_compute_async(make_key(args, kwargs), lambda: func(*args, **kwargs))
+            wrapper = async_wrapper
+        else:
+            @wraps(func)
+            def sync_wrapper(*args, **kwargs):
+                return cache.get_or_compute(make_key(args, kwargs), lambda: func(*args, **kwargs))
+            wrapper = sync_wrapper
+
+        wrapper.cache = cache
+        wrapper.cache_clear = cache.clear
+        return wrapper
+    return decorator